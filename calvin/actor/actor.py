@@ -342,6 +342,10 @@ class Actor(object):
     def migration_info(self):
         return self._migration_info
 
+    @property
+    def priority(self):
+        return self._priority
+
     # What are the arguments, really?
     def __init__(self, actor_type, name='', allow_invalid_transitions=True, disable_transition_checks=False,
                  disable_state_checks=False, actor_id=None, security=None):
@@ -350,12 +354,13 @@ class Actor(object):
         self._type = actor_type
         self._name = name  # optional: human_readable_name
         self._id = actor_id or calvinuuid.uuid("ACTOR")
-        _log.debug("New actor id: %s, supplied actor id %s" % (self._id, actor_id))
+        _log.debug("New actor id: %s, supplied actor id %s", self._id, actor_id)
         self._deployment_requirements = []
         self._port_property_capabilities = None
         self._signature = None
+        self._priority = 1  # Scheduling priority, see calvin.runtime.north.plugins.scheduling
         self._component_members = set([self._id])  # We are only part of component if this is extended
-        self._managed = set(('_id', '_name', '_has_started', '_deployment_requirements', '_signature', '_subject_attributes', '_migration_info', "_port_property_capabilities", "_replication_data"))
+        self._managed = set(('_id', '_name', '_has_started', '_deployment_requirements', '_signature', '_subject_attributes', '_migration_info', "_port_property_capabilities", "_replication_data", "_priority"))
         self._has_started = False
         self._calvinsys = None
         self.calvinsys = None
@@ -449,7 +454,7 @@ class Actor(object):
         if self.fsm.state() == Actor.STATUS.ENABLED:
             # We already was enabled thats fine now with dynamic port connections
             return
-        _log.debug("actor.did_connect BEGIN %s %s " % (self._name, self._id))
+        _log.debug("actor.did_connect BEGIN %s %s ", self._name, self._id)
         # If we happen to be in READY, go to PENDING
         if self.fsm.state() == Actor.STATUS.READY:
             self.fsm.transition_to(Actor.STATUS.PENDING)
@@ -468,7 +473,7 @@ class Actor(object):
 
         # If we made it here, all ports are connected
         self.fsm.transition_to(Actor.STATUS.ENABLED)
-        _log.debug("actor.did_connect ENABLED %s %s " % (self._name, self._id))
+        _log.debug("actor.did_connect ENABLED %s %s ", self._name, self._id)
 
         # Actor enabled, inform scheduler
         self._calvinsys.scheduler_wakeup()
@@ -477,7 +482,7 @@ class Actor(object):
     def did_disconnect(self, port):
         """Called when a port is disconnected, checks actor is fully disconnected."""
         # If the actor is MIGRATABLE, return since it will be migrated soon.
-        _log.debug("Actor %s did_disconnect %s" % (self._id, Actor.STATUS.reverse_mapping[self.fsm.state()]))
+        _log.debug("Actor %s did_disconnect %s", self._id, Actor.STATUS.reverse_mapping[self.fsm.state()])
         if self.fsm.state() == Actor.STATUS.MIGRATABLE:
             return
         # If we happen to be in ENABLED/DENIED, go to PENDING
@@ -519,7 +524,7 @@ class Actor(object):
     def _authorized(self):
         authorized = self.check_authorization_decision()
         if not authorized:
-            _log.info("Access denied for actor %s(%s)" % ( self._type, self._id))
+            _log.info("Access denied for actor %s(%s)", self._type, self._id)
             # The authorization decision is not valid anymore.
             # Change actor status to DENIED.
             self.fsm.transition_to(Actor.STATUS.DENIED)
@@ -535,7 +540,7 @@ class Actor(object):
         _log.warning("%s (%s) actor blocked for %f sec" % (self._name, self._type, time_spent))
 
     def _handle_exhaustion(self, exhausted_ports, output_ok):
-        _log.debug("actor_fire %s test exhaust %s, %s, %s" % (self._id, self._exhaust_cb is not None, exhausted_ports, output_ok))
+        _log.debug("actor_fire %s test exhaust %s, %s, %s", self._id, self._exhaust_cb is not None, exhausted_ports, output_ok)
         for port in exhausted_ports:
             # Might result in actor changing to PENDING
             try:
@@ -544,7 +549,7 @@ class Actor(object):
                 _log.exception("FINSIHED EXHAUSTION FAILED")
         if (output_ok and self._exhaust_cb is not None and
             not any([p.any_outstanding_exhaustion_tokens() for p in self.inports.values()])):
-            _log.debug("actor %s exhausted" % self._id)
+            _log.debug("actor %s exhausted", self._id)
             # We are in exhaustion, got all exhaustion tokens from peer ports
             # but stopped firing while outport token slots available, i.e. exhausted inports or deadlock
             # FIXME handle exhaustion deadlock
@@ -553,9 +558,11 @@ class Actor(object):
             self._exhaust_cb = None
 
     @verify_status([STATUS.ENABLED])
-    def fire(self):
+    def fire(self, time_slice=None):
         """
         Fire an actor.
+        Keeps firing actions until no action can fire or, when time_slice is given,
+        the actor has been firing for time_slice seconds.
         Returns True if any action fired
         """
         # FIXME: Move authorization decision to scheduler
@@ -588,11 +595,10 @@ class Actor(object):
             #
             if did_fire:
                 #
-                # Limit time given to actors even if it could continue a new round of firing
+                # Limit time given to actors even if it could continue a new round of firing,
+                # the time slice is decided by the scheduler
                 #
-                # FIXME: IMHO this decision should be made in the scheduler. No timing here.
-                time_spent = time.time() - start_time
-                done = time_spent > 0.020
+                done = time_slice is not None and time.time() - start_time > time_slice
             else:
                 #
                 # We reached the end of the list without ANY firing during this round
@@ -609,7 +615,7 @@ class Actor(object):
         # We want to run even if not fully connected during exhaustion
         r = self.fsm.state() == Actor.STATUS.ENABLED or self._exhaust_cb is not None
         if not r:
-            _log.debug("Actor %s %s not enabled" % (self._name, self._id))
+            _log.debug("Actor %s %s not enabled", self._name, self._id)
         return r
 
     def denied(self):
@@ -785,6 +791,9 @@ class Actor(object):
         if self._signature is None:
             self._signature = signature
 
+    def priority_set(self, priority):
+        self._priority = priority
+
     def check_authorization_decision(self):
         """Check if authorization decision is still valid"""
         if self.authorization_checks:
@@ -803,11 +812,11 @@ class Actor(object):
         if reply and reply.status == 200 and reply.data["node_id"]:
             self._migration_info = reply.data
             self.fsm.transition_to(Actor.STATUS.MIGRATABLE)
-            _log.info("Migrate actor %s to node %s" % (self._name, self._migration_info["node_id"]))
+            _log.info("Migrate actor %s to node %s", self._name, self._migration_info["node_id"])
             # Inform the scheduler that the actor is ready to migrate.
             self._calvinsys.scheduler_maintenance_wakeup()
         else:
-            _log.info("No possible migration destination found for actor %s" % self._name)
+            _log.info("No possible migration destination found for actor %s", self._name)
             # Try to enable/migrate actor again after a delay.
             self._calvinsys.scheduler_maintenance_wakeup(delay=True)
 
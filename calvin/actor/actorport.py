@@ -18,7 +18,7 @@ from calvin.utilities import calvinuuid
 from calvin.utilities.calvin_callback import CalvinCB
 from calvin.runtime.north.plugins.port import queue
 import calvin.requests.calvinresponse as response
-from calvin.utilities.calvinlogger import get_logger
+from calvin.utilities.calvinlogger import get_logger, Lazy
 from calvin.runtime.north.plugins.port import DISCONNECT
 
 import copy
@@ -200,7 +200,7 @@ class InPort(Port):
             endpoints = self.endpoints
         else:
             endpoints = [e for e in self.endpoints if e.get_peer()[1] in peer_ids]
-        _log.debug("actorinport.disconnect %s remove: %s current: %s %s" % (self.id, peer_ids, [e.get_peer()[1] for e in self.endpoints], DISCONNECT.reverse_mapping[terminate]))
+        _log.debug("actorinport.disconnect %s remove: %s current: %s %s", self.id, peer_ids, Lazy(lambda: [e.get_peer()[1] for e in self.endpoints]), DISCONNECT.reverse_mapping[terminate])
         # Remove all endpoints corresponding to the peer ids
         self.endpoints = [e for e in self.endpoints if e not in endpoints]
         for e in endpoints:
@@ -210,7 +210,7 @@ class InPort(Port):
         exhausting = self.queue.is_exhausting()
         if len(self.endpoints) == 0 and not exhausting:
             self.owner.did_disconnect(self)
-        _log.debug("actorinport.disconnected %s removed: %s current: %s" % (self.id, peer_ids, [e.get_peer()[1] for e in self.endpoints]))
+        _log.debug("actorinport.disconnected %s removed: %s current: %s", self.id, peer_ids, Lazy(lambda: [e.get_peer()[1] for e in self.endpoints]))
         return endpoints
 
     def any_outstanding_exhaustion_tokens(self):
@@ -221,7 +221,7 @@ class InPort(Port):
             return False
 
     def exhausted_tokens(self, tokens):
-        _log.debug("actorinport.exhausted_tokens %s %s" % (self.owner._id, self.id))
+        _log.debug("actorinport.exhausted_tokens %s %s", self.owner._id, self.id)
         self.queue.set_exhausted_tokens(tokens)
         exhausting = self.queue.is_exhausting()
         if len(self.endpoints) == 0 and not exhausting:
@@ -231,7 +231,7 @@ class InPort(Port):
     def finished_exhaustion(self):
         if len(self.endpoints) == 0 and not self.queue.is_exhausting():
             self.owner.did_disconnect(self)
-            _log.debug("actorinport.finished_exhaustion did_disconnect %s" % self.id)
+            _log.debug("actorinport.finished_exhaustion did_disconnect %s", self.id)
 
     def peek_token(self, metadata=None):
         """Used by actor (owner) to peek a token from the port. Following peeks will get next token. Reset with peek_cancel."""
@@ -250,7 +250,11 @@ class InPort(Port):
         if metadata is None:
             metadata = self.id
         # The return has information on if the queue exhausted the remaining tokens
-        return self.queue.commit(metadata)
+        exhausted = self.queue.commit(metadata)
+        # Released slots could let the endpoints advertise a larger window
+        for ep in self.endpoints:
+            ep.mark_dirty()
+        return exhausted
 
     def read(self, metadata=None):
         """
@@ -349,7 +353,7 @@ class OutPort(Port):
             endpoints = self.endpoints
         else:
             endpoints = [e for e in self.endpoints if e.get_peer()[1] in peer_ids]
-        _log.debug("actoroutport.disconnect   remove: %s current: %s %s" % (peer_ids, [e.get_peer()[1] for e in self.endpoints], DISCONNECT.reverse_mapping[terminate]))
+        _log.debug("actoroutport.disconnect   remove: %s current: %s %s", peer_ids, Lazy(lambda: [e.get_peer()[1] for e in self.endpoints]), DISCONNECT.reverse_mapping[terminate])
         # Remove all endpoints corresponding to the peer ids
         self.endpoints = [e for e in self.endpoints if e not in endpoints]
         for e in endpoints:
@@ -358,16 +362,20 @@ class OutPort(Port):
             self.properties['nbr_peers'] -= len(endpoints)
         if len(self.endpoints) == 0:
             self.owner.did_disconnect(self)
-        _log.debug("actoroutport.disconnected remove: %s current: %s" % (peer_ids, [e.get_peer()[1] for e in self.endpoints]))
+        _log.debug("actoroutport.disconnected remove: %s current: %s", peer_ids, Lazy(lambda: [e.get_peer()[1] for e in self.endpoints]))
         return endpoints
 
     def exhausted_tokens(self, tokens):
-        _log.debug("actoroutport.exhausted_tokens %s %s" % (self.owner._id, self.id))
+        _log.debug("actoroutport.exhausted_tokens %s %s", self.owner._id, self.id)
         self.queue.set_exhausted_tokens(tokens)
+        for ep in self.endpoints:
+            ep.mark_dirty()
 
     def write_token(self, data):
         """docstring for write_token"""
         self.queue.write(data, self.id)
+        for ep in self.endpoints:
+            ep.mark_dirty()
 
     def tokens_available(self, length):
         """Used by actor (owner) to check number of token slots available on the port."""
@@ -427,6 +435,11 @@ class PortMeta(object):
         return self._port
 
     def retry(self, callback):
+        # The cached location was wrong, e.g. the peer actor has migrated
+        if self.port_id:
+            self.pm.node.storage.invalidate_port(self.port_id)
+        if self.actor_id:
+            self.pm.node.storage.invalidate_actor(self.actor_id)
         self.node_id = None
         self.retries += 1
         self.retrieve(callback)
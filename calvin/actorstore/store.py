@@ -69,6 +69,84 @@ def _rel_path_to_namespace(rel_path):
 def _normalize_namespace(namespace):
     return namespace.strip('.')
 
+#
+# Actor class cache
+#
+class _ActorClassCache(object):
+    """
+    Actor classes loaded from file, shared by all stores, keyed by name and content digest.
+    The digest of a file is only recomputed when its mtime or size changes, and signature
+    verification results are kept per digest and signature files.
+    """
+
+    def __init__(self):
+        super(_ActorClassCache, self).__init__()
+        self.clear()
+
+    def clear(self):
+        # path -> (mtime, size, digest)
+        self.digests = {}
+        # (name, digest) -> class
+        self.classes = {}
+        # (digest, signature files, truststore, flag) -> (verified, signer)
+        self.signatures = {}
+        self.stats = {'hits': 0, 'misses': 0, 'invalidations': 0, 'signature_hits': 0, 'signature_misses': 0}
+
+    def digest(self, path):
+        """ Content digest of the file at path, None when it can't be read """
+        try:
+            stat = os.stat(path)
+            entry = self.digests.get(path)
+            if entry and entry[:2] == (stat.st_mtime, stat.st_size):
+                return entry[2]
+            with open(path, 'rb') as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+        except (IOError, OSError):
+            return None
+        if entry and entry[2] != digest:
+            # Source changed, drop classes that can no longer be loaded from it
+            self.stats['invalidations'] += 1
+            for key in [key for key in self.classes if key[1] == entry[2]]:
+                del self.classes[key]
+        self.digests[path] = (stat.st_mtime, stat.st_size, digest)
+        return digest
+
+    def get(self, name, digest):
+        pyclass = self.classes.get((name, digest))
+        self.stats['hits' if pyclass else 'misses'] += 1
+        return pyclass
+
+    def put(self, name, digest, pyclass):
+        self.classes[(name, digest)] = pyclass
+
+    def verify_signature(self, sec, path, digest, flag):
+        """ Memoized sec.verify_signature(path, flag) """
+        sign_files = tuple(sorted((f, os.path.getmtime(f)) for f in glob.glob(path + ".sign.*")))
+        key = (digest, sign_files, getattr(sec, 'truststore_for_signing', None), flag)
+        if key in self.signatures:
+            self.stats['signature_hits'] += 1
+            return self.signatures[key]
+        self.stats['signature_misses'] += 1
+        result = sec.verify_signature(path, flag)
+        self.signatures[key] = result
+        return result
+
+    def statistics(self):
+        stats = dict(self.stats)
+        stats['size'] = len(self.classes)
+        return stats
+
+_actor_class_cache = _ActorClassCache()
+
+
+def actor_class_cache_statistics():
+    """ Hits, misses and invalidations of the actor class cache """
+    return _actor_class_cache.statistics()
+
+
+def clear_actor_class_cache():
+    _actor_class_cache.clear()
+
 #
 # Singleton implementation
 #
@@ -134,14 +212,14 @@ class Store(object):
                         subdirs.remove(exclude)
 
 
-    def _load_pymodule(self, name, path):
+    def _load_pymodule(self, name, path, skip_verify=False):
         if not os.path.isfile(path):
             return (None, None)
         pymodule = None
         signer = None
         _log.debug("Store load_pymodule SECURITY %s" % str(self.sec))
         try:
-            if self.sec:
+            if self.sec and not skip_verify:
                 _log.debug("Verify signature for %s actor" % name)
                 verified, signer = self.sec.verify_signature(path, "actor")
                 if self.verify and not verified:
@@ -158,10 +236,10 @@ class Store(object):
             return (pymodule, signer)
 
 
-    def _load_pyclass(self, name, path):
+    def _load_pyclass(self, name, path, skip_verify=False):
         if not os.path.isfile(path):
             return (None, None)
-        pymodule, signer = self._load_pymodule(name, path)
+        pymodule, signer = self._load_pymodule(name, path, skip_verify)
         pyclass = pymodule and pymodule.__dict__.get(name, None)
         if not pyclass:
             _log.debug("No entry %s in %s" % (name, path))
@@ -218,11 +296,29 @@ class ActorStore(Store):
 
 
     def load_actor(self, actor_type, actor_path):
-        actor_class, signer = self._load_pyclass(actor_type, actor_path)
+        digest = _actor_class_cache.digest(actor_path)
+        if digest is None:
+            return (None, None)
+        signer = None
+        if self.sec:
+            try:
+                verified, signer = _actor_class_cache.verify_signature(self.sec, actor_path, digest, "actor")
+            except Exception:
+                _log.exception("Could not verify signature for %s actor" % actor_type)
+                return (None, None)
+            if self.verify and not verified:
+                _log.debug("Failed verification of signature for %s actor" % actor_type)
+                return (None, signer)
+        actor_class = _actor_class_cache.get(actor_type, digest)
+        if actor_class:
+            return actor_class, signer
+        # Signature already verified
+        actor_class = self._load_pyclass(actor_type, actor_path, skip_verify=True)[0]
         if actor_class:
             inports, outports = self._gather_ports(actor_class)
             actor_class.inport_properties = {p: pp for p, pp in inports}
             actor_class.outport_properties = {p: pp for p, pp in outports}
+            _actor_class_cache.put(actor_type, digest, actor_class)
         return actor_class, signer
 
 
@@ -16,8 +16,9 @@
 
 import pytest
 import timeit
+from mock import Mock
 
-from calvin.actorstore.store import ActorStore
+from calvin.actorstore.store import ActorStore, actor_class_cache_statistics, clear_actor_class_cache
 
 
 class TestActorStore(object):
@@ -51,3 +52,89 @@ class TestActorStore(object):
     def test_perf(self):
         time = timeit.timeit(lambda: self.ms.lookup("std.Sum"), number=1000)
         assert time < .2
+
+
+ACTOR_SOURCE = '''
+from calvin.actor.actor import Actor, manage, condition
+
+class Counter(Actor):
+    """
+    Produce a counter
+
+    Outputs:
+      integer : Integer
+    """
+
+    @manage(['count'])
+    def init(self):
+        self.count = %d
+
+    @condition(action_output=['integer'])
+    def cnt(self):
+        self.count += 1
+        return (self.count, )
+
+    action_priority = (cnt, )
+'''
+
+
+class TestActorClassCache(object):
+
+    def setup_method(self, method):
+        clear_actor_class_cache()
+
+    def write_actor(self, path, start, mtime):
+        path.write(ACTOR_SOURCE % start)
+        path.setmtime(mtime)
+
+    def test_cached_lookup(self):
+        ms = ActorStore()
+        found, _, actor_class, _ = ms.lookup("std.Sum")
+        assert found
+        found, _, cached_class, _ = ActorStore().lookup("std.Sum")
+        assert cached_class is actor_class
+        assert cached_class.inport_properties
+        stats = actor_class_cache_statistics()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['size'] == 1
+
+    def test_invalidate_on_change(self, tmpdir):
+        path = tmpdir.join("Counter.py")
+        self.write_actor(path, 0, 1000000)
+        ms = ActorStore()
+        actor_class, _ = ms.load_actor("Counter", str(path))
+        assert ms.load_actor("Counter", str(path))[0] is actor_class
+        self.write_actor(path, 10, 2000000)
+        changed_class, _ = ms.load_actor("Counter", str(path))
+        assert changed_class is not actor_class
+        stats = actor_class_cache_statistics()
+        assert stats['invalidations'] == 1
+        assert stats['size'] == 1
+        # Unchanged content is still cached, even with a new mtime
+        path.setmtime(3000000)
+        assert ms.load_actor("Counter", str(path))[0] is changed_class
+
+    def test_signature_memoized(self, tmpdir):
+        path = tmpdir.join("Counter.py")
+        self.write_actor(path, 0, 1000000)
+        sec = Mock()
+        sec.verify_signature = Mock(return_value=(True, ["signer"]))
+        ms = ActorStore(security=sec)
+        assert ms.load_actor("Counter", str(path))[1] == ["signer"]
+        assert ms.load_actor("Counter", str(path))[1] == ["signer"]
+        assert sec.verify_signature.call_count == 1
+        # New signature file verifies again
+        tmpdir.join("Counter.py.sign.abc").write("signature")
+        ms.load_actor("Counter", str(path))
+        assert sec.verify_signature.call_count == 2
+
+    def test_failed_signature(self, tmpdir):
+        path = tmpdir.join("Counter.py")
+        self.write_actor(path, 0, 1000000)
+        sec = Mock()
+        sec.verify_signature = Mock(return_value=(False, None))
+        assert ActorStore(security=sec).load_actor("Counter", str(path)) == (None, None)
+        assert actor_class_cache_statistics()['size'] == 0
+        # Not verifying loads it anyway
+        assert ActorStore(security=sec, verify=False).load_actor("Counter", str(path))[0]
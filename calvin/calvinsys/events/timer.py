@@ -14,37 +14,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from calvin.runtime.south.plugins.async import async
-
 from calvin.utilities.calvinlogger import get_logger
 
 _log = get_logger(__name__)
 
 
-class TimerEvent(async.DelayedCall):
-    def __init__(self, actor_id, delay, trigger_loop, repeats=False):
-        super(TimerEvent, self).__init__(delay, dc_callback=self.trigger)
-        self._actor_id = actor_id
-        self._triggered = False
-        self.trigger_loop = trigger_loop
-        self.repeats = repeats
-        _log.debug("Set calvinsys timer %f %s on %s" % (delay, "repeat" if self.repeats else "", self._actor_id))
-
-    @property
-    def triggered(self):
-        return self._triggered
-
-    def ack(self):
-        self._triggered = False
-
-    def trigger(self):
-        _log.debug("Trigger calvinsys timer on %s" % (self._actor_id))
-        self._triggered = True
-        if self.repeats:
-            self.reset()
-        self.trigger_loop(actor_ids=[self._actor_id])
-
-
 class TimerHandler(object):
     def __init__(self, node, actor):
         super(TimerHandler, self).__init__()
@@ -52,10 +26,12 @@ class TimerHandler(object):
         self.node = node
 
     def once(self, delay):
-        return TimerEvent(self._actor.id, delay, self.node.sched.trigger_loop)
+        _log.debug("Set calvinsys timer %f on %s" % (delay, self._actor.id))
+        return self.node.sched.timers.once(self._actor.id, delay)
 
     def repeat(self, delay):
-        return TimerEvent(self._actor.id, delay, self.node.sched.trigger_loop, repeats=True)
+        _log.debug("Set calvinsys timer %f repeat on %s" % (delay, self._actor.id))
+        return self.node.sched.timers.repeat(self._actor.id, delay)
 
 def register(node, actor, events=None):
     """
@@ -25,8 +25,8 @@ _log = get_logger(__name__)
 
 
 class File(object):
-    def __init__(self, node, fname, mode):
-        self.fd = filedescriptor.FD(node.sched.trigger_loop, fname, mode)
+    def __init__(self, node, actor, fname, mode):
+        self.fd = filedescriptor.FD(node.sched.io_trigger(actor.id, "file"), fname, mode)
 
     def write(self, data):
         self.fd.write(data)
@@ -51,8 +51,8 @@ class File(object):
 
 
 class StdIn(File):
-    def __init__(self, node):
-        self.fd = filedescriptor.FDStdIn(node.sched.trigger_loop)
+    def __init__(self, node, actor):
+        self.fd = filedescriptor.FDStdIn(node.sched.io_trigger(actor.id, "stdin"))
 
 
 def access_allowed(filename):
@@ -60,9 +60,10 @@ def access_allowed(filename):
 
 
 class FileHandler(object):
-    def __init__(self, node):
+    def __init__(self, node, actor):
         super(FileHandler, self).__init__()
         self.node = node
+        self._actor = actor
 
     def open(self, fname, mode):
         if 'r' in mode and not os.path.exists(fname):
@@ -71,10 +72,10 @@ class FileHandler(object):
         if 'w' in mode and not access_allowed(fname):
             raise Exception("Cannot create file")
 
-        return File(self.node, fname, mode)
+        return File(self.node, self._actor, fname, mode)
 
     def open_stdin(self):
-        return StdIn(self.node)
+        return StdIn(self.node, self._actor)
 
     def close(self, fp):
         fp.close()
@@ -84,4 +85,4 @@ def register(node, actor, io=None):
     """
         Called when the system object is first created.
     """
-    return FileHandler(node)
+    return FileHandler(node, actor)
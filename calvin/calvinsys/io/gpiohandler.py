@@ -23,16 +23,17 @@ class GPIOPin(object):
     GPIO pin
     """
 
-    def __init__(self, node, pin, direction, pull):
+    def __init__(self, node, actor_id, pin, direction, pull):
         """
         Init gpio pin
         Parameters:
           node - calvin node
+          actor_id - actor woken up on edges
           pin - gpio pin
           direction - pin direction (i=in, o=out)
           pull - pull resistor (u=up, d=down)
         """
-        self.gpio = gpiopin.GPIOPin(node.sched.trigger_loop, pin, direction, pull)
+        self.gpio = gpiopin.GPIOPin(node.sched.io_trigger(actor_id, "gpio"), pin, direction, pull)
 
     def detect_edge(self, edge):
         """
@@ -113,9 +114,10 @@ class GPIOPin(object):
 
 class GPIOHandler(object):
 
-    def __init__(self, node):
+    def __init__(self, node, actor=None):
         super(GPIOHandler, self).__init__()
         self.node = node
+        self._actor_id = actor.id if actor else None
 
     def open(self, pin, direction, pull=None):
         if direction != "i" and direction != "o":
@@ -123,7 +125,7 @@ class GPIOHandler(object):
         if pull is not None:
             if pull != "u" and pull != "d":
                 raise Exception("Pull configuration must be u or d (up or down)")
-        return GPIOPin(self.node, pin, direction, pull)
+        return GPIOPin(self.node, self._actor_id, pin, direction, pull)
 
     def close(self, gpio):
         gpio.close()
@@ -133,4 +135,4 @@ def register(node, actor=None):
     """
         Called when the system object is first created.
     """
-    return GPIOHandler(node)
+    return GPIOHandler(node, actor)
@@ -25,13 +25,14 @@ class Switch(object):
     def __init__(self, node, actor):
         self._node = node
         self._actor = actor
+        self._trigger_sched = node.sched.io_trigger(actor.id, "switch")
         self._state = switch.Switch(node, actor, self._new_measurement)
         self._has_data = False
 
     def _new_measurement(self, measurement):
         self._measurement = measurement
         self._has_data = True
-        self._node.sched.trigger_loop(actor_ids=[self._actor])
+        self._trigger_sched()
 
     def has_data(self):
         return self._has_data
@@ -26,6 +26,7 @@ class HTTPClientHandler(object):
         _log.info("Started HTTPClientHandler")
         self._actor = actor
         self._node = node
+        self._trigger = node.sched.io_trigger(actor.id, "http")
         callbacks = {'receive-headers': [CalvinCB(self._receive_headers)],
                      'receive-body': [CalvinCB(self._receive_body)]}
         self._client = http_client.HTTPClient(callbacks)
@@ -51,10 +52,10 @@ class HTTPClientHandler(object):
         return self._issue_request('DELETE', url, {}, headers, None)
 
     def _receive_headers(self, dummy=None):
-        self._node.sched.trigger_loop()
+        self._trigger()
 
     def _receive_body(self, dummy=None):
-        self._node.sched.trigger_loop()
+        self._trigger()
 
     def received_error(self, handle):
         return self._requests[handle].error() is not None
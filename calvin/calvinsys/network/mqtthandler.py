@@ -49,6 +49,7 @@ class MQTTHandler(object):
         super(MQTTHandler, self).__init__()
         self._node = node
         self._actor = actor
+        self._trigger_sched = node.sched.io_trigger(actor.id, "mqtt")
         self._messages = []
 
     def start(self, host, port, settings):
@@ -66,7 +67,7 @@ class MQTTHandler(object):
 
     def new_message(self, topic, message):
         self._messages.append((topic,message))
-        self._node.sched.trigger_loop(actor_ids=[self._actor])
+        self._trigger_sched()
     
     def has_message(self):
         return len(self._messages) > 0
@@ -27,9 +27,7 @@ class ClientHandler(object):
         self._actor = actor
         self._node = node
         self._connections = {}
-
-    def _trigger_sched(self):
-        self._node.sched.trigger_loop(actor_ids=[self._actor.id])
+        self._trigger_sched = node.sched.io_trigger(actor.id, "socket")
 
     # Callbacks from socket client imp
     def _disconnected(self, handle, addr, reason):
@@ -32,6 +32,7 @@ class OPCUAClient(object):
     def __init__(self, node, actor):
         self._node = node
         self._actor = actor
+        self._trigger_sched = node.sched.io_trigger(actor.id, "opcua")
         self._changed_variables = []
         self._client = None
         self._handles = []
@@ -40,7 +41,7 @@ class OPCUAClient(object):
         self.state = OPCUAClient.STATE["init"]
     
     def _trigger(self):
-        self._node.sched.trigger_loop(actor_ids=[self._actor])
+        self._trigger_sched()
         
     def _set_state(self, new_state):
         _log.info("%s -> %s" % (self.state, new_state,))
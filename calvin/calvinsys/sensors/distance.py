@@ -26,13 +26,14 @@ class Distance(object):
     def __init__(self, node, actor):
         self._node = node
         self._actor = actor
+        self._trigger_sched = node.sched.io_trigger(actor.id, "distance")
         self._distance = distance.Distance(node, actor, self._new_measurement)
         self._has_data = False
 
     def _new_measurement(self, measurement):
         self._measurement = measurement
         self._has_data = True
-        self._node.sched.trigger_loop(actor_ids=[self._actor])
+        self._trigger_sched()
 
     def start(self, frequency):
         self._distance.start(frequency)
@@ -35,6 +35,7 @@ class Enclosure(object):
     def __init__(self, node, actor):
         self._node = node
         self._actor = actor
+        self._trigger_sched = node.sched.io_trigger(actor.id, "enclosure")
         self._fan_data = None
         self._power_data = None
         self._ambient_temp = None
@@ -58,7 +59,7 @@ class Enclosure(object):
         return self.enclosure.identity()
         
     def _trigger(self):
-        self._node.sched.trigger_loop(actor_ids=[self._actor])
+        self._trigger_sched()
 
     def get_cpu_temps(self):
         assert self.has_cpu_temps
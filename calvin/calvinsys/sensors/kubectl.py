@@ -32,6 +32,7 @@ class KubeCtl(object):
         _log.info("new kube")
         self._node = node
         self._actor = actor
+        self._trigger_sched = node.sched.io_trigger(actor.id, "kubectl")
         self._metrics = {}
         self._active_metrics= {}
         
@@ -45,7 +46,7 @@ class KubeCtl(object):
 
     def _trigger(self):
         _log.info("trigger")
-        self._node.sched.trigger_loop(actor_ids=[self._actor])
+        self._trigger_sched()
 
     def has_metric(self, metric):
         return self._metrics[metric] is not None
@@ -26,17 +26,18 @@ class RotaryEncoder(object):
     def __init__(self, node, actor):
         self._node = node
         self._actor = actor
+        self._trigger_sched = node.sched.io_trigger(actor.id, "rotary_encoder")
         self._encoder = rotary_encoder.RotaryEncoder(node, self._knob, self._button)
         self._direction = None
         self._button_pressed = False
 
     def _knob(self, direction):
         self._direction = direction
-        self._node.sched.trigger_loop(actor_ids=[self._actor])
+        self._trigger_sched()
     
     def _button(self):
         self._button_pressed = True
-        self._node.sched.trigger_loop(actor_ids=[self._actor])
+        self._trigger_sched()
         
     def was_turned(self):
         return self._direction is not None
@@ -91,6 +91,44 @@ port_property_data = {
         'direction': 'inout',
         'capability_type': "ignore"
     },
+    'queue_type': {
+        'doc': """Storage of tokens in queues with the default routing.""",
+        'user-level': True,
+        'type': 'category',
+        'capability_type': "category",
+        'values': {
+            'fifo': {
+                'doc': """The default, all of the queue length is kept in memory.""",
+                'direction': "inout"
+            },
+            'spill_fifo': {
+                'doc': """
+                    Keep a small window of tokens in memory and spill the rest of the queue
+                    to disk, for long queues absorbing bursts. Default queue length is 1024.
+                    """,
+                'direction': "inout"
+            },
+        }
+    },
+    'flow_control': {
+        'doc': """Flow control of tokens sent to peers on other runtimes.""",
+        'user-level': True,
+        'type': 'category',
+        'capability_type': "ignore",
+        'values': {
+            'backoff': {
+                'doc': """The default, send all tokens and back off exponentially when the peer's queue is full.""",
+                'direction': "out"
+            },
+            'window': {
+                'doc': """
+                    Send tokens within a window of free slots advertised by the peer, peers not
+                    advertising a window fall back to backoff.
+                    """,
+                'direction': "out"
+            },
+        }
+    },
     'nbr_peers': {
         'doc': """
                 Automatically set based on connections in calvinscript. When
@@ -39,6 +39,10 @@ NODE = '/node'
 NODES = '/nodes'
 NODE_ID = '/id'
 PEER_SETUP = '/peer_setup'
+SCHEDULER_STATISTICS = '/scheduler/statistics'
+MIGRATION_STATISTICS = '/migration/statistics'
+ACTOR_CLASS_CACHE = '/actorstore/cache'
+STORAGE_CACHE = '/storagecache'
 ACTOR = '/actor'
 ACTOR_PATH = '/actor/{}'
 ACTORS = '/actors'
@@ -165,6 +169,18 @@ class RequestHandler(object):
         r = self._get(rt, timeout, async, NODES)
         return self.check_response(r)
 
+    def get_scheduler_statistics(self, rt, timeout=DEFAULT_TIMEOUT, async=False):
+        r = self._get(rt, timeout, async, SCHEDULER_STATISTICS)
+        return self.check_response(r)
+
+    def get_migration_statistics(self, rt, timeout=DEFAULT_TIMEOUT, async=False):
+        r = self._get(rt, timeout, async, MIGRATION_STATISTICS)
+        return self.check_response(r)
+
+    def get_actor_class_cache_statistics(self, rt, timeout=DEFAULT_TIMEOUT, async=False):
+        r = self._get(rt, timeout, async, ACTOR_CLASS_CACHE)
+        return self.check_response(r)
+
     def peer_setup(self, rt, *peers, **kwargs):
         timeout = kwargs.get('timeout', DEFAULT_TIMEOUT)
         async = kwargs.get('async', False)
@@ -242,8 +258,10 @@ class RequestHandler(object):
         r = self._post(rt, timeout, async, path)
         return self.check_response(r)
 
-    def migrate(self, rt, actor_id, dst_id, timeout=DEFAULT_TIMEOUT, async=False):
+    def migrate(self, rt, actor_id, dst_id, timeout=DEFAULT_TIMEOUT, async=False, precopy=None):
         data = {'peer_node_id': dst_id}
+        if precopy is not None:
+            data['precopy'] = precopy
         path = ACTOR_MIGRATE.format(actor_id)
         r = self._post(rt, timeout, async, path, data)
         return self.check_response(r)
@@ -398,6 +416,14 @@ class RequestHandler(object):
         r = self._get(rt, timeout, async, "/dumpstorage")
         return self.check_response(r)
 
+    def get_storage_cache_statistics(self, rt, timeout=DEFAULT_TIMEOUT, async=False):
+        r = self._get(rt, timeout, async, STORAGE_CACHE)
+        return self.check_response(r)
+
+    def clear_storage_cache(self, rt, timeout=DEFAULT_TIMEOUT, async=False):
+        r = self._delete(rt, timeout, async, STORAGE_CACHE)
+        return self.check_response(r)
+
     def async_response(self, response):
         try:
             self.future_responses.remove(response)
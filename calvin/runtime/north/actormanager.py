@@ -15,6 +15,8 @@
 # limitations under the License.
 
 import random
+import time
+from collections import deque
 from calvin.actorstore.store import ActorStore
 from calvin.utilities import dynops
 from calvin.utilities.requirement_matching import ReqMatch
@@ -27,9 +29,28 @@ from calvin.actor.actor import ShadowActor
 from calvin.runtime.north.plugins.port import DISCONNECT
 from calvin.runtime.north.calvinsys import get_calvinsys
 from calvin.runtime.north.calvinlib import get_calvinlib
+from calvin.runtime.north import migration_state
+from calvin.utilities import calvinconfig
 
 
 _log = get_logger(__name__)
+_conf = calvinconfig.get()
+
+# zlib level of migrated actor state, 0 sends the state uncompressed.
+# Only peers announcing migration_state.PACKED_STATE get a packed state.
+MIGRATION_COMPRESS_LEVEL = _conf.get(None, "migration_compress_level")
+if MIGRATION_COMPRESS_LEVEL is None:
+    MIGRATION_COMPRESS_LEVEL = 6
+# Managed attributes larger than this many bytes are sent in chunks ahead of the state, 0 never
+MIGRATION_CHUNK_SIZE = _conf.get(None, "migration_chunk_size") or 0
+# Seconds received chunks are kept waiting for the next chunk or the state
+MIGRATION_CHUNK_TIMEOUT = _conf.get(None, "migration_chunk_timeout") or 60.0
+# Copy the state to the peer before disconnecting a migrating actor, see migrate
+MIGRATION_PRECOPY = bool(_conf.get(None, "migration_precopy"))
+# Seconds a precopied snapshot is kept waiting for the actor to follow
+MIGRATION_PRECOPY_TIMEOUT = _conf.get(None, "migration_precopy_timeout") or 60.0
+# Number of migrations kept for migration_statistics
+MIGRATION_HISTORY = 100
 
 
 def log_callback(reply, **kwargs):
@@ -45,6 +66,15 @@ class ActorManager(object):
         super(ActorManager, self).__init__()
         self.actors = {}
         self.node = node
+        # Chunks of migrating actors' state received ahead of actor_new, {actor_id: {key: [chunk, ...]}}
+        self._migration_chunks = {}
+        # Expiry of the received chunks per actor, {actor_id: DelayedCall}
+        self._migration_chunk_timers = {}
+        # What peers accept in a migrated state from their node info, {node_id: set(capabilities)}
+        self._peer_capabilities = {}
+        # Precopied state snapshots of actors that will migrate to us, {actor_id: (received, state)}
+        self._precopies = {}
+        self.migrations = deque(maxlen=MIGRATION_HISTORY)
 
     def _actor_not_found(self, actor_id):
         _log.exception("Actor '{}' not found".format(actor_id))
@@ -144,6 +174,16 @@ class ActorManager(object):
 
     def new_from_migration(self, actor_type, state, prev_connections=None, callback=None):
         """Instantiate an actor of type 'actor_type' and apply the 'state' to the actor."""
+        try:
+            state = migration_state.unpack(state, self._pop_chunks(state.get('_id')))
+            if migration_state.is_delta(state):
+                received, snapshot = self._precopies.pop(state['_id'])
+                state = migration_state.merge(snapshot, state)
+        except Exception:
+            _log.exception("Failed to unpack state of migrated actor")
+            if callback:
+                callback(status=response.CalvinResponse(response.INTERNAL_ERROR))
+            return
         try:
             _log.analyze(self.node.id, "+", state)
             subject_attributes = state.pop('_subject_attributes', None)
@@ -171,6 +211,51 @@ class ActorManager(object):
             # Still want to create shadow actor.
             self.new(actor_type, None, state, prev_connections, callback=callback, shadow_actor=True)
 
+    def new_precopy(self, state):
+        """Keep the state snapshot of an actor that will migrate to us, returns False when it can't be unpacked."""
+        try:
+            snapshot = migration_state.unpack(state, self._pop_chunks(state.get('_id')))
+        except Exception:
+            _log.exception("Failed to unpack precopied actor state")
+            return False
+        now = time.time()
+        for actor_id, (received, _) in self._precopies.items():
+            if now - received > MIGRATION_PRECOPY_TIMEOUT:
+                del self._precopies[actor_id]
+        self._precopies[snapshot['_id']] = (now, snapshot)
+        return True
+
+    def new_chunk_from_migration(self, actor_id, key, index, data):
+        """Keep a chunk of a managed attribute of an actor that is migrating to us, returns False when out of order."""
+        parts = self._migration_chunks.setdefault(actor_id, {}).setdefault(key, [])
+        if index == 0:
+            # Restarted (e.g. retried) migration
+            del parts[:]
+        if index != len(parts):
+            _log.error("Chunk %d of attribute %s of actor %s out of order", index, key, actor_id)
+            self._pop_chunks(actor_id)
+            return False
+        parts.append(data)
+        # Dropped unless the next chunk or the state arrives in time, e.g. when the sender is gone
+        timer = self._migration_chunk_timers.pop(actor_id, None)
+        if timer:
+            timer.cancel()
+        self._migration_chunk_timers[actor_id] = async.DelayedCall(MIGRATION_CHUNK_TIMEOUT,
+                                                                   self._expire_chunks, actor_id)
+        return True
+
+    def _expire_chunks(self, actor_id):
+        _log.warning("Dropping chunks of actor %s, the migration did not complete", actor_id)
+        self._migration_chunk_timers.pop(actor_id, None)
+        self._migration_chunks.pop(actor_id, None)
+
+    def _pop_chunks(self, actor_id):
+        """ Remove and return the received chunks of actor_id, None when there are none """
+        timer = self._migration_chunk_timers.pop(actor_id, None)
+        if timer:
+            timer.cancel()
+        return self._migration_chunks.pop(actor_id, None)
+
     def _new_from_state(self, actor_type, state, actor_def, security,
                              access_decision=None, shadow_actor=False):
         """Return a restored actor in PENDING state, raises an exception on failure."""
@@ -213,6 +298,11 @@ class ActorManager(object):
             for port_id in port_ids:
                 self.node.storage.delete_port(port_id)
             self.node.control.log_actor_destroy(a.id)
+        else:
+            # Migrating, the actor and its ports will be registered by the new node
+            self.node.storage.invalidate_actor(actor_id)
+            for port_id in port_ids:
+                self.node.storage.invalidate_port(port_id)
         del self.actors[actor_id]
 
     def _destroy_log_cb(self, key, value):
@@ -334,8 +424,9 @@ class ActorManager(object):
         self.robust_migrate(actor_id, pp, callback=cb)
         _log.analyze(self.node.id, "+ END", {})
 
-    def robust_migrate(self, actor_id, node_ids, callback, **kwargs):
+    def robust_migrate(self, actor_id, node_ids, callback, precopy=None, **kwargs):
         """ Will try to migrate the actor to each of the suggested node_ids (which is modified),
+            precopy is passed on to migrate.
             Optionally kwargs can contain state, actor_type and ports
             If all else fails the state, actor_type and ports will be returned in the callback.
             These could be used by the callback to either try another list of node_ids,
@@ -358,22 +449,28 @@ class ActorManager(object):
             return
         if 'state' in kwargs:
             # Retry another node
-            self.node.proto.actor_new(
+            self.lookup_peer(node_id, CalvinCB(
+                self._send_state,
                 node_id,
                 CalvinCB(self._robust_migrate_cb, actor_id=actor_id, node_ids=node_ids, callback=callback),
-                kwargs.get('actor_type', None), kwargs.get('state', None), kwargs.get('ports', None))
+                kwargs.get('actor_type', None), kwargs.get('state', None), kwargs.get('ports', None)))
         else:
             # Start with standard migration
             self.migrate(actor_id, node_id,
-                        CalvinCB(self._robust_migrate_cb, actor_id=actor_id, node_ids=node_ids, callback=callback))
+                        CalvinCB(self._robust_migrate_cb, actor_id=actor_id, node_ids=node_ids, callback=callback,
+                                 precopy=precopy),
+                        precopy=precopy)
 
     def _robust_migrate_cb(self, status, actor_id, node_ids, callback, **kwargs):
         # Just for moving status into kwargs, TODO the reply_handler should use kwarg
         kwargs['status'] = status
         self.robust_migrate(actor_id, node_ids, callback, **kwargs)
 
-    def migrate(self, actor_id, node_id, callback=None):
-        """ Migrate an actor actor_id to peer node node_id """
+    def migrate(self, actor_id, node_id, callback=None, precopy=None):
+        """ Migrate an actor actor_id to peer node node_id
+            precopy: copy the state to the peer while the actor keeps running and only send
+                     what changed once it is disconnected, defaults to migration_precopy
+        """
         if actor_id not in self.actors:
             # Can only migrate actors from our node
             if callback:
@@ -387,6 +484,47 @@ class ActorManager(object):
             if callback:
                 callback(status=response.CalvinResponse(True))
             return
+        self.lookup_peer(node_id, CalvinCB(self._migrate_to_peer, actor, node_id, callback, precopy))
+
+    def lookup_peer(self, node_id, cb):
+        """ Learn what peer node_id accepts in a migrated state from its node info, then call cb """
+        self.node.storage.get_node(node_id, cb=CalvinCB(self._peer_found, cb=cb))
+
+    def _peer_found(self, key, value, cb):
+        try:
+            capabilities = value.get('migration', [])
+        except AttributeError:
+            # Unknown node, let the migration fail when no link can be made
+            capabilities = []
+        self._peer_capabilities[key] = set(capabilities)
+        cb()
+
+    def peer_accepts(self, node_id, capability):
+        """ True when the last lookup_peer of node_id found the migration_state capability """
+        return capability in self._peer_capabilities.get(node_id, ())
+
+    def _migrate_to_peer(self, actor, node_id, callback, precopy):
+        if self.actors.get(actor.id) is not actor or actor._migrating_to is not None:
+            # Destroyed or migrated during the lookup
+            _log.warning("Actor %s gone before migration to %s", actor.id, node_id)
+            if callback:
+                callback(status=response.CalvinResponse(False))
+            return
+        if precopy is None:
+            precopy = MIGRATION_PRECOPY
+        if precopy and not self.peer_accepts(node_id, migration_state.PRECOPY):
+            # An older runtime would not reply to ACTOR_PRECOPY
+            _log.info("Peer %s does not take precopied state, migrating actor %s without", node_id, actor.id)
+            precopy = False
+        if precopy:
+            self._precopy(actor, node_id, callback)
+        else:
+            self._migrate(actor, node_id, callback, {'started': time.time(), 'precopy': False})
+
+    def _migrate(self, actor, node_id, callback, record, digests=None):
+        """ Freeze the actor by disconnecting it and continue in _migrate_disconnected """
+        actor_id = actor.id
+        record['frozen'] = time.time()
         actor._migrating_to = node_id
         actor.will_migrate()
         actor_type = actor._type
@@ -398,23 +536,113 @@ class ActorManager(object):
                                                   actor_type=actor_type,
                                                   ports=ports,
                                                   node_id=node_id,
-                                                  callback=callback),
+                                                  callback=callback,
+                                                  record=record,
+                                                  digests=digests),
                                 actor_id=actor_id)
         _log.analyze(self.node.id, "+ POST DISCONNECT", {'actor_name': actor.name, 'actor_id': actor.id})
         self.node.control.log_actor_migrate(actor_id, node_id)
 
-    def _migrate_disconnected(self, actor, actor_type, ports, node_id, status, callback = None, **state):
+    def _precopy(self, actor, node_id, callback):
+        """ Send a snapshot of the state of the still running actor to node_id ahead of the migration """
+        record = {'started': time.time(), 'precopy': True}
+        snapshot = actor.state()
+        digests = migration_state.digests(snapshot)
+        state, chunks, size, record['precopy_bytes'] = self._pack_state(node_id, snapshot)
+        send = CalvinCB(self.node.proto.actor_precopy, node_id, state=state)
+        done = CalvinCB(self._precopied, actor=actor, node_id=node_id, callback=callback, record=record,
+                        digests=digests)
+        self._send_state_chunk(response.CalvinResponse(True), node_id=node_id, actor_id=actor.id, chunks=chunks,
+                               send=send, done=done)
+
+    def _precopied(self, status, actor, node_id, callback, record, digests):
+        if self.actors.get(actor.id) is not actor or actor._migrating_to is not None:
+            # Destroyed or migrated while the snapshot was sent
+            _log.warning("Actor %s gone before migration to %s", actor.id, node_id)
+            if callback:
+                callback(status=response.CalvinResponse(False))
+            return
+        if not status:
+            _log.warning("Precopy of actor %s to %s failed, sending complete state", actor.id, node_id)
+            digests = None
+        self._migrate(actor, node_id, callback, record, digests)
+
+    def _migrate_disconnected(self, actor, actor_type, ports, node_id, status, callback=None, record=None,
+                              digests=None, **state):
         """ Actor disconnected, continue migration """
         _log.analyze(self.node.id, "+ DISCONNECTED", {'actor_name': actor.name, 'actor_id': actor.id, 'status': status})
         state = actor.state()
         self.destroy(actor.id, temporary=True)
         if status:
-            callback = CalvinCB(callback, state=state, ports=ports, actor_type=actor_type)
-            self.node.proto.actor_new(node_id, callback, actor_type, state, ports)
+            if callback:
+                callback = CalvinCB(callback, state=state, ports=ports, actor_type=actor_type)
+            self._send_state(node_id, callback, actor_type, state, ports, record=record, digests=digests)
         else:
             if callback:
                 callback(status=status, state=state, ports=ports, actor_type=actor_type)
 
+    def _send_state(self, node_id, callback, actor_type, state, ports, record=None, digests=None):
+        """
+        Send the state of a migrating actor to peer node node_id, only what changed since the
+        precopied snapshot with digests when given. The callback gets the reply status.
+        """
+        record = record or {'started': time.time(), 'precopy': False}
+        record.setdefault('frozen', record['started'])
+        record.update(actor_id=state['_id'], node_id=node_id)
+        if digests:
+            state = migration_state.delta(state, digests)
+        state, chunks, record['state_bytes'], record['sent_bytes'] = self._pack_state(node_id, state)
+        record['chunks'] = len(chunks)
+        send = CalvinCB(self.node.proto.actor_new, node_id, actor_type=actor_type, state=state,
+                        prev_connections=ports)
+        done = CalvinCB(self._state_sent, record=record, callback=callback)
+        self._send_state_chunk(response.CalvinResponse(True), node_id=node_id, actor_id=record['actor_id'],
+                               chunks=chunks, send=send, done=done)
+
+    def _pack_state(self, node_id, state):
+        """
+        Pack state according to migration_compress_level and migration_chunk_size and what peer node_id
+        accepts, returns the state to send, the chunks (key, index, data) to send ahead of it, the unpacked
+        and the packed size
+        """
+        if not self.peer_accepts(node_id, migration_state.FIFO_STATE):
+            state = migration_state.with_fifo_slots(state)
+        packing = MIGRATION_COMPRESS_LEVEL or MIGRATION_CHUNK_SIZE
+        if not packing or not self.peer_accepts(node_id, migration_state.PACKED_STATE):
+            return state, [], None, None
+        packed, parts, size = migration_state.pack(state, MIGRATION_COMPRESS_LEVEL, MIGRATION_CHUNK_SIZE)
+        chunks = [(key, index, data) for key, datas in parts.items() for index, data in enumerate(datas)]
+        return packed, chunks, size, migration_state.packed_size(packed, parts)
+
+    def _send_state_chunk(self, status, node_id, actor_id, chunks, send, done):
+        """ Send the chunks one at a time, each after the previous is acknowledged, then send the state """
+        if not status:
+            done(status)
+        elif chunks:
+            key, index, data = chunks.pop(0)
+            self.node.proto.actor_new_chunk(node_id, CalvinCB(self._send_state_chunk, node_id=node_id,
+                                                              actor_id=actor_id, chunks=chunks, send=send,
+                                                              done=done),
+                                            actor_id, key, index, data)
+        else:
+            send(callback=done)
+
+    def _state_sent(self, status, record, callback):
+        now = time.time()
+        record['status'] = bool(status)
+        record['latency'] = now - record.pop('started')
+        record['freeze'] = now - record.pop('frozen')
+        self.migrations.append(record)
+        _log.info("Migration of actor %s to %s %s in %.3f s (frozen %.3f s), %s bytes state sent as %s bytes in %d chunks",
+                  record['actor_id'], record['node_id'], "done" if status else "failed", record['latency'],
+                  record['freeze'], record['state_bytes'], record['sent_bytes'], record['chunks'])
+        if callback:
+            callback(status)
+
+    def migration_statistics(self):
+        """ Latency, freeze time and size of the latest outgoing migrations, oldest first """
+        return list(self.migrations)
+
     def peernew_to_local_cb(self, reply, **kwargs):
         if kwargs['actor_id'] == reply:
             # Managed to setup since new returned same actor id
@@ -512,8 +740,11 @@ class ActorManager(object):
 
         return self.actors[actor_id].report(**(kwargs if kwargs and isinstance(kwargs, dict) else {}))
 
-    def enabled_actors(self):
-        return [actor for actor in self.actors.values() if actor.enabled()]
+    def enabled_actors(self, actor_ids=None):
+        if actor_ids is None:
+            return [actor for actor in self.actors.values() if actor.enabled()]
+        actors = [self.actors[actor_id] for actor_id in actor_ids if actor_id in self.actors]
+        return [actor for actor in actors if actor.enabled()]
 
     def denied_actors(self):
         return [actor for actor in self.actors.values() if actor.denied()]
@@ -16,6 +16,7 @@
 
 import os
 import copy
+import time
 from calvin.utilities.calvin_callback import CalvinCB
 from calvin.utilities import dynops
 from calvin.utilities import calvinlogger
@@ -26,8 +27,20 @@ from calvin.actorstore.store import ActorStore, GlobalStore
 from calvin.runtime.south.plugins.async import async
 from calvin.utilities.security import Security
 from calvin.utilities.requirement_matching import ReqMatch
+from calvin.utilities import calvinconfig
+from calvin.runtime.north.plugins.placement.placement_problem import PlacementProblem
+from calvin.runtime.north.plugins.placement.heuristic_solver import HeuristicSolver
+from calvin.runtime.north.plugins.placement import objective_factory
+from calvin.runtime.north import node_load
 
 _log = calvinlogger.get_logger(__name__)
+_conf = calvinconfig.get()
+
+# Weight of each placement objective, see plugins/placement
+PLACEMENT_OBJECTIVES = _conf.get(None, "placement_objectives") or {"colocation": 1.0, "load_balance": 0.5,
+                                                                    "link_cost": 1.0}
+# Seconds the placement solver may spend improving a deployment
+PLACEMENT_TIME_BUDGET = _conf.get(None, "placement_time_budget") or 0.2
 
 
 class Application(object):
@@ -430,9 +443,6 @@ class AppManager(object):
             status = response.CalvinResponse(response.CREATED)
             _log.analyze(self._node.id, "+ MISS PLACEMENT", {'app_id': app.id, 'placement': app.actor_placement}, tb=True)
 
-        # Collect an actor by actor matrix stipulating a weighting 0.0 - 1.0 for their connectivity
-        actor_ids, actor_matrix = self._actor_connectivity(app)
-
         # Get list of all possible nodes
         node_ids = set([])
         for possible_nodes in app.actor_placement.values():
@@ -442,27 +452,36 @@ class AppManager(object):
         for actor_id, possible_nodes in app.actor_placement.iteritems():
             if any([isinstance(n, dynops.InfiniteElement) for n in possible_nodes]):
                 app.actor_placement[actor_id] = node_ids
-        _log.analyze(self._node.id, "+ ACTOR MATRIX", {'actor_ids': actor_ids, 'actor_matrix': actor_matrix,
-                                            'node_ids': node_ids, 'placement': app.actor_placement}, tb=True)
 
-        # Weight the actors possible placement with their connectivity matrix
-        weighted_actor_placement = {}
-        for actor_id in actor_ids:
-            # actor matrix is symmetric, so independent if read horizontal or vertical
-            actor_weights = actor_matrix[actor_ids.index(actor_id)]
-            # Sum the actor weights for each actors possible nodes, matrix mult AA * AN,
-            # AA actor weights, AN actor * node with 1 when possible
-            weights = [sum([actor_weights[actor_ids.index(_id)] if node_id in app.actor_placement[actor_id] else 0
-                             for _id in actor_ids])
-                             for node_id in node_ids]
-            # Get first node with highest weight
-            # FIXME should verify that the node actually exist also
-            # TODO should select from a resource sharing perspective also, instead of picking first max
-            # TODO: should also ask authorization server before selecting node to migrate to.
-            _log.analyze(self._node.id, "+ WEIGHTS", {'actor_id': actor_id, 'weights': weights})
-            #weighted_actor_placement[actor_id] = node_ids[weights.index(max(weights))]
-            # Get a list of nodes in sorted weighted order
-            weighted_actor_placement[actor_id] = [n for (w, n) in sorted(zip(weights, node_ids), reverse=True)]
+        # Collect the load summaries of the candidate runtimes before placing
+        if not node_ids:
+            self._place(app, node_ids, {}, status)
+            return
+        loads = {}
+        for node_id in node_ids:
+            self.storage.get_node_load(node_id, cb=CalvinCB(self._node_load_cb, app=app, node_ids=node_ids,
+                                                            loads=loads, status=status))
+
+    def _node_load_cb(self, key, value, app, node_ids, loads, status):
+        loads[key] = value if value else None
+        if len(loads) == len(node_ids):
+            self._place(app, node_ids, loads, status)
+
+    def _place(self, app, node_ids, loads, status):
+        # Place the actors with their connections, node load and link RTTs as objectives
+        now = time.time()
+        capacity = {node_id: node_load.capacity(loads.get(node_id), now) for node_id in node_ids}
+        problem = PlacementProblem(app.actor_placement.keys(), app.actor_placement, self._actor_connections(app),
+                                   capacity=capacity, rtt=self._node_rtts(node_ids), local_node_id=self._node.id)
+        objectives = [(weight, objective_factory.get(name, problem))
+                      for name, weight in PLACEMENT_OBJECTIVES.iteritems() if weight]
+        solver = HeuristicSolver(problem, objectives, PLACEMENT_TIME_BUDGET)
+        solver.solve()
+        # TODO: should also ask authorization server before selecting node to migrate to.
+        # Each actor gets a list of nodes, the best placement first
+        weighted_actor_placement = solver.ranked()
+        _log.analyze(self._node.id, "+ PLACEMENT", {'node_ids': node_ids, 'placement': weighted_actor_placement,
+                                                    'moves': solver.moves}, tb=True)
         for actor_id, node_id in weighted_actor_placement.iteritems():
             _log.debug("Actor deployment %s \t-> %s" % (app.actors[actor_id], node_id))
             # FIXME add callback that recreate the actor locally
@@ -472,31 +491,30 @@ class AppManager(object):
         del app._org_cb
         _log.analyze(self._node.id, "+ DONE", {'app_id': app.id}, tb=True)
 
-    def _actor_connectivity(self, app):
-        """ Matrix of weights between actors how close they want to be
-            0 = don't care
-            1 = same node
-
-            Currently any nodes that are connected gets 0.5, and
-            diagonal is 1:s
-        """
-        list_actors = app.get_actors()
-        l= len(list_actors)
-        actor_matrix = [[0 for x in range(l)] for x in range(l)]
-        for actor_id in list_actors:
-            connections = self._node.am.connections(actor_id)
-            for p in connections['inports'].values():
-                try:
-                    peer_actor_id = self._node.pm._get_local_port(port_id=p[1]).owner.id
-                except:
-                    # Only work while the peer still is local
-                    # TODO get it from storage
-                    continue
-                actor_matrix[list_actors.index(actor_id)][list_actors.index(peer_actor_id)] = 0.5
-                actor_matrix[list_actors.index(peer_actor_id)][list_actors.index(actor_id)] = 0.5
-        for i in range(l):
-            actor_matrix[i][i] = 1
-        return (list_actors, actor_matrix)
+    def _actor_connections(self, app):
+        """ List of (actor_id, peer_actor_id) for each connection between the app's local actors """
+        connections = []
+        for actor_id in app.get_actors():
+            if actor_id not in self._node.am.actors:
+                continue
+            for peers in self._node.am.connections(actor_id)['inports'].values():
+                for peer_node_id, peer_port_id in peers:
+                    try:
+                        peer_actor_id = self._node.pm._get_local_port(port_id=peer_port_id).owner.id
+                    except:
+                        # Only work while the peer still is local
+                        # TODO get it from storage
+                        continue
+                    connections.append((actor_id, peer_actor_id))
+        return connections
+
+    def _node_rtts(self, node_ids):
+        """ Measured RTT of the links to the nodes, {node_id: seconds}, None when no link """
+        rtts = {}
+        for node_id in node_ids:
+            link = self._node.network.link_get(node_id)
+            rtts[node_id] = link.get_rtt() if link else None
+        return rtts
 
     # Remigration
 
@@ -615,6 +633,11 @@ class Deployer(object):
         return self.deploy_info['requirements'][name] if (self.deploy_info and 'requirements' in self.deploy_info
                                                             and name in self.deploy_info['requirements']) else []
 
+    def get_priority(self, actor_name):
+        name = self.component_name(actor_name) or actor_name
+        name = name.split(':', 1)[1] if self.ns else name
+        return self.deploy_info['priorities'].get(name, None) if (self.deploy_info and 'priorities' in self.deploy_info) else None
+
     def lookup_and_verify(self, actor_name, info, cb=None):
         """
         Lookup and verify actor in actor store.
@@ -696,6 +719,10 @@ class Deployer(object):
                         self.node.am.actors[actor_id]._replication_data.inhibate(actor_id, True)
                 # Placement requirements
                 self.node.am.actors[actor_id].requirements_add(actor_reqs, extend=False)
+            priority = self.get_priority(actor_name)
+            if priority is not None:
+                # Scheduling priority
+                self.node.am.actors[actor_id].priority_set(priority)
             self.actor_map[actor_name] = actor_id
             self.node.app_manager.add(self.app_id, actor_id)
         except Exception as e:
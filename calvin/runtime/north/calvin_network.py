@@ -419,10 +419,8 @@ class CalvinNetwork(object):
             self._links[peer_id] = CalvinLink(self.node.id, peer_id, tp_link)
 
         # Find and call any callbacks registered for the uri or peer id
-        _log.debug("join _finished: %s: peer_id: %s, uri: %s\npending_joins_by_id: %s\npending_joins: %s" % (self.node.id, peer_id,
-                                                                                         uri,
-                                                                                         self.pending_joins_by_id,
-                                                                                         self.pending_joins))
+        _log.debug("join _finished: %s: peer_id: %s, uri: %s\npending_joins_by_id: %s\npending_joins: %s", self.node.id, peer_id,
+                   uri, self.pending_joins_by_id, self.pending_joins)
         if peer_id in self.pending_joins_by_id:
             peer_uri = self.pending_joins_by_id.pop(peer_id)
             if peer_uri in self.pending_joins:
@@ -31,6 +31,7 @@ from calvin.runtime.north import replicationmanager
 from calvin.runtime.north import appmanager
 from calvin.runtime.north import scheduler
 from calvin.runtime.north import storage
+from calvin.runtime.north import node_load
 from calvin.runtime.north import calvincontrol
 from calvin.runtime.north import metering
 from calvin.runtime.north.certificate_authority import certificate_authority
@@ -127,6 +128,7 @@ class Node(object):
         # TODO: be able to specify the interfaces
         # @TODO: Store capabilities
         self.storage = storage.Storage(self)
+        self.load_reporter = node_load.LoadReporter(self)
 
         self.network = CalvinNetwork(self)
         self.proto = CalvinProto(self, self.network)
@@ -255,6 +257,7 @@ class Node(object):
             self.storage.stop(stopped)
 
         _log.analyze(self.id, "+", {})
+        self.load_reporter.stop()
         self.storage.delete_node(self, cb=deleted_node)
         for link in self.network.list_direct_links():
             self.network.link_get(link).close()
@@ -352,6 +355,7 @@ class Node(object):
     def _storage_started_cb(self, *args, **kwargs):
         self.authentication.find_authentication_server()
         self.authorization.register_node()
+        self.load_reporter.start()
 
 def setup_logging(filename):
 
@@ -93,6 +93,8 @@ class CalvinTunnel(object):
         self.recv_handler = None
         self.down_handler = None
         self.up_handler = None
+        # Capabilities announced by the tunnel user on the peer side, e.g. supported message types
+        self.peer_capabilities = set()
 
     def _late_link(self, peer_node_id):
         """ Sometimes the peer is unknown even when a tunnel object is needed.
@@ -186,6 +188,8 @@ class CalvinProto(CalvinCBClass):
             # or using the callback_register method.
             'PROXY_CONFIG': [CalvinCB(self.proxy_config_handler)],
             'ACTOR_NEW': [CalvinCB(self.actor_new_handler)],
+            'ACTOR_NEW_CHUNK': [CalvinCB(self.actor_new_chunk_handler)],
+            'ACTOR_PRECOPY': [CalvinCB(self.actor_precopy_handler)],
             'ACTOR_MIGRATE': [CalvinCB(self.actor_migrate_handler)],
             'APP_DESTROY': [CalvinCB(self.app_destroy_handler)],
             'PORT_CONNECT': [CalvinCB(self.port_connect_handler)],
@@ -235,6 +239,8 @@ class CalvinProto(CalvinCBClass):
         resp = {
             'PROXY_CONFIG': response.INTERNAL_ERROR,
             'ACTOR_NEW': response.INTERNAL_ERROR,
+            'ACTOR_NEW_CHUNK': response.INTERNAL_ERROR,
+            'ACTOR_PRECOPY': response.INTERNAL_ERROR,
             'ACTOR_MIGRATE': response.NOT_FOUND,
             'APP_DESTROY': response.NOT_FOUND,
             'PORT_CONNECT': response.NOT_FOUND,
@@ -315,6 +321,43 @@ class CalvinProto(CalvinCBClass):
                                         callback=CalvinCB(self.node.network.link_request, payload['from_rt_uuid'], callback=CalvinCB(send_message,
                                             msg = {'cmd': 'REPLY', 'msg_uuid': payload['msg_uuid']})))
 
+    def actor_new_chunk(self, to_rt_uuid, callback, actor_id, key, index, data):
+        """ Sends a chunk of a large managed attribute ahead of actor_new, only intended for migrating actors
+            callback: called when finished with the peers respons as argument
+            actor_id: the migrating actor
+            key: name of the managed attribute
+            index: chunk number, starting at 0
+            data: chunk of the packed attribute, see migration_state
+        """
+        self.node.network.link_request(to_rt_uuid, CalvinCB(send_message,
+                                                            msg = {'cmd': 'ACTOR_NEW_CHUNK', 'actor_id': actor_id,
+                                                                   'key': key, 'index': index, 'data': data},
+                                                            callback=callback))
+
+    def actor_new_chunk_handler(self, payload):
+        """ Peer sends chunk of a migrating actor's state """
+        ok = self.node.am.new_chunk_from_migration(payload['actor_id'], payload['key'], payload['index'],
+                                                   payload['data'])
+        msg = {'cmd': 'REPLY', 'msg_uuid': payload['msg_uuid'],
+               'value': response.CalvinResponse(True if ok else response.BAD_REQUEST).encode()}
+        self.network.link_request(payload['from_rt_uuid'], CalvinCB(send_message, msg=msg))
+
+    def actor_precopy(self, to_rt_uuid, callback, state):
+        """ Sends a snapshot of the state of an actor that will migrate to to_rt_uuid
+            callback: called when finished with the peers respons as argument
+            state: see actor manager
+        """
+        self.node.network.link_request(to_rt_uuid, CalvinCB(send_message,
+                                                            msg = {'cmd': 'ACTOR_PRECOPY', 'state': state},
+                                                            callback=callback))
+
+    def actor_precopy_handler(self, payload):
+        """ Peer sends snapshot of an actor's state ahead of migrating it """
+        ok = self.node.am.new_precopy(payload['state'])
+        msg = {'cmd': 'REPLY', 'msg_uuid': payload['msg_uuid'],
+               'value': response.CalvinResponse(True if ok else response.BAD_REQUEST).encode()}
+        self.network.link_request(payload['from_rt_uuid'], CalvinCB(send_message, msg=msg))
+
     def actor_migrate(self, to_rt_uuid, callback, actor_id, requirements, extend=False, move=False):
         """ Request actor on to_rt_uuid node to migrate accoring to new deployment requirements
             callback: called when finished with the status respons as argument
@@ -589,7 +632,7 @@ class CalvinProto(CalvinCBClass):
         callback: called when finished with the authentication decision
         jwt: signed JSON Web Token (JWT) containing the authentication request
         """
-        _log.debug("authentication_decision:\n\tauth_server_uuid={}\n\tcallback={}\n\tjwt={}".format(auth_server_uuid, callback, jwt))
+        _log.debug("authentication_decision:\n\tauth_server_uuid=%s\n\tcallback=%s\n\tjwt=%s", auth_server_uuid, callback, jwt)
         self.node.network.link_request(auth_server_uuid,
                                        CalvinCB(send_message,
             msg = {'cmd': 'AUTHENTICATION_DECISION', 'jwt': jwt, 'cert_name': self.node.runtime_credentials.cert_name},
@@ -603,7 +646,7 @@ class CalvinProto(CalvinCBClass):
         sender and receiver are used for both the request and response.
         A Policy Decision Point (PDP) is used to determine if access is permitted.
         """
-        _log.debug("authentication_decision_handler:\n\tpayload={}".format(payload))
+        _log.debug("authentication_decision_handler:\n\tpayload=%s", payload)
         if ('authentication' in _sec_conf) and 'accept_external_requests' in _sec_conf['authentication']:
             try:
                 self.node.authentication.decode_request(payload,
@@ -621,14 +664,14 @@ class CalvinProto(CalvinCBClass):
 
     def _authentication_decision_handler_jwt_decoded_cb(self, decoded, payload):
         """The JWT is now decoded, let's try to authenticate the content"""
-        _log.debug("authentication_decision_handler_jwt_decoded_cb:\n\tdecoded={}\n\tpayload={}".format(decoded, payload))
+        _log.debug("authentication_decision_handler_jwt_decoded_cb:\n\tdecoded=%s\n\tpayload=%s", decoded, payload)
         self.node.authentication.adp.authenticate(decoded["request"],
                             callback=CalvinCB(self._authentication_decision_handler, payload, decoded,
                                              ))
 
     def _authentication_decision_handler(self, payload, request, auth_response):
         """Decision has been made, return the response"""
-        _log.debug("_authentication_decision_handler:\n\tpayload={}\n\trequest={}\n\tauth_response={}".format(payload, request, auth_response))
+        _log.debug("_authentication_decision_handler:\n\tpayload=%s\n\trequest=%s\n\tauth_response=%s", payload, request, auth_response)
         try:
             jwt_response = self.node.authentication.encode_response(request, auth_response)
             data_response = {"jwt": jwt_response, "cert_name": self.node.runtime_credentials.cert_name}
@@ -649,7 +692,7 @@ class CalvinProto(CalvinCBClass):
         callback: called when finished with the registration
         jwt: signed JSON Web Token (JWT) containing the node attributes
         """
-        _log.debug("authorization_register:\n\tauthz_server_uuid={}\n\tcallback={}\n\tjwt={}".format(authz_server_uuid, callback, jwt))
+        _log.debug("authorization_register:\n\tauthz_server_uuid=%s\n\tcallback=%s\n\tjwt=%s", authz_server_uuid, callback, jwt)
         self.node.network.link_request(authz_server_uuid,
                                        CalvinCB(send_message,
                                                 msg = {'cmd': 'AUTHORIZATION_REGISTER', 'jwt': jwt, 'cert_name': self.node.runtime_credentials.cert_name},
@@ -661,7 +704,7 @@ class CalvinProto(CalvinCBClass):
 
         Signed JSON Web Token (JWT) is used to send the attributes.
         """
-        _log.debug("authorization_register_handler:\n\tpayload={}".format(payload))
+        _log.debug("authorization_register_handler:\n\tpayload=%s", payload)
         if not _sec_conf['authorization']['accept_external_requests']:
             reply = response.CalvinResponse(response.NOT_FOUND)
             # Send reply
@@ -682,7 +725,7 @@ class CalvinProto(CalvinCBClass):
 
     def _authorization_register_handler_cb(self, decoded, payload):
         """JWT is now decoded, register node"""
-        _log.debug("_authorization_register_handler_cb:\ndecoded={}\npayload={}".format(decoded, payload))
+        _log.debug("_authorization_register_handler_cb:\ndecoded=%s\npayload=%s", decoded, payload)
         self.node.authorization.pdp.register_node(decoded["iss"], decoded["attributes"])
         reply = response.CalvinResponse(response.OK)
         # Send reply
@@ -697,7 +740,7 @@ class CalvinProto(CalvinCBClass):
         callback: called when finished with the authorization decision
         jwt: signed JSON Web Token (JWT) containing the authorization request
         """
-        _log.debug("authorization_decision:\n\tauthz_server_uuid={}\n\tcallback={}\n\tjwt={}".format(authz_server_uuid, callback, jwt))
+        _log.debug("authorization_decision:\n\tauthz_server_uuid=%s\n\tcallback=%s\n\tjwt=%s", authz_server_uuid, callback, jwt)
         self.node.network.link_request(authz_server_uuid,
                                        CalvinCB(send_message,
             msg = {'cmd': 'AUTHORIZATION_DECISION', 'jwt': jwt, 'cert_name': self.node.runtime_credentials.cert_name},
@@ -711,7 +754,7 @@ class CalvinProto(CalvinCBClass):
         sender and receiver are used for both the request and response.
         A Policy Decision Point (PDP) is used to determine if access is permitted.
         """
-        _log.debug("authorization_decision_handler:\n\tPayload={}".format(payload))
+        _log.debug("authorization_decision_handler:\n\tPayload=%s", payload)
         if not _sec_conf['authorization']['accept_external_requests']:
             reply = response.CalvinResponse(response.NOT_FOUND)
             # Send reply
@@ -731,13 +774,13 @@ class CalvinProto(CalvinCBClass):
 
     def _authorization_decision_handler_jwt_decoded_cb(self, decoded, payload):
         """JWT is now decoded, continute with authorization decision"""
-        _log.debug("_authorization_decision_handler_jwt_decoded_cb:\n\tDecoded={}\n\tPayload={}".format(decoded, payload))
+        _log.debug("_authorization_decision_handler_jwt_decoded_cb:\n\tDecoded=%s\n\tPayload=%s", decoded, payload)
         self.node.authorization.pdp.authorize(decoded["request"],
                             callback=CalvinCB(self._authorization_decision_handler, payload, decoded))
 
     def _authorization_decision_handler(self, payload, request, authz_response):
         """Authorization decision has been made, now send response"""
-        _log.debug("_authorization_decision_handler:\n\tPayload={}\n\tRequest={}\n\tAuthz_response={}".format(payload, request, authz_response))
+        _log.debug("_authorization_decision_handler:\n\tPayload=%s\n\tRequest=%s\n\tAuthz_response=%s", payload, request, authz_response)
         try:
             jwt_response = self.node.authorization.encode_response(request, authz_response)
             data_response = {"jwt": jwt_response, "cert_name": self.node.runtime_credentials.cert_name}
@@ -757,7 +800,7 @@ class CalvinProto(CalvinCBClass):
         callback: called when finished with the search
         jwt: signed JSON Web Token (JWT) containing the authorization request
         """
-        _log.debug("authorization_search:\n\tauthz_server_uuid={}\n\tcallback={}\n\tjwt={}".format(authz_server_uuid, callback, jwt))
+        _log.debug("authorization_search:\n\tauthz_server_uuid=%s\n\tcallback=%s\n\tjwt=%s", authz_server_uuid, callback, jwt)
         self.node.network.link_request(authz_server_uuid,
                                        CalvinCB(send_message,
             msg = {'cmd': 'AUTHORIZATION_SEARCH', 'jwt': jwt, 'cert_name': self.node.runtime_credentials.cert_name},
@@ -771,7 +814,7 @@ class CalvinProto(CalvinCBClass):
         sender and receiver are used for both the request and response.
         A Policy Decision Point (PDP) is used for the authorization search.
         """
-        _log.debug("authorization_search_handler:\n\tpayload={}".format(payload))
+        _log.debug("authorization_search_handler:\n\tpayload=%s", payload)
         try:
             decoded = self.node.authorization.decode_request(payload,
                                                              CalvinCB(self._authorization_search_handler_jwt_decoded_cb,
@@ -785,7 +828,7 @@ class CalvinProto(CalvinCBClass):
 
     def _authorization_search_handler_jwt_decoded_cb(self, decoded, payload):
         """JWT is now decoded, contintue search for runtime where actor is allowed to execute"""
-        _log.debug("_authorization_search_handler_jwt_decoded:\n\tdecoded={}\n\tpayload={}".format(decoded, payload))
+        _log.debug("_authorization_search_handler_jwt_decoded:\n\tdecoded=%s\n\tpayload=%s", decoded, payload)
         try:
             self.node.authorization.pdp.runtime_search(decoded["request"], decoded["whitelist"],
                                          CalvinCB(self._authorization_search_handler, payload, decoded))
@@ -798,7 +841,7 @@ class CalvinProto(CalvinCBClass):
 
     def _authorization_search_handler(self, payload, request, search_result):
         """Search for a candidate finished, now send response"""
-        _log.debug("_authorization_search_handler:\n\tpayload={}\n\trequest={}\n\tsearch_result={}".format(payload, request, search_result))
+        _log.debug("_authorization_search_handler:\n\tpayload=%s\n\trequest=%s\n\tsearch_result=%s", payload, request, search_result)
         try:
             if search_result is None:
                 runtime_id = None
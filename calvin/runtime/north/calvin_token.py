@@ -14,6 +14,34 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from calvin.runtime.north.plugins.coders.messages.msgpack_coder import packb, unpackb
+
+# Compact token wire format: one tag byte followed by the payload. The tag is the index
+# of the token type times two, plus one when the payload is the raw bytes value
+# (passed through without any encoding), otherwise the payload is the msgpack:ed value.
+_COMPACT_TYPES = ['Token', 'ExceptionToken', 'EOSToken']
+
+
+def encode_compact(representation):
+    """ Encode a token representation ({'type': ..., 'data': ...}) into the compact wire format """
+    try:
+        index = _COMPACT_TYPES.index(representation.get('type', ''))
+    except ValueError:
+        # Decoded as exception token anyway
+        index = 1
+    data = representation.get('data', 'Bad Token')
+    if isinstance(data, str):
+        return chr(2 * index + 1) + data
+    return chr(2 * index) + packb(data)
+
+
+def decode_compact(data):
+    """ Decode the compact wire format into a token representation """
+    tag = ord(data[0])
+    value = data[1:] if tag & 1 else unpackb(data[1:])
+    return {'type': _COMPACT_TYPES[tag >> 1], 'data': value}
+
+
 class Token(object):
 
     """ Token class """
@@ -32,6 +60,9 @@ class Token(object):
     @classmethod
     def decode(cls, data, coder=None):
         representaton = coder.decode(data) if coder else data
+        if isinstance(representaton, str):
+            # Compact wire format, see encode_compact
+            representaton = decode_compact(representaton)
         token_type = representaton.get('type', '')
         class_ = {
             'Token':Token,
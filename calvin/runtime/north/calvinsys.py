@@ -82,11 +82,17 @@ class CalvinSys(object):
         self.objects.append(obj)
         return obj
 
-    def scheduler_wakeup(self, actor):
+    def scheduler_wakeup(self, actor, source="calvinsys"):
         """
-        Trigger scheduler
+        Trigger scheduler for actor, source is counted in the scheduler wakeup statistics
         """
-        self._node.sched.trigger_loop(actor_ids=[actor.id])
+        self._node.sched.wakeup(actor.id, source)
+
+    def timers(self):
+        """
+        The scheduler's timer wheel
+        """
+        return self._node.sched.timers
 
     def has_capability(self, requirement):
         """
@@ -135,7 +135,10 @@ def handle_actor_migrate(self, handle, connection, match, data, hdr):
     """
     POST /actor/{actor-id}/migrate
     Migrate actor to (other) node, either explicit node_id or by updated requirements
-    Body: {"peer_node_id": <node-id>}
+    Body: {"peer_node_id": <node-id>, "precopy": True or False}
+    With precopy the state is copied to the node while the actor keeps running, only the changes are
+    sent once the actor is disconnected, defaults to migration_precopy in config. The time the actor
+    was disconnected is reported as freeze by GET /migration/statistics.
     Alternative body:
     Body:
     {
@@ -156,7 +159,8 @@ def handle_actor_migrate(self, handle, connection, match, data, hdr):
     if 'peer_node_id' in data:
         try:
             self.node.am.migrate(match.group(1), data['peer_node_id'],
-                             callback=CalvinCB(self.actor_migrate_cb, handle, connection))
+                             callback=CalvinCB(self.actor_migrate_cb, handle, connection),
+                             precopy=data.get('precopy'))
         except:
             _log.exception("Migration failed")
             status = calvinresponse.INTERNAL_ERROR
@@ -370,7 +374,8 @@ def handle_deploy(self, handle, connection, match, data, hdr):
                                               }, ...
                                            ],
                 ...
-                            }
+                            },
+            "priorities": {"<actor instance 1 name>": <scheduling priority, default 1>, ...}  # optional
            }
     }
     Note that either a script or app_info must be supplied. Optionally security
@@ -115,6 +115,32 @@ def handle_dump_storage(self, handle, connection, match, data, hdr):
     self.send_response(handle, connection, json.dumps(name), status=calvinresponse.OK)
 
 
+@handler(r"GET /storagecache\sHTTP/1")
+@authentication_decorator
+def handle_get_storage_cache(self, handle, connection, match, data, hdr):
+    """
+    GET /storagecache
+    Get statistics of the registry read cache on this calvin node
+    Response status code: OK
+    Response: {"hits": <n>, "misses": <n>, "evictions": <n>, "invalidations": <n>,
+               "size": <n>, "max_size": <n, 0 when disabled>}
+    """
+    self.send_response(handle, connection, json.dumps(self.node.storage.cache_statistics()))
+
+
+@handler(r"DELETE /storagecache\sHTTP/1")
+@authentication_decorator
+def handle_delete_storage_cache(self, handle, connection, match, data, hdr):
+    """
+    DELETE /storagecache
+    Drop all values in the registry read cache on this calvin node
+    Response status code: OK
+    Response: none
+    """
+    self.node.storage.clear_cache()
+    self.send_response(handle, connection, None, status=calvinresponse.OK)
+
+
 #
 # FIXME: These probably belongs in this API but I'm not completely sure
 #
@@ -7,6 +7,7 @@ from routes import handler, register
 from authentication import authentication_decorator
 from calvin.runtime.north.calvinsys import get_calvinsys
 from calvin.runtime.north.calvinlib import get_calvinlib
+from calvin.actorstore.store import actor_class_cache_statistics
 
 _log = get_logger(__name__)
 
@@ -92,6 +93,54 @@ def handle_quit(self, handle, connection, match, data, hdr):
     self.send_response(handle, connection, None, status=calvinresponse.ACCEPTED)
 
 
+@handler(r"GET /scheduler/statistics\sHTTP/1")
+@authentication_decorator
+def handle_get_scheduler_statistics(self, handle, connection, match, data, hdr):
+    """
+    GET /scheduler/statistics
+    Get actor firing statistics of the scheduler on this calvin node
+    Response status code: OK
+    Response: {"mode": <scheduler mode>, "policy": <scheduling policy>,
+               "last_loop": {"fired": <n>, "evaluated": <n>, "skipped": <n>, "queue_depth": <n>},
+               "total": {"loops": <n>, "fired": <n>, "evaluated": <n>, "skipped": <n>},
+               "monitor": {"registered": <n>, "dirty": <n>, "last_loop": <n>, "serviced": <n>, "loops": <n>},
+               "timers": {"timers": <n>, "expired": <n>, "missed": <n>, "wakeups": <n>, "ticks": <n>,
+                          "resolution": <seconds>},
+               "wakeups": {<I/O source, e.g. file or socket>: <n>, ...}}
+    """
+    self.send_response(handle, connection, json.dumps(self.node.sched.statistics()))
+
+
+@handler(r"GET /actorstore/cache\sHTTP/1")
+@authentication_decorator
+def handle_get_actor_class_cache(self, handle, connection, match, data, hdr):
+    """
+    GET /actorstore/cache
+    Get statistics of the actor class cache, shared by the actor stores of this calvin process
+    Response status code: OK
+    Response: {"hits": <n>, "misses": <n>, "invalidations": <n>, "signature_hits": <n>,
+               "signature_misses": <n>, "size": <n>}
+    """
+    self.send_response(handle, connection, json.dumps(actor_class_cache_statistics()))
+
+
+@handler(r"GET /migration/statistics\sHTTP/1")
+@authentication_decorator
+def handle_get_migration_statistics(self, handle, connection, match, data, hdr):
+    """
+    GET /migration/statistics
+    Get latency, freeze time and size of the latest actor migrations from this calvin node, oldest first.
+    The freeze time is from the actor is disconnected until it is running on the new node, the
+    precopy_bytes is the size of the precopied snapshot and only present for precopy migrations.
+    Response status code: OK
+    Response: [{"actor_id": <actor-id>, "node_id": <node-id>, "status": <true or false>, "precopy": <true or false>,
+                "latency": <seconds>, "freeze": <seconds>, "precopy_bytes": <n, null when not packed>,
+                "state_bytes": <n, null when not packed>, "sent_bytes": <n, null when not packed>,
+                "chunks": <n>}, ...]
+    """
+    self.send_response(handle, connection, json.dumps(self.node.am.migration_statistics()))
+
+
 @handler(r"OPTIONS /[^\s]*\sHTTP/1")
 @authentication_decorator
 def handle_options(self, handle, connection, match, data, hdr):
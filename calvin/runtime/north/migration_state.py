@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Packing of actor state for migration.
+
+The state is msgpack:ed, zlib compressed and base64 encoded into one string that any
+message coder can carry. Managed attributes that are larger than the chunk size are
+packed on their own and split into chunks, which are sent ahead of the actor state.
+
+Runtimes announce what they accept in their node info, see CAPABILITIES. A peer that
+does not announce them (an older runtime) gets the plain state with all queue slots.
+"""
+
+import zlib
+import base64
+import hashlib
+from calvin.runtime.north.plugins.coders.messages.msgpack_coder import packb, unpackb
+from calvin.runtime.north.plugins.port.queue.common import is_fifo_state, fifo_slots
+
+# Accepted in a migrated state: packed (compressed, chunked) states and queues holding only unread tokens,
+# and ACTOR_PRECOPY snapshots ahead of a delta state
+PACKED_STATE = 'packed_state'
+FIFO_STATE = 'fifo_state'
+PRECOPY = 'precopy'
+CAPABILITIES = [PACKED_STATE, FIFO_STATE, PRECOPY]
+
+
+def is_packed(state):
+    return '_packed' in state
+
+
+def _encode(data, level):
+    if level:
+        data = zlib.compress(data, level)
+    return base64.b64encode(data)
+
+
+def _decode(data, compression):
+    data = base64.b64decode(data)
+    if compression == 'zlib':
+        data = zlib.decompress(data)
+    return data
+
+
+def pack(state, level, chunk_size=0):
+    """
+    Pack the actor state using zlib compression level (0 is no compression).
+    Managed attributes larger than chunk_size bytes (0 is never) are left out
+    of the packed state and returned split into chunks of chunk_size.
+    Returns packed state, {key: [chunk, ...]} and the unpacked size in bytes.
+    """
+    actor_id = state['_id']
+    state = dict(state)
+    size = 0
+    chunks = {}
+    if chunk_size:
+        for key in state['_managed']:
+            if key not in state:
+                # Unchanged in a delta
+                continue
+            data = packb(state[key])
+            if len(data) > chunk_size:
+                del state[key]
+                size += len(data)
+                data = _encode(data, level)
+                chunks[key] = [data[i:i + chunk_size] for i in xrange(0, len(data), chunk_size)]
+    data = packb(state)
+    size += len(data)
+    packed = {
+        '_packed': 'zlib' if level else 'none',
+        '_id': actor_id,
+        'data': _encode(data, level),
+        'chunks': {key: len(parts) for key, parts in chunks.items()}
+    }
+    return packed, chunks, size
+
+
+def packed_size(packed, chunks):
+    """ Number of bytes of packed state and chunks """
+    return len(packed['data']) + sum(len(data) for parts in chunks.values() for data in parts)
+
+
+def unpack(packed, chunks=None):
+    """
+    Return the actor state from a packed state and its received chunks ({key: [chunk, ...]}).
+    A state that is not packed is returned as is.
+    """
+    if not is_packed(packed):
+        return packed
+    compression = packed['_packed']
+    state = unpackb(_decode(packed['data'], compression))
+    chunks = chunks or {}
+    for key, count in packed['chunks'].items():
+        parts = chunks.get(key, [])
+        if len(parts) != count:
+            raise Exception("Got %d of %d chunks of attribute '%s'" % (len(parts), count, key))
+        state[key] = unpackb(_decode("".join(parts), compression))
+    return state
+
+
+def digests(state):
+    """ Digest of each managed attribute of a state snapshot """
+    return {key: hashlib.sha1(packb(state[key])).digest() for key in state['_managed']}
+
+
+def delta(state, digests):
+    """ The state without the managed attributes that are unchanged since the snapshot with digests """
+    managed = set(state['_managed'])
+    changed = {key: value for key, value in state.items()
+               if key not in managed or key == '_id' or digests.get(key) != hashlib.sha1(packb(value)).digest()}
+    changed['_precopy'] = True
+    return changed
+
+
+def is_delta(state):
+    return '_precopy' in state
+
+
+def merge(snapshot, delta):
+    """ Return the complete state from a snapshot and a delta made from it """
+    managed = set(delta['_managed'])
+    state = {key: value for key, value in snapshot.items() if key in managed}
+    state.update(delta)
+    del state['_precopy']
+    return state
+
+
+def with_fifo_slots(state):
+    """ The state with every queue holding all its slots, for peers without FIFO_STATE """
+    state = dict(state)
+    for direction in ('inports', 'outports'):
+        ports = state[direction] = dict(state[direction])
+        for name, port in ports.items():
+            queue = port.get('queue', {})
+            fifo = queue.get('fifo')
+            if is_fifo_state(fifo):
+                fifo = fifo_slots(fifo, queue['N'])
+            elif isinstance(fifo, dict):
+                fifo = {p: fifo_slots(s, queue['N']) if is_fifo_state(s) else s for p, s in fifo.items()}
+            else:
+                continue
+            ports[name] = dict(port, queue=dict(queue, fifo=fifo))
+    return state
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+import random
+import time
+
+from calvin.runtime.south.plugins.async import async
+from calvin.utilities import calvinconfig
+from calvin.utilities.calvinlogger import get_logger
+
+_log = get_logger(__name__)
+_conf = calvinconfig.get()
+
+# Seconds between load summaries published to the registry, 0 disables publishing
+LOAD_REPORT_INTERVAL = _conf.get(None, "load_report_interval")
+if LOAD_REPORT_INTERVAL is None:
+    LOAD_REPORT_INTERVAL = 5.0
+# Summaries older than this many seconds are treated as unknown
+LOAD_MAX_AGE = _conf.get(None, "load_max_age") or 30.0
+# How a node is picked among candidates: least_loaded, two_choices or random
+LOAD_SELECTION = _conf.get(None, "load_selection") or "two_choices"
+# Score of a node without a recent load summary, a busy node without queue pressure
+UNKNOWN_LOAD = 1.0
+# Capacity of a saturated node, placement still needs a positive capacity
+MIN_CAPACITY = 0.05
+
+
+def load_score(summary, now=None):
+    """
+    Single load figure of a node summary, 0.0 (idle) to 2.0 (saturated).
+    The busiest of CPU and scheduler utilization plus saturating queue pressure.
+    """
+    if not summary or (now or time.time()) - summary.get('time', 0) > LOAD_MAX_AGE:
+        return UNKNOWN_LOAD
+    busy = max(summary.get('cpu', 0.0), 1.0 - summary.get('idle', 1.0))
+    pressure = summary.get('pressure', 0.0)
+    return min(busy, 1.0) + pressure / (pressure + 1.0)
+
+
+def capacity(summary, now=None):
+    """ Spare capacity of a node for placement, 1.0 when idle down to MIN_CAPACITY when saturated """
+    return max(MIN_CAPACITY, 1.0 - load_score(summary, now) / 2.0)
+
+
+def select_node(node_ids, loads, selection=None, rnd=random):
+    """
+    Pick one of node_ids using their load summaries, loads: {node_id: summary}.
+    least_loaded takes the lowest score, two_choices the lowest of two random candidates
+    which avoids all selectors herding onto the same node, random ignores the load.
+    """
+    node_ids = sorted(node_ids)
+    if not node_ids:
+        return None
+    selection = selection or LOAD_SELECTION
+    if selection == "random":
+        return rnd.choice(node_ids)
+    if selection == "two_choices" and len(node_ids) > 2:
+        node_ids = rnd.sample(node_ids, 2)
+    elif selection not in ("least_loaded", "two_choices"):
+        raise ValueError("Unknown load selection %s" % selection)
+    now = time.time()
+    scores = [(load_score(loads.get(node_id), now), node_id) for node_id in node_ids]
+    best = min(score for score, _ in scores)
+    return rnd.choice([node_id for score, node_id in scores if score == best])
+
+
+class LoadReporter(object):
+
+    """
+    Periodically publish a compact load summary of the runtime to the registry:
+    cpu: fraction of a CPU used by the runtime process
+    idle: fraction of the time the scheduler was not firing actors
+    pressure: full queue events per second on the actors' inports
+    actors: number of actors on the runtime
+    """
+
+    def __init__(self, node, interval=None):
+        super(LoadReporter, self).__init__()
+        self.node = node
+        self.interval = LOAD_REPORT_INTERVAL if interval is None else interval
+        self._timer = None
+        self._last = None
+
+    def start(self):
+        if not self.interval:
+            return
+        self._last = self._sample()
+        self._timer = async.DelayedCall(self.interval, self._report)
+
+    def stop(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _sample(self):
+        """ Cumulative counters, (wall time, process CPU time, scheduler busy time, queue full events) """
+        cpu = os.times()
+        pressure = 0
+        for actor in self.node.am.actors.values():
+            for _, count, _ in actor.get_pressure().values():
+                pressure += count
+        return (time.time(), cpu[0] + cpu[1], self.node.sched.busy_time, pressure)
+
+    def summary(self):
+        """ Load since the previous summary """
+        sample = self._sample()
+        last = self._last or sample
+        self._last = sample
+        elapsed = sample[0] - last[0]
+        if elapsed <= 0:
+            return {'cpu': 0.0, 'idle': 1.0, 'pressure': 0.0, 'actors': len(self.node.am.actors), 'time': sample[0]}
+        return {'cpu': max(0.0, sample[1] - last[1]) / elapsed,
+                'idle': max(0.0, 1.0 - max(0.0, sample[2] - last[2]) / elapsed),
+                # Counters restart when actors come and go
+                'pressure': max(0, sample[3] - last[3]) / elapsed,
+                'actors': len(self.node.am.actors),
+                'time': sample[0]}
+
+    def _report(self):
+        self._timer = None
+        if self.node.quitting:
+            return
+        try:
+            self.node.storage.set_node_load(self.node.id, self.summary())
+        except Exception:
+            _log.exception("Failed to publish load summary")
+        self._timer = async.DelayedCall(self.interval, self._report)
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Encode/decode throughput of the runtime to runtime message coders.
+
+    python -m calvin.runtime.north.plugins.coders.benchmark [-n ITERATIONS] [--coder NAME]
+"""
+
+import argparse
+import base64
+import timeit
+
+from calvin.runtime.north.calvin_token import Token
+from calvin.runtime.north.plugins.coders.messages import message_coder_factory, json_coder, msgpack_coder
+from calvin.utilities import calvinuuid
+
+
+def _tunnel_data(value):
+    return {'cmd': 'TUNNEL_DATA', 'value': value, 'tunnel_id': calvinuuid.uuid("TUNNEL"),
+            'from_rt_uuid': calvinuuid.uuid("NODE"), 'to_rt_uuid': calvinuuid.uuid("NODE"),
+            'msg_uuid': calvinuuid.uuid("MSGID")}
+
+
+def messages():
+    """ Realistic messages, name: message """
+    port_id = calvinuuid.uuid("PORT")
+    peer_port_id = calvinuuid.uuid("PORT")
+
+    def token_msg(token, sequencenbr=17):
+        return _tunnel_data({'cmd': 'TOKEN', 'token': token.encode(), 'peer_port_id': peer_port_id,
+                             'sequencenbr': sequencenbr, 'port_id': port_id})
+    # Camera actor sends base64 encoded jpeg images
+    frame = base64.b64encode("\xff\xd8" + "\x5a" * 30000)
+    actor_info = {'name': "app:src", 'type': "std.CountTimer", 'node_id': calvinuuid.uuid("NODE"),
+                  'inports': [], 'outports': [{'id': port_id, 'name': "integer"}]}
+    return {
+        'TOKEN int': token_msg(Token(4711)),
+        'TOKEN dict': token_msg(Token({'temperature': 21.5, 'unit': "C", 'timestamp': 1508312345.123})),
+        'TOKEN frame': token_msg(Token(frame)),
+        'TOKENS 32 int': _tunnel_data({'cmd': 'TOKENS', 'tokens': [Token(n).encode() for n in range(32)],
+                                       'peer_port_id': peer_port_id, 'sequencenbr': 0, 'port_id': port_id}),
+        'TOKEN_REPLY': _tunnel_data({'cmd': 'TOKEN_REPLY', 'port_id': port_id, 'peer_port_id': peer_port_id,
+                                     'sequencenbr': 17, 'value': 'ACK'}),
+        'storage GET': _tunnel_data({'cmd': 'GET', 'key': "actor-" + calvinuuid.uuid("ACTOR"),
+                                     'msg_uuid': calvinuuid.uuid("MSGID")}),
+        'storage REPLY': _tunnel_data({'cmd': 'REPLY', 'key': "actor-" + calvinuuid.uuid("ACTOR"),
+                                       'msg_uuid': calvinuuid.uuid("MSGID"),
+                                       'value': json_coder.MessageCoder().encode(actor_info)}),
+    }
+
+
+def benchmark(coder, message, iterations):
+    """ Returns (encode seconds per message, decode seconds per message, encoded size) """
+    data = coder.encode(message)
+    encode = min(timeit.repeat(lambda: coder.encode(message), number=iterations, repeat=3)) / iterations
+    decode = min(timeit.repeat(lambda: coder.decode(data), number=iterations, repeat=3)) / iterations
+    return encode, decode, len(data)
+
+
+def main():
+    argparser = argparse.ArgumentParser(description="Benchmark the message coders")
+    argparser.add_argument('-n', '--iterations', type=int, default=2000, help="encode/decode iterations per message")
+    argparser.add_argument('--coder', action='append', choices=message_coder_factory.get_prio_list(),
+                           help="coder to benchmark, default all")
+    args = argparser.parse_args()
+
+    print "json backend: %s, msgpack backend: %s" % ("ujson" if json_coder.NATIVE else "json",
+                                                     "msgpack" if msgpack_coder.NATIVE else "umsgpack")
+    print "%-10s %-15s %12s %12s %12s %10s" % ("coder", "message", "encode us", "decode us", "msg/s", "bytes")
+    msgs = messages()
+    for name in args.coder or message_coder_factory.get_prio_list():
+        coder = message_coder_factory.get(name)
+        for msg_name in sorted(msgs):
+            encode, decode, size = benchmark(coder, msgs[msg_name], args.iterations)
+            print "%-10s %-15s %12.1f %12.1f %12d %10d" % (name, msg_name, encode * 1e6, decode * 1e6,
+                                                           1.0 / (encode + decode), size)
+
+
+if __name__ == '__main__':
+    main()
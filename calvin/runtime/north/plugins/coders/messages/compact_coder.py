@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from message_coder import MessageCoderBase
+from msgpack_coder import packb, unpackb, Ext, ext_data
+from calvin.runtime.north.calvin_token import encode_compact
+
+# msgpack extension type used for tokens in the compact wire format
+TOKEN_EXT_TYPE = 0x43
+
+
+class MessageCoder(MessageCoderBase):
+
+    """
+        msgpack coder that sends the tokens in token transport messages in the compact
+        token wire format. Received tokens are left in the wire format until decoded by
+        the receiving endpoint, hence they are passed along as is when forwarded.
+    """
+
+    def _pack_token(self, token):
+        if isinstance(token, str):
+            # Already in compact wire format
+            return Ext(TOKEN_EXT_TYPE, token)
+        return Ext(TOKEN_EXT_TYPE, encode_compact(token))
+
+    @staticmethod
+    def _unpack_token(token):
+        data = ext_data(token, TOKEN_EXT_TYPE)
+        return token if data is None else data
+
+    @staticmethod
+    def _token_message(data):
+        """ Return the token transport message carried in data or None """
+        if data.get('cmd') != 'TUNNEL_DATA':
+            return None
+        value = data.get('value')
+        if isinstance(value, dict) and value.get('cmd') in ('TOKEN', 'TOKENS'):
+            return value
+        return None
+
+    def encode(self, data):
+        value = self._token_message(data)
+        if value is not None:
+            # Don't modify the callers message, it might be resent
+            value = dict(value)
+            if value['cmd'] == 'TOKEN':
+                value['token'] = self._pack_token(value['token'])
+            else:
+                value['tokens'] = [self._pack_token(t) for t in value['tokens']]
+            data = dict(data, value=value)
+        return packb(data)
+
+    def decode(self, data):
+        data = unpackb(data)
+        value = self._token_message(data)
+        if value is not None:
+            if value['cmd'] == 'TOKEN':
+                value['token'] = self._unpack_token(value['token'])
+            else:
+                value['tokens'] = [self._unpack_token(t) for t in value['tokens']]
+        return data
@@ -17,11 +17,31 @@
 import json
 from message_coder import MessageCoderBase
 
+# Use ujson when available, falls back to the json module
+try:
+    import ujson
+    NATIVE = True
+except ImportError:
+    NATIVE = False
+
+if NATIVE and int(ujson.__version__.split('.')[0]) >= 2:
+    dumps = ujson.dumps
+    loads = ujson.loads
+elif NATIVE:
+    # Older ujson looses precision when encoding floats, only use it for decoding
+    dumps = json.dumps
+
+    def loads(data):
+        return ujson.loads(data, precise_float=True)
+else:
+    dumps = json.dumps
+    loads = json.loads
+
 # set of functions to encode/decode data tokens to/from a json description
 class MessageCoder(MessageCoderBase):
 
     def encode(self, data):
-        return json.dumps(data)
+        return dumps(data)
 
     def decode(self, data):
-        return json.loads(data)
+        return loads(data)
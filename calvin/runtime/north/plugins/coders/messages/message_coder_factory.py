@@ -17,9 +17,13 @@
 # Coders
 import json_coder
 import msgpack_coder
+import compact_coder
 
 def get_prio_list():
-    return ['json', 'msgpack']
+    if msgpack_coder.NATIVE:
+        return ['compact', 'json', 'msgpack']
+    # Pure python msgpack is slower than json
+    return ['json', 'compact', 'msgpack']
 
 def get(type_):
     if type_ == "json":
@@ -28,4 +32,7 @@ def get(type_):
     if type_ == "msgpack":
         return msgpack_coder.MessageCoder()
 
+    if type_ == "compact":
+        return compact_coder.MessageCoder()
+
     raise Exception("Coder {} requested is not supported".format(type_))
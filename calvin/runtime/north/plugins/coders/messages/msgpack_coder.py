@@ -14,17 +14,56 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import umsgpack
 from message_coder import MessageCoderBase
 
-umsgpack.compatibility = True
+# Use the msgpack C extension when available, it is wire compatible with umsgpack in
+# compatibility mode (strings as raw bytes). The defaults of msgpack changed over its
+# versions (e.g. raw, use_bin_type and strict_map_key in 1.0), the modes are set explicitly.
+try:
+    import msgpack
+    NATIVE = True
+except ImportError:
+    import umsgpack
+    umsgpack.compatibility = True
+    NATIVE = False
+
+if NATIVE:
+    Ext = msgpack.ExtType
+
+    def packb(data):
+        return msgpack.packb(data, use_bin_type=False)
+
+    if msgpack.version >= (0, 6, 1):
+        # Maps with non-string keys are valid
+        def unpackb(data):
+            return msgpack.unpackb(data, raw=True, strict_map_key=False)
+    elif msgpack.version >= (0, 5, 2):
+        def unpackb(data):
+            return msgpack.unpackb(data, raw=True)
+    else:
+        unpackb = msgpack.unpackb
+
+    def ext_data(obj, type_):
+        """ Return data of extension type type_ or None """
+        if isinstance(obj, msgpack.ExtType) and obj.code == type_:
+            return obj.data
+        return None
+else:
+    Ext = umsgpack.Ext
+    packb = umsgpack.packb
+    unpackb = umsgpack.unpackb
+
+    def ext_data(obj, type_):
+        """ Return data of extension type type_ or None """
+        if isinstance(obj, umsgpack.Ext) and obj.type == type_:
+            return obj.data
+        return None
+
 
-# set of functions to encode/decode data tokens to/from a json description
 class MessageCoder(MessageCoderBase):
 
     def encode(self, data):
-        return umsgpack.packb(data)
+        return packb(data)
 
     def decode(self, data):
-        data = umsgpack.unpackb(data)
-        return data
+        return unpackb(data)
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from calvin.runtime.north.plugins.placement.objective_base import ObjectiveBase
+
+
+class Colocation(ObjectiveBase):
+
+    """
+    Connected actors on different nodes cost the weight of their connection
+    """
+
+    def cost(self, actor, node, placement, load):
+        return sum(weight for peer, weight in self.problem.neighbors[actor]
+                   if placement[peer] is not None and placement[peer] != node)
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+
+class HeuristicSolver(object):
+
+    """
+    Bounded time placement heuristic minimizing the weighted sum of objectives.
+    Actors are first placed greedily, the most connected first, on their cheapest node
+    given the actors placed so far. Then actors are moved to cheaper nodes, one at a
+    time, until no move improves the placement or the time budget is spent.
+    problem: the PlacementProblem
+    objectives: list of (weight, objective)
+    time_budget: seconds the solver may spend improving the greedy placement
+    """
+
+    # Actors evaluated between checks of the time budget
+    CHECK_INTERVAL = 64
+
+    def __init__(self, problem, objectives, time_budget):
+        super(HeuristicSolver, self).__init__()
+        self.problem = problem
+        self.objectives = objectives
+        self.time_budget = time_budget
+        self.placement = [None] * len(problem.actor_ids)
+        self.load = [0] * len(problem.node_ids)
+        self.moves = 0
+
+    def _cost(self, actor, node):
+        return sum(weight * objective.cost(actor, node, self.placement, self.load)
+                   for weight, objective in self.objectives)
+
+    def _cheapest(self, actor, nodes):
+        best, best_cost = None, None
+        for node in nodes:
+            cost = self._cost(actor, node)
+            if best_cost is None or cost < best_cost - 1e-9:
+                best, best_cost = node, cost
+        return best
+
+    def _place(self, actor, node):
+        if self.placement[actor] is not None:
+            self.load[self.placement[actor]] -= 1
+        self.placement[actor] = node
+        if node is not None:
+            self.load[node] += 1
+
+    def solve(self):
+        """ Return the placement, the node index of each actor (None when it has no allowed node) """
+        deadline = time.time() + self.time_budget
+        problem = self.problem
+        order = sorted(xrange(len(problem.actor_ids)),
+                       key=lambda actor: -sum(weight for _, weight in problem.neighbors[actor]))
+        for actor in order:
+            allowed = problem.allowed[actor]
+            self._place(actor, allowed[0] if len(allowed) == 1 else self._cheapest(actor, allowed))
+        movable = [actor for actor in order if len(problem.allowed[actor]) > 1]
+        improved = True
+        while improved:
+            improved = False
+            for count, actor in enumerate(movable):
+                if count % self.CHECK_INTERVAL == 0 and time.time() > deadline:
+                    return self.placement
+                current = self.placement[actor]
+                self._place(actor, None)
+                best = self._cheapest(actor, [current] + problem.allowed[actor])
+                self._place(actor, best)
+                if best != current:
+                    self.moves += 1
+                    improved = True
+        return self.placement
+
+    def ranked(self):
+        """ Allowed node ids of each actor, {actor_id: [node_id, ...]}, solved placement first then cheapest first """
+        problem = self.problem
+        ranked = {}
+        for actor, actor_id in enumerate(problem.actor_ids):
+            current = self.placement[actor]
+            self._place(actor, None)
+            costs = sorted((0 if node == current else 1, self._cost(actor, node), node)
+                           for node in problem.allowed[actor])
+            self._place(actor, current)
+            ranked[actor_id] = [problem.node_ids[node] for _, _, node in costs]
+        return ranked
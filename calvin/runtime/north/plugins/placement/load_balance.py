@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from calvin.runtime.north.plugins.placement.objective_base import ObjectiveBase
+
+
+class LoadBalance(ObjectiveBase):
+
+    """
+    Actors on a node cost its load relative to its capacity, about 1.0 when all nodes
+    have their share of the actors
+    """
+
+    def __init__(self, problem):
+        super(LoadBalance, self).__init__(problem)
+        # Actors per unit of capacity when evenly spread
+        self._share = float(len(problem.actor_ids)) / (sum(problem.capacity) or 1.0) or 1.0
+
+    def cost(self, actor, node, placement, load):
+        return (load[node] + 1) / (self.problem.capacity[node] * self._share)
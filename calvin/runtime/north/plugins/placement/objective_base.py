@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+
+class ObjectiveBase(object):
+
+    """
+    Base class for placement objectives.
+    The placement solver minimizes the weighted sum of the objectives' costs.
+    problem: the PlacementProblem
+    """
+
+    def __init__(self, problem):
+        super(ObjectiveBase, self).__init__()
+        self.problem = problem
+
+    def cost(self, actor, node, placement, load):
+        """
+            Return the cost of placing actor on node, given the node of the other actors
+            (placement, None when not yet placed) and the number of actors on each node
+            not counting this actor (load). Actors and nodes are indexes in the problem.
+        """
+        raise NotImplementedError("Placement objective not implemented.")
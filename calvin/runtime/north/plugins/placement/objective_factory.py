@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+# Placement objectives
+
+import colocation
+import load_balance
+import link_cost
+
+
+def get(type_, problem):
+    if type_ == "colocation":
+        return colocation.Colocation(problem)
+    if type_ == "load_balance":
+        return load_balance.LoadBalance(problem)
+    if type_ == "link_cost":
+        return link_cost.LinkCost(problem)
+
+    raise Exception("Placement objective {} is not supported".format(type_))
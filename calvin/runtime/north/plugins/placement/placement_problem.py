@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+class PlacementProblem(object):
+
+    """
+    Actors to place on nodes, with actors and nodes numbered by index.
+    actor_ids: list of actor ids
+    allowed: {actor_id: node ids the actor may be placed on}
+    connections: (actor_id, peer_actor_id) pairs, one for each port connection
+    capacity: {node_id: relative capacity of the node}, nodes not listed have capacity 1.0
+    rtt: {node_id: measured round trip time in seconds from local_node_id}
+    local_node_id: the node where the RTTs were measured
+    """
+
+    def __init__(self, actor_ids, allowed, connections, capacity=None, rtt=None, local_node_id=None):
+        super(PlacementProblem, self).__init__()
+        self.actor_ids = list(actor_ids)
+        actor_index = {actor_id: i for i, actor_id in enumerate(self.actor_ids)}
+        node_ids = set()
+        for actor_id in self.actor_ids:
+            node_ids.update(allowed[actor_id])
+        self.node_ids = sorted(node_ids)
+        node_index = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        self.allowed = [sorted(node_index[n] for n in set(allowed[actor_id])) for actor_id in self.actor_ids]
+
+        # Sparse symmetric connectivity, neighbors[i] lists (j, weight) for actors i and j connected
+        weights = {}
+        for actor_id, peer_actor_id in connections:
+            i = actor_index.get(actor_id)
+            j = actor_index.get(peer_actor_id)
+            if i is None or j is None or i == j:
+                continue
+            edge = (min(i, j), max(i, j))
+            weights[edge] = weights.get(edge, 0.0) + 1.0
+        self.neighbors = [[] for _ in self.actor_ids]
+        for (i, j), weight in weights.iteritems():
+            self.neighbors[i].append((j, weight))
+            self.neighbors[j].append((i, weight))
+
+        capacity = capacity or {}
+        self.capacity = [float(capacity.get(node_id, 1.0)) for node_id in self.node_ids]
+        self.link_cost = self._link_cost(rtt or {}, local_node_id)
+
+    def _link_cost(self, rtt, local_node_id):
+        """
+        Cost 0.0 - 1.0 of a connection between each pair of nodes, from the RTTs between the local
+        node and the other nodes. Between two remote nodes the sum of their RTTs is used, an upper
+        bound when routed via the local node. Nodes without a measured RTT get the highest RTT.
+        """
+        known = [rtt[node_id] for node_id in self.node_ids if rtt.get(node_id) is not None]
+        default = max(known) if known else 1.0
+        hops = [0.0 if node_id == local_node_id else rtt.get(node_id) or default for node_id in self.node_ids]
+        cost = [[0.0 if a == b else hops[a] + hops[b] for b in xrange(len(hops))] for a in xrange(len(hops))]
+        highest = max([max(row) for row in cost] + [0.0])
+        if highest:
+            cost = [[c / highest for c in row] for row in cost]
+        return cost
@@ -58,8 +58,8 @@ class LocalConnection(BaseConnection):
         _log.analyze(self.node.id, "+", {})
         inport.set_queue(queue.get(inport, peer_port=outport))
         outport.set_queue(queue.get(outport, peer_port=inport))
-        ein = endpoint.LocalInEndpoint(inport, outport)
-        eout = endpoint.LocalOutEndpoint(outport, inport)
+        ein = endpoint.LocalInEndpoint(inport, outport, self.node.sched.trigger_loop)
+        eout = endpoint.LocalOutEndpoint(outport, inport, self.node.sched.trigger_loop)
 
         if ein.use_monitor():
             self.node.monitor.register_endpoint(ein)
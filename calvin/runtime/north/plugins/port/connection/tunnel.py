@@ -23,6 +23,7 @@ import calvin.requests.calvinresponse as response
 from calvin.utilities import calvinlogger
 from calvin.runtime.north.plugins.port.connection.common import BaseConnection, PURPOSE
 from calvin.runtime.north.plugins.port import DISCONNECT
+from calvin.runtime.north.plugins.port.endpoint.tunnel import TOKENS_CAPABILITY
 
 _log = calvinlogger.get_logger(__name__)
 
@@ -373,9 +374,15 @@ class TunnelConnection(BaseConnection):
             tunnel.register_tunnel_down(CalvinCB(self.tunnel_down, tunnel))
             tunnel.register_tunnel_up(CalvinCB(self.tunnel_up, tunnel))
             tunnel.register_recv(CalvinCB(self.tunnel_recv_handler, tunnel))
+            # Tell peer what we support, an older peer will just ignore it
+            self.send_capabilities(tunnel)
             # We accept it by returning True
             return True
 
+        def send_capabilities(self, tunnel):
+            """ Announce the token transport capabilities of this runtime over the tunnel """
+            tunnel.send({'cmd': 'TOKEN_CAPABILITIES', 'capabilities': [TOKENS_CAPABILITY]})
+
         def tunnel_down(self, tunnel):
             """ Callback that the tunnel is not accepted or is going down """
             tunnel_peer_id = tunnel.peer_node_id
@@ -399,6 +406,7 @@ class TunnelConnection(BaseConnection):
         def tunnel_up(self, tunnel):
             """ Callback that the tunnel is working """
             tunnel_peer_id = tunnel.peer_node_id
+            self.send_capabilities(tunnel)
             # If a port connect have ordered a tunnel then it have a callback in pending
             # which want to continue with the connection
             if tunnel_peer_id in self.pending_tunnels:
@@ -409,8 +417,8 @@ class TunnelConnection(BaseConnection):
                         pass
                 self.pending_tunnels.pop(tunnel_peer_id)
 
-        def recv_token_handler(self, tunnel, payload):
-            """ Gets called when a token arrives on any port """
+        def _recv_handler(self, tunnel, payload, method_name, reply_cmd):
+            """ Gets called when token(s) arrives on any port, calls method_name on the receiving endpoint """
             try:
                 port = self._get_local_port(port_id=payload['peer_port_id'])
                 for e in port.endpoints:
@@ -418,7 +426,7 @@ class TunnelConnection(BaseConnection):
                     # it is sorted out if we connect again
                     try:
                         if e.peer_id == payload['port_id']:
-                            e.recv_token(payload)
+                            getattr(e, method_name)(payload)
                             break
                     except:
                         pass
@@ -426,32 +434,60 @@ class TunnelConnection(BaseConnection):
                 # Inform other end that it sent token to a port that does not exist on this node or
                 # that we have initiated a disconnect (endpoint does not have recv_token).
                 # Can happen e.g. when the actor and port just migrated and the token was in the air
-                _log.debug("recv_token_handler, ABORT")
-                reply = {'cmd': 'TOKEN_REPLY',
+                _log.debug("%s, ABORT", method_name)
+                reply = {'cmd': reply_cmd,
                          'port_id': payload['port_id'],
                          'peer_port_id': payload['peer_port_id'],
                          'sequencenbr': payload['sequencenbr'],
                          'value': 'ABORT'}
+                if 'tokens' in payload:
+                    reply.update({'count': len(payload['tokens']), 'acked': payload['sequencenbr'] - 1, 'nack': []})
                 tunnel.send(reply)
 
-        def recv_token_reply_handler(self, tunnel, payload):
-            """ Gets called when a token is (N)ACKed for any port """
+        def recv_token_handler(self, tunnel, payload):
+            """ Gets called when a token arrives on any port """
+            self._recv_handler(tunnel, payload, 'recv_token', 'TOKEN_REPLY')
+
+        def recv_tokens_handler(self, tunnel, payload):
+            """ Gets called when a run of tokens arrives on any port """
+            self._recv_handler(tunnel, payload, 'recv_tokens', 'TOKENS_REPLY')
+
+        def _reply_handler(self, payload, reply):
+            """ Send the reply to correct endpoint (an outport may have several when doing fan-out) """
             try:
                 port = self._get_local_port(port_id=payload['port_id'])
             except:
                 pass
             else:
-                # Send the reply to correct endpoint (an outport may have several when doing fan-out)
                 for e in port.endpoints:
                     # We might have started disconnect before getting the reply back, just ignore in that case
                     # it is sorted out if we connect again
                     try:
                         if e.get_peer()[1] == payload['peer_port_id']:
-                            e.reply(payload['sequencenbr'], payload['value'])
+                            reply(e)
                             break
                     except:
                         pass
 
+        def recv_token_reply_handler(self, tunnel, payload):
+            """ Gets called when a token is (N)ACKed for any port """
+            self._reply_handler(payload, lambda e: e.reply(payload['sequencenbr'], payload['value'],
+                                                           payload.get('window')))
+
+        def recv_tokens_reply_handler(self, tunnel, payload):
+            """ Gets called when a run of tokens is (N)ACKed for any port """
+            self._reply_handler(payload, lambda e: e.reply_tokens(payload['sequencenbr'], payload['count'],
+                                                                  payload['acked'], payload['nack'], payload['value'],
+                                                                  payload.get('window')))
+
+        def recv_token_window_handler(self, tunnel, payload):
+            """ Gets called when a peer port advertise a larger window of tokens it can accept """
+            self._reply_handler(payload, lambda e: e.update_window(payload['window']))
+
+        def recv_capabilities_handler(self, tunnel, payload):
+            """ Gets called when the peer announces its token transport capabilities """
+            tunnel.peer_capabilities.update(payload['capabilities'])
+
         def tunnel_recv_handler(self, tunnel, payload):
             """ Gets called when we receive a message over a tunnel """
             if 'cmd' in payload:
@@ -459,6 +495,14 @@ class TunnelConnection(BaseConnection):
                     self.recv_token_handler(tunnel, payload)
                 elif 'TOKEN_REPLY' == payload['cmd']:
                     self.recv_token_reply_handler(tunnel, payload)
+                elif 'TOKENS' == payload['cmd']:
+                    self.recv_tokens_handler(tunnel, payload)
+                elif 'TOKENS_REPLY' == payload['cmd']:
+                    self.recv_tokens_reply_handler(tunnel, payload)
+                elif 'TOKEN_WINDOW' == payload['cmd']:
+                    self.recv_token_window_handler(tunnel, payload)
+                elif 'TOKEN_CAPABILITIES' == payload['cmd']:
+                    self.recv_capabilities_handler(tunnel, payload)
 
     def init(self):
         return TunnelConnection.TokenTunnel(self.node, self.kwargs['portmanager'])
@@ -20,11 +20,14 @@ class Endpoint(object):
 
     """docstring for Endpoint"""
 
-    def __init__(self, port, former_peer_id=None):
+    def __init__(self, port, former_peer_id=None, trigger_loop=None):
         super(Endpoint, self).__init__()
         self.port = port
         self.former_peer_id = former_peer_id
         self.remaining_tokens = {}
+        self.trigger_loop = trigger_loop
+        # Set by the monitor when registered
+        self.monitor = None
 
     def __str__(self):
         return "%s(port_id=%s)" % (self.__class__.__name__, self.port.id)
@@ -35,6 +38,26 @@ class Endpoint(object):
     def use_monitor(self):
         return False
 
+    def wakeup(self):
+        """
+        Mark the actor owning the port as runnable, e.g. when tokens arrived or token slots were released.
+        """
+        if self.trigger_loop is not None:
+            self.trigger_loop(actor_ids=[self.port.owner.id])
+
+    def mark_dirty(self):
+        """
+        Have the monitor call communicate() in its next loop, e.g. when tokens were queued, acked or consumed.
+        """
+        if self.monitor is not None:
+            self.monitor.set_dirty(self)
+
+    def pending(self):
+        """
+        True when communicate() should be called again in the next loop even without new events.
+        """
+        return False
+
     def communicate(self):
         """
         Called by the runtime when it is possible to transfer data to counterpart.
@@ -31,8 +31,8 @@ class LocalInEndpoint(Endpoint):
 
     """docstring for LocalEndpoint"""
 
-    def __init__(self, port, peer_port):
-        super(LocalInEndpoint, self).__init__(port)
+    def __init__(self, port, peer_port, trigger_loop=None):
+        super(LocalInEndpoint, self).__init__(port, trigger_loop=trigger_loop)
         self.peer_port = peer_port
         self.peer_id = peer_port.id
         self.pressure_count = 0
@@ -64,8 +64,8 @@ class LocalOutEndpoint(Endpoint):
 
     """docstring for LocalEndpoint"""
 
-    def __init__(self, port, peer_port):
-        super(LocalOutEndpoint, self).__init__(port)
+    def __init__(self, port, peer_port, trigger_loop=None):
+        super(LocalOutEndpoint, self).__init__(port, trigger_loop=trigger_loop)
         self.peer_port = peer_port
         self.peer_id = peer_port.id
         self.peer_endpoint = None
@@ -97,6 +97,10 @@ class LocalOutEndpoint(Endpoint):
     def use_monitor(self):
         return True
 
+    def pending(self):
+        # Tokens not yet moved, e.g. since the peer queue is full
+        return self.port.queue.tokens_available(1, self.peer_id)
+
     def communicate(self, *args, **kwargs):
         if self.peer_endpoint is None:
             for e in self.peer_port.endpoints:
@@ -105,6 +109,8 @@ class LocalOutEndpoint(Endpoint):
                     break
         sent = False
         nbr = None
+        # When our queue was full the actor could not produce, it needs a wakeup when slots are released
+        blocked = not self.port.queue.slots_available(1, self.port.id)
         while True:
             try:
                 nbr, token = self.port.queue.com_peek(self.peer_id)
@@ -124,4 +130,9 @@ class LocalOutEndpoint(Endpoint):
                 break
         if self.peer_endpoint and nbr is not None:
             self.peer_endpoint.pressure_last = nbr
+        if sent:
+            if self.peer_endpoint:
+                self.peer_endpoint.wakeup()
+            if blocked:
+                self.wakeup()
         return sent
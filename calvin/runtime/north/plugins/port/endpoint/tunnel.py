@@ -19,9 +19,11 @@ from calvin.runtime.north.plugins.port.endpoint.common import Endpoint
 from calvin.runtime.north.plugins.port.queue.common import COMMIT_RESPONSE, QueueEmpty, QueueFull
 from calvin.runtime.north.plugins.port import DISCONNECT
 import time
-from calvin.utilities.calvinlogger import get_logger
+from calvin.utilities.calvinlogger import get_logger, Lazy
+from calvin.utilities import calvinconfig
 
 _log = get_logger(__name__)
+_conf = calvinconfig.get()
 
 #
 # Remote tunnel endpoints
@@ -29,20 +31,34 @@ _log = get_logger(__name__)
 
 PRESSURE_LENGTH = 20
 
+# Tunnel capability for sending a run of tokens in one TOKENS message
+TOKENS_CAPABILITY = 'TOKENS'
+# Max number of tokens in one TOKENS message
+TOKEN_BATCH_SIZE = _conf.get(None, "token_batch_size") or 64
+
+
+def window_flow_control(port_properties):
+    """ True when the outport's properties selects the credit window flow control """
+    return (port_properties or {}).get('flow_control', 'backoff') == 'window'
+
+
 class TunnelInEndpoint(Endpoint):
 
     """docstring for TunnelInEndpoint"""
 
     def __init__(self, port, tunnel, peer_node_id, peer_port_id, peer_port_properties, trigger_loop):
-        super(TunnelInEndpoint, self).__init__(port)
+        super(TunnelInEndpoint, self).__init__(port, trigger_loop=trigger_loop)
         self.tunnel = tunnel
         self.peer_id = peer_port_id
         self.peer_node_id = peer_node_id
         self.peer_port_properties = peer_port_properties
-        self.trigger_loop = trigger_loop
         self.pressure_count = 0
         self.pressure = [0] * PRESSURE_LENGTH
         self.pressure_last = 0
+        # Credit window flow control, the window is the sequence number limit (exclusive) peer may send up to
+        self.window_mode = window_flow_control(peer_port_properties)
+        self.sequencenbr_next = None
+        self.window_sent = 0
 
     def __str__(self):
         str = super(TunnelInEndpoint, self).__str__()
@@ -66,25 +82,50 @@ class TunnelInEndpoint(Endpoint):
             tokens = self.port.queue.exhaust(peer_id=self.peer_id, terminate=DISCONNECT.EXHAUST_PEER_RECV)
             self.remaining_tokens = {self.port.id: tokens}
 
-    def recv_token(self, payload):
+    def _com_write(self, token, sequencenbr):
+        """ Write one encoded token to the queue, returns True when it should be ACKed """
         try:
-            r = self.port.queue.com_write(Token.decode(payload['token']), self.peer_id, payload['sequencenbr'])
+            r = self.port.queue.com_write(Token.decode(token), self.peer_id, sequencenbr)
             if r == COMMIT_RESPONSE.handled:
-                # New token, trigger loop
-                self.trigger_loop()
+                # New token, wake up the actor
+                self.wakeup()
+                self.sequencenbr_next = sequencenbr + 1
             if r == COMMIT_RESPONSE.invalid:
                 ok = False
             else:
                 # Either old or new token, ack it
                 ok = True
-            _log.debug("recv_token %s %s: %d %s => %s %d" % (self.port.id, self.port.name, payload['sequencenbr'], payload['token'], "True" if ok else "False", r))
+            _log.debug("recv_token %s %s: %d %s => %s %d", self.port.id, self.port.name, sequencenbr, token, "True" if ok else "False", r)
         except QueueFull:
             # Queue full just send NACK
             ok = False
-            if self.pressure[(self.pressure_count - 1) % PRESSURE_LENGTH] != payload['sequencenbr']:
-                self.pressure[self.pressure_count % PRESSURE_LENGTH] = payload['sequencenbr']
+            if self.pressure[(self.pressure_count - 1) % PRESSURE_LENGTH] != sequencenbr:
+                self.pressure[self.pressure_count % PRESSURE_LENGTH] = sequencenbr
                 self.pressure_count += 1
-        self.pressure_last = payload['sequencenbr']
+        self.pressure_last = sequencenbr
+        return ok
+
+    def _window(self):
+        """ The sequence number limit (exclusive) of tokens that currently fits in the queue """
+        # Free slots are monotonic in the length asked for, large queues makes a linear probe costly
+        queue = self.port.queue
+        low, high = 0, queue.N
+        while low < high:
+            mid = (low + high + 1) // 2
+            if queue.slots_available(mid, self.peer_id):
+                low = mid
+            else:
+                high = mid - 1
+        return self.sequencenbr_next + low
+
+    def _add_window(self, reply):
+        if self.window_mode and self.sequencenbr_next is not None:
+            self.window_sent = self._window()
+            reply['window'] = self.window_sent
+        return reply
+
+    def recv_token(self, payload):
+        ok = self._com_write(payload['token'], payload['sequencenbr'])
         reply = {
             'cmd': 'TOKEN_REPLY',
             'port_id': payload['port_id'],
@@ -92,7 +133,50 @@ class TunnelInEndpoint(Endpoint):
             'sequencenbr': payload['sequencenbr'],
             'value': 'ACK' if ok else 'NACK'
         }
-        self.tunnel.send(reply)
+        self.tunnel.send(self._add_window(reply))
+
+    def recv_tokens(self, payload):
+        """ Receive a run of tokens with consecutive sequence numbers starting at payload['sequencenbr'] """
+        first = payload['sequencenbr']
+        count = len(payload['tokens'])
+        nack = []
+        for sequencenbr, token in enumerate(payload['tokens'], first):
+            if not self._com_write(token, sequencenbr):
+                # Tokens are written in sequence order, the rest of the run can't be written either
+                nack.append([sequencenbr, first + count - 1])
+                break
+        reply = {
+            'cmd': 'TOKENS_REPLY',
+            'port_id': payload['port_id'],
+            'peer_port_id': payload['peer_port_id'],
+            'sequencenbr': first,
+            'count': count,
+            # All tokens up to and including acked are ACKed
+            'acked': nack[0][0] - 1 if nack else first + count - 1,
+            # Ranges [first, last] of NACKed tokens, tokens after acked but outside these are ACKed
+            'nack': nack,
+            'value': 'ACK'
+        }
+        self.tunnel.send(self._add_window(reply))
+
+    def use_monitor(self):
+        # Needed to advertise a larger window when the actor have consumed tokens
+        return self.window_mode
+
+    def communicate(self, *args, **kwargs):
+        if not self.window_mode or self.sequencenbr_next is None:
+            return False
+        window = self._window()
+        if window <= self.window_sent:
+            return False
+        self.window_sent = window
+        self.tunnel.send({
+            'cmd': 'TOKEN_WINDOW',
+            'port_id': self.peer_id,
+            'peer_port_id': self.port.id,
+            'window': window
+        })
+        return True
 
     def set_peer_port_id(self, id):
         if self.peer_id is None:
@@ -109,17 +193,20 @@ class TunnelOutEndpoint(Endpoint):
     """docstring for TunnelOutEndpoint"""
 
     def __init__(self, port, tunnel, peer_node_id, peer_port_id, peer_port_properties, trigger_loop):
-        super(TunnelOutEndpoint, self).__init__(port)
+        super(TunnelOutEndpoint, self).__init__(port, trigger_loop=trigger_loop)
         self.tunnel = tunnel
         self.peer_id = peer_port_id
         self.peer_node_id = peer_node_id
         self.peer_port_properties = peer_port_properties
-        self.trigger_loop = trigger_loop
         # Keep track of acked tokens, only contains something post call if acks comes out of order
         self.sequencenbrs_acked = []
         self.backoff = 0.0
         self.time_cont = 0.0
         self.bulk = True
+        # Credit window flow control, window is unknown until the peer have advertised it
+        self.window_mode = window_flow_control(self.port.properties)
+        self.window = None
+        self.sequencenbr_next = None
 
     def __str__(self):
         str = super(TunnelOutEndpoint, self).__str__()
@@ -148,8 +235,21 @@ class TunnelOutEndpoint(Endpoint):
             tokens = self.port.queue.exhaust(peer_id=self.peer_id, terminate=DISCONNECT.EXHAUST_PEER_SEND)
             self.remaining_tokens = {self.port.id: tokens}
 
-    def reply(self, sequencenbr, status):
-        _log.debug("Reply on port %s/%s/%s [%i] %s" % (self.port.owner.name, self.peer_id, self.port.name, sequencenbr, status))
+    def update_window(self, window):
+        """ The peer advertised that it accepts tokens with sequence numbers below window """
+        if not self.window_mode or window is None:
+            return
+        if self.window is None or window > self.window:
+            # Room for more tokens
+            self.wakeup()
+            self.mark_dirty()
+        self.window = window
+
+    def reply(self, sequencenbr, status, window=None):
+        self.update_window(window)
+        # NACKed tokens are resent and the ACK can release the backoff
+        self.mark_dirty()
+        _log.debug("Reply on port %s/%s/%s [%i] %s", self.port.owner.name, self.peer_id, self.port.name, sequencenbr, status)
         if status == 'ACK':
             self._reply_ack(sequencenbr, status)
         elif status == 'NACK':
@@ -158,12 +258,30 @@ class TunnelOutEndpoint(Endpoint):
             # FIXME implement ABORT
             pass
 
+    def reply_tokens(self, sequencenbr, count, acked, nack, status, window=None):
+        """ Handle the cumulative reply on a run of tokens sent with TOKENS """
+        self.update_window(window)
+        self.mark_dirty()
+        _log.debug("Reply on port %s/%s/%s [%i-%i] %s acked %i nack %s", self.port.owner.name, self.peer_id,
+                   self.port.name, sequencenbr, sequencenbr + count - 1, status, acked, nack)
+        if status != 'ACK':
+            # FIXME implement ABORT
+            return
+        nacked = set()
+        for start, end in nack:
+            nacked.update(range(start, end + 1))
+        for n in range(sequencenbr, sequencenbr + count):
+            if n <= acked or n not in nacked:
+                self._reply_ack(n, 'ACK')
+        if nack:
+            self._reply_nack(min(start for start, end in nack), 'NACK')
+
     def _reply_ack(self, sequencenbr, status):
         # Back to full send speed directly
         self.bulk = True
         self.backoff = 0.0
         # Maybe someone can fill the queue again
-        self.trigger_loop()
+        self.wakeup()
         r = self.port.queue.com_commit(self.peer_id, sequencenbr)
         if r == COMMIT_RESPONSE.handled or r == COMMIT_RESPONSE.invalid:
             return
@@ -175,6 +293,12 @@ class TunnelOutEndpoint(Endpoint):
                 self.sequencenbrs_acked.remove(n)
 
     def _reply_nack(self, sequencenbr, status):
+        if self.window is not None:
+            # Peer advertise its window, resend when the window opens instead of backing off
+            if self.port.queue.com_cancel(self.peer_id, sequencenbr) == COMMIT_RESPONSE.handled:
+                self.sequencenbrs_acked = [n for n in self.sequencenbrs_acked if n < sequencenbr]
+                self.sequencenbr_next = sequencenbr
+            return
         # Make send only send one token at a time and have increasing time between them
         curr_time = time.time()
         if self.bulk:
@@ -192,11 +316,9 @@ class TunnelOutEndpoint(Endpoint):
 
     def _send_one_token(self):
         sequencenbr_sent, token = self.port.queue.com_peek(self.peer_id)
-        _log.debug("Send on port  %s/%s/%s [%i] %s" % (self.port.owner.name,
-                                                       self.peer_id,
-                                                       self.port.name,
-                                                       sequencenbr_sent,
-                                                       "" if self.bulk else "@%f/%f" % (self.time_cont, self.backoff)))
+        self.sequencenbr_next = sequencenbr_sent + 1
+        _log.debug("Send on port  %s/%s/%s [%i] %s", self.port.owner.name, self.peer_id, self.port.name,
+                   sequencenbr_sent, Lazy(lambda: "" if self.bulk else "@%f/%f" % (self.time_cont, self.backoff)))
         self.tunnel.send({
             'cmd': 'TOKEN',
             'token': token.encode(),
@@ -205,13 +327,52 @@ class TunnelOutEndpoint(Endpoint):
             'port_id': self.port.id
         })
 
+    def _send_tokens(self, max_tokens=TOKEN_BATCH_SIZE):
+        """ Send a run of consecutive tokens in one TOKENS message """
+        tokens = []
+        sequencenbr_first = None
+        while len(tokens) < max_tokens and self.port.queue.tokens_available(1, self.peer_id):
+            sequencenbr_sent, token = self.port.queue.com_peek(self.peer_id)
+            if sequencenbr_first is None:
+                sequencenbr_first = sequencenbr_sent
+            tokens.append(token.encode())
+        self.sequencenbr_next = sequencenbr_first + len(tokens)
+        _log.debug("Send on port  %s/%s/%s [%i-%i]", self.port.owner.name, self.peer_id, self.port.name,
+                   sequencenbr_first, sequencenbr_first + len(tokens) - 1)
+        self.tunnel.send({
+            'cmd': 'TOKENS',
+            'tokens': tokens,
+            'peer_port_id': self.peer_id,
+            'sequencenbr': sequencenbr_first,
+            'port_id': self.port.id
+        })
+
     def use_monitor(self):
         return True
 
+    def pending(self):
+        # Tokens not yet sent, e.g. while backing off or waiting for the window to open
+        return self.port.queue.tokens_available(1, self.peer_id)
+
     def communicate(self, *args, **kwargs):
         # FIXME uses internal queue attributes
         sent = False
-        if self.bulk:
+        if self.window is not None:
+            # Send what fits in the window advertised by the peer
+            batch = TOKENS_CAPABILITY in self.tunnel.peer_capabilities
+            while (self.port.queue.tokens_available(1, self.peer_id) and
+                   self.sequencenbr_next < self.window):
+                sent = True
+                if batch:
+                    self._send_tokens(min(TOKEN_BATCH_SIZE, self.window - self.sequencenbr_next))
+                else:
+                    self._send_one_token()
+        elif self.bulk and TOKENS_CAPABILITY in self.tunnel.peer_capabilities:
+            # Send all we have in batches, since other side seems to keep up
+            while self.port.queue.tokens_available(1, self.peer_id):
+                sent = True
+                self._send_tokens()
+        elif self.bulk:
             # Send all we have, since other side seems to keep up
             while self.port.queue.tokens_available(1, self.peer_id):
                 sent = True
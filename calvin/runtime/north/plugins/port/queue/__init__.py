@@ -24,11 +24,19 @@ _MODULES = {'fanout_fifo': 'FanoutFIFO',
             'fanout_round_robin_fifo': "FanoutRoundRobinFIFO",
             'fanout_random_fifo': "FanoutRandomFIFO",
             'fanout_balanced_fifo': "FanoutBalancedFIFO",
-            'fanout_mapped_fifo': 'FanoutMappedFIFO'}
+            'fanout_mapped_fifo': 'FanoutMappedFIFO',
+            'ring_fifo': 'RingFIFO',
+            'spill_fifo': 'SpillFIFO'}
 
 from calvin.utilities.calvinlogger import get_logger
+from calvin.utilities import calvinconfig
 
 _log = get_logger(__name__)
+_conf = calvinconfig.get()
+
+# Implementation used for the default all tokens to all peers routing,
+# ring_fifo is a drop-in replacement of fanout_fifo for wide fanouts
+_FANOUT_QUEUE = _conf.get(None, "fanout_queue") or "fanout_fifo"
 
 
 for module in _MODULES.keys():
@@ -62,7 +70,12 @@ def get(port, peer_port=None, peer_port_meta=None):
         elif routing_prop == 'collect-any-tagged':
             selected_queue = "collect_any"
         else:
-            selected_queue = "fanout_fifo"
+            selected_queue = _FANOUT_QUEUE
+            queue_type = port.properties.get('queue_type', 'fifo')
+            if isinstance(queue_type, (tuple, list)):
+                queue_type = queue_type[0]
+            if queue_type == 'spill_fifo':
+                selected_queue = 'spill_fifo'
     try:
         class_ = getattr(globals()[selected_queue], _MODULES[selected_queue])
         peer_port_properties = {}
@@ -16,6 +16,7 @@
 
 from calvin.runtime.north.calvin_token import Token
 from calvin.runtime.north.plugins.port.queue.common import QueueFull, COMMIT_RESPONSE
+from calvin.runtime.north.plugins.port.queue.common import fifo_state, fifo_from_state
 from calvin.runtime.north.plugins.port import DISCONNECT
 from calvin.utilities import calvinlogger
 
@@ -61,7 +62,9 @@ class CollectBase(object):
         if remap is None:
             state = {
                 'queuetype': self._type,
-                'fifo': {p: [t.encode() for t in tokens] for p, tokens in self.fifo.items()},
+                'fifo': {p: fifo_state(tokens, min(self.read_pos.get(p, 0), self.tentative_read_pos.get(p, 0)),
+                                       self.write_pos.get(p, 0))
+                         for p, tokens in self.fifo.items()},
                 'N': self.N,
                 'writers': self.writers,
                 'write_pos': self.write_pos,
@@ -73,7 +76,7 @@ class CollectBase(object):
         else:
             state = {
                 'queuetype': self._type,
-                'fifo': {remap[p] if p in remap else p: [Token(0).encode() for t in tokens] for p, tokens in self.fifo.items()},
+                'fifo': {remap[p] if p in remap else p: fifo_state(tokens, 0, 0) for p, tokens in self.fifo.items()},
                 'N': self.N,
                 'writers': sorted([remap[pid] if pid in remap else pid for pid in self.writers]),
                 'write_pos': {remap[pid] if pid in remap else pid: 0 for pid in self.write_pos.keys()},
@@ -87,8 +90,8 @@ class CollectBase(object):
 
     def _set_state(self, state):
         self._type = state.get('queuetype')
-        self.fifo = {p: [Token.decode(t) for t in tokens] for p, tokens in state['fifo'].items()}
         self.N = state['N']
+        self.fifo = {p: fifo_from_state(tokens, self.N) for p, tokens in state['fifo'].items()}
         self.writers = state['writers']
         self.write_pos = state['write_pos']
         self.read_pos = state['read_pos']
@@ -111,7 +114,7 @@ class CollectBase(object):
             self.writers.append(writer)
             self.writers.sort()
         if len(self.writers) > self.nbr_peers:
-            _log.debug("ADD_WRITER %s" % writer)
+            _log.debug("ADD_WRITER %s", writer)
             self.nbr_peers = len(self.writers)
 
         if self.tags.get(writer, None) is None:
@@ -120,7 +123,7 @@ class CollectBase(object):
     def remove_writer(self, writer):
         if not isinstance(writer, basestring):
             raise Exception('Not a string: %s' % writer)
-        _log.debug("remove_writer %s %s" % (self.reader if hasattr(self, 'reader') else "--", writer))
+        _log.debug("remove_writer %s %s", self.reader if hasattr(self, 'reader') else "--", writer)
         del self.read_pos[writer]
         del self.tentative_read_pos[writer]
         del self.write_pos[writer]
@@ -161,7 +164,7 @@ class CollectBase(object):
     def exhaust(self, peer_id, terminate):
         # We can't do anything until we consumed the last token
         self.termination[peer_id] = (terminate, False)
-        _log.debug("exhaust %s %s %s" % (self._type, peer_id, DISCONNECT.reverse_mapping[terminate]))
+        _log.debug("exhaust %s %s %s", self._type, peer_id, DISCONNECT.reverse_mapping[terminate])
         return []
 
     def any_outstanding_exhaustion_tokens(self):
@@ -170,9 +173,9 @@ class CollectBase(object):
         return any([not t[1] for t in self.termination.values()])
 
     def set_exhausted_tokens(self, tokens):
-        _log.debug("set_exhausted_tokens %s %s new:%s existing:%s writers:%s" % (
-            self.reader if hasattr(self, 'reader') else "--", self._type, tokens, 
-            self.exhausted_tokens, self.writers))
+        _log.debug("set_exhausted_tokens %s %s new:%s existing:%s writers:%s",
+            self.reader if hasattr(self, 'reader') else "--", self._type, tokens,
+            self.exhausted_tokens, self.writers)
         # Extend lists of current exhaust tokens, not replace (with likely empty list).
         # This is useful when a disconnect happens from both directions or other reasons
         self.exhausted_tokens.update({k: self.exhausted_tokens.get(k, []) + v   for k, v in tokens.items()})
@@ -187,7 +190,7 @@ class CollectBase(object):
             if self._transfer_exhaust_tokens(peer_id, exhausted_tokens):
                 remove.append(peer_id)
         for peer_id in remove:
-            _log.debug("set_exhausted_tokens remove %s %s" % (peer_id, self.exhausted_tokens[peer_id]))
+            _log.debug("set_exhausted_tokens remove %s %s", peer_id, self.exhausted_tokens[peer_id])
             del self.exhausted_tokens[peer_id]
         # Remove any terminated queues if empty
         for peer_id in tokens.keys():
@@ -209,8 +212,8 @@ class CollectBase(object):
             if not self.slots_available(1, peer_id):
                 break
             r = self.com_write(token, peer_id, pos)
-            _log.debug("write exhausted tokens on %s, %s: (%d, %s) %s" % (
-                peer_id, self.reader if hasattr(self, 'reader') else "--", pos, str(token), COMMIT_RESPONSE.reverse_mapping[r]))
+            _log.debug("write exhausted tokens on %s, %s: (%d, %s) %s",
+                peer_id, self.reader if hasattr(self, 'reader') else "--", pos, token, COMMIT_RESPONSE.reverse_mapping[r])
             # This is a token that now is in the queue, was in the queue or is invalid, for all cases remove it
             exhausted_tokens.pop(0)
         return not bool(exhausted_tokens)
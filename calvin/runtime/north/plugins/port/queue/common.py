@@ -15,9 +15,41 @@
 # limitations under the License.
 
 from calvin.utilities.utils import enum
+from calvin.runtime.north.calvin_token import Token
 
 COMMIT_RESPONSE = enum('handled', 'unhandled', 'invalid')
 
+
+def fifo_state(fifo, first, last):
+    """
+    Serialize the tokens at positions first ... last - 1 of a ring buffer fifo.
+    The other slots only hold consumed tokens or placeholders and are left out.
+    """
+    N = len(fifo)
+    first = max(first, last - N)
+    return {'first': first, 'tokens': [fifo[pos % N].encode() for pos in xrange(first, last)]}
+
+
+def fifo_from_state(state, N):
+    """ Rebuild a ring buffer fifo of length N from fifo_state or a list of all encoded slots """
+    if isinstance(state, list):
+        return [Token.decode(data) for data in state]
+    fifo = [Token(0)] * N
+    first = state['first']
+    for i, data in enumerate(state['tokens']):
+        fifo[(first + i) % N] = Token.decode(data)
+    return fifo
+
+
+def is_fifo_state(state):
+    return isinstance(state, dict) and 'first' in state and 'tokens' in state
+
+
+def fifo_slots(state, N):
+    """ All N encoded slots of a ring buffer fifo from fifo_state, the format older runtimes expect """
+    return [t.encode() for t in fifo_from_state(state, N)]
+
+
 class QueueNone(object):
     def __init__(self):
         super(QueueNone, self).__init__()
@@ -16,6 +16,7 @@
 
 from calvin.runtime.north.calvin_token import Token
 from calvin.runtime.north.plugins.port.queue.common import QueueEmpty, COMMIT_RESPONSE
+from calvin.runtime.north.plugins.port.queue.common import fifo_state, fifo_from_state
 from calvin.runtime.north.plugins.port import DISCONNECT
 from calvin.utilities import calvinlogger
 
@@ -49,7 +50,9 @@ class FanoutBase(object):
         if remap is None:
             state = {
                 'queuetype': self._type,
-                'fifo': {p: [t.encode() for t in tokens] for p, tokens in self.fifo.items()},
+                'fifo': {p: fifo_state(tokens, min(self.read_pos.get(p, 0), self.tentative_read_pos.get(p, 0)),
+                                       self.write_pos.get(p, 0))
+                         for p, tokens in self.fifo.items()},
                 'N': self.N,
                 'readers': self.readers,
                 'write_pos': self.write_pos,
@@ -60,7 +63,7 @@ class FanoutBase(object):
             # Remapping of port ids implies reset of tokens
             state = {
                 'queuetype': self._type,
-                'fifo': {remap[p] if p in remap else p: [Token(0).encode() for t in tokens] for p, tokens in self.fifo.items()},
+                'fifo': {remap[p] if p in remap else p: fifo_state(tokens, 0, 0) for p, tokens in self.fifo.items()},
                 'N': self.N,
                 'readers': sorted([remap[pid] if pid in remap else pid for pid in self.readers]),
                 'write_pos': {remap[pid] if pid in remap else pid: 0 for pid in self.write_pos.keys()},
@@ -71,8 +74,8 @@ class FanoutBase(object):
 
     def _set_state(self, state):
         self._type = state.get('queuetype')
-        self.fifo = {p: [Token.decode(t) for t in tokens] for p, tokens in state['fifo'].items()}
         self.N = state['N']
+        self.fifo = {p: fifo_from_state(tokens, self.N) for p, tokens in state['fifo'].items()}
         self.readers = state['readers']
         self.write_pos = state['write_pos']
         self.read_pos = state['read_pos']
@@ -124,7 +127,7 @@ class FanoutBase(object):
             self.readers.append(reader)
             # self.readers.sort()
         if len(self.readers) > self.nbr_peers:
-            _log.debug("ADD_READER %s" % reader)
+            _log.debug("ADD_READER %s", reader)
             self.nbr_peers = len(self.readers)
     
     def remove_reader(self, reader):
@@ -144,7 +147,7 @@ class FanoutBase(object):
         return self.readers
     
     def set_exhausted_tokens(self, tokens):
-        _log.debug("exhausted_tokens %s %s" % (self._type, tokens))
+        _log.debug("exhausted_tokens %s %s", self._type, tokens)
         if tokens and tokens.values()[0]:
             _log.error("Got exhaust tokens on scheduler_fifo port %s" % str(tokens))
         return self.nbr_peers
@@ -153,7 +156,7 @@ class FanoutBase(object):
         return False
 
     def exhaust(self, peer_id, terminate):
-        _log.debug("exhaust %s %s %s" % (self._type, peer_id, DISCONNECT.reverse_mapping[terminate]))
+        _log.debug("exhaust %s %s %s", self._type, peer_id, DISCONNECT.reverse_mapping[terminate])
         if peer_id not in self.readers:
             # FIXME handle writer
             return []
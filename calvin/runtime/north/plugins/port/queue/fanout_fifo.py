@@ -16,6 +16,7 @@
 
 from calvin.runtime.north.calvin_token import Token
 from calvin.runtime.north.plugins.port.queue.common import QueueFull, QueueEmpty, COMMIT_RESPONSE
+from calvin.runtime.north.plugins.port.queue.common import fifo_state, fifo_from_state
 from calvin.runtime.north.plugins.port import DISCONNECT
 from calvin.utilities import calvinlogger
 
@@ -56,7 +57,7 @@ class FanoutFIFO(object):
         if remap is None:
             state = {
                 'queuetype': self._type,
-                'fifo': [t.encode() for t in self.fifo],
+                'fifo': fifo_state(self.fifo, self._first_pos(), self.write_pos),
                 'N': self.N,
                 'readers': list(self.readers),
                 'write_pos': self.write_pos,
@@ -68,7 +69,7 @@ class FanoutFIFO(object):
             # Remapping of port ids, also implies reset of tokens
             state = {
                 'queuetype': self._type,
-                'fifo': [Token(0).encode()] * len(self.fifo),
+                'fifo': fifo_state(self.fifo, 0, 0),
                 'N': self.N,
                 'readers': [remap[pid] if pid in remap else pid for pid in self.readers],
                 'write_pos': 0,
@@ -80,14 +81,18 @@ class FanoutFIFO(object):
 
     def _set_state(self, state):
         self._type = state.get('queuetype',"fanout_fifo")
-        self.fifo = [Token.decode(d) for d in state['fifo']]
         self.N = state['N']
+        self.fifo = fifo_from_state(state['fifo'], self.N)
         self.readers = set(state['readers'])
         self.write_pos = state['write_pos']
         self.read_pos = state['read_pos']
         self.tentative_read_pos = state['tentative_read_pos']
         self.reader_offset = state.get('reader_offset', {pid: 0 for pid in self.readers})
 
+    def _first_pos(self):
+        # Oldest position any reader may still read
+        return min(self.read_pos.values() + self.tentative_read_pos.values() + [self.write_pos])
+
     @property
     def queue_type(self):
         return self._type
@@ -134,28 +139,31 @@ class FanoutFIFO(object):
 
     def exhaust(self, peer_id, terminate):
         self.termination[peer_id] = (terminate, False)
-        _log.debug("exhaust %s %s %s" % (self._type, peer_id, DISCONNECT.reverse_mapping[terminate]))
+        _log.debug("exhaust %s %s %s", self._type, peer_id, DISCONNECT.reverse_mapping[terminate])
         if peer_id not in self.readers:
             return []
         if terminate in [DISCONNECT.EXHAUST_PEER_SEND, DISCONNECT.EXHAUST_OUTPORT]:
             # Retrive remaining tokens to be returned
             tokens = []
             for read_pos in range(self.read_pos[peer_id], self.write_pos):
-                tokens.append([read_pos, self.fifo[read_pos % self.N]])
+                tokens.append([read_pos, self._token(read_pos)])
             # Remove the peer, so no more waiting for this peer to read
             self.remove_reader(peer_id)
-            _log.debug("Send exhaust tokens %s" % tokens)
+            _log.debug("Send exhaust tokens %s", tokens)
             del self.termination[peer_id]
             return tokens
         return []
 
+    def _token(self, pos):
+        return self.fifo[pos % self.N]
+
     def any_outstanding_exhaustion_tokens(self):
         # Between having asked actor to exhaust and receiving exhaustion tokens we don't want to assume that
         # the exhaustion is done.
         return any([not t[1] for t in self.termination.values()])
 
     def set_exhausted_tokens(self, tokens):
-        _log.debug("set_exhausted_tokens %s %s %s" % (self._type, tokens, {k:DISCONNECT.reverse_mapping[v[0]] for k, v in self.termination.items()}))
+        _log.debug("set_exhausted_tokens %s %s %s", self._type, tokens, calvinlogger.Lazy(lambda: {k:DISCONNECT.reverse_mapping[v[0]] for k, v in self.termination.items()}))
         self.exhausted_tokens.update(tokens)
         for peer_id in tokens.keys():
             try:
@@ -189,8 +197,8 @@ class FanoutFIFO(object):
             if not self.slots_available(1, peer_id):
                 break
             r = self.com_write(token, peer_id, pos)
-            _log.debug("exhausted_tokens on %s: (%d, %s) %s" % (
-                peer_id, pos, str(token), COMMIT_RESPONSE.reverse_mapping[r]))
+            _log.debug("exhausted_tokens on %s: (%d, %s) %s",
+                peer_id, pos, token, COMMIT_RESPONSE.reverse_mapping[r])
             # This is a token that now is in the queue, was in the queue or is invalid, for all cases remove it
             exhausted_tokens.pop(0)
         return not bool(exhausted_tokens)
@@ -248,7 +256,7 @@ class FanoutFIFO(object):
         # If fully consumed remove queue
         terminated = False
         if self.termination:
-            _log.debug("COMMIT %s %s" % (metadata, {k:DISCONNECT.reverse_mapping[v[0]] for k, v in self.termination.items()}))
+            _log.debug("COMMIT %s %s", metadata, calvinlogger.Lazy(lambda: {k:DISCONNECT.reverse_mapping[v[0]] for k, v in self.termination.items()}))
         if (self.termination.get(metadata, (-1,))[0] in [DISCONNECT.EXHAUST_PEER_RECV, DISCONNECT.EXHAUST_INPORT] and
             min(self.read_pos.values() or [0]) == self.write_pos and
             self.termination.get(metadata, (-1, False))[1]):
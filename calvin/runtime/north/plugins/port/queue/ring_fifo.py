@@ -0,0 +1,404 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from array import array
+
+from calvin.runtime.north.calvin_token import Token
+from calvin.runtime.north.plugins.port.queue.common import QueueFull, QueueEmpty, COMMIT_RESPONSE
+from calvin.runtime.north.plugins.port.queue.common import fifo_state, fifo_from_state
+from calvin.runtime.north.plugins.port import DISCONNECT
+from calvin.utilities import calvinlogger
+
+_log = calvinlogger.get_logger(__name__)
+
+
+class RingFIFO(object):
+
+    """
+    Default FIFO, all tokens to all peers, kept in a fixed ring.
+
+    Same behaviour and state format as FanoutFIFO, but the per reader
+    positions live in arrays indexed by a reader slot and the lowest
+    committed read position is tracked instead of recomputed, which
+    keeps wide fanouts and long queues cheap.
+    """
+
+    __slots__ = ('fifo', 'N', 'direction', 'nbr_peers', 'readers', 'write_pos', 'writer',
+                 'exhausted_tokens', 'termination', '_type', '_ids', '_slot',
+                 '_read', '_tentative', '_offset', '_min_read', '_min_count')
+
+    def __init__(self, port_properties, peer_port_properties):
+        super(RingFIFO, self).__init__()
+        # Set default queue length to 4 if not specified
+        length = port_properties.get('queue_length', 4)
+        # Compensate length for FIFO having an unused slot
+        length += 1
+        self.fifo = [Token(0)] * length
+        self.N = length
+        self.direction = port_properties.get('direction', None)
+        self.nbr_peers = port_properties.get('nbr_peers', 1)
+        self.readers = set()
+        # NOTE: For simplicity, modulo operation is only used in fifo access,
+        #       all read and write positions are monotonousy increasing
+        self.write_pos = 0
+        # Reader slots, _ids[slot] is the reader id and _slot[id] its slot
+        self._ids = []
+        self._slot = {}
+        self._read = array('l')
+        self._tentative = array('l')
+        self._offset = array('l')
+        # Lowest committed read position and number of readers at it
+        self._min_read = 0
+        self._min_count = 0
+        # Same wire type as FanoutFIFO, the state is interchangeable
+        self._type = "fanout_fifo"
+        self.writer = None  # Not part of state, assumed not needed in migrated information
+        self.exhausted_tokens = {}
+        self.termination = {}
+
+    def __str__(self):
+        return "Tokens: %s, w:%i, r:%s, tr:%s" % (self.fifo, self.write_pos, self.read_pos, self.tentative_read_pos)
+
+    @property
+    def read_pos(self):
+        return dict(zip(self._ids, self._read))
+
+    @property
+    def tentative_read_pos(self):
+        return dict(zip(self._ids, self._tentative))
+
+    @property
+    def reader_offset(self):
+        return dict(zip(self._ids, self._offset))
+
+    def _state(self, remap=None):
+        if remap is None:
+            state = {
+                'queuetype': self._type,
+                'fifo': fifo_state(self.fifo, min(self._read.tolist() + self._tentative.tolist() + [self.write_pos]),
+                                   self.write_pos),
+                'N': self.N,
+                'readers': list(self.readers),
+                'write_pos': self.write_pos,
+                'read_pos': self.read_pos,
+                'tentative_read_pos': self.tentative_read_pos,
+                'reader_offset': self.reader_offset
+            }
+        else:
+            # Remapping of port ids, also implies reset of tokens
+            remapped = {pid: remap[pid] if pid in remap else pid for pid in self._ids}
+            state = {
+                'queuetype': self._type,
+                'fifo': fifo_state(self.fifo, 0, 0),
+                'N': self.N,
+                'readers': remapped.values(),
+                'write_pos': 0,
+                'read_pos': {pid: 0 for pid in remapped.values()},
+                'tentative_read_pos': {pid: 0 for pid in remapped.values()},
+                'reader_offset': {pid: 0 for pid in remapped.values()}
+            }
+        return state
+
+    def _set_state(self, state):
+        self._type = state.get('queuetype', "fanout_fifo")
+        self.N = state['N']
+        self.fifo = fifo_from_state(state['fifo'], self.N)
+        self.write_pos = state['write_pos']
+        read_pos = state['read_pos']
+        tentative_read_pos = state['tentative_read_pos']
+        reader_offset = state.get('reader_offset', {})
+        self.readers = set()
+        self._ids = []
+        self._slot = {}
+        self._read = array('l')
+        self._tentative = array('l')
+        self._offset = array('l')
+        for reader in state['readers']:
+            self._add_slot(reader, read_pos.get(reader, 0), tentative_read_pos.get(reader, 0),
+                           reader_offset.get(reader, 0))
+        self._update_min()
+
+    @property
+    def queue_type(self):
+        return self._type
+
+    def _add_slot(self, reader, read_pos, tentative_read_pos, offset):
+        self._slot[reader] = len(self._ids)
+        self._ids.append(reader)
+        self._read.append(read_pos)
+        self._tentative.append(tentative_read_pos)
+        self._offset.append(offset)
+        self.readers.add(reader)
+
+    def _remove_slot(self, reader):
+        # Move the last slot into the freed one to keep the arrays dense
+        slot = self._slot.pop(reader)
+        last = len(self._ids) - 1
+        if slot != last:
+            moved = self._ids[last]
+            self._ids[slot] = moved
+            self._slot[moved] = slot
+            self._read[slot] = self._read[last]
+            self._tentative[slot] = self._tentative[last]
+            self._offset[slot] = self._offset[last]
+        self._ids.pop()
+        self._read.pop()
+        self._tentative.pop()
+        self._offset.pop()
+        self.readers.discard(reader)
+
+    def _update_min(self):
+        if self._read:
+            self._min_read = min(self._read)
+            self._min_count = self._read.count(self._min_read)
+        else:
+            self._min_read = 0
+            self._min_count = 0
+
+    def _set_read_pos(self, slot, pos):
+        old = self._read[slot]
+        if pos == old:
+            return
+        self._read[slot] = pos
+        if pos < self._min_read:
+            self._update_min()
+        elif old == self._min_read:
+            # Only rescan when the last reader leaves the lowest position
+            self._min_count -= 1
+            if not self._min_count:
+                self._update_min()
+
+    def add_writer(self, writer, properties):
+        self.writer = writer
+
+    def remove_writer(self, writer):
+        pass
+
+    def add_reader(self, reader, properties):
+        if not isinstance(reader, basestring):
+            raise Exception('Not a string: %s' % reader)
+        if reader in self.readers:
+            return
+        if len(self.readers) + 1 > self.nbr_peers:
+            self.nbr_peers = len(self.readers) + 1
+            # Replicated actor connect for first time, start from oldest possible
+            oldest = self._min_read
+            self._add_slot(reader, oldest, oldest, oldest)
+        else:
+            self._add_slot(reader, 0, 0, 0)
+        self._update_min()
+
+    def remove_reader(self, reader):
+        if reader not in self.readers:
+            return
+        self._remove_slot(reader)
+        self._update_min()
+        self.nbr_peers -= 1
+
+    def is_exhausting(self, peer_id=None):
+        if peer_id is None:
+            return bool(self.termination)
+        else:
+            return peer_id in self.termination
+
+    def exhaust(self, peer_id, terminate):
+        self.termination[peer_id] = (terminate, False)
+        _log.debug("exhaust %s %s %s", self._type, peer_id, DISCONNECT.reverse_mapping[terminate])
+        if peer_id not in self.readers:
+            return []
+        if terminate in [DISCONNECT.EXHAUST_PEER_SEND, DISCONNECT.EXHAUST_OUTPORT]:
+            # Retrive remaining tokens to be returned
+            N = self.N
+            fifo = self.fifo
+            tokens = [[pos, fifo[pos % N]] for pos in xrange(self._read[self._slot[peer_id]], self.write_pos)]
+            # Remove the peer, so no more waiting for this peer to read
+            self.remove_reader(peer_id)
+            _log.debug("Send exhaust tokens %s", tokens)
+            del self.termination[peer_id]
+            return tokens
+        return []
+
+    def any_outstanding_exhaustion_tokens(self):
+        # Between having asked actor to exhaust and receiving exhaustion tokens we don't want to assume that
+        # the exhaustion is done.
+        return any([not t[1] for t in self.termination.values()])
+
+    def set_exhausted_tokens(self, tokens):
+        _log.debug("set_exhausted_tokens %s %s %s", self._type, tokens, calvinlogger.Lazy(lambda: {k:DISCONNECT.reverse_mapping[v[0]] for k, v in self.termination.items()}))
+        self.exhausted_tokens.update(tokens)
+        for peer_id in tokens.keys():
+            try:
+                # We can get set_exhaust_token even after done with the termination, since it is a confirmation
+                # from peer port it has handled the exhaustion also
+                self.termination[peer_id] = (self.termination[peer_id][0], True)
+            except:
+                pass
+        self._transfer_all_exhaust_tokens()
+        # If fully consumed remove peer_ids in tokens
+        for peer_id in tokens.keys():
+            if (self.termination.get(peer_id, (-1,))[0] in [DISCONNECT.EXHAUST_PEER_RECV, DISCONNECT.EXHAUST_INPORT] and
+                self._min_read == self.write_pos):
+                del self.termination[peer_id]
+                # Acting as inport then only one reader, remove it if still around
+                try:
+                    reader = next(iter(self.readers))
+                    self.remove_reader(reader)
+                except:
+                    _log.exception("Tried to remove reader on fanout fifo")
+        return self.nbr_peers
+
+    def _transfer_all_exhaust_tokens(self):
+        if not self.exhausted_tokens:
+            return
+        remove = []
+        for peer_id, exhausted_tokens in self.exhausted_tokens.items():
+            if self._transfer_exhaust_tokens(peer_id, exhausted_tokens):
+                # Emptied
+                remove.append(peer_id)
+        for peer_id in remove:
+            del self.exhausted_tokens[peer_id]
+
+    def _transfer_exhaust_tokens(self, peer_id, exhausted_tokens):
+        # exhausted tokens are in sequence order, but could contain tokens already in queue
+        for pos, token in exhausted_tokens[:]:
+            if not self.slots_available(1, peer_id):
+                break
+            r = self.com_write(token, peer_id, pos)
+            _log.debug("exhausted_tokens on %s: (%d, %s) %s",
+                peer_id, pos, token, COMMIT_RESPONSE.reverse_mapping[r])
+            # This is a token that now is in the queue, was in the queue or is invalid, for all cases remove it
+            exhausted_tokens.pop(0)
+        return not bool(exhausted_tokens)
+
+    def get_peers(self):
+        if self.direction == "out":
+            return self.readers
+        elif self.direction == "in" and self.writer is not None:
+            return set([self.writer])
+        else:
+            return None
+
+    def write(self, data, metadata):
+        write_pos = self.write_pos
+        if (self.N - ((write_pos - self._min_read) % self.N) - 1) < 1:
+            raise QueueFull()
+        self.fifo[write_pos % self.N] = data
+        self.write_pos = write_pos + 1
+        return True
+
+    def slots_available(self, length, metadata):
+        return (self.N - ((self.write_pos - self._min_read) % self.N) - 1) >= length
+
+    def tokens_available(self, length, metadata):
+        if not self.readers:
+            return False
+        slot = self._slot.get(metadata)
+        if slot is None:
+            raise Exception("No reader %s in %s" % (metadata, self.readers))
+        return (self.write_pos - self._tentative[slot]) >= length
+
+    #
+    # Reading is done tentatively until committed
+    #
+    def peek(self, metadata):
+        slot = self._slot.get(metadata)
+        if slot is None:
+            raise Exception("Unknown reader: '%s'" % metadata)
+        read_pos = self._tentative[slot]
+        if read_pos >= self.write_pos:
+            raise QueueEmpty(reader=metadata)
+        self._tentative[slot] = read_pos + 1
+        return self.fifo[read_pos % self.N]
+
+    def commit(self, metadata):
+        slot = self._slot[metadata]
+        self._set_read_pos(slot, self._tentative[slot])
+        self._transfer_all_exhaust_tokens()
+        # If fully consumed remove queue
+        if not self.termination:
+            return False
+        _log.debug("COMMIT %s %s", metadata, calvinlogger.Lazy(lambda: {k:DISCONNECT.reverse_mapping[v[0]] for k, v in self.termination.items()}))
+        terminated = False
+        if (self.termination.get(metadata, (-1,))[0] in [DISCONNECT.EXHAUST_PEER_RECV, DISCONNECT.EXHAUST_INPORT] and
+            self._min_read == self.write_pos and
+            self.termination.get(metadata, (-1, False))[1]):
+            del self.termination[metadata]
+            terminated = True
+            # Acting as inport then only one reader, remove it if still around
+            try:
+                reader = next(iter(self.readers))
+                self.remove_reader(reader)
+            except:
+                _log.exception("Tried to remove reader on fanout fifo")
+        return terminated
+
+    def cancel(self, metadata):
+        slot = self._slot[metadata]
+        self._tentative[slot] = self._read[slot]
+
+    #
+    # Queue operations used by communication which utilize a sequence number
+    #
+
+    def com_write(self, data, metadata, sequence_nbr):
+        if sequence_nbr == self.write_pos:
+            self.write(data, metadata)
+            return COMMIT_RESPONSE.handled
+        elif sequence_nbr < self.write_pos:
+            return COMMIT_RESPONSE.unhandled
+        else:
+            return COMMIT_RESPONSE.invalid
+
+    def com_peek(self, metadata):
+        slot = self._slot[metadata]
+        return (self._tentative[slot] - self._offset[slot], self.peek(metadata))
+
+    def com_commit(self, reader, sequence_nbr):
+        """ Will commit one token when the sequence_nbr matches
+            return COMMIT_RESPONSE for action on token sequence_nbr.
+            Only act on sequence nbrs at end of queue.
+            reader: peer_id
+            sequence_nbr: token sequence_nbr
+        """
+        slot = self._slot[reader]
+        sequence_nbr += self._offset[slot]
+        if sequence_nbr >= self._tentative[slot]:
+            return COMMIT_RESPONSE.invalid
+        read_pos = self._read[slot]
+        if read_pos < self._tentative[slot]:
+            if sequence_nbr == read_pos:
+                self._set_read_pos(slot, read_pos + 1)
+                return COMMIT_RESPONSE.handled
+            else:
+                return COMMIT_RESPONSE.unhandled
+
+    def com_cancel(self, reader, sequence_nbr):
+        """ Will cancel tokens from the sequence_nbr to end
+            return COMMIT_RESPONSE for action on tokens.
+            reader: peer_id
+            sequence_nbr: token sequence_nbr
+        """
+        slot = self._slot[reader]
+        sequence_nbr += self._offset[slot]
+        if sequence_nbr < self._read[slot] or sequence_nbr > self._tentative[slot]:
+            return COMMIT_RESPONSE.invalid
+        self._tentative[slot] = sequence_nbr
+        return COMMIT_RESPONSE.handled
+
+    def com_is_committed(self, reader):
+        slot = self._slot[reader]
+        return self._tentative[slot] == self._read[slot]
@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import mmap
+import tempfile
+from collections import deque
+
+from calvin.runtime.north.calvin_token import Token, encode_compact
+from calvin.runtime.north.plugins.port.queue.common import QueueFull, QueueEmpty, COMMIT_RESPONSE
+from calvin.runtime.north.plugins.port.queue.fanout_fifo import FanoutFIFO
+from calvin.utilities import calvinconfig
+from calvin.utilities import calvinlogger
+
+_log = calvinlogger.get_logger(__name__)
+_conf = calvinconfig.get()
+
+# Number of tokens kept in memory, the rest of the queue is spilled to disk
+SPILL_WINDOW = _conf.get(None, "spill_fifo_window") or 16
+# Directory for segment files, None is the system temporary directory
+SPILL_DIR = _conf.get(None, "spill_fifo_dir") or None
+# Bytes consumed at the start of the segment before the remaining tokens are moved to its start
+SPILL_COMPACT = _conf.get(None, "spill_fifo_compact") or 1 << 20
+# Bytes of the segment mapped at a time
+MAP_WINDOW = 1 << 20
+# Queue length when the port does not specify one
+DEFAULT_LENGTH = 1024
+
+
+class SpillFIFO(FanoutFIFO):
+
+    """
+    FIFO, all tokens to all peers, for long queues absorbing bursts.
+
+    The oldest tokens are kept in a small in-memory window, tokens written
+    while the window is full are appended to a memory-mapped segment file
+    and moved back into the window as readers commit. The segment is
+    truncated when it has been drained, and compacted when its consumed
+    start is larger than SPILL_COMPACT and than the tokens still in it.
+    """
+
+    def __init__(self, port_properties, peer_port_properties):
+        # Storage is handled here, don't let the base class preallocate the full length
+        length = port_properties.get('queue_length', DEFAULT_LENGTH)
+        properties = dict(port_properties, queue_length=0)
+        super(SpillFIFO, self).__init__(properties, peer_port_properties)
+        self.fifo = None
+        # Compensate length for FIFO having an unused slot
+        self.N = length + 1
+        self._type = "spill_fifo"
+        self._window = SPILL_WINDOW
+        # Tokens at positions head ... head + len(memory) - 1
+        self._head = 0
+        self._memory = deque()
+        # Segment offsets of the spilled tokens following the memory window,
+        # entries before _first have been moved back or consumed
+        self._offsets = []
+        self._first = 0
+        self._end = 0
+        self._file = None
+        # Window of the segment at _map_start, mapped when reading
+        self._map = None
+        self._map_start = 0
+
+    def __str__(self):
+        return "Tokens: %d (%d spilled), w:%i, r:%s, tr:%s" % (
+            self.write_pos - self._head, self._spilled(), self.write_pos, self.read_pos, self.tentative_read_pos)
+
+    def _state(self, remap=None):
+        if remap is None:
+            state = {
+                'queuetype': self._type,
+                'N': self.N,
+                'readers': list(self.readers),
+                'write_pos': self.write_pos,
+                'read_pos': self.read_pos,
+                'tentative_read_pos': self.tentative_read_pos,
+                'reader_offset': self.reader_offset,
+                'head': self._head,
+                'tokens': [self._token(pos).encode() for pos in xrange(self._head, self.write_pos)]
+            }
+        else:
+            # Remapping of port ids, also implies reset of tokens
+            state = {
+                'queuetype': self._type,
+                'N': self.N,
+                'readers': [remap[pid] if pid in remap else pid for pid in self.readers],
+                'write_pos': 0,
+                'read_pos': {remap[pid] if pid in remap else pid: 0 for pid in self.read_pos},
+                'tentative_read_pos': {remap[pid] if pid in remap else pid: 0 for pid in self.tentative_read_pos},
+                'reader_offset': {remap[pid] if pid in remap else pid: 0 for pid in self.reader_offset},
+                'head': 0,
+                'tokens': []
+            }
+        return state
+
+    def _set_state(self, state):
+        self._type = state.get('queuetype', "spill_fifo")
+        self.N = state['N']
+        self.readers = set(state['readers'])
+        self.read_pos = state['read_pos']
+        self.tentative_read_pos = state['tentative_read_pos']
+        self.reader_offset = state.get('reader_offset', {pid: 0 for pid in self.readers})
+        self._memory = deque()
+        self._reset_segment()
+        self._head = state['head']
+        for data in state['tokens']:
+            self._store(Token.decode(data))
+        self.write_pos = state['write_pos']
+
+    #
+    # Token storage
+    #
+
+    def _spilled(self):
+        return len(self._offsets) - self._first
+
+    def _store(self, data):
+        if len(self._memory) < self._window and not self._spilled():
+            self._memory.append(data)
+            return
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(prefix="calvin-spill-", dir=SPILL_DIR)
+        data = encode_compact(data.encode())
+        self._file.write(data)
+        self._offsets.append(self._end)
+        self._end += len(data)
+
+    def _load(self, index):
+        index += self._first
+        start = self._offsets[index]
+        end = self._offsets[index + 1] if index + 1 < len(self._offsets) else self._end
+        if self._map is None or start < self._map_start or end > self._map_start + len(self._map):
+            # Map the window of the segment from the token on
+            self._file.flush()
+            self._unmap()
+            self._map_start = start - start % mmap.ALLOCATIONGRANULARITY
+            length = min(max(end - self._map_start, MAP_WINDOW), self._end - self._map_start)
+            self._map = mmap.mmap(self._file.fileno(), length, access=mmap.ACCESS_READ, offset=self._map_start)
+        return Token.decode(self._map[start - self._map_start:end - self._map_start])
+
+    def _unmap(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def _compact(self):
+        """ Move the spilled tokens not yet consumed to the start of the segment """
+        base = self._offsets[self._first]
+        self._unmap()
+        self._file.flush()
+        pos = base
+        while pos < self._end:
+            self._file.seek(pos)
+            data = self._file.read(min(MAP_WINDOW, self._end - pos))
+            self._file.seek(pos - base)
+            self._file.write(data)
+            pos += len(data)
+        self._file.truncate(self._end - base)
+        self._file.seek(self._end - base)
+        self._offsets = [offset - base for offset in self._offsets[self._first:]]
+        self._first = 0
+        self._end -= base
+
+    def _reset_segment(self):
+        self._unmap()
+        if self._file is not None:
+            self._file.seek(0)
+            self._file.truncate()
+        self._offsets = []
+        self._first = 0
+        self._end = 0
+
+    def _token(self, pos):
+        index = pos - self._head
+        if index < len(self._memory):
+            return self._memory[index]
+        return self._load(index - len(self._memory))
+
+    def _release(self):
+        """ Drop tokens read by all readers and refill the memory window from the segment """
+        head = min(self.read_pos.values() or [self._head])
+        drop = head - self._head
+        if drop <= 0:
+            return
+        self._head = head
+        in_memory = min(drop, len(self._memory))
+        for _ in xrange(in_memory):
+            self._memory.popleft()
+        # Readers may have consumed tokens directly from the segment
+        self._first += drop - in_memory
+        while len(self._memory) < self._window and self._spilled():
+            self._memory.append(self._load(0))
+            self._first += 1
+        if self._offsets and not self._spilled():
+            self._reset_segment()
+        elif self._spilled():
+            consumed = self._offsets[self._first]
+            if consumed >= SPILL_COMPACT and consumed >= self._end - consumed:
+                self._compact()
+
+    #
+    # Queue operations
+    #
+
+    def remove_reader(self, reader):
+        super(SpillFIFO, self).remove_reader(reader)
+        self._release()
+
+    def write(self, data, metadata):
+        if not self.slots_available(1, metadata):
+            raise QueueFull()
+        self._store(data)
+        self.write_pos += 1
+        return True
+
+    def peek(self, metadata):
+        if metadata not in self.readers:
+            raise Exception("Unknown reader: '%s'" % metadata)
+        if not self.tokens_available(1, metadata):
+            raise QueueEmpty(reader=metadata)
+        read_pos = self.tentative_read_pos[metadata]
+        data = self._token(read_pos)
+        self.tentative_read_pos[metadata] = read_pos + 1
+        return data
+
+    def commit(self, metadata):
+        terminated = super(SpillFIFO, self).commit(metadata)
+        self._release()
+        return terminated
+
+    def com_commit(self, reader, sequence_nbr):
+        r = super(SpillFIFO, self).com_commit(reader, sequence_nbr)
+        if r == COMMIT_RESPONSE.handled:
+            self._release()
+        return r
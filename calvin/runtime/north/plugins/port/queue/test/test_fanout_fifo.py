@@ -174,6 +174,37 @@ class TestFanoutFIFO(unittest.TestCase):
         for i in [1,2,3]:
             self.assertEqual(port.peek("reader-%d" % i).value, "data-%d" % 2)
     
+    def testSerialize_skips_read_slots(self):
+        self.outport.add_reader("reader-1", {})
+        self.outport.add_reader("reader-2", {})
+        for i in [1,2,3,4]:
+                self.outport.write(Token("data-%d" % i), None)
+        # reader-1 has read 2 tokens, reader-2 1 token
+        for reader, n in [("reader-1", 2), ("reader-2", 1)]:
+            for _ in range(n):
+                self.outport.peek(reader)
+            self.outport.commit(reader)
+        state = self.outport._state()
+        # Only tokens some reader has not yet read
+        self.assertEqual(state['fifo']['first'], 1)
+        self.assertEqual([Token.decode(t).value for t in state['fifo']['tokens']], ["data-2", "data-3", "data-4"])
+        port = self.create_port()
+        port._set_state(state)
+        self.assertEqual(port.peek("reader-1").value, "data-3")
+        self.assertEqual(port.peek("reader-2").value, "data-2")
+
+    def testSerialize_all_slots(self):
+        # State with every slot, as sent by older runtimes
+        self.outport.add_reader("reader-1", {})
+        state = self.outport._state()
+        state['fifo'] = [Token("data-%d" % i).encode() for i in range(5)]
+        state['write_pos'] = 3
+        state['read_pos'] = state['tentative_read_pos'] = {"reader-1": 1}
+        port = self.create_port()
+        port._set_state(state)
+        self.assertEqual(port.peek("reader-1").value, "data-1")
+        self.assertEqual(port.peek("reader-1").value, "data-2")
+
     def testSerialize_remap(self):
         self.outport.add_reader("reader-1", {})
         self.outport.add_reader("reader-2", {})
@@ -0,0 +1,74 @@
+import pytest
+
+pytest_unittest = pytest.mark.unittest
+
+from calvin.runtime.north.calvin_token import Token
+from calvin.runtime.north.plugins.port.queue.ring_fifo import RingFIFO
+from calvin.runtime.north.plugins.port.queue.common import QueueFull, COMMIT_RESPONSE
+from calvin.runtime.north.plugins.port.queue.fanout_fifo import FanoutFIFO
+from calvin.runtime.north.plugins.port.queue.test import test_fanout_fifo
+
+
+@pytest_unittest
+class TestRingFIFO(test_fanout_fifo.TestFanoutFIFO):
+
+    def create_port(self):
+        return RingFIFO({'routing': self.routing, "direction": self.direction,
+                         'nbr_peers': self.num_peers}, {})
+
+    def testSlots(self):
+        with self.assertRaises(AttributeError):
+            self.outport.unknown = True
+
+    def testMinReadPos(self):
+        for i in [1, 2, 3]:
+            self.outport.add_reader("reader-%d" % i, {})
+        for i in [1, 2, 3, 4]:
+            self.outport.write("data-%d" % i, None)
+        with self.assertRaises(QueueFull):
+            self.outport.write("data-5", None)
+        for i in [1, 2]:
+            self.outport.peek("reader-%d" % i)
+            self.outport.commit("reader-%d" % i)
+        # reader-3 still holds the first token
+        self.assertFalse(self.outport.slots_available(1, None))
+        self.outport.peek("reader-3")
+        self.outport.commit("reader-3")
+        self.assertTrue(self.outport.slots_available(1, None))
+        # Removing the slowest reader frees its tokens
+        self.outport.peek("reader-1")
+        self.outport.commit("reader-1")
+        self.outport.remove_reader("reader-2")
+        self.outport.remove_reader("reader-3")
+        self.assertTrue(self.outport.slots_available(2, None))
+        self.assertEqual(self.outport.read_pos, {"reader-1": 2})
+
+    def testComCommit(self):
+        self.outport.add_reader("reader-1", {})
+        self.outport.add_reader("reader-2", {})
+        for i in [1, 2]:
+            self.outport.write("data-%d" % i, None)
+        self.assertEqual(self.outport.com_peek("reader-1"), (0, "data-1"))
+        self.assertEqual(self.outport.com_peek("reader-1"), (1, "data-2"))
+        self.assertEqual(self.outport.com_commit("reader-1", 1), COMMIT_RESPONSE.unhandled)
+        self.assertEqual(self.outport.com_commit("reader-1", 0), COMMIT_RESPONSE.handled)
+        self.assertEqual(self.outport.com_cancel("reader-1", 1), COMMIT_RESPONSE.handled)
+        self.assertEqual(self.outport.tentative_read_pos["reader-1"], 1)
+        self.assertFalse(self.outport.com_is_committed("reader-2") and self.outport.tokens_available(3, "reader-2"))
+
+    def testStateCompatible(self):
+        for i in [1, 2, 3]:
+            self.outport.add_reader("reader-%d" % i, {})
+        for i in [1, 2, 3]:
+            self.outport.write(Token("data-%d" % i), None)
+        self.outport.peek("reader-2")
+        self.outport.commit("reader-2")
+        fifo = FanoutFIFO({'routing': self.routing, "direction": self.direction,
+                           'nbr_peers': self.num_peers}, {})
+        fifo._set_state(self.outport._state())
+        self.assertEqual(fifo.read_pos, self.outport.read_pos)
+        port = self.create_port()
+        port._set_state(fifo._state())
+        self.assertEqual(port._state(), self.outport._state())
+        self.assertEqual(port.peek("reader-2").value, "data-2")
+        self.assertFalse(port.slots_available(2, None))
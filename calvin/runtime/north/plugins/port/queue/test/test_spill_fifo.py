@@ -0,0 +1,156 @@
+import pytest
+from mock import patch
+
+pytest_unittest = pytest.mark.unittest
+
+from calvin.runtime.north.calvin_token import Token
+from calvin.runtime.north.plugins.port import queue
+from calvin.runtime.north.plugins.port.queue import spill_fifo
+from calvin.runtime.north.plugins.port.queue.common import QueueFull, COMMIT_RESPONSE
+from calvin.runtime.north.plugins.port.queue.test import test_fanout_fifo
+
+
+class DummyPort(object):
+    pass
+
+
+@pytest_unittest
+class TestSpillFIFO(test_fanout_fifo.TestFanoutFIFO):
+
+    queue_type = "spill_fifo"
+    queue_length = 4
+
+    def create_port(self):
+        port = DummyPort()
+        port.properties = {'routing': self.routing, "direction": self.direction,
+                           'nbr_peers': self.num_peers, 'queue_type': 'spill_fifo',
+                           'queue_length': self.queue_length}
+        return queue.get(port)
+
+    def create_spilling_port(self, length=10):
+        self.queue_length = length
+        port = self.create_port()
+        port._window = 2
+        for i in [1, 2, 3]:
+            port.add_reader("reader-%d" % i, {})
+        for i in range(length):
+            port.write(Token(i), None)
+        return port
+
+    def testSerialize_skips_read_slots(self):
+        self.outport.add_reader("reader-1", {})
+        self.outport.add_reader("reader-2", {})
+        for i in [1,2,3,4]:
+                self.outport.write(Token("data-%d" % i), None)
+        for reader, n in [("reader-1", 2), ("reader-2", 1)]:
+            for _ in range(n):
+                self.outport.peek(reader)
+            self.outport.commit(reader)
+        state = self.outport._state()
+        self.assertEqual(state['head'], 1)
+        self.assertEqual([Token.decode(t).value for t in state['tokens']], ["data-2", "data-3", "data-4"])
+        port = self.create_port()
+        port._set_state(state)
+        self.assertEqual(port.peek("reader-1").value, "data-3")
+        self.assertEqual(port.peek("reader-2").value, "data-2")
+
+    @pytest.mark.skip(reason="spill_fifo state has always held only the unread tokens, there is no old format")
+    def testSerialize_all_slots(self):
+        pass
+
+    def testWrite_Normal(self):
+        self.outport.write("data-1", None)
+        self.outport.write("data-2", None)
+        self.assertEqual(list(self.outport._memory), ["data-1", "data-2"])
+
+    def testWrite_Spill(self):
+        port = self.create_spilling_port()
+        self.assertEqual(len(port._memory), 2)
+        self.assertEqual(port._spilled(), 8)
+        with self.assertRaises(QueueFull):
+            port.write(Token(10), None)
+        self.assertEqual([port.peek("reader-1").value for i in range(10)], range(10))
+        self.assertFalse(port.tokens_available(1, "reader-1"))
+
+    def testCommit_Spill(self):
+        port = self.create_spilling_port()
+        for i in range(5):
+            for r in ["reader-1", "reader-2"]:
+                port.peek(r)
+                port.commit(r)
+        # reader-3 keeps the tokens
+        self.assertEqual(port._spilled(), 8)
+        self.assertFalse(port.slots_available(1, None))
+        for i in range(7):
+            port.peek("reader-3")
+            port.commit("reader-3")
+        # Released tokens read by all, refilled window from the segment
+        self.assertEqual(port._head, 5)
+        self.assertEqual([t.value for t in port._memory], [5, 6])
+        self.assertEqual(port._spilled(), 3)
+        self.assertTrue(port.slots_available(5, None))
+        port.write(Token(10), None)
+        self.assertEqual(port.peek("reader-1").value, 5)
+        self.assertEqual(port.peek("reader-3").value, 7)
+        for r in ["reader-1", "reader-2", "reader-3"]:
+            port.cancel(r)
+            while port.tokens_available(1, r):
+                port.peek(r)
+            port.commit(r)
+        # Drained segment is reset
+        self.assertEqual(port._spilled(), 0)
+        self.assertEqual(port._end, 0)
+        self.assertEqual(len(port._memory), 0)
+
+    def testComCommit_Spill(self):
+        port = self.create_spilling_port()
+        for r in ["reader-1", "reader-2", "reader-3"]:
+            nbr, token = port.com_peek(r)
+            self.assertEqual((nbr, token.value), (0, 0))
+            self.assertEqual(port.com_commit(r, nbr), COMMIT_RESPONSE.handled)
+        self.assertEqual(port._head, 1)
+        self.assertEqual(port._spilled(), 7)
+
+    def testSerialize_Spill(self):
+        port = self.create_spilling_port()
+        for i in range(3):
+            port.peek("reader-1")
+        port.commit("reader-1")
+        port.peek("reader-2")
+        state = port._state()
+        self.assertEqual(len(state['tokens']), 10)
+        restored = self.create_port()
+        restored._window = 2
+        restored._set_state(state)
+        self.assertEqual(restored._spilled(), 8)
+        self.assertEqual(restored.peek("reader-1").value, 3)
+        self.assertEqual(restored.peek("reader-2").value, 1)
+        self.assertFalse(restored.slots_available(1, None))
+
+    @patch.object(spill_fifo, 'MAP_WINDOW', 64)
+    @patch.object(spill_fifo, 'SPILL_COMPACT', 256)
+    def testCompact_Spill(self):
+        port = self.create_spilling_port()
+        # Sustained backlog, the segment never drains
+        for i in range(10, 1000):
+            for r in ["reader-1", "reader-2", "reader-3"]:
+                self.assertEqual(port.peek(r).value, i - 10)
+                port.commit(r)
+            port.write(Token(i), None)
+            self.assertEqual(port._spilled(), 8)
+            self.assertTrue(port._end < 1024)
+        self.assertEqual([port.peek("reader-1").value for i in range(10)], range(990, 1000))
+
+    @patch.object(spill_fifo, 'MAP_WINDOW', 4096)
+    def testMapWindow_Spill(self):
+        self.queue_length = 40
+        port = self.create_port()
+        port._window = 2
+        port.add_reader("reader-1", {})
+        for i in range(40):
+            port.write(Token("%04d" % i * 250), None)
+        self.assertTrue(port._end > 8 * 4096)
+        for i in range(40):
+            self.assertEqual(port.peek("reader-1").value, "%04d" % i * 250)
+            # Only a window of the segment is mapped
+            self.assertTrue(len(port._map or "") <= 2 * 4096 + 1024)
@@ -30,7 +30,7 @@ def req_op(node, requires, actor_id=None, component=None):
     iters = []
     for r in requires:
         _log.analyze(node.id, "+", {'req_cap': r})
-        iters.append(node.storage.get_index_iter(['node', 'capabilities', r]))
+        iters.append(node.storage.get_index_iter(['node', 'capabilities', r], cached=True))
 
     it = dynops.Intersection(*iters)
     it.set_name("actor_reqs_match")
@@ -22,7 +22,7 @@ req_type = "placement"
 def req_op(node, actor_id=None, component=None):
     """ Returns an infinite dynamic iterable """
     index_str = format_index_string(("node_name", {}))
-    it = node.storage.get_index_iter(index_str)
+    it = node.storage.get_index_iter(index_str, cached=True)
     it.set_name("all_match")
     return it
     
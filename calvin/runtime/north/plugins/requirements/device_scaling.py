@@ -15,7 +15,7 @@
 # limitations under the License.
 
 from calvin.utilities.replication_defs import PRE_CHECK
-import random
+from calvin.runtime.north.node_load import select_node
 
 req_type = "replication"
 
@@ -56,7 +56,7 @@ def pre_check(node, **kwargs):
 def initiate(node, actor, **kwargs):
     pass
 
-def select(node, actor, possible_placements, **kwargs):
+def select(node, actor, possible_placements, loads=None, **kwargs):
     if not possible_placements:
         return []
     prefered_placements = possible_placements - set([node.id])
@@ -67,4 +67,4 @@ def select(node, actor, possible_placements, **kwargs):
     else:
         actor._replication_data.limit_count = 10
     # TODO Send out all
-    return [random.choice(list(prefered_placements))]
\ No newline at end of file
+    return [select_node(prefered_placements, loads or {})]
\ No newline at end of file
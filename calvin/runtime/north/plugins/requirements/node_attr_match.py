@@ -26,6 +26,6 @@ def req_op(node, index, actor_id=None, component=None):
         component contains a list of all actor_ids of the component if the actor belongs to a component else None
     """
     index_str = format_index_string(index)
-    it = node.storage.get_index_iter(index_str)
+    it = node.storage.get_index_iter(index_str, cached=True)
     it.set_name("attr_match")
     return it
@@ -15,7 +15,7 @@
 # limitations under the License.
 
 from calvin.utilities.replication_defs import PRE_CHECK
-import random
+from calvin.runtime.north.node_load import select_node
 from calvin.utilities.calvinlogger import get_logger
 
 _log = get_logger(__name__)
@@ -111,12 +111,12 @@ def pre_check(node, **kwargs):
 def initiate(node, actor, **kwargs):
     pass
 
-def select(node, actor, possible_placements, **kwargs):
+def select(node, actor, possible_placements, loads=None, **kwargs):
     if not possible_placements:
         return []
     prefered_placements = possible_placements - set([node.id])
     if not prefered_placements:
         # When require being alone on runtime, we should fail here
         return None
-    # TODO pick a runtime that is lightly loaded
-    return [random.choice(list(prefered_placements))]
\ No newline at end of file
+    # Pick a runtime that is lightly loaded
+    return [select_node(prefered_placements, loads or {})]
\ No newline at end of file
@@ -25,7 +25,7 @@ def req_op(node, port_property, actor_id=None, component=None):
     """
     it = []
     for p in port_property:
-        it.append(node.storage.get_index_iter(['node', 'capabilities', p]))
+        it.append(node.storage.get_index_iter(['node', 'capabilities', p], cached=True))
     if len(it) > 1:
         final = dynops.Union(*it)
     elif len(it) == 1:
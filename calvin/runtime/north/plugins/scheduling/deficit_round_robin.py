@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+
+import policy_base
+
+# Max number of loops worth of credit an actor can collect
+MAX_CREDIT_LOOPS = 8
+
+
+class DeficitRoundRobinPolicy(policy_base.PolicyBase):
+
+    """
+    Deficit round-robin with priorities.
+    Each loop an actor is credited the base time slice multiplied with its priority,
+    the time spent firing is deducted. Actors are fired in order of most credit, hence
+    actors not reached before the scheduler loop was out of time, or actors with high
+    priority, are fired first in the next loop. An actor that had nothing to fire loses
+    its credit.
+    """
+
+    def __init__(self, time_slice):
+        super(DeficitRoundRobinPolicy, self).__init__(time_slice)
+        self._deficit = {}
+
+    def order(self, actors):
+        for actor in actors:
+            quantum = self.base_time_slice * self.weight(actor)
+            deficit = self._deficit.get(actor.id, 0.0) + quantum
+            self._deficit[actor.id] = min(deficit, quantum * MAX_CREDIT_LOOPS)
+        return sorted(actors, key=lambda actor: self._deficit[actor.id], reverse=True)
+
+    def time_slice(self, actor):
+        return max(0.0, self._deficit.get(actor.id, self.base_time_slice))
+
+    def fired(self, actor, did_fire, time_spent):
+        if did_fire:
+            self._deficit[actor.id] = self._deficit.get(actor.id, 0.0) - time_spent
+        else:
+            # Nothing to do, don't save up credit
+            self._deficit.pop(actor.id, None)
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+
+class PolicyBase(object):
+
+    """
+    Base class for scheduling policies.
+    A policy decides in which order runnable actors are fired during a scheduler loop
+    and how long each actor may keep firing (its time slice).
+    time_slice: the base time slice in seconds
+    """
+
+    def __init__(self, time_slice):
+        super(PolicyBase, self).__init__()
+        self.base_time_slice = time_slice
+
+    @staticmethod
+    def weight(actor):
+        """ The scheduling weight of an actor, based on its priority (minimum 1) """
+        return max(1, actor.priority)
+
+    def order(self, actors):
+        """
+            Return the list of actors in the order they should be fired.
+        """
+        raise NotImplementedError("Scheduling policy not implemented.")
+
+    def time_slice(self, actor):
+        """
+            Return the time (in seconds) the actor may keep firing.
+        """
+        return self.base_time_slice
+
+    def fired(self, actor, did_fire, time_spent):
+        """
+            Called after the actor has been fired, for policies that keep accounts.
+        """
+        pass
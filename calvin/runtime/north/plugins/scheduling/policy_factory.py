@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+# Scheduling policies
+
+import random_policy
+import weighted_round_robin
+import deficit_round_robin
+
+
+def get(type_, time_slice):
+    if type_ == "random":
+        return random_policy.RandomPolicy(time_slice)
+    if type_ == "weighted_round_robin":
+        return weighted_round_robin.WeightedRoundRobinPolicy(time_slice)
+    if type_ == "deficit_round_robin":
+        return deficit_round_robin.DeficitRoundRobinPolicy(time_slice)
+
+    raise Exception("Scheduling policy {} is not supported".format(type_))
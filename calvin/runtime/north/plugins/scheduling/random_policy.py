@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+
+import random
+
+import policy_base
+
+
+class RandomPolicy(policy_base.PolicyBase):
+
+    """
+    Fire actors in random order with equal time slices
+    """
+
+    def order(self, actors):
+        # Shuffle order since we stop after executing actors for too long
+        actors = list(actors)
+        random.shuffle(actors)
+        return actors
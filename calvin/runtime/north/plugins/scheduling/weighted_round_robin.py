@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+
+import policy_base
+
+
+class WeightedRoundRobinPolicy(policy_base.PolicyBase):
+
+    """
+    Fire actors in round-robin order, the first actor to fire moves one step each loop.
+    Each actor's time slice is the base time slice multiplied with its priority.
+    """
+
+    def __init__(self, time_slice):
+        super(WeightedRoundRobinPolicy, self).__init__(time_slice)
+        self._round = 0
+
+    def order(self, actors):
+        actors = sorted(actors, key=lambda actor: actor.id)
+        if not actors:
+            return actors
+        start = self._round % len(actors)
+        self._round += 1
+        return actors[start:] + actors[:start]
+
+    def time_slice(self, actor):
+        return self.base_time_slice * self.weight(actor)
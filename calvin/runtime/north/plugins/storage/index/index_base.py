@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import re
+
+
+def split_index(index):
+    r""" List of the levels of an index string, escaped with \/ and \\ for / and \ within levels,
+        a list is returned as is
+    """
+    if isinstance(index, list):
+        return list(index)
+    return re.split(r'(?<![^\\]\\)/', index.lstrip("/"))
+
+
+def index_strings(index, root_prefix_level):
+    """ Index strings for all levels of index, the first root_prefix_level levels form the top level """
+    items = split_index(index)
+    root = "/".join(items[:root_prefix_level])
+    del items[:root_prefix_level]
+    items.insert(0, root)
+    return ['/' + '/'.join(items[:l]) for l in range(1, len(items) + 1)]
+
+
+class IndexBase(object):
+    """
+        Base class for the layouts of the hierarchical index in the registry,
+        see Storage.add_index etc. for the meaning of the arguments.
+        All functions in this class should be async and never block.
+
+        The index given to get and get_iter is a string starting with a slash.
+        Callbacks are called with cb(key=key, value=...) where value is
+        True/False for add, remove and delete and a list of values
+        or None for get.
+    """
+    def __init__(self, storage):
+        super(IndexBase, self).__init__()
+        self.storage = storage
+
+    def add(self, index, value, root_prefix_level, cb=None):
+        raise NotImplementedError()
+
+    def remove(self, index, value, root_prefix_level, cb=None):
+        raise NotImplementedError()
+
+    def delete(self, index, root_prefix_level, cb=None):
+        raise NotImplementedError()
+
+    def get(self, index, cb):
+        raise NotImplementedError()
+
+    def get_iter(self, index, include_key=False):
+        """ Returns a dynops List that is final when all values are appended """
+        raise NotImplementedError()
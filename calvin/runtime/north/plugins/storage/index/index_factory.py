@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from calvin.runtime.north.plugins.storage.index.index_levels import LevelIndex
+from calvin.runtime.north.plugins.storage.index.index_trie import TrieIndex
+from calvin.runtime.north.plugins.storage.index.index_prefix_hash import PrefixHashIndex
+
+
+def get(type_, storage):
+    if type_ == "levels":
+        return LevelIndex(storage)
+    elif type_ == "trie":
+        return TrieIndex(storage)
+    elif type_ == "prefix_hash":
+        return PrefixHashIndex(storage)
+
+    raise Exception("Index {} requested is not supported".format(type_))
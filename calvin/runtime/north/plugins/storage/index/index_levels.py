@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from calvin.runtime.north.plugins.storage.index.index_base import IndexBase, index_strings
+from calvin.utilities.calvin_callback import CalvinCB
+from calvin.utilities import calvinlogger
+
+_log = calvinlogger.get_logger(__name__)
+
+
+class LevelIndex(IndexBase):
+    """
+        Stores the value in a set at each level of the index,
+        hence a lookup is a single get but adding and removing
+        a value costs one registry operation per level.
+    """
+
+    def _index_cb(self, key, value, org_cb, index_items):
+        """
+        Collect all the index levels operations into one callback
+        """
+        _log.debug("index cb key:%s, value:%s, index_items:%s", key, value, index_items)
+        # cb False if not already done it at first False value
+        if not value and index_items:
+            org_cb(key=key, value=False)
+            del index_items[:]
+        if key in index_items:
+            # remove this index level from list
+            index_items.remove(key)
+            # If all done send True
+            if not index_items:
+                org_cb(key=key, value=True)
+
+    def add(self, index, value, root_prefix_level, cb=None):
+        indexes = index_strings(index, root_prefix_level)
+        # make copy of indexes since altered in callbacks
+        for i in indexes[:]:
+            self.storage.append(prefix="index-", key=i, value=[value],
+                                cb=CalvinCB(self._index_cb, org_cb=cb, index_items=indexes) if cb else None)
+
+    def remove(self, index, value, root_prefix_level, cb=None):
+        # TODO Currently we don't go deeper than the specified index for a remove,
+        # e.g. node/affiliation/owner/com.ericsson would remove the value from
+        # all deeper indeces. But no current use case exist either.
+        indexes = index_strings(index, root_prefix_level)
+        # make copy of indexes since altered in callbacks
+        for i in indexes[:]:
+            self.storage.remove(prefix="index-", key=i, value=[value],
+                                cb=CalvinCB(self._index_cb, org_cb=cb, index_items=indexes) if cb else None)
+
+    def delete(self, index, root_prefix_level, cb=None):
+        indexes = index_strings(index, root_prefix_level)
+        # make copy of indexes since altered in callbacks
+        for i in indexes[:]:
+            self.storage.delete(prefix="index-", key=i,
+                                cb=CalvinCB(self._index_cb, org_cb=cb, index_items=indexes) if cb else None)
+
+    def get(self, index, cb):
+        self.storage.get_concat(prefix="index-", key=index, cb=cb)
+
+    def get_iter(self, index, include_key=False):
+        return self.storage.get_concat_iter(prefix="index-", key=index, include_key=include_key)
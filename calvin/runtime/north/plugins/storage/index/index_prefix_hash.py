@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from calvin.runtime.north.plugins.storage.index.index_base import IndexBase, index_strings, split_index
+from calvin.utilities.calvin_callback import CalvinCB
+from calvin.utilities import dynops
+
+# Separates the full index from the value in a bucket entry
+SEPARATOR = "\x00"
+
+
+class PrefixHashIndex(IndexBase):
+    """
+        Prefix hash table layout for a distributed registry. Each value is
+        stored once, as an entry of its full index and the value, in the set
+        of the index's top level (the bucket). Adding or removing a value is
+        a single registry operation. A lookup gets the buckets of the index
+        and of each of its parents and keeps entries at or below the index.
+        Values must be strings.
+    """
+
+    def _entry(self, index, value, root_prefix_level):
+        indexes = index_strings(index, root_prefix_level)
+        return indexes[0], indexes[-1] + SEPARATOR + value
+
+    def add(self, index, value, root_prefix_level, cb=None):
+        bucket, entry = self._entry(index, value, root_prefix_level)
+        self.storage.append(prefix="index_bucket-", key=bucket, value=[entry], cb=cb)
+
+    def remove(self, index, value, root_prefix_level, cb=None):
+        bucket, entry = self._entry(index, value, root_prefix_level)
+        self.storage.remove(prefix="index_bucket-", key=bucket, value=[entry], cb=cb)
+
+    def delete(self, index, root_prefix_level, cb=None):
+        indexes = index_strings(index, root_prefix_level)
+        self.storage.get_concat(prefix="index_bucket-", key=indexes[0],
+                                cb=CalvinCB(self._delete_entries, index=indexes[-1], org_cb=cb))
+
+    def _delete_entries(self, key, value, index, org_cb):
+        entries = [e for e in value or [] if self._match(index, e)]
+        if entries:
+            self.storage.remove(prefix="index_bucket-", key=key, value=entries, cb=org_cb)
+        elif org_cb:
+            org_cb(key=key, value=True)
+
+    def _match(self, index, entry):
+        full_index = entry.partition(SEPARATOR)[0]
+        return full_index == index or full_index.startswith(index + "/")
+
+    def _lookup(self, index, cb):
+        """ Get the buckets that can hold entries at or below index, cb is called with the set of values """
+        levels = split_index(index)
+        buckets = ['/' + '/'.join(levels[:l]) for l in range(1, len(levels) + 1)]
+        lookup = {'index': index, 'pending': len(buckets), 'values': set(), 'cb': cb}
+        for bucket in buckets:
+            self.storage.get_concat(prefix="index_bucket-", key=bucket, cb=CalvinCB(self._lookup_cb, lookup=lookup))
+
+    def _lookup_cb(self, key, value, lookup):
+        for entry in value or []:
+            if self._match(lookup['index'], entry):
+                lookup['values'].add(entry.partition(SEPARATOR)[2])
+        lookup['pending'] -= 1
+        if lookup['pending'] == 0:
+            lookup['cb'](lookup['values'])
+
+    def get(self, index, cb):
+        if not cb:
+            return
+        self._lookup(index, CalvinCB(self._get_cb, index=index, org_cb=cb))
+
+    def _get_cb(self, values, index, org_cb):
+        org_cb(key=index, value=list(values) if values else None)
+
+    def get_iter(self, index, include_key=False):
+        it = dynops.List()
+        self._lookup(index, CalvinCB(self._get_iter_cb, index=index, include_key=include_key, it=it))
+        return it
+
+    def _get_iter_cb(self, values, index, include_key, it):
+        it.extend([(index, v) for v in values] if include_key else list(values))
+        it.final()
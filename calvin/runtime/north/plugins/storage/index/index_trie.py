@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from calvin.runtime.north.plugins.storage.index.index_base import split_index
+from calvin.runtime.north.plugins.storage.index.index_levels import LevelIndex
+from calvin.runtime.south.plugins.async import async
+from calvin.utilities import dynops
+
+
+# Registries only this runtime writes to, unless it serves storage proxy clients
+PRIVATE_STORAGE_TYPES = ("local", "local_dict")
+
+
+class _TrieNode(object):
+    __slots__ = ('children', 'values')
+
+    def __init__(self):
+        self.children = {}
+        self.values = set()
+
+
+class TrieIndex(LevelIndex):
+    """
+        Keeps the index of this node in a local prefix tree, each value is stored once
+        at the node of its full index and a lookup collects the values of the subtree.
+        All changes are also written to the registry with the levels layout. Lookups are
+        answered from the trie only when the registry is private to this runtime (storage
+        type local or local_dict without storage proxy clients), otherwise they go to the
+        registry, which also holds the index entries of the other runtimes.
+    """
+
+    def __init__(self, storage):
+        super(TrieIndex, self).__init__(storage)
+        self.root = _TrieNode()
+
+    def _path(self, levels):
+        # Path of trie nodes from the root, None when not in the trie
+        path = [self.root]
+        for level in levels:
+            node = path[-1].children.get(level)
+            if node is None:
+                return None
+            path.append(node)
+        return path
+
+    def _prune(self, levels, path):
+        # Remove nodes without values and children, bottom up
+        for level, parent, node in reversed(zip(levels, path[:-1], path[1:])):
+            if node.values or node.children:
+                break
+            del parent.children[level]
+
+    def _local(self):
+        # Only this node has written to the index
+        return self.storage.storage_type in PRIVATE_STORAGE_TYPES and not self.storage.tunnel
+
+    def add(self, index, value, root_prefix_level, cb=None):
+        levels = split_index(index)
+        node = self.root
+        for level in levels:
+            node = node.children.setdefault(level, _TrieNode())
+        node.values.add(value)
+        super(TrieIndex, self).add(index, value, root_prefix_level, cb=cb)
+
+    def remove(self, index, value, root_prefix_level, cb=None):
+        levels = split_index(index)
+        path = self._path(levels)
+        if path is not None:
+            path[-1].values.discard(value)
+            self._prune(levels, path)
+        super(TrieIndex, self).remove(index, value, root_prefix_level, cb=cb)
+
+    def delete(self, index, root_prefix_level, cb=None):
+        levels = split_index(index)
+        path = self._path(levels)
+        if path is not None:
+            path[-1].values.clear()
+            path[-1].children.clear()
+            self._prune(levels, path)
+        super(TrieIndex, self).delete(index, root_prefix_level, cb=cb)
+
+    def values(self, index):
+        """ Set of the values stored at index or below it """
+        path = self._path(split_index(index))
+        values = set()
+        nodes = [path[-1]] if path else []
+        while nodes:
+            node = nodes.pop()
+            values |= node.values
+            nodes.extend(node.children.itervalues())
+        return values
+
+    def get(self, index, cb):
+        if not self._local():
+            return super(TrieIndex, self).get(index, cb)
+        values = self.values(index)
+        if cb:
+            async.DelayedCall(0, cb, key=index, value=list(values) if values else None)
+
+    def get_iter(self, index, include_key=False):
+        if not self._local():
+            return super(TrieIndex, self).get_iter(index, include_key=include_key)
+        values = self.values(index)
+        it = dynops.List([(index, v) for v in values] if include_key else list(values))
+        it.final()
+        return it
@@ -24,6 +24,9 @@ from calvin.utilities import calvinuuid
 _conf = calvinconfig.get()
 _log = calvinlogger.get_logger(__name__)
 
+# Seconds to wait for a reply from the master before failing the request
+REPLY_TIMEOUT = _conf.get('global', 'storage_proxy_timeout') or 10.0
+
 
 class StorageProxy(StorageBase):
     """ Implements a storage that asks a master node, this is the client class"""
@@ -33,7 +36,11 @@ class StorageProxy(StorageBase):
         self.retries = 0
         self.node = node
         self.tunnel = None
+        # msg_uuid -> {'cb': callback, 'cmd': command, 'key': key(s) of the request,
+        #              'many': batched, 'timeout': DelayedCall}
         self.replies = {}
+        # Batched commands the master serves, negotiated when the tunnel is up
+        self.capabilities = set()
         _log.info("PROXY init for %s", self.master_uri)
         super(StorageProxy, self).__init__()
 
@@ -90,6 +97,10 @@ class StorageProxy(StorageBase):
             return True
         _log.analyze(self.node.id, "+ CLIENT", {'tunnel_id': self.tunnel.id})
         self.tunnel = None
+        self.capabilities = set()
+        # No replies will come on this tunnel
+        for msg_id in self.replies.keys():
+            self._fail(msg_id)
         # FIXME assumes that the org_cb is the callback given by storage when starting, can only be called once
         # not future up/down
         if org_cb:
@@ -103,6 +114,8 @@ class StorageProxy(StorageBase):
         if not self.tunnel:
             return True
         _log.analyze(self.node.id, "+ CLIENT", {'tunnel_id': self.tunnel.id})
+        # Until the master replies requests are sent per key
+        self.send(cmd='CAPABILITIES', msg={}, cb=self._capabilities_cb)
         # FIXME assumes that the org_cb is the callback given by storage when starting, can only be called once
         # not future up/down
         if org_cb:
@@ -114,11 +127,30 @@ class StorageProxy(StorageBase):
         """ Gets called when a storage master replies"""
         _log.analyze(self.node.id, "+ CLIENT", {'payload': payload})
         if 'msg_uuid' in payload and payload['msg_uuid'] in self.replies and 'cmd' in payload and payload['cmd']=='REPLY':
-            self.replies.pop(payload['msg_uuid'])(**{k: v for k, v in payload.iteritems() if k in ('key', 'value')})
-
-    def send(self, cmd, msg, cb):
+            reply = self.replies.pop(payload['msg_uuid'])
+            reply['timeout'].cancel()
+            if reply['cb']:
+                reply['cb'](**{k: v for k, v in payload.iteritems() if k in ('key', 'value')})
+
+    def _capabilities_cb(self, key, value):
+        self.capabilities = set(value or [])
+        _log.info("Storage proxy master batched commands %s", sorted(self.capabilities))
+
+    def _fail(self, msg_id):
+        """ Fail a request without reply, False for each key of a batched request """
+        reply = self.replies.pop(msg_id, None)
+        if reply is None:
+            return
+        reply['timeout'].cancel()
+        _log.warning("Storage proxy %s request for %s failed", reply['cmd'], reply['key'])
+        if reply['cb']:
+            value = {k: False for k in reply['key']} if reply['many'] else False
+            reply['cb'](key=reply['key'], value=value)
+
+    def send(self, cmd, msg, cb, many=False):
         msg_id = calvinuuid.uuid("MSGID")
-        self.replies[msg_id] = cb
+        self.replies[msg_id] = {'cb': cb, 'cmd': cmd, 'key': msg.get('key'), 'many': many,
+                                'timeout': async.DelayedCall(REPLY_TIMEOUT, self._fail, msg_id)}
         msg['msg_uuid'] = msg_id
         self.tunnel.send(dict(msg, cmd=cmd, msg_uuid=msg_id))
 
@@ -151,6 +183,30 @@ class StorageProxy(StorageBase):
         _log.analyze(self.node.id, "+ CLIENT", {'key': key, 'value': value})
         self.send(cmd='REMOVE',msg={'key':key, 'value': value}, cb=cb)
 
+    def get_many(self, keys, cb=None):
+        """
+            Gets the values of a list of keys from the storage in one request
+        """
+        if 'GET_MANY' not in self.capabilities:
+            return super(StorageProxy, self).get_many(keys, cb=cb)
+        _log.analyze(self.node.id, "+ CLIENT", {'keys': keys})
+        self.send(cmd='GET_MANY', msg={'key': list(set(keys))}, cb=cb, many=True)
+
+    def set_many(self, items, cb=None):
+        """
+            Set several key, value pairs given as a dictionary in one request
+        """
+        if 'SET_MANY' not in self.capabilities:
+            return super(StorageProxy, self).set_many(items, cb=cb)
+        _log.analyze(self.node.id, "+ CLIENT", {'keys': items.keys()})
+        self.send(cmd='SET_MANY', msg={'key': items.keys(), 'value': items}, cb=cb, many=True)
+
+    def append_many(self, items, cb=None):
+        if 'APPEND_MANY' not in self.capabilities:
+            return super(StorageProxy, self).append_many(items, cb=cb)
+        _log.analyze(self.node.id, "+ CLIENT", {'keys': items.keys()})
+        self.send(cmd='APPEND_MANY', msg={'key': items.keys(), 'value': items}, cb=cb, many=True)
+
     def bootstrap(self, addrs, cb=None):
         _log.analyze(self.node.id, "+ CLIENT", None)
 
@@ -14,6 +14,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from calvin.utilities.calvin_callback import CalvinCB
 
 
 class StorageBase(object):
@@ -36,6 +37,9 @@ class StorageBase(object):
             append:
                 key: The key
                 status: True or False
+            get_many/set_many/append_many:
+                key: The list of keys
+                value: Dictionary with the value or status of each key
             bootstrap:
                 status: List of True and/or false:s
 
@@ -43,6 +47,11 @@ class StorageBase(object):
     def __init__(self, node=None):
         pass
 
+    def _many_cb(self, key, value, batch, cb):
+        batch['result'][key] = value
+        if cb and len(batch['result']) == len(batch['keys']):
+            cb(key=batch['keys'], value=batch['result'])
+
     def start(self, iface='', network='', bootstrap=[], cb=None):
         """
             Starts the service if its nneeded for the storage service
@@ -71,6 +80,39 @@ class StorageBase(object):
     def append(self, key, value, cb=None):
         raise NotImplementedError()
 
+    def get_many(self, keys, cb=None):
+        """
+            Gets the values of a list of keys from the storage,
+            plugins that can batch requests should override this
+        """
+        batch = {'keys': list(set(keys)), 'result': {}}
+        if not batch['keys'] and cb:
+            cb(key=[], value={})
+        for key in batch['keys']:
+            self.get(key, cb=CalvinCB(self._many_cb, batch=batch, cb=cb))
+
+    def set_many(self, items, cb=None):
+        """
+            Set several key, value pairs given as a dictionary in the storage,
+            plugins that can batch requests should override this
+        """
+        batch = {'keys': items.keys(), 'result': {}}
+        if not items and cb:
+            cb(key=[], value={})
+        for key, value in items.iteritems():
+            self.set(key, value, cb=CalvinCB(self._many_cb, batch=batch, cb=cb))
+
+    def append_many(self, items, cb=None):
+        """
+            Append to several keys given as a dictionary of key, value pairs,
+            plugins that can batch requests should override this
+        """
+        batch = {'keys': items.keys(), 'result': {}}
+        if not items and cb:
+            cb(key=[], value={})
+        for key, value in items.iteritems():
+            self.append(key, value, cb=CalvinCB(self._many_cb, batch=batch, cb=cb))
+
     def remove(self, key, value, cb=None):
         raise NotImplementedError()
 
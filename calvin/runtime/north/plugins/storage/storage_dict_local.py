@@ -14,12 +14,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import bisect
+import json
+import os
+import tempfile
+
 from calvin.runtime.south.plugins.async import async
+from calvin.utilities import calvinconfig
+from calvin.utilities import calvinlogger
+
+_conf = calvinconfig.get()
+_log = calvinlogger.get_logger(__name__)
 
 
 class StorageLocal(object):
     """
-        Base class for implementing storage plugins.
+        In-process registry, single values and sets are kept in dictionaries
+        and all callbacks are done in a later reactor turn.
         All functions in this class should be async and never block
 
         All functions takes a callback parameter:
@@ -37,22 +48,107 @@ class StorageLocal(object):
             append:
                 key: The key
                 status: True or False
+            get_many/set_many/append_many:
+                key: The list of keys
+                value: Dictionary with the value or status of each key
+            get_prefix:
+                key: The prefix
+                value: Dictionary with the value of each single value key starting with prefix
             bootstrap:
                 status: List of True and/or false:s
 
+        Values of append and remove are json encoded lists of items that are
+        added to or removed from the set of the key, get_concat returns the set
+        as a json encoded list.
+
+        When the global option local_dict_snapshot names a file the registry is
+        loaded from it at start and written to it local_dict_snapshot_interval
+        seconds after a change and at stop.
+
+        A sorted list of the single value keys serves get_prefix. Adding or
+        deleting a key is O(n) in the number of keys (a list insert/delete),
+        which is fine for the number of keys a runtime registry holds.
     """
     def __init__(self, node=None):
         self._data = {}
+        self._sets = {}
+        # Sorted keys of _data for prefix scans
+        self._keys = []
+        self._snapshot_file = _conf.get('global', 'local_dict_snapshot')
+        self._snapshot_interval = _conf.get('global', 'local_dict_snapshot_interval') or 1.0
+        self._snapshot_delayedcall = None
 
     def _dummy_cb(self, *args, **kwargs):
         pass
 
+    def _changed(self):
+        if self._snapshot_file and self._snapshot_delayedcall is None:
+            self._snapshot_delayedcall = async.DelayedCall(self._snapshot_interval, self.snapshot)
+
+    def _set(self, key, value):
+        if value is None:
+            # Setting None is a delete
+            if self._data.pop(key, None) is not None:
+                del self._keys[bisect.bisect_left(self._keys, key)]
+        else:
+            if key not in self._data:
+                bisect.insort(self._keys, key)
+            self._data[key] = value
+        self._sets.pop(key, None)
+
+    def _append(self, key, value):
+        self._sets.setdefault(key, set()).update(json.loads(value))
+
+    def _remove(self, key, value):
+        items = self._sets.get(key)
+        if items is None:
+            return
+        items.difference_update(json.loads(value))
+        if not items:
+            del self._sets[key]
+
+    def snapshot(self):
+        """
+            Write the registry to the snapshot file, replacing it atomically
+        """
+        self._snapshot_delayedcall = None
+        if not self._snapshot_file:
+            return
+        directory = os.path.dirname(os.path.abspath(self._snapshot_file))
+        fd, name = tempfile.mkstemp(prefix=".snapshot", dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as fp:
+                json.dump({'data': self._data, 'sets': {k: list(v) for k, v in self._sets.iteritems()}}, fp)
+                # On disk before it replaces the previous snapshot
+                fp.flush()
+                os.fsync(fp.fileno())
+            os.rename(name, self._snapshot_file)
+        except Exception:
+            _log.exception("Failed to write registry snapshot %s", self._snapshot_file)
+            os.remove(name)
+
+    def _load_snapshot(self):
+        if not self._snapshot_file or not os.path.isfile(self._snapshot_file):
+            return
+        if not os.path.getsize(self._snapshot_file):
+            return
+        try:
+            with open(self._snapshot_file, 'rb') as fp:
+                state = json.load(fp)
+        except Exception:
+            _log.exception("Failed to load registry snapshot %s", self._snapshot_file)
+            return
+        self._data = state['data']
+        self._sets = {k: set(v) for k, v in state['sets'].iteritems()}
+        self._keys = sorted(self._data)
+
     def start(self, iface='', network='', bootstrap=[], cb=None, name=None, nodeid=None):
         """
             Starts the service if its nneeded for the storage service
             cb  is the callback called when the srtart is finished
         """
         cb = cb or self._dummy_cb
+        self._load_snapshot()
         async.DelayedCall(0, cb, True)
 
     def set(self, key, value, cb=None):
@@ -60,7 +156,8 @@ class StorageLocal(object):
             Set a key, value pair in the storage
         """
         cb = cb or self._dummy_cb
-        self._data[key] = value
+        self._set(key, value)
+        self._changed()
         async.DelayedCall(0, cb, key, True)
 
     def get(self, key, cb=None):
@@ -68,43 +165,65 @@ class StorageLocal(object):
             Gets a value from the storage
         """
         cb = cb or self._dummy_cb
-        if key in self._data:
-            async.DelayedCall(0, cb, key, self._data[key])
-        else:
-            async.DelayedCall(0, cb, key, None)
+        async.DelayedCall(0, cb, key, self._data.get(key))
 
     def get_concat(self, key, cb=None):
         """
-            Gets a value from the storage
+            Gets a set from the storage
         """
         cb = cb or self._dummy_cb
-        if key in self._data and isinstance(self._data[key], list()):
-            async.DelayedCall(0, cb, key, self._data[key])
-        else:
-            async.DelayedCall(0, cb, key, None)
+        items = self._sets.get(key)
+        async.DelayedCall(0, cb, key, json.dumps(list(items)) if items else None)
+
+    def get_prefix(self, prefix, cb=None):
+        """
+            Gets all single values with keys starting with prefix
+        """
+        cb = cb or self._dummy_cb
+        start = bisect.bisect_left(self._keys, prefix)
+        values = {}
+        for key in self._keys[start:]:
+            if not key.startswith(prefix):
+                break
+            values[key] = self._data[key]
+        async.DelayedCall(0, cb, prefix, values)
+
+    def get_many(self, keys, cb=None):
+        """
+            Gets the values of a list of keys from the storage
+        """
+        cb = cb or self._dummy_cb
+        keys = list(set(keys))
+        async.DelayedCall(0, cb, keys, {key: self._data.get(key) for key in keys})
+
+    def set_many(self, items, cb=None):
+        """
+            Set several key, value pairs given as a dictionary in the storage
+        """
+        cb = cb or self._dummy_cb
+        for key, value in items.iteritems():
+            self._set(key, value)
+        self._changed()
+        async.DelayedCall(0, cb, items.keys(), {key: True for key in items})
 
     def append(self, key, value, cb=None):
         cb = cb or self._dummy_cb
-        if key not in self._data:
-            self._data[key] = [value]
-        else:
-            self._data[key] = list(set(self._data[key] + [value]))
+        self._append(key, value)
+        self._changed()
         async.DelayedCall(0, cb, key, True)
 
+    def append_many(self, items, cb=None):
+        cb = cb or self._dummy_cb
+        for key, value in items.iteritems():
+            self._append(key, value)
+        self._changed()
+        async.DelayedCall(0, cb, items.keys(), {key: True for key in items})
+
     def remove(self, key, value, cb=None):
         cb = cb or self._dummy_cb
-        if key not in self._data:
-            async.DelayedCall(0, cb, key, False)
-        else:
-            if isinstance(self._data[key], list()):
-                if value in self._data[key]:
-                    self._data[key].remove(value)
-                    async.DelayedCall(0, cb, key, True)
-                else:
-                    async.DelayedCall(0, cb, key, False)
-            else:
-                self._data.pop(key)
-                async.DelayedCall(0, cb, key, True)
+        self._remove(key, value)
+        self._changed()
+        async.DelayedCall(0, cb, key, True)
 
     def bootstrap(self, addrs, cb=None):
         cb = cb or self._dummy_cb
@@ -112,4 +231,7 @@ class StorageLocal(object):
 
     def stop(self, cb=None):
         cb = cb or self._dummy_cb
+        if self._snapshot_delayedcall is not None:
+            self._snapshot_delayedcall.cancel()
+        self.snapshot()
         async.DelayedCall(0, cb, True)
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import json
+import sqlite3
+
+from calvin.runtime.north.plugins.storage.storage_base import StorageBase
+from calvin.runtime.south.plugins.async import async
+from calvin.utilities import calvinconfig
+from calvin.utilities import calvinlogger
+
+_conf = calvinconfig.get()
+_log = calvinlogger.get_logger(__name__)
+
+# Max number of variables in one sqlite statement
+_MAX_VARIABLES = 500
+
+
+class StorageSQLite(StorageBase):
+    """
+        Persistent registry in an sqlite database using a write-ahead log.
+
+        Writes are done directly in an open transaction, so they are seen by
+        following reads, and committed together after storage_sqlite_commit_delay
+        seconds (group commit). The callbacks of the writes are called after the
+        commit, hence a successful write is durable. Restarting with the same
+        storage_sqlite_file continues with the stored registry.
+
+        Callbacks are the same as for StorageLocal, values of append and remove are
+        json encoded lists of items that are added to or removed from the set of
+        the key and get_concat returns the set as a json encoded list.
+    """
+    def __init__(self, node=None):
+        super(StorageSQLite, self).__init__()
+        self._filename = _conf.get('global', 'storage_sqlite_file') or "calvin_registry.sqlite"
+        self._commit_delay = _conf.get('global', 'storage_sqlite_commit_delay') or 0.01
+        self._db = None
+        # Callbacks waiting for the commit, list of (cb, key, value)
+        self._uncommitted = []
+        self._commit_delayedcall = None
+
+    def _dummy_cb(self, *args, **kwargs):
+        pass
+
+    def start(self, iface='', network='', bootstrap=[], cb=None, name=None, nodeid=None):
+        """
+            Opens the database, cb is called with True when done
+        """
+        cb = cb or self._dummy_cb
+        try:
+            self._db = sqlite3.connect(self._filename)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            # With the write-ahead log a commit is durable against process crashes without syncing
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS value (key TEXT PRIMARY KEY, value TEXT)")
+            self._db.execute("CREATE TABLE IF NOT EXISTS item (key TEXT, item TEXT, PRIMARY KEY (key, item))")
+            self._db.commit()
+        except sqlite3.Error:
+            _log.exception("Failed to open registry database %s", self._filename)
+            async.DelayedCall(0, cb, False)
+            return
+        _log.info("Registry database %s opened", self._filename)
+        async.DelayedCall(0, cb, True)
+
+    def _written(self, cb, key, value):
+        """ Call cb with key, value after the next commit """
+        self._uncommitted.append((cb, key, value))
+        if self._commit_delayedcall is None:
+            self._commit_delayedcall = async.DelayedCall(self._commit_delay, self.commit)
+
+    def commit(self):
+        """
+            Commit all writes since the last commit and call their callbacks
+        """
+        self._commit_delayedcall = None
+        uncommitted, self._uncommitted = self._uncommitted, []
+        try:
+            self._db.commit()
+            success = True
+        except sqlite3.Error:
+            _log.exception("Failed to commit %d registry writes", len(uncommitted))
+            self._db.rollback()
+            success = False
+        for cb, key, value in uncommitted:
+            if success:
+                cb(key, value)
+            elif isinstance(value, dict):
+                cb(key, {k: False for k in value})
+            else:
+                cb(key, False)
+
+    def _set(self, key, value):
+        if value is None:
+            # Setting None is a delete
+            self._db.execute("DELETE FROM value WHERE key = ?", (key,))
+        else:
+            self._db.execute("INSERT OR REPLACE INTO value (key, value) VALUES (?, ?)", (key, value))
+        self._db.execute("DELETE FROM item WHERE key = ?", (key,))
+
+    def _append(self, key, value):
+        self._db.executemany("INSERT OR IGNORE INTO item (key, item) VALUES (?, ?)",
+                             [(key, json.dumps(item)) for item in json.loads(value)])
+
+    def _remove(self, key, value):
+        self._db.executemany("DELETE FROM item WHERE key = ? AND item = ?",
+                             [(key, json.dumps(item)) for item in json.loads(value)])
+
+    def _write(self, func, key, value, cb):
+        cb = cb or self._dummy_cb
+        try:
+            func(key, value)
+        except (sqlite3.Error, ValueError):
+            _log.exception("Failed to write registry key %s", key)
+            async.DelayedCall(0, cb, key, False)
+            return
+        self._written(cb, key, True)
+
+    def _write_many(self, func, items, cb):
+        cb = cb or self._dummy_cb
+        status = {}
+        for key, value in items.iteritems():
+            try:
+                func(key, value)
+                status[key] = True
+            except (sqlite3.Error, ValueError):
+                _log.exception("Failed to write registry key %s", key)
+                status[key] = False
+        self._written(cb, items.keys(), status)
+
+    def set(self, key, value, cb=None):
+        """
+            Set a key, value pair in the storage
+        """
+        self._write(self._set, key, value, cb)
+
+    def set_many(self, items, cb=None):
+        """
+            Set several key, value pairs given as a dictionary in the storage
+        """
+        self._write_many(self._set, items, cb)
+
+    def append(self, key, value, cb=None):
+        self._write(self._append, key, value, cb)
+
+    def append_many(self, items, cb=None):
+        self._write_many(self._append, items, cb)
+
+    def remove(self, key, value, cb=None):
+        self._write(self._remove, key, value, cb)
+
+    def get(self, key, cb=None):
+        """
+            Gets a value from the storage
+        """
+        cb = cb or self._dummy_cb
+        row = self._db.execute("SELECT value FROM value WHERE key = ?", (key,)).fetchone()
+        async.DelayedCall(0, cb, key, row[0] if row else None)
+
+    def get_many(self, keys, cb=None):
+        """
+            Gets the values of a list of keys from the storage
+        """
+        cb = cb or self._dummy_cb
+        keys = list(set(keys))
+        values = dict.fromkeys(keys)
+        for i in xrange(0, len(keys), _MAX_VARIABLES):
+            chunk = keys[i:i + _MAX_VARIABLES]
+            values.update(self._db.execute("SELECT key, value FROM value WHERE key IN (%s)" %
+                                           ",".join("?" * len(chunk)), chunk))
+        async.DelayedCall(0, cb, keys, values)
+
+    def get_concat(self, key, cb=None):
+        """
+            Gets a set from the storage
+        """
+        cb = cb or self._dummy_cb
+        items = [json.loads(row[0]) for row in self._db.execute("SELECT item FROM item WHERE key = ?", (key,))]
+        async.DelayedCall(0, cb, key, json.dumps(items) if items else None)
+
+    def bootstrap(self, addrs, cb=None):
+        cb = cb or self._dummy_cb
+        async.DelayedCall(0, cb, True)
+
+    def stop(self, cb=None):
+        cb = cb or self._dummy_cb
+        if self._db is not None:
+            if self._commit_delayedcall is not None:
+                self._commit_delayedcall.cancel()
+            self.commit()
+            self._db.close()
+            self._db = None
+        async.DelayedCall(0, cb, True)
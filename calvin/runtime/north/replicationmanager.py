@@ -29,6 +29,7 @@ from calvin.actor.actorstate import ActorState
 from calvin.runtime.north.plugins.requirements import req_operations
 from calvin.actor.actorport import PortMeta
 from calvin.runtime.north.plugins.port import DISCONNECT
+from calvin.runtime.north import migration_state
 from calvin.utilities.utils import enum
 
 _log = get_logger(__name__)
@@ -244,11 +245,17 @@ class ReplicationManager(object):
                     replication_id=actor._replication_data.id,
                     actor_id=new_id, callback=cb_status, master_id=actor.id, dst_node_id=dst_node_id))
         else:
-            self.node.proto.actor_new(
-                dst_node_id, CalvinCB(self._replicated, replication_id=actor._replication_data.id,
-                                         actor_id=new_id, callback=cb_status, master_id=actor.id,
-                                         dst_node_id=dst_node_id),
-                actor_type, state, ports)
+            self.node.am.lookup_peer(dst_node_id, CalvinCB(
+                self._send_replica, dst_node_id, actor_type, state, ports,
+                CalvinCB(self._replicated, replication_id=actor._replication_data.id,
+                         actor_id=new_id, callback=cb_status, master_id=actor.id,
+                         dst_node_id=dst_node_id)))
+
+    def _send_replica(self, dst_node_id, actor_type, state, ports, callback):
+        if not self.node.am.peer_accepts(dst_node_id, migration_state.FIFO_STATE):
+            # Older runtime, queues with all their slots
+            state = migration_state.with_fifo_slots(state)
+        self.node.proto.actor_new(dst_node_id, callback, actor_type, state, ports)
 
     def _replicated(self, status, replication_id=None, actor_id=None, callback=None, master_id=None, dst_node_id=None):
         _log.analyze(self.node.id, "+", {'status': status, 'replication_id': replication_id, 'actor_id': actor_id})
@@ -470,9 +477,27 @@ class ReplicationManager(object):
             if actor._replicate_callback:
                 actor._replicate_callback(status=calvinresponse.CalvinResponse(False))
             return
+        # Collect the load summaries of the candidate runtimes before selecting
+        node_ids = set([n for n in possible_placements if not isinstance(n, dynops.InfiniteElement)])
+        node_ids.discard(self.node.id)
+        if not node_ids:
+            self._select_placement(actor, possible_placements, {})
+            return
+        loads = {}
+        for node_id in node_ids:
+            self.node.storage.get_node_load(node_id, cb=CalvinCB(self._node_load_cb, actor=actor,
+                                            possible_placements=possible_placements, node_ids=node_ids, loads=loads))
+
+    def _node_load_cb(self, key, value, actor, possible_placements, node_ids, loads):
+        loads[key] = value if value else None
+        if len(loads) == len(node_ids):
+            self._select_placement(actor, possible_placements, loads)
+
+    def _select_placement(self, actor, possible_placements, loads):
         # Select, always a list of node_ids, could be more than one
         req = actor._replication_data.requirements
-        selected = req_operations[req['op']].select(self.node, actor, possible_placements, **req['kwargs'])
+        selected = req_operations[req['op']].select(self.node, actor, possible_placements, loads=loads,
+                                                    **req['kwargs'])
         _log.analyze(self.node.id, "+", {'possible_placements': possible_placements, 'selected': selected})
         if selected is None:
             # When None - selection will never succeed
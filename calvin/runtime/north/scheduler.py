@@ -16,9 +16,10 @@
 
 import sys
 import time
-import random
 
 from calvin.runtime.south.plugins.async import async
+from calvin.runtime.north.plugins.scheduling import policy_factory
+from calvin.runtime.north.timer_wheel import TimerWheel
 from calvin.utilities.calvin_callback import CalvinCB
 from calvin.utilities.calvinlogger import get_logger
 from calvin.utilities import calvinconfig
@@ -45,7 +46,22 @@ class Scheduler(object):
         self._heartbeat = 1
         self._maintenance_loop = None
         self._maintenance_delay = _conf.get(None, "maintenance_delay") or 300
+        # Scheduler mode, 'all' fires every enabled actor each loop,
+        # 'ready' only fires actors that have been marked runnable
+        self._mode = _conf.get(None, "scheduler_mode") or "all"
+        # Max time spent firing actors in one loop, and the policy deciding order and time slice of actors
+        self._loop_budget = _conf.get(None, "scheduler_loop_budget") or 0.100
+        self._policy_name = _conf.get(None, "scheduler_policy") or "random"
+        self.policy = policy_factory.get(self._policy_name, _conf.get(None, "scheduler_time_slice") or 0.020)
         self.actor_pressures = {}
+        # Timers of the actors' calvinsys timer objects
+        self.timers = TimerWheel(self.trigger_loop)
+        self._loop_stats = {'fired': 0, 'evaluated': 0, 'skipped': 0, 'queue_depth': 0}
+        self._total_stats = {'loops': 0, 'fired': 0, 'evaluated': 0, 'skipped': 0}
+        # Seconds spent firing actors since start
+        self.busy_time = 0.0
+        # Loops triggered by each kind of I/O source
+        self._wakeups = {}
 
     def run(self):
         async.run_ioloop()
@@ -63,12 +79,15 @@ class Scheduler(object):
             return
 
         actors_to_fire = None if all_ else self._trigger_set
+        if self._mode == "ready":
+            # Triggers arriving while firing are collected for the next loop
+            self._trigger_set = set()
         did_fire, timeout, actor_ids = self.fire_actors(actors_to_fire)
 
         self._loop_once = None
 
-        local_trigger_set = self._trigger_set
-        self._trigger_set = set()
+        if self._mode != "ready":
+            self._trigger_set = set()
 
         activity = did_fire or activity or timeout
 
@@ -87,7 +106,7 @@ class Scheduler(object):
     def trigger_loop(self, delay=0, actor_ids=None):
         """ Trigger the loop_once potentially after waiting delay seconds """
         if delay > 0:
-            _log.debug("Delayed trigger %s" % delay)
+            _log.debug("Delayed trigger %s", delay)
             async.DelayedCall(delay, self.loop_once, True)
         else:
             # Never have more then one outstanding loop_once
@@ -105,40 +124,117 @@ class Scheduler(object):
                 if self._loop_once is None:
                     self._loop_once = async.DelayedCall(0, self.loop_once)
 
+    def wakeup(self, actor_id, source):
+        """ Trigger the loop for the actor owning an I/O source, counted per source """
+        self._wakeups[source] = self._wakeups.get(source, 0) + 1
+        if actor_id is None:
+            self.trigger_loop()
+        else:
+            self.trigger_loop(actor_ids=[actor_id])
+
+    def io_trigger(self, actor_id, source):
+        """ A trigger_loop replacement for I/O objects, waking only the actor owning them """
+        def trigger(delay=0, actor_ids=None):
+            self.wakeup(actor_id, source)
+        return trigger
+
     def _log_exception_during_fire(self, e):
         _log.exception(e)
 
     def fire_actors(self, actor_ids=None):
-        did_fire = False
-        actor_ids = set()
+        if self._mode == "ready":
+            actors = self._ready_actors(actor_ids)
+        else:
+            actors = self.actor_mgr.enabled_actors()
+        actors = self.policy.order(actors)
+
+        did_fire, timeout, fired, evaluated = self._fire(actors)
+
+        if self._mode == "ready":
+            # Actors that fired might fire again, actors not reached before timeout are still runnable
+            actor_ids = fired | set(actor.id for actor in actors[evaluated:])
+        else:
+            actor_ids = set(actor.id for actor in actors[:evaluated])
+
+        self._update_statistics(queue_depth=len(actors), fired=len(fired), evaluated=evaluated)
 
-        actors = self.actor_mgr.enabled_actors()
-        # Shuffle order since now we stop after executing actors for too long
-        random.shuffle(actors)
+        # FIXME: self.idle = not (timeout or did_fire)
+        self.idle = False if timeout else not did_fire
+
+        return (did_fire, timeout, actor_ids)
+
+    def _ready_actors(self, actor_ids):
+        """Return the enabled actors among actor_ids, or all enabled actors when actor_ids is None"""
+        if actor_ids is None:
+            return self.actor_mgr.enabled_actors()
+        actor_ids = set(actor_ids)
+        actor_ids.discard(None)
+        return self.actor_mgr.enabled_actors(actor_ids)
+
+    def _fire(self, actors):
+        """
+        Fire actors in order until all have been fired or the loop budget is spent.
+        Returns (did_fire, timeout, ids of actors that fired, number of actors evaluated)
+        """
+        did_fire = False
+        fired = set()
+        evaluated = 0
 
         start_time = time.time()
         timeout = False
         for actor in actors:
+            evaluated += 1
+            actor_did_fire = False
+            fire_time = time.time()
             try:
-                _log.debug("Fire actor %s (%s, %s)" % (actor.name, actor._type, actor.id))
-                did_fire |= actor.fire()
-                actor_ids.add(actor.id)
+                _log.debug("Fire actor %s (%s, %s)", actor.name, actor._type, actor.id)
+                actor_did_fire = actor.fire(self.policy.time_slice(actor))
             except Exception as e:
                 self._log_exception_during_fire(e)
+            self.policy.fired(actor, actor_did_fire, time.time() - fire_time)
+            if actor_did_fire:
+                did_fire = True
+                fired.add(actor.id)
 
             pressure = actor.get_pressure().values()
             pressure_values = [p for _, _, p in pressure]
             if self.actor_pressures.get(actor.id, False) != pressure_values:
                 self.actor_pressures[actor.id] = pressure_values
 
-            timeout = time.time() - start_time > 0.100
+            timeout = time.time() - start_time > self._loop_budget
             if timeout:
                 break
 
-        # FIXME: self.idle = not (timeout or did_fire)
-        self.idle = False if timeout else not did_fire
-
-        return (did_fire, timeout, actor_ids)
+        self.busy_time += time.time() - start_time
+        return (did_fire, timeout, fired, evaluated)
+
+    def _update_statistics(self, queue_depth, fired, evaluated):
+        self._loop_stats = {
+            'fired': fired,
+            'evaluated': evaluated,
+            'skipped': len(self.actor_mgr.actors) - evaluated,
+            'queue_depth': queue_depth
+        }
+        self._total_stats['loops'] += 1
+        self._total_stats['fired'] += fired
+        self._total_stats['evaluated'] += evaluated
+        self._total_stats['skipped'] += self._loop_stats['skipped']
+
+    def statistics(self):
+        """
+        Return scheduler statistics for the last loop and accumulated over all loops.
+        fired: actors that fired any action
+        evaluated: actors that were asked to fire
+        skipped: actors on the runtime that were not asked to fire
+        queue_depth: actors that were runnable when the loop started
+        monitor: endpoints registered and serviced by the monitor
+        timers: active and expired timers of the timer wheel
+        wakeups: loops triggered by each kind of I/O source
+        """
+        return {'mode': self._mode, 'policy': self._policy_name,
+                'last_loop': dict(self._loop_stats), 'total': dict(self._total_stats),
+                'monitor': self.monitor.statistics(), 'timers': self.timers.statistics(),
+                'wakeups': dict(self._wakeups)}
 
     def maintenance_loop(self):
         # Migrate denied actors
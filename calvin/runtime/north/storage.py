@@ -15,6 +15,7 @@
 # limitations under the License.
 
 from calvin.runtime.north.plugins.storage import storage_factory
+from calvin.runtime.north.plugins.storage.index import index_factory
 from calvin.runtime.north.plugins.coders.messages import message_coder_factory
 from calvin.csparser.port_property_syntax import list_port_property_capabilities
 from calvin.runtime.south.plugins.async import async
@@ -28,11 +29,29 @@ from calvin.utilities.security import Security, security_enabled
 from calvin.utilities import dynops
 from calvin.runtime.north.calvinsys import get_calvinsys
 from calvin.runtime.north.calvinlib import get_calvinlib
-import re
+from calvin.runtime.north import migration_state
+from collections import OrderedDict
+import time
 
 _log = calvinlogger.get_logger(__name__)
 _conf = calvinconfig.get()
 
+# Seconds a resolved cached index lookup is reused, see get_index_iter
+INDEX_CACHE_TTL = _conf.get(None, "index_cache_ttl") or 2.0
+# Read-through cache of encoded get values, disabled (0) unless storage_cache_size is set
+STORAGE_CACHE_SIZE = _conf.get(None, "storage_cache_size") or 0
+# Seconds a cached value is trusted per key prefix, prefixes not listed are never cached.
+# Changes made by other nodes are not invalidated, hence applications and actors are not cached by default.
+STORAGE_CACHE_TTL = _conf.get(None, "storage_cache_ttl") or {"node-": 10.0, "port-": 2.0}
+# Max number of keys in each get_many/set_many/append_many request to the storage plugin
+STORAGE_BATCH_SIZE = _conf.get(None, "storage_batch_size") or 100
+
+
+def _chunks(items, size):
+    for i in xrange(0, len(items), size):
+        yield items[i:i + size]
+
+
 class Storage(object):
 
     """
@@ -47,6 +66,7 @@ class Storage(object):
         self.node = node
         storage_type = _conf.get('global', 'storage_type')
         _log.info("#### STORAGE TYPE %s ####", storage_type)
+        self.storage_type = storage_type
         self.proxy = _conf.get('global', 'storage_proxy') if storage_type == 'proxy' else None
         _log.analyze(self.node.id, "+", {'proxy': self.proxy})
         self.tunnel = {}
@@ -56,8 +76,22 @@ class Storage(object):
         else:
             self.storage = storage_factory.get(storage_type, node)
         self.coder = message_coder_factory.get("json")  # TODO: always json? append/remove requires json at the moment
+        # Layout of the hierarchical index in the registry, all nodes sharing a registry must use the same
+        index_type = _conf.get('global', 'index_type') or "levels"
+        self.index = index_factory.get(index_type, self)
         self.flush_delayedcall = None
         self.reset_flush_timeout()
+        # (index, include_key) -> {'time': resolved time, 'values': list or None when pending, 'waiters': [List]}
+        self.index_cache = {}
+        # prefix+key -> (expiry time, encoded value), in least recently used order
+        self.cache = OrderedDict()
+        self.cache_size = STORAGE_CACHE_SIZE
+        # prefix+key -> marker of the outstanding get allowed to fill the cache
+        self._cache_pending = {}
+        self.cache_stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+        # get_iter requests collected during a reactor turn and sent with get_many
+        self._get_iter_batch = []
+        self._get_iter_delayedcall = None
 
     ### Storage life cycle management ###
 
@@ -82,23 +116,26 @@ class Storage(object):
         if self.flush_timeout < 600:
             self.flush_timeout = self.flush_timeout * 2
         self.flush_delayedcall = None
-        for key in self.localstore:
-            _log.debug("Flush key %s: %s" % (key, self.localstore[key]))
-            self.storage.set(key=key, value=self.localstore[key],
-                             cb=CalvinCB(func=self.set_cb, org_key=None, org_value=None, org_cb=None, silent=True))
-
+        for keys in _chunks(self.localstore.keys(), STORAGE_BATCH_SIZE):
+            _log.debug("Flush keys %s", keys)
+            self.storage.set_many(items={key: self.localstore[key] for key in keys},
+                                  cb=CalvinCB(func=self._flush_many_cb, key_cb=self.set_cb))
+
+        appends = [key for key, value in self.localstore_sets.iteritems() if value['+']]
+        for keys in _chunks(appends, STORAGE_BATCH_SIZE):
+            self._flush_append(keys)
         for key, value in self.localstore_sets.iteritems():
-            self._flush_append(key, value['+'])
             self._flush_remove(key, value['-'])
 
-    def _flush_append(self, key, value):
-        if not value:
-            return
+    def _flush_many_cb(self, key, value, key_cb):
+        """ Result of a flushed batch, value is a dictionary with the status of each key """
+        for k, status in value.iteritems():
+            key_cb(k, status, org_key=None, org_value=None, org_cb=None, silent=True)
 
-        _log.debug("Flush append on key %s: %s" % (key, list(value)))
-        coded_value = self.coder.encode(list(value))
-        self.storage.append(key=key, value=coded_value,
-                            cb=CalvinCB(func=self.append_cb, org_key=None, org_value=None, org_cb=None, silent=True))
+    def _flush_append(self, keys):
+        items = {key: self.coder.encode(list(self.localstore_sets[key]['+'])) for key in keys}
+        _log.debug("Flush append on keys %s", keys)
+        self.storage.append_many(items=items, cb=CalvinCB(func=self._flush_many_cb, key_cb=self.append_cb))
 
     def _flush_remove(self, key, value):
         if not value:
@@ -160,6 +197,10 @@ class Storage(object):
                             'REMOVE': self.remove,
                             'DELETE': self.delete,
                             'REPLY': self._proxy_reply}
+        # Batched commands, each key is handled by the corresponding single key command
+        self._proxy_many_cmds = {'GET_MANY': 'GET',
+                                 'SET_MANY': 'SET',
+                                 'APPEND_MANY': 'APPEND'}
         try:
             self.node.proto.register_tunnel_handler('storage', CalvinCB(self.tunnel_request_handles))
         except:
@@ -207,6 +248,7 @@ class Storage(object):
             value indicate success.
         """
         _log.debug("Set key %s, value %s" % (prefix + key, value))
+        self.invalidate(prefix, key)
         value = self.coder.encode(value) if value else value
 
         if prefix + key in self.localstore_sets:
@@ -219,9 +261,76 @@ class Storage(object):
         elif cb:
             async.DelayedCall(0, cb, key=key, value=True)
 
-    def get_cb(self, key, value, org_cb, org_key):
+    ### Read-through cache ###
+
+    def _cacheable(self, prefix):
+        return self.cache_size > 0 and prefix in STORAGE_CACHE_TTL
+
+    def _cache_lookup(self, prefix, key):
+        """ Returns the fresh cached value of prefix+key or None,
+            only values that are not None/False are cached.
+        """
+        if not self._cacheable(prefix):
+            return None
+        entry = self.cache.pop(prefix + key, None)
+        if entry is not None and entry[0] > time.time():
+            # Reinsert as most recently used
+            self.cache[prefix + key] = entry
+            self.cache_stats['hits'] += 1
+            # Decoded per hit, callers may modify the value they get
+            return self.coder.decode(entry[1])
+        self.cache_stats['misses'] += 1
+        return None
+
+    def _cache_expect(self, prefix, key):
+        """ Returns a marker to pass to _cache_fill when the value of an issued get
+            arrives, or None when prefix+key is not cacheable.
+        """
+        if not self._cacheable(prefix):
+            return None
+        marker = object()
+        self._cache_pending[prefix + key] = marker
+        return marker
+
+    def _cache_fill(self, prefix, key, marker, value):
+        """ Cache the encoded value unless prefix+key was invalidated after the get was issued """
+        if self._cache_pending.get(prefix + key) is not marker:
+            return
+        del self._cache_pending[prefix + key]
+        # Deleted (False) and never set (None) are not cached
+        if not value:
+            return
+        self.cache[prefix + key] = (time.time() + STORAGE_CACHE_TTL[prefix], value)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+            self.cache_stats['evictions'] += 1
+
+    def invalidate(self, prefix, key):
+        """ Drop any cached value for registry key: prefix+key,
+            also prevents outstanding gets from caching an older value.
+        """
+        self._cache_pending.pop(prefix + key, None)
+        if self.cache.pop(prefix + key, None) is not None:
+            self.cache_stats['invalidations'] += 1
+
+    def clear_cache(self):
+        """ Drop all cached values """
+        self.cache_stats['invalidations'] += len(self.cache)
+        self.cache.clear()
+        self._cache_pending.clear()
+
+    def cache_statistics(self):
+        """ Returns the read cache counters and current size """
+        stats = dict(self.cache_stats)
+        stats['size'] = len(self.cache)
+        stats['max_size'] = self.cache_size
+        return stats
+
+    def get_cb(self, key, value, org_cb, org_key, prefix=None, cache_marker=None):
         """ get callback
         """
+        if cache_marker is not None:
+            self._cache_fill(prefix, org_key, cache_marker, value)
         if value:
             value = self.coder.decode(value)
         org_cb(org_key, value)
@@ -235,6 +344,8 @@ class Storage(object):
             note that the key here is without the prefix.
             False is returned when value has been deleted,
             None is returned if never set (this is current behaviour and might change).
+            Values of prefixes in STORAGE_CACHE_TTL are cached when storage_cache_size is set,
+            each caller gets its own copy.
         """
         if not cb:
             return
@@ -244,20 +355,29 @@ class Storage(object):
             if value:
                 value = self.coder.decode(value)
             async.DelayedCall(0, cb, key=key, value=value)
+            return
+
+        value = self._cache_lookup(prefix, key)
+        if value is not None:
+            async.DelayedCall(0, cb, key=key, value=value)
         else:
             try:
-                self.storage.get(key=prefix + key, cb=CalvinCB(func=self.get_cb, org_cb=cb, org_key=key))
+                self.storage.get(key=prefix + key, cb=CalvinCB(func=self.get_cb, org_cb=cb, org_key=key, prefix=prefix,
+                                                               cache_marker=self._cache_expect(prefix, key)))
             except:
                 if self.started:
                     _log.error("Failed to get: %s" % key)
                 async.DelayedCall(0, cb, key=key, value=False)
 
-    def get_iter_cb(self, key, value, it, org_key, include_key=False):
+    def get_iter_cb(self, key, value, it, org_key, include_key=False, prefix=None, cache_marker=None):
         """ get callback
         """
         _log.analyze(self.node.id, "+ BEGIN", {'value': value, 'key': org_key})
+        if cache_marker is not None:
+            self._cache_fill(prefix, org_key, cache_marker, value)
         if value:
             value = self.coder.decode(value)
+        if value:
             it.append((key, value) if include_key else value)
             _log.analyze(self.node.id, "+", {'value': value, 'key': org_key})
         else:
@@ -288,15 +408,36 @@ class Storage(object):
                     value = self.coder.decode(value)
                 _log.analyze(self.node.id, "+", {'value': value, 'key': key})
                 it.append((key, value) if include_key else value)
+                return
+            value = self._cache_lookup(prefix, key)
+            if value is not None:
+                it.append((key, value) if include_key else value)
             else:
-                try:
-                    self.storage.get(key=prefix + key,
-                                     cb=CalvinCB(func=self.get_iter_cb, it=it, org_key=key, include_key=include_key))
-                except:
-                    if self.started:
-                        _log.analyze(self.node.id, "+", {'value': 'FailedElement', 'key': key})
-                        _log.error("Failed to get: %s" % key)
-                    it.append((key, dynops.FailedElement) if include_key else dynops.FailedElement)
+                # Sent with other get_iter requests of this reactor turn, see _flush_get_iter
+                self._get_iter_batch.append((prefix + key, CalvinCB(func=self.get_iter_cb, it=it, org_key=key,
+                                                                     include_key=include_key, prefix=prefix,
+                                                                     cache_marker=self._cache_expect(prefix, key))))
+                if self._get_iter_delayedcall is None:
+                    self._get_iter_delayedcall = async.DelayedCall(0, self._flush_get_iter)
+
+    def _flush_get_iter(self):
+        """ Send collected get_iter requests to storage using get_many """
+        batch, self._get_iter_batch = self._get_iter_batch, []
+        self._get_iter_delayedcall = None
+        for requests in _chunks(batch, STORAGE_BATCH_SIZE):
+            try:
+                self.storage.get_many(keys=[key for key, _ in requests],
+                                      cb=CalvinCB(func=self._get_iter_many_cb, requests=requests))
+            except:
+                if self.started:
+                    _log.error("Failed to get: %s", [key for key, _ in requests])
+                for key, cb in requests:
+                    cb(key, None)
+
+    def _get_iter_many_cb(self, key, value, requests):
+        """ get_many callback, value is a dictionary with the value of each key """
+        for k, cb in requests:
+            cb(k, value.get(k))
 
     def get_concat_cb(self, key, value, org_cb, org_key, local_list):
         """ get callback
@@ -501,6 +642,7 @@ class Storage(object):
             value indicate success.
         """
         _log.debug("Deleting key %s" % prefix + key)
+        self.invalidate(prefix, key)
         if prefix + key in self.localstore:
             del self.localstore[prefix + key]
         if (prefix + key) in self.localstore_sets:
@@ -520,6 +662,7 @@ class Storage(object):
         self.set(prefix="node-", key=node.id,
                   value={"uris": node.uris,
                          "control_uris": [node.external_control_uri],
+                         "migration": migration_state.CAPABILITIES,
                          "attributes": {'public': node.attributes.get_public(),
                                         'indexed_public': node.attributes.get_indexed_public(as_list=False)}}, cb=cb)
         self._add_node_index(node)
@@ -618,10 +761,23 @@ class Storage(object):
         """
         self.get(prefix="node-", key=node_id, cb=cb)
 
+    def set_node_load(self, node_id, summary, cb=None):
+        """
+        Store the load summary of a node, see node_load.LoadReporter
+        """
+        self.set(prefix="nodeload-", key=node_id, value=summary, cb=cb)
+
+    def get_node_load(self, node_id, cb=None):
+        """
+        Get the load summary of a node from storage
+        """
+        self.get(prefix="nodeload-", key=node_id, cb=cb)
+
     def delete_node(self, node, cb=None):
         """
         Delete node from storage
         """
+        self.delete(prefix="nodeload-", key=node.id, cb=None)
         self.delete(prefix="node-", key=node.id, cb=None if node.attributes.get_indexed_public() else cb)
         if node.attributes.get_indexed_public():
             self._delete_node_index(node, cb=cb)
@@ -722,6 +878,12 @@ class Storage(object):
         """
         self.get(prefix="actor-", key=actor_id, cb=cb)
 
+    def invalidate_actor(self, actor_id):
+        """
+        Drop any cached actor data, e.g. when the actor migrates
+        """
+        self.invalidate(prefix="actor-", key=actor_id)
+
     def delete_actor(self, actor_id, cb=None):
         """
         Delete actor from storage
@@ -750,6 +912,12 @@ class Storage(object):
         """
         self.get(prefix="port-", key=port_id, cb=cb)
 
+    def invalidate_port(self, port_id):
+        """
+        Drop any cached port data, e.g. when the port's actor migrates
+        """
+        self.invalidate(prefix="port-", key=port_id)
+
     def delete_port(self, port_id, cb=None):
         """
         Delete port from storage
@@ -844,39 +1012,6 @@ class Storage(object):
         self.get_replica(replication_id,
                 cb=CalvinCB(self.get_replication_cb, org_cb=cb, data=data))
 
-    def index_cb(self, key, value, org_cb, index_items):
-        """
-        Collect all the index levels operations into one callback
-        """
-        _log.debug("index cb key:%s, value:%s, index_items:%s" % (key, value, index_items))
-        #org_key = key.partition("-")[2]
-        org_key = key
-        # cb False if not already done it at first False value
-        if not value and index_items:
-            org_cb(key=org_key, value=False)
-            del index_items[:]
-        if org_key in index_items:
-            # remove this index level from list
-            index_items.remove(org_key)
-            # If all done send True
-            if not index_items:
-                org_cb(key=org_key, value=True)
-
-    def _index_strings(self, index, root_prefix_level):
-        # Make the list of index levels that should be used
-        # The index string must been escaped with \/ and \\ for / and \ within levels, respectively
-        if isinstance(index, list):
-            items = index
-        else:
-            items = re.split(r'(?<![^\\]\\)/', index.lstrip("/"))
-        root = "/".join(items[:root_prefix_level])
-        del items[:root_prefix_level]
-        items.insert(0, root)
-
-        # index strings for all levels
-        indexes = ['/'+'/'.join(items[:l]) for l in range(1,len(items)+1)]
-        return indexes
-
     def add_index(self, index, value, root_prefix_level=3, cb=None):
         """
         Add single value (e.g. a node id) to a set stored in registry
@@ -893,22 +1028,10 @@ class Storage(object):
             note that the key here is without the prefix and
             value indicate success.
         """
+        _log.debug("add index %s: %s", index, value)
+        self.index.add(index, value, root_prefix_level, cb=cb)
 
-        # TODO this implementation will store the value to each level of the index.
-        # When time permits a proper implementation should be done with for example
-        # a prefix hash table on top of the DHT or using other storage backend with
-        # prefix search built in.
-
-        _log.debug("add index %s: %s" % (index, value))
-
-        indexes = self._index_strings(index, root_prefix_level)
-
-        # make copy of indexes since altered in callbacks
-        for i in indexes[:]:
-            self.append(prefix="index-", key=i, value=[value],
-                        cb=CalvinCB(self.index_cb, org_cb=cb, index_items=indexes) if cb else None)
-
-    def remove_index(self, index, value, root_prefix_level=2, cb=None):
+    def remove_index(self, index, value, root_prefix_level=3, cb=None):
         """
         Remove single value (e.g. a node id) from a set stored in registry
         index: The multilevel key:
@@ -920,31 +1043,15 @@ class Storage(object):
                OR a list of each levels strings
         value: the value that is to be removed from the set stored at each level of the index
         root_prefix_level: the top level of the index that can be searched separately,
-               with e.g. =1 then node/address can't be split
+               with e.g. =1 then node/address can't be split, must be the same as when added
         cb: Callback with signature cb(key=key, value=True/False)
             note that the key here is without the prefix and
             value indicate success.
         """
+        _log.debug("remove index %s: %s", index, value)
+        self.index.remove(index, value, root_prefix_level, cb=cb)
 
-        # TODO this implementation will delete the value to each level of the index.
-        # When time permits a proper implementation should be done with for example
-        # a prefix hash table on top of the DHT or using other storage backend with
-        # prefix search built in.
-
-        # TODO Currently we don't go deeper than the specified index for a remove,
-        # e.g. node/affiliation/owner/com.ericsson would remove the value from
-        # all deeper indeces. But no current use case exist either.
-
-        _log.debug("remove index %s: %s" % (index, value))
-
-        indexes = self._index_strings(index, root_prefix_level)
-
-        # make copy of indexes since altered in callbacks
-        for i in indexes[:]:
-            self.remove(prefix="index-", key=i, value=[value],
-                        cb=CalvinCB(self.index_cb, org_cb=cb, index_items=indexes) if cb else None)
-
-    def delete_index(self, index, root_prefix_level=2, cb=None):
+    def delete_index(self, index, root_prefix_level=3, cb=None):
         """
         Remove index entry in registry
         index: The multilevel key:
@@ -960,13 +1067,7 @@ class Storage(object):
             note that the key here is without the prefix and
             value indicate success.
         """
-
-        indexes = self._index_strings(index, root_prefix_level)
-
-        # make copy of indexes since altered in callbacks
-        for i in indexes[:]:
-            self.delete(prefix="index-", key=i,
-                        cb=CalvinCB(self.index_cb, org_cb=cb, index_items=indexes) if cb else None)
+        self.index.delete(index, root_prefix_level, cb=cb)
 
     def get_index(self, index, cb=None):
         """
@@ -989,20 +1090,15 @@ class Storage(object):
         not yet distributed.
         """
 
-        # TODO this implementation will get the value from the level of the index.
-        # When time permits a proper implementation should be done with for example
-        # a prefix hash table on top of the DHT or using other storage backend with
-        # prefix search built in.
-
         if isinstance(index, list):
             index = "/".join(index)
 
         if not index.startswith("/"):
             index = "/" + index
-        _log.debug("get index %s" % (index))
-        self.get_concat(prefix="index-", key=index, cb=cb)
+        _log.debug("get index %s", index)
+        self.index.get(index, cb=cb)
 
-    def get_index_iter(self, index, include_key=False):
+    def get_index_iter(self, index, include_key=False, cached=False):
         """
         Get multiple values from the registry stored at the index level or
         below it in hierarchy.
@@ -1016,6 +1112,9 @@ class Storage(object):
         include_key: When the parameter include_key is True a tuple of (index, value)
                is placed in dynamic interable instead of only the retrived value,
                note it is only the supplied index, not for each sub-level.
+        cached: When True an identical lookup made within INDEX_CACHE_TTL seconds, or still
+               in progress, is shared instead of asking the registry again. Suitable for
+               requirement matching when deploying many actors with the same requirements.
         returned: Dynamic iterable object
             Values are placed in the dynamic iterable object.
             The dynamic iterable are of the List subclass to
@@ -1030,18 +1129,50 @@ class Storage(object):
         not yet distributed.
         """
 
-        # TODO this implementation will get the value from the level of the index.
-        # When time permits a proper implementation should be done with for example
-        # a prefix hash table on top of the DHT or using other storage backend with
-        # prefix search built in.
-
         if isinstance(index, list):
             index = "/".join(index)
 
         if not index.startswith("/"):
             index = "/" + index
-        _log.debug("get index iter %s" % (index))
-        return self.get_concat_iter(prefix="index-", key=index, include_key=include_key)
+        _log.debug("get index iter %s", index)
+        if cached:
+            return self._get_cached_index_iter(index, include_key)
+        return self.index.get_iter(index, include_key=include_key)
+
+    def _get_cached_index_iter(self, index, include_key):
+        key = (index, include_key)
+        entry = self.index_cache.get(key)
+        if entry is None or (entry['values'] is not None and time.time() - entry['time'] > INDEX_CACHE_TTL):
+            self._expire_index_cache()
+            entry = {'time': None, 'values': None, 'waiters': []}
+            self.index_cache[key] = entry
+            source = self.index.get_iter(index, include_key=include_key)
+            source.set_cb(self._index_cache_resolved, source, entry)
+            # Might already be final, e.g. when failed
+            self._index_cache_resolved(source, entry)
+        if entry['values'] is None:
+            it = dynops.List()
+            entry['waiters'].append(it)
+        else:
+            it = dynops.List(list(entry['values']))
+            it.final()
+        return it
+
+    def _index_cache_resolved(self, source, entry):
+        if not source._final or entry['values'] is not None:
+            return
+        entry['values'] = list(source.list)
+        entry['time'] = time.time()
+        waiters, entry['waiters'] = entry['waiters'], []
+        for it in waiters:
+            it.extend(list(entry['values']))
+            it.final()
+
+    def _expire_index_cache(self):
+        now = time.time()
+        for key, entry in self.index_cache.items():
+            if entry['values'] is not None and now - entry['time'] > INDEX_CACHE_TTL:
+                del self.index_cache[key]
 
     ### Storage proxy server ###
 
@@ -1076,7 +1207,13 @@ class Storage(object):
         """ Gets called when a storage client request"""
         _log.debug("Storage proxy request %s" % payload)
         _log.analyze(self.node.id, "+ SERVER", {'payload': payload})
-        if 'cmd' in payload and payload['cmd'] in self._proxy_cmds:
+        if 'cmd' in payload and payload['cmd'] == 'CAPABILITIES':
+            # Batched commands this master serves, older masters don't answer
+            self._proxy_send_reply(key=None, value=sorted(self._proxy_many_cmds.keys()), tunnel=tunnel,
+                                   encode=False, msgid=payload['msg_uuid'])
+        elif 'cmd' in payload and payload['cmd'] in self._proxy_many_cmds:
+            self._proxy_many(tunnel, payload)
+        elif 'cmd' in payload and payload['cmd'] in self._proxy_cmds:
             if 'value' in payload:
                 if payload['cmd'] == 'SET' and payload['value'] is None:
                     # We detected a delete operation, since a set op with unencoded None is a delete
@@ -1097,6 +1234,27 @@ class Storage(object):
         else:
             _log.error("Unknown storage proxy request %s" % payload['cmd'] if 'cmd' in payload else "")
 
+    def _proxy_many(self, tunnel, payload):
+        """ Serve a batched storage client request with a single reply holding the result of each key """
+        cmd = self._proxy_many_cmds[payload['cmd']]
+        keys = list(set(payload['key']))
+        batch = {'keys': keys, 'result': {}}
+        cb = CalvinCB(self._proxy_many_cb, batch=batch, tunnel=tunnel, encode=cmd == 'GET', msgid=payload['msg_uuid'])
+        if not keys:
+            self._proxy_send_reply(key=[], value={}, tunnel=tunnel, encode=False, msgid=payload['msg_uuid'])
+        for key in keys:
+            if cmd == 'GET':
+                self.get(prefix="", key=key, cb=cb)
+            elif cmd == 'SET' and payload['value'][key] is None:
+                self.delete(prefix="", key=key, cb=cb)
+            else:
+                self._proxy_cmds[cmd](prefix="", key=key, value=self.coder.decode(payload['value'][key]), cb=cb)
+
+    def _proxy_many_cb(self, key, value, batch, tunnel, encode, msgid):
+        batch['result'][key] = self.coder.encode(value) if encode else value
+        if len(batch['result']) == len(batch['keys']):
+            self._proxy_send_reply(key=batch['keys'], value=batch['result'], tunnel=tunnel, encode=False, msgid=msgid)
+
     def _proxy_send_reply(self, key, value, tunnel, encode, msgid):
         _log.analyze(self.node.id, "+ SERVER", {'msgid': msgid, 'key': key, 'value': value})
         tunnel.send({'cmd': 'REPLY', 'msg_uuid': msgid, 'key': key, 'value': self.coder.encode(value) if encode else value})
@@ -109,7 +109,8 @@ class TestStorageStarted(object):
         self.storage.get_node(node.id, cb=CalvinCB(cb))
         yield wait_for(self.q.empty, condition=lambda x: not x())
         value = self.q.get(timeout=.001)
-        assert value["value"] == {u'attributes': {u'indexed_public': [], u'public': {}}, u'control_uris': [u'127.0.0.1:5000'], u'uris': [u'127.0.0.1:5000']}
+        assert value["value"] == {u'attributes': {u'indexed_public': [], u'public': {}}, u'control_uris': [u'127.0.0.1:5000'], u'uris': [u'127.0.0.1:5000'],
+                                  u'migration': [u'packed_state', u'fifo_state', u'precopy']}
 
         self.storage.delete_node(node, cb=CalvinCB(cb))
         yield wait_for(self.q.empty, condition=lambda x: not x())
@@ -214,7 +215,8 @@ class TestStorageNotStarted(object):
         yield wait_for(self.q.empty, condition=lambda x: not x())
         value = self.q.get(timeout=.001)
         assert value["key"] == node.id and value["value"] == {u'attributes': {u'indexed_public': [], u'public': {}},
-                                                              u'control_uris': [u'127.0.0.1:5000'], 'uris': node.uris}
+                                                              u'control_uris': [u'127.0.0.1:5000'], 'uris': node.uris,
+                                                              u'migration': [u'packed_state', u'fifo_state', u'precopy']}
 
         self.storage.delete_node(node, cb=CalvinCB(func=cb))
         yield wait_for(self.q.empty, condition=lambda x: not x())
@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import math
+import time
+
+from calvin.runtime.south.plugins.async import async
+from calvin.utilities import calvinconfig
+from calvin.utilities.calvinlogger import get_logger
+
+_log = get_logger(__name__)
+_conf = calvinconfig.get()
+
+# Seconds per tick of the timer wheel, timers expire at the first tick after their deadline
+TIMER_RESOLUTION = _conf.get(None, "timer_resolution") or 0.010
+# Slots per wheel level (power of two) and number of levels, 256 slots and 4 levels covers 2**32 ticks
+WHEEL_BITS = 8
+WHEEL_LEVELS = 4
+
+
+class WheelTimer(object):
+
+    """
+    A timer of an actor, periodic timers keep their phase, i.e. the next deadline is
+    computed from the previous deadline and not from when the timer fired.
+    The triggered flag stays set until acked, expiries before that are coalesced.
+    """
+
+    def __init__(self, wheel, actor_id, delay, period=None, callback=None):
+        super(WheelTimer, self).__init__()
+        self._wheel = wheel
+        self.actor_id = actor_id
+        self.delay = delay
+        self.period = period
+        self.callback = callback
+        self.deadline = None
+        self.tick = None
+        self._triggered = False
+        self._active = False
+        self._slot = None
+
+    @property
+    def triggered(self):
+        return self._triggered
+
+    def ack(self):
+        self._triggered = False
+
+    def active(self):
+        return self._active
+
+    def cancel(self):
+        self._wheel._remove(self)
+
+    def reset(self):
+        """ Restart the timer, the first deadline is delay seconds from now """
+        self._wheel._remove(self)
+        self.deadline = time.time() + self.delay
+        self._wheel._add(self)
+
+    def trigger(self):
+        """ Expire the timer now, a periodic timer keeps its deadlines """
+        self._triggered = True
+        if self.callback:
+            self.callback()
+        self._wheel.trigger_loop(actor_ids=[self.actor_id])
+
+    def _expired(self, now):
+        self._triggered = True
+        if self.period:
+            # Skip the periods that already passed, e.g. after a long blocking action
+            missed = max(0, int(math.floor((now - self.deadline) / self.period)))
+            self.deadline += (missed + 1) * self.period
+            return missed
+        self._active = False
+        return 0
+
+
+class TimerWheel(object):
+
+    """
+    Hierarchical timer wheel shared by the actors' timers on a runtime.
+    Level 0 has a slot per tick, each higher level a slot per revolution of the level below,
+    timers are moved down a level when the lower level wraps. A single delayed call is armed
+    for the next tick with expiring timers, and the actors of all timers expiring at once are
+    woken up with one trigger_loop.
+    """
+
+    def __init__(self, trigger_loop, resolution=None):
+        super(TimerWheel, self).__init__()
+        self.trigger_loop = trigger_loop
+        self.resolution = resolution or TIMER_RESOLUTION
+        self._slots = 1 << WHEEL_BITS
+        self._mask = self._slots - 1
+        self._levels = [[set() for _ in range(self._slots)] for _ in range(WHEEL_LEVELS)]
+        self._start = time.time()
+        # Next tick to process
+        self._tick = self._current_tick(self._start) + 1
+        self._size = 0
+        self._call = None
+        self._call_tick = None
+        self._expiring = False
+        self._stats = {'expired': 0, 'missed': 0, 'wakeups': 0, 'ticks': 0}
+
+    def once(self, actor_id, delay, callback=None):
+        """ Timer expiring delay seconds from now """
+        timer = WheelTimer(self, actor_id, delay, callback=callback)
+        timer.reset()
+        return timer
+
+    def repeat(self, actor_id, period, callback=None):
+        """ Timer expiring every period seconds from now """
+        timer = WheelTimer(self, actor_id, period, period=period, callback=callback)
+        timer.reset()
+        return timer
+
+    def statistics(self):
+        """
+        timers: active timers
+        expired: timer expiries, missed: periods skipped by periodic timers
+        wakeups: trigger_loop calls, ticks: ticks processed
+        """
+        stats = dict(self._stats)
+        stats['timers'] = self._size
+        stats['resolution'] = self.resolution
+        return stats
+
+    def _current_tick(self, now):
+        return int(math.floor((now - self._start) / self.resolution))
+
+    def _add(self, timer):
+        # First tick at or after the deadline
+        timer.tick = max(self._tick, int(math.ceil((timer.deadline - self._start) / self.resolution)))
+        timer._active = True
+        self._size += 1
+        self._insert(timer)
+        if not self._expiring and (self._call_tick is None or timer.tick < self._call_tick):
+            self._schedule()
+
+    def _insert(self, timer):
+        delta = timer.tick - self._tick
+        for level in range(WHEEL_LEVELS):
+            if delta < 1 << (WHEEL_BITS * (level + 1)) or level == WHEEL_LEVELS - 1:
+                # Beyond the top level the timer waits in the last slot and is reinserted when cascaded
+                tick = min(timer.tick, self._tick + (1 << (WHEEL_BITS * WHEEL_LEVELS)) - 1)
+                timer._slot = self._levels[level][(tick >> (WHEEL_BITS * level)) & self._mask]
+                timer._slot.add(timer)
+                return
+
+    def _remove(self, timer):
+        if not timer._active:
+            return
+        timer._slot.discard(timer)
+        timer._active = False
+        self._size -= 1
+        if self._size == 0 and self._call is not None:
+            self._call.cancel()
+            self._call = self._call_tick = None
+
+    def _cascade(self, level):
+        """ Move the timers of the current slot at level down, returns the slot index """
+        index = (self._tick >> (WHEEL_BITS * level)) & self._mask
+        slot = self._levels[level][index]
+        self._levels[level][index] = set()
+        for timer in slot:
+            self._insert(timer)
+        return index
+
+    def _advance(self, last):
+        """ Process all ticks up to and including last, returns the timers that expired """
+        expired = []
+        if self._size == 0:
+            self._tick = max(self._tick, last + 1)
+            return expired
+        while self._tick <= last and self._size:
+            index = self._tick & self._mask
+            if index == 0:
+                level = 1
+                while level < WHEEL_LEVELS and self._cascade(level) == 0:
+                    level += 1
+            slot = self._levels[0][index]
+            if slot:
+                self._levels[0][index] = set()
+                for timer in slot:
+                    if timer.tick > self._tick:
+                        # Waited in the last slot beyond the top level
+                        self._insert(timer)
+                        continue
+                    expired.append(timer)
+                    self._size -= 1
+                    timer._active = False
+            self._tick += 1
+            self._stats['ticks'] += 1
+        self._tick = max(self._tick, last + 1)
+        return expired
+
+    def _next_tick(self):
+        """ The next tick with expiring timers on level 0, or where level 0 wraps and timers cascade """
+        index = self._tick & self._mask
+        for i in range(index, self._slots):
+            if self._levels[0][i]:
+                return self._tick + i - index
+        return self._tick + self._slots - index
+
+    def _schedule(self):
+        if self._call is not None:
+            self._call.cancel()
+            self._call = self._call_tick = None
+        if self._size == 0:
+            return
+        self._call_tick = self._next_tick()
+        delay = max(0.0, self._start + self._call_tick * self.resolution - time.time())
+        self._call = async.DelayedCall(delay, self._expire)
+
+    def _expire(self):
+        # The call was armed for call_tick, don't let rounding of the time leave it unprocessed
+        last = self._call_tick
+        self._call = self._call_tick = None
+        now = time.time()
+        last = max(last, self._current_tick(now))
+        actor_ids = set()
+        # Timers added by callbacks or rearmed are scheduled once when done
+        self._expiring = True
+        try:
+            for timer in self._advance(last):
+                self._stats['expired'] += 1
+                self._stats['missed'] += timer._expired(now)
+                if timer.period:
+                    self._add(timer)
+                if timer.callback:
+                    try:
+                        timer.callback()
+                    except Exception:
+                        _log.exception("Timer callback failed")
+                actor_ids.add(timer.actor_id)
+        finally:
+            self._expiring = False
+            self._schedule()
+        actor_ids.discard(None)
+        if actor_ids:
+            self._stats['wakeups'] += 1
+            self.trigger_loop(actor_ids=list(actor_ids))
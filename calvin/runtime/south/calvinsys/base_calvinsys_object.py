@@ -81,4 +81,4 @@ class BaseCalvinsysObject(object):
         """
         Trigger the scheduler
         """
-        self.calvinsys.scheduler_wakeup(self.actor)
+        self.calvinsys.scheduler_wakeup(self.actor, self.name)
@@ -16,7 +16,6 @@
 # limitations under the License.
 
 from calvin.runtime.south.calvinsys import base_calvinsys_object
-from calvin.runtime.south.plugins.async import async
 
 class Timer(base_calvinsys_object.BaseCalvinsysObject):
     """
@@ -52,39 +51,41 @@ class Timer(base_calvinsys_object.BaseCalvinsysObject):
 
     def init(self, repeats=False, **kwargs):
         self._timer = None
+        # Triggered but not read when the timer was set again
         self._triggered = False
-        self._timeout = None
-        self._repeats = True
+        self._repeats = repeats
 
-    def _timer_cb(self):
-        self._triggered = True
-        self.scheduler_wakeup()
-        
     def can_read(self):
-        return self._triggered
-    
+        return self._triggered or (self._timer is not None and self._timer.triggered)
+
     def read(self):
         self._triggered = False
-        if self._repeats :
-            self._timer = async.DelayedCall(self._timeout, self._timer_cb)
-    
+        # Repeating timers keep running with their original phase
+        if self._timer:
+            self._timer.ack()
+
     def write(self, set_reset_or_cancel):
         cancel_only = isinstance(set_reset_or_cancel, bool)
 
         # cancel timer if running
-        if self._timer and self._timer.active():
+        if self._timer:
             self._timer.cancel()
-        
+            self._triggered = self._triggered or self._timer.triggered
+            self._timer = None
+
         if not cancel_only:
-            self._timeout = float(set_reset_or_cancel)
-            self._timer = async.DelayedCall(self._timeout, self._timer_cb)
+            timeout = float(set_reset_or_cancel)
+            if self._repeats:
+                self._timer = self.calvinsys.timers().repeat(self.actor.id, timeout)
+            else:
+                self._timer = self.calvinsys.timers().once(self.actor.id, timeout)
 
     def can_write(self):
         # Can always stop & reset a timer
         return True
-        
+
     def close(self):
         if self._timer:
             self._timer.cancel()
-            del self._timer
+            self._timer = None
         self._triggered = False
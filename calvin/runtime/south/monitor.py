@@ -21,18 +21,64 @@ _log = get_logger(__name__)
 
 class Event_Monitor(object):
 
+    """
+    Calls communicate() on the registered endpoints that have something to do.
+    Endpoints mark themselves dirty when tokens are queued, acked or consumed, and
+    stay dirty while they have tokens pending, other endpoints are not touched.
+    """
+
     def __init__(self):
         super(Event_Monitor, self).__init__()
-        """docstring for __init__"""
-
-        self.endpoints = []
+        self.endpoints = set()
+        self._dirty = set()
+        self._last_serviced = 0
+        self._serviced = 0
+        self._loops = 0
 
     def register_endpoint(self, endpoint):
-        self.endpoints.append(endpoint)
+        self.endpoints.add(endpoint)
+        endpoint.monitor = self
+        # Might have tokens already
+        self._dirty.add(endpoint)
 
     def unregister_endpoint(self, endpoint):
         self.endpoints.remove(endpoint)
+        self._dirty.discard(endpoint)
+        endpoint.monitor = None
+
+    def set_dirty(self, endpoint):
+        if endpoint in self.endpoints:
+            self._dirty.add(endpoint)
 
     def loop(self, scheduler):
-        # Communicate endpoint, see if anyone sent anything
-        return any([endp.communicate() for endp in self.endpoints])
+        # Communicate dirty endpoints, see if anyone sent anything
+        activity = False
+        serviced = 0
+        dirty, self._dirty = self._dirty, set()
+        try:
+            while dirty:
+                endp = next(iter(dirty))
+                serviced += 1
+                if endp.communicate():
+                    activity = True
+                # Only done when communicate succeeded
+                dirty.discard(endp)
+                if endp.pending():
+                    self._dirty.add(endp)
+        finally:
+            # Keep the failed endpoint and what was not serviced, unless unregistered meanwhile
+            self._dirty.update(dirty & self.endpoints)
+            self._last_serviced = serviced
+            self._serviced += serviced
+            self._loops += 1
+        return activity
+
+    def statistics(self):
+        """
+        registered: endpoints registered
+        dirty: endpoints to service in the next loop
+        last_loop: endpoints serviced in the last loop
+        serviced, loops: endpoints serviced and loops since start
+        """
+        return {'registered': len(self.endpoints), 'dirty': len(self._dirty), 'last_loop': self._last_serviced,
+                'serviced': self._serviced, 'loops': self._loops}
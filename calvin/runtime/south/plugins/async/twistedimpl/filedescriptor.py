@@ -16,20 +16,121 @@
 
 import sys
 import os
+import mmap
 
 from twisted.internet.abstract import FileDescriptor
 from twisted.internet import fdesc
 
+from calvin.utilities import calvinconfig
+
+_conf = calvinconfig.get()
+
+# Bytes read ahead of the reader, reading from the file is paused when the buffer is full
+READ_BUFFER_SIZE = _conf.get(None, "file_read_buffer") or 65536
+# Map regular files opened for reading into memory instead of reading them through the reactor
+READ_MMAP = bool(_conf.get(None, "file_read_mmap"))
+
+
+class LineBuffer(object):
+    """
+    Bounded buffer of data read from a file, split into lines.
+    Consumed data is dropped from the front of the buffer when it is more than half of it,
+    lines are copied out once through a memoryview.
+    """
+    def __init__(self, max_size=None):
+        super(LineBuffer, self).__init__()
+        self.max_size = max_size or READ_BUFFER_SIZE
+        self._buf = bytearray()
+        self._pos = 0
+        # Position of the newline ending the first line, when found
+        self._eol = -1
+
+    def __len__(self):
+        return len(self._buf) - self._pos
+
+    def full(self):
+        return len(self) >= self.max_size
+
+    def append(self, data):
+        self._buf += data
+
+    def has_line(self, at_end=False):
+        """A complete line, or the last data at end of file, or a line longer than the buffer"""
+        if not len(self):
+            return False
+        if self._eol < 0:
+            self._eol = self._buf.find(b"\n", self._pos)
+        return self._eol >= 0 or at_end or self.full()
+
+    def read_line(self):
+        """Return the first line of the buffer, or all of it when there is no newline"""
+        end = self._eol if self._eol >= 0 else self._buf.find(b"\n", self._pos)
+        if end < 0:
+            end = len(self._buf)
+        line = memoryview(self._buf)[self._pos:end].tobytes()
+        self._consume(end + 1)
+        return line
+
+    def read(self):
+        data = memoryview(self._buf)[self._pos:].tobytes()
+        self._consume(len(self._buf))
+        return data
+
+    def _consume(self, pos):
+        self._eol = -1
+        self._pos = min(pos, len(self._buf))
+        if self._pos == len(self._buf):
+            self._buf = bytearray()
+            self._pos = 0
+        elif self._pos > len(self._buf) / 2:
+            del self._buf[:self._pos]
+            self._pos = 0
+
+
+class MappedFile(object):
+    """Lines of a regular file mapped into memory, same interface as LineBuffer"""
+    def __init__(self, fp):
+        super(MappedFile, self).__init__()
+        self._map = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        self._pos = 0
+
+    def __len__(self):
+        return len(self._map) - self._pos
+
+    def full(self):
+        return False
+
+    def has_line(self, at_end=True):
+        return len(self) > 0
+
+    def read_line(self):
+        end = self._map.find(b"\n", self._pos)
+        if end < 0:
+            end = len(self._map)
+        line = self._map[self._pos:end]
+        self._pos = min(end + 1, len(self._map))
+        return line
+
+    def read(self):
+        data = self._map[self._pos:]
+        self._pos = len(self._map)
+        return data
+
+    def close(self):
+        self._map.close()
+
 
 class FD(FileDescriptor):
     """A Calvin file object"""
     def __init__(self, trigger, fname, mode):
         super(FD, self).__init__()
         self.trigger = trigger
+        self.buffer = LineBuffer()
+        self._done = False
+        self._paused = False
         self._init_fp(fname, mode)
         fdesc.setNonBlocking(self)
         self.connected = True  # Required by FileDescriptor class
-        self.data = b""
 
     def _init_fp(self, fname, mode):
         self.fp = open(fname, mode, buffering=2048)
@@ -41,7 +142,12 @@ class FD(FileDescriptor):
             # In order to determine when we have reached EOF
             self.filelen = os.path.getsize(fname)
             self.totalread = 0
-            self.startReading()
+            if READ_MMAP and self.filelen and "+" not in mode and os.path.isfile(fname):
+                # Lines are read straight from the mapping, nothing to wait for
+                self.buffer = MappedFile(self.fp)
+                self.totalread = self.filelen
+            else:
+                self.startReading()
 
     def fileno(self):
         return self.fp.fileno()
@@ -58,31 +164,52 @@ class FD(FileDescriptor):
 
     def dataRead(self, data):
         self.totalread += len(data)
-        self.data += data
+        self.buffer.append(data)
+        if self.buffer.full():
+            # Continue when the reader has caught up
+            self._paused = True
+            self.stopReading()
 
     def doRead(self):
         self.trigger()
-        return fdesc.readFromFD(self.fp.fileno(), self.dataRead)
+        result = fdesc.readFromFD(self.fp.fileno(), self.dataRead)
+        if result is not None:
+            self._done = True
+        return result
+
+    def _resume(self):
+        if self._paused and len(self.buffer) <= self.buffer.max_size / 2:
+            self._paused = False
+            self.startReading()
+
+    def atEnd(self):
+        """Nothing more to read from the file"""
+        return self._done or self.totalread == self.filelen
 
     def hasData(self):
-        return len(self.data)
+        """A line can be read"""
+        return self.buffer.has_line(self.atEnd())
 
     def endOfFile(self):
         """No buffered data, and we have read the entire file, EOF"""
-        return len(self.data) == 0 and self.totalread == self.filelen
+        return len(self.buffer) == 0 and self.atEnd()
 
     def readLine(self):
         """Return the first line of the buffer"""
-        line, _, self.data = self.data.partition("\n")
+        line = self.buffer.read_line()
+        self._resume()
         return line
 
     def close(self):
+        if isinstance(self.buffer, MappedFile):
+            self.buffer.close()
+            self.buffer = LineBuffer()
         self.loseConnection()
 
     def read(self):
         """Get buffered data"""
-        data = self.data
-        self.data = b""
+        data = self.buffer.read()
+        self._resume()
         return data
 
 
@@ -92,6 +219,7 @@ class FDStdIn(FD):
 
     def _init_fp(self, *args):
         self.fp = sys.stdin
+        self.filelen = None
         self.totalread = 0
         self.startReading()
 
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import pytest
+from mock import patch
+
+from calvin.runtime.south.plugins.async.twistedimpl import filedescriptor
+from calvin.runtime.south.plugins.async.twistedimpl.filedescriptor import FD, LineBuffer, MappedFile
+
+pytestmark = pytest.mark.unittest
+
+
+def read_lines(fd):
+    lines = []
+    while not fd.endOfFile():
+        if fd.hasData():
+            lines.append(fd.readLine())
+        else:
+            fd.doRead()
+    return lines
+
+
+class TestLineBuffer(object):
+
+    def test_lines(self):
+        buf = LineBuffer(max_size=16)
+        buf.append(b"ab\nc")
+        assert buf.has_line()
+        assert buf.read_line() == b"ab"
+        # Partial line waits for more data or end of file
+        assert not buf.has_line()
+        assert buf.has_line(at_end=True)
+        buf.append(b"d\n\nef")
+        assert buf.read_line() == b"cd"
+        assert buf.read_line() == b""
+        assert buf.read() == b"ef"
+        assert len(buf) == 0
+        assert not buf.has_line(at_end=True)
+
+    def test_bounded(self):
+        buf = LineBuffer(max_size=8)
+        buf.append(b"0123456789")
+        assert buf.full()
+        # A line longer than the buffer is returned in pieces
+        assert buf.has_line()
+        assert buf.read_line() == b"0123456789"
+        buf.append(b"a\n" * 8)
+        for _ in range(5):
+            assert buf.read_line() == b"a"
+        # Consumed data is dropped from the buffer
+        assert len(buf._buf) == 6
+        assert len(buf) == 6
+
+
+class TestFD(object):
+
+    def _file(self, tmpdir, data):
+        f = tmpdir.join("data.txt")
+        f.write(data, mode="wb")
+        return str(f)
+
+    @patch.object(FD, 'stopReading')
+    @patch.object(FD, 'startReading')
+    def test_read_lines(self, start_reading, stop_reading, tmpdir):
+        lines = ["line %d" % i for i in range(10000)]
+        fd = FD(lambda: None, self._file(tmpdir, "\n".join(lines)), "r")
+        assert read_lines(fd) == lines
+        assert fd.endOfFile()
+
+    @patch.object(FD, 'stopReading')
+    @patch.object(FD, 'startReading')
+    def test_read_ahead_paused(self, start_reading, stop_reading, tmpdir):
+        fd = FD(lambda: None, self._file(tmpdir, ("x" * 99 + "\n") * 10000), "r")
+        fd.buffer.max_size = 1000
+        while not stop_reading.called:
+            fd.doRead()
+        assert len(fd.buffer) >= 1000
+        start_reading.reset_mock()
+        while not start_reading.called:
+            assert fd.readLine() == "x" * 99
+        # Resumed when at most half full
+        assert len(fd.buffer) <= 500
+        fd.close()
+
+    def test_mmap(self, tmpdir):
+        lines = ["line %d" % i for i in range(1000)] + [""]
+        with patch.object(filedescriptor, 'READ_MMAP', True):
+            with patch.object(FD, 'startReading') as start_reading:
+                fd = FD(lambda: None, self._file(tmpdir, "\n".join(lines) + "\nlast"), "r")
+                assert not start_reading.called
+        assert isinstance(fd.buffer, MappedFile)
+        assert fd.hasData()
+        assert read_lines(fd) == lines + ["last"]
+        assert not fd.hasData()
+        fd.close()
@@ -32,6 +32,7 @@ class Chart():
     def __init__(self, node, actor, ctype=None, dataset=[], **kwargs):
         self._node = node
         self._actor = actor
+        self._trigger_sched = node.sched.io_trigger(actor.id, "chart")
         self._req_counter = 0
         self._requests = []
 
@@ -367,7 +368,7 @@ class Chart():
         import time
         time.sleep(3)
         request["image"] = result
-        self._node.sched.trigger_loop(actor_ids=[self._actor])
+        self._trigger_sched()
 
     def _cb_error(self, *args, **kwargs):
         _log.error("%r: %r" % (args, kwargs))
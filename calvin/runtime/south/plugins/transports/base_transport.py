@@ -14,6 +14,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from collections import OrderedDict
 from calvin.utilities.calvin_callback import CalvinCBClass
 from calvin.runtime.north.plugins.coders.messages import message_coder_factory
 
@@ -105,8 +106,9 @@ class BaseTransport(CalvinCBClass):
         """
             Return the filtered coders on this transport
                 can be a subset of the total in the system.
+                Ordered with the preferred coder first.
         """
-        coders = {}
+        coders = OrderedDict()
         for coder in message_coder_factory.get_prio_list():
             coders[coder] = message_coder_factory.get(coder)
         return coders
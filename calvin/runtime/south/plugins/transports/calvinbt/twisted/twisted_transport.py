@@ -150,19 +150,19 @@ class TwistedCalvinTransport(base_transport.CalvinTransportBase):
         c.connect()
 
     def _set_proto(self, proto):
-        _log.debug("%s, %s, %s" % (self, '_set_proto', proto))
+        _log.debug("%s, %s, %s", self, '_set_proto', proto)
         self._proto = proto
 
     def _connected(self, proto):
-        _log.debug("%s, %s" % (self, 'connected'))
+        _log.debug("%s, %s", self, 'connected')
         self._callback_execute('connected')
 
     def _disconnected(self, reason):
-        _log.debug("%s, %s, %s" % (self, 'disconnected', reason))
+        _log.debug("%s, %s, %s", self, 'disconnected', reason)
         self._callback_execute('disconnected', str(reason))
 
     def _data(self, data):
-        _log.debug("%s, %s, %s" % (self, '_data', data))
+        _log.debug("%s, %s, %s", self, '_data', data)
         self._callback_execute('data', data)
 
 
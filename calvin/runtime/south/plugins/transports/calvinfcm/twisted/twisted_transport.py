@@ -88,7 +88,7 @@ class CalvinXMLStreamProtocol(CalvinCBClass, xmlstream.XmlStream):
         for name in valid_names:
             cbs = self.get_callbacks_by_name(name)
             for cb_id in cbs:
-                _log.debug("Removing cbs: %s" % cb_id)
+                _log.debug("Removing cbs: %s", cb_id)
                 ids.append(cb_id)
         
         for cb_id in ids:
@@ -235,26 +235,26 @@ class TwistedCalvinTransport(base_transport.CalvinTransportBase):
             reactor.connectTCP(self._host_ip, int(self._host_port), self._factory)
 
     def _set_proto(self, proto):
-        _log.debug("%s, %s, %s" % (self, '_set_proto', proto))
+        _log.debug("%s, %s, %s", self, '_set_proto', proto)
         if self._proto:
             _log.error("_set_proto: Already connected")
             return
         self._proto = proto
 
     def _connected(self, proto):
-        _log.debug("%s, %s" % (self, 'connected'))
+        _log.debug("%s, %s", self, 'connected')
         self._callback_execute('connected')
 
     def _disconnected(self, reason):
-        _log.debug("%s, %s, %s" % (self, 'disconnected', reason))
+        _log.debug("%s, %s, %s", self, 'disconnected', reason)
         self._callback_execute('disconnected', reason)
 
     def _connection_failed(self, addr, reason):
-        _log.debug("%s, %s, %s" % (self, 'connection_failed', reason))
+        _log.debug("%s, %s, %s", self, 'connection_failed', reason)
         self._callback_execute('connection_failed', reason)
 
     def _data(self, data):
-        _log.debug("%s, %s, %s" % (self, '_data', data))
+        _log.debug("%s, %s, %s", self, '_data', data)
         self._callback_execute('data', data)
 
 
@@ -85,7 +85,7 @@ class CalvinTransport(base_transport.BaseTransport):
     def send(self, payload, timeout=None, coder=None):
         tcoder = coder or self._coder
         try:
-            _log.debug('send_message %s => %s "%s"' % (self._rt_id, self._remote_rt_id, payload))
+            _log.debug('send_message %s => %s "%s"', self._rt_id, self._remote_rt_id, payload)
             self._callback_execute('send_message', self, payload)
             # Send
             raw_payload = tcoder.encode(payload)
@@ -137,6 +137,7 @@ class CalvinTransport(base_transport.BaseTransport):
 
             sid = data_obj['sid']
 
+            # Pick our most preferred coder that the peer supports
             for coder in self.get_coders():
                 if coder in data_obj['serializers']:
                     self._coder = self.get_coders()[coder]
@@ -273,7 +274,7 @@ class CalvinServer(base_transport.BaseServer):
         import socket
         
         if uri in self._peers:
-            _log.info("Peer %s already connected" % uri)
+            _log.info("Peer %s already connected", uri)
             # Disconnect client localy and remove callbacks
             
             class ErrorMessage:
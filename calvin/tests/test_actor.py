@@ -122,8 +122,9 @@ def test_state(actor):
         '_component_members': set([actor.id]),
         '_has_started': False,
         '_deployment_requirements': [],
-        '_managed': set(['dump', '_has_started', '_signature', '_id', '_deployment_requirements', '_name', '_subject_attributes', '_migration_info', '_port_property_capabilities', '_replication_data', 'last']),
+        '_managed': set(['dump', '_has_started', '_signature', '_id', '_deployment_requirements', '_name', '_subject_attributes', '_migration_info', '_port_property_capabilities', '_replication_data', '_priority', 'last']),
         '_signature': None,
+        '_priority': 1,
         'dump': False,
         '_id': actor.id,
         '_port_property_capabilities': None,
@@ -131,11 +132,7 @@ def test_state(actor):
                                              'routing': 'default',
                                              'nbr_peers': 1},
                               'queue': {'N': 5,
-                                       'fifo': [{'data': 0, 'type': 'Token'},
-                                                {'data': 0, 'type': 'Token'},
-                                                {'data': 0, 'type': 'Token'},
-                                                {'data': 0, 'type': 'Token'},
-                                                {'data': 0, 'type': 'Token'}],
+                                       'fifo': {'first': 0, 'tokens': []},
                                        'queuetype': 'fanout_fifo',
                                        'read_pos': {inport.id: 0},
                                        'reader_offset': {inport.id: 0},
@@ -149,11 +146,7 @@ def test_state(actor):
                                               'routing': 'fanout',
                                               'nbr_peers': 1},
                                'queue': {'N': 5,
-                                        'fifo': [{'data': 0, 'type': 'Token'},
-                                                 {'data': 0, 'type': 'Token'},
-                                                 {'data': 0, 'type': 'Token'},
-                                                 {'data': 0, 'type': 'Token'},
-                                                 {'data': 0, 'type': 'Token'}],
+                                        'fifo': {'first': 0, 'tokens': []},
                                         'queuetype': 'fanout_fifo',
                                         'read_pos': {},
                                         'reader_offset': {},
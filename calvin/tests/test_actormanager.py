@@ -20,6 +20,10 @@ from mock import Mock, patch
 
 from calvin.tests import DummyNode
 from calvin.runtime.north.actormanager import ActorManager
+from calvin.runtime.north.replicationmanager import ReplicationManager, ReplicationData
+from calvin.utilities.replication_defs import REPLICATION_STATUS
+from calvin.runtime.north import migration_state
+from calvin.requests import calvinresponse
 from calvin.runtime.north.plugins.port import queue
 
 pytestmark = pytest.mark.unittest
@@ -32,6 +36,10 @@ class ActorManagerTests(unittest.TestCase):
         self.am = ActorManager(node=n)
         n.am = self.am
         n.pm.remove_ports_of_actor = Mock(return_value = [])
+        self._peer_info({'migration': migration_state.CAPABILITIES})
+
+    def _peer_info(self, value):
+        self.am.node.storage.get_node = Mock(side_effect=lambda node_id, cb: cb(node_id, value))
 
     def tearDown(self):
         pass
@@ -148,6 +156,219 @@ class ActorManagerTests(unittest.TestCase):
         self.assertEqual(cb.kwargs['ports'], actor.connections(self.am.node.id))
         self.am.node.control.log_actor_migrate.assert_called_once_with(actor_id, peer_node.id)
 
+    def _disconnected(self, actor, actor_id, callback):
+        actor.outports['token'].set_queue(queue.fanout_fifo.FanoutFIFO({'queue_length': 4, 'direction': "out"}, {}))
+        self.am.node.proto = Mock()
+        peer_node = DummyNode()
+        self.am.migrate(actor_id, peer_node.id, callback)
+        args, kwargs = self.am.node.pm.disconnect.call_args
+        kwargs['callback'](status=calvinresponse.CalvinResponse(True))
+        return peer_node
+
+    def test_migrate_sends_packed_state(self):
+        callback_mock = Mock()
+        actor, actor_id = self._new_actor('std.Constant', {'data': 42})
+        peer_node = self._disconnected(actor, actor_id, callback_mock)
+
+        assert not self.am.node.proto.actor_new_chunk.called
+        args, kwargs = self.am.node.proto.actor_new.call_args
+        self.assertEqual(args[0], peer_node.id)
+        self.assertEqual(kwargs['actor_type'], 'std.Constant')
+        assert migration_state.is_packed(kwargs['state'])
+        self.assertEqual(migration_state.unpack(kwargs['state'])['data'], 42)
+
+        # Peer reply
+        kwargs['callback'](calvinresponse.CalvinResponse(True))
+        assert callback_mock.called
+        # Unpacked state for retries on other nodes
+        self.assertEqual(callback_mock.call_args[1]['state']['data'], 42)
+        stats = self.am.migration_statistics()
+        self.assertEqual(len(stats), 1)
+        self.assertEqual(stats[0]['actor_id'], actor_id)
+        self.assertEqual(stats[0]['node_id'], peer_node.id)
+        assert stats[0]['status']
+        assert stats[0]['latency'] >= 0
+        assert stats[0]['sent_bytes'] > 0
+
+    @patch('calvin.runtime.north.actormanager.MIGRATION_CHUNK_SIZE', 64)
+    def test_migrate_sends_chunks_ahead(self):
+        actor, actor_id = self._new_actor('std.Constant', {'data': range(100)})
+        self._disconnected(actor, actor_id, Mock())
+
+        proto = self.am.node.proto
+        chunks = []
+        # Each chunk is sent when the previous one is acknowledged
+        while proto.actor_new_chunk.called:
+            args, kwargs = proto.actor_new_chunk.call_args
+            proto.actor_new_chunk.reset_mock()
+            self.assertEqual(args[2], actor_id)
+            chunks.append(args[3:])
+            assert not proto.actor_new.called
+            args[1](calvinresponse.CalvinResponse(True))
+        assert len(chunks) > 1
+        assert all(key == 'data' for key, index, data in chunks)
+        assert proto.actor_new.called
+
+        # Chunks are kept by the peer until the state arrives
+        peer = ActorManager(node=DummyNode())
+        for key, index, data in chunks:
+            assert peer.new_chunk_from_migration(actor_id, key, index, data)
+        packed = proto.actor_new.call_args[1]['state']
+        self.assertEqual(migration_state.unpack(packed, peer._migration_chunks[actor_id])['data'], range(100))
+
+    def test_migrate_to_older_peer(self):
+        actor, actor_id = self._new_actor('std.Constant', {'data': 42})
+        # Node info without migration capabilities
+        self._peer_info({'uris': []})
+        self._disconnected(actor, actor_id, Mock())
+
+        state = self.am.node.proto.actor_new.call_args[1]['state']
+        assert not migration_state.is_packed(state)
+        self.assertEqual(state['data'], 42)
+        # All queue slots
+        self.assertEqual(len(state['outports']['token']['queue']['fifo']), 5)
+
+    def test_replicate_to_older_peer(self):
+        actor, actor_id = self._new_actor('std.Constant', {'data': 42})
+        actor.outports['token'].set_queue(queue.fanout_fifo.FanoutFIFO({'queue_length': 4, 'direction': "out"}, {}))
+        actor._replication_data = ReplicationData(actor_id=actor_id, master=actor_id)
+        actor._replication_data.status = REPLICATION_STATUS.READY
+        self._peer_info({'uris': []})
+        self.am.node.proto = Mock()
+        ReplicationManager(self.am.node).replicate(actor_id, "peer", Mock())
+        args = self.am.node.proto.actor_new.call_args[0]
+        self.assertEqual(args[0], "peer")
+        # All queue slots
+        self.assertEqual(len(args[3]['outports']['token']['queue']['fifo']), 5)
+
+    def test_migrate_actor_gone_during_lookup(self):
+        callback_mock = Mock()
+        actor, actor_id = self._new_actor('std.Constant', {'data': 42})
+        self.am.node.storage.get_node = Mock()
+        self.am.migrate(actor_id, "peer", callback_mock)
+        self.am.destroy(actor_id)
+        self.am.node.storage.get_node.call_args[1]['cb']("peer", {})
+        assert not self.am.node.pm.disconnect.called
+        assert not callback_mock.call_args[1]['status']
+
+    def test_migrate_chunk_failure(self):
+        actor, actor_id = self._new_actor('std.Constant', {'data': 42})
+        done = Mock()
+        self.am.node.proto = Mock()
+        send = Mock()
+        self.am._send_state_chunk(calvinresponse.CalvinResponse(False), node_id="node", actor_id=actor_id,
+                                  chunks=[('data', 1, "x")], send=send, done=done)
+        assert not self.am.node.proto.actor_new_chunk.called
+        assert not send.called
+        assert not done.call_args[0][0]
+
+    def test_chunk_out_of_order(self):
+        assert self.am.new_chunk_from_migration("actor", "data", 0, "a")
+        assert not self.am.new_chunk_from_migration("actor", "data", 2, "c")
+        assert "actor" not in self.am._migration_chunks
+
+    @patch('calvin.runtime.north.actormanager.async')
+    def test_chunks_expire(self, async_mock):
+        assert self.am.new_chunk_from_migration("actor", "data", 0, "a")
+        args = async_mock.DelayedCall.call_args[0]
+        self.assertEqual(args[1:], (self.am._expire_chunks, "actor"))
+        args[1](*args[2:])
+        assert "actor" not in self.am._migration_chunks
+        assert "actor" not in self.am._migration_chunk_timers
+
+    @patch('calvin.runtime.north.actormanager.async')
+    def test_chunks_timer_cancelled(self, async_mock):
+        assert self.am.new_chunk_from_migration("actor", "data", 0, "a")
+        timer = self.am._migration_chunk_timers["actor"]
+        assert self.am._pop_chunks("actor") == {"data": ["a"]}
+        assert timer.cancel.called
+        assert "actor" not in self.am._migration_chunk_timers
+
+    def test_new_from_migration_missing_chunks(self):
+        callback_mock = Mock()
+        actor, actor_id = self._new_actor('std.Constant', {'data': 42})
+        packed, chunks, size = migration_state.pack(actor.state(), 6, chunk_size=1)
+        self.am.new_from_migration('std.Constant', packed, callback=callback_mock)
+        assert not callback_mock.call_args[1]['status']
+
+    def test_migrate_precopy(self):
+        callback_mock = Mock()
+        actor, actor_id = self._new_actor('std.Constant', {'data': range(100)})
+        actor.outports['token'].set_queue(queue.fanout_fifo.FanoutFIFO({'queue_length': 4, 'direction': "out"}, {}))
+        self.am.node.proto = Mock()
+        peer = ActorManager(node=DummyNode())
+        self.am.migrate(actor_id, peer.node.id, callback_mock, precopy=True)
+
+        # The snapshot is sent while the actor is still running
+        assert not self.am.node.pm.disconnect.called
+        args, kwargs = self.am.node.proto.actor_precopy.call_args
+        self.assertEqual(args[0], peer.node.id)
+        assert peer.new_precopy(kwargs['state'])
+        assert actor_id in peer._precopies
+        actor.data = 7
+        kwargs['callback'](calvinresponse.CalvinResponse(True))
+
+        # Then frozen, only what changed is sent
+        assert self.am.node.pm.disconnect.called
+        args, kwargs = self.am.node.pm.disconnect.call_args
+        kwargs['callback'](status=calvinresponse.CalvinResponse(True))
+        args, kwargs = self.am.node.proto.actor_new.call_args
+        delta = migration_state.unpack(kwargs['state'])
+        assert migration_state.is_delta(delta)
+        self.assertEqual(delta['data'], 7)
+        assert '_name' not in delta
+        state = migration_state.merge(peer._precopies[actor_id][1], delta)
+        self.assertEqual(state['data'], 7)
+        self.assertEqual(state['_name'], actor.name)
+
+        kwargs['callback'](calvinresponse.CalvinResponse(True))
+        record = self.am.migration_statistics()[-1]
+        assert record['precopy']
+        assert record['precopy_bytes'] > record['sent_bytes']
+        assert 0 <= record['freeze'] <= record['latency']
+        assert callback_mock.called
+
+    def test_migrate_precopy_failed(self):
+        actor, actor_id = self._new_actor('std.Constant', {'data': 42})
+        actor.outports['token'].set_queue(queue.fanout_fifo.FanoutFIFO({'queue_length': 4, 'direction': "out"}, {}))
+        self.am.node.proto = Mock()
+        self.am.migrate(actor_id, "peer", Mock(), precopy=True)
+        # Peer without precopy support
+        self.am.node.proto.actor_precopy.call_args[1]['callback'](calvinresponse.CalvinResponse(False))
+        args, kwargs = self.am.node.pm.disconnect.call_args
+        kwargs['callback'](status=calvinresponse.CalvinResponse(True))
+        state = migration_state.unpack(self.am.node.proto.actor_new.call_args[1]['state'])
+        assert not migration_state.is_delta(state)
+        self.assertEqual(state['data'], 42)
+
+    def test_migrate_precopy_older_peer(self):
+        actor, actor_id = self._new_actor('std.Constant', {'data': 42})
+        actor.outports['token'].set_queue(queue.fanout_fifo.FanoutFIFO({'queue_length': 4, 'direction': "out"}, {}))
+        self._peer_info({'migration': [migration_state.PACKED_STATE, migration_state.FIFO_STATE]})
+        self.am.node.proto = Mock()
+        self.am.migrate(actor_id, "peer", Mock(), precopy=True)
+        # Frozen right away without a snapshot
+        assert not self.am.node.proto.actor_precopy.called
+        assert self.am.node.pm.disconnect.called
+
+    def test_migrate_precopy_actor_gone(self):
+        callback_mock = Mock()
+        actor, actor_id = self._new_actor('std.Constant', {'data': 42})
+        self.am.node.proto = Mock()
+        self.am.migrate(actor_id, "peer", callback_mock, precopy=True)
+        self.am.destroy(actor_id)
+        self.am.node.proto.actor_precopy.call_args[1]['callback'](calvinresponse.CalvinResponse(True))
+        assert not self.am.node.pm.disconnect.called
+        assert not callback_mock.call_args[1]['status']
+
+    def test_new_from_migration_without_precopy(self):
+        callback_mock = Mock()
+        actor, actor_id = self._new_actor('std.Constant', {'data': 42})
+        state = actor.state()
+        delta = migration_state.delta(state, migration_state.digests(state))
+        self.am.new_from_migration('std.Constant', delta, callback=callback_mock)
+        assert not callback_mock.call_args[1]['status']
+
     def test_connect(self):
         actor, actor_id = self._new_actor('std.Constant', {'data': 42})
         connection_list = [['1', '2', '3', '4'], ['5', '6', '7', '8']]
@@ -201,6 +422,13 @@ class ActorManagerTests(unittest.TestCase):
         enabled_actor.enable()
         self.assertEqual(self.am.enabled_actors(), [enabled_actor])
 
+    def test_enabled_actors_by_id(self):
+        actor, actor_id = self._new_actor('std.Constant', {'data': 42, 'name': 'actor'})
+        enabled_actor, enabled_actor_id = self._new_actor('std.Constant', {'data': 42, 'name': 'actor'})
+        enabled_actor.enable()
+        self.assertEqual(self.am.enabled_actors([actor_id, enabled_actor_id, "unknown"]), [enabled_actor])
+        self.assertEqual(self.am.enabled_actors([actor_id]), [])
+
     def test_list_actors(self):
         actor_1, actor_1_id = self._new_actor('std.Constant', {'data': 42, 'name': 'actor'})
         actor_2, actor_2_id = self._new_actor('std.Constant', {'data': 42, 'name': 'actor'})
@@ -15,8 +15,9 @@
 # limitations under the License.
 
 import pytest
-from mock import Mock
+from mock import Mock, patch
 
+from calvin.utilities import calvin_callback
 from calvin.utilities.calvin_callback import CalvinCB, CalvinCBGroup, CalvinCBClass
 
 pytestmark = pytest.mark.unittest
@@ -89,3 +90,27 @@ def test_calvin_cb_class():
 
     cb._callback_execute('f', 1, 2, a=3)
     func.assert_called_with(1, 2, a=3)
+
+
+def test_callback_ids():
+    cb1 = CalvinCB(Mock())
+    cb2 = CalvinCB(Mock())
+    group = CalvinCBGroup([cb1, cb2])
+    assert len(set([cb1._id, cb2._id, group._id])) == 3
+    with pytest.raises(AttributeError):
+        cb1.unknown = True
+
+
+@patch.object(calvin_callback, 'CALLBACK_DEBUG', True)
+def test_debug_info():
+    def fail():
+        raise Exception("failed")
+    cb = CalvinCB(fail)
+    assert cb._debug_info[-1][2] == "test_debug_info"
+    with patch.object(calvin_callback, '_log') as log:
+        cb()
+        assert "test_debug_info" in log.info.call_args[0][0]
+
+
+def test_no_debug_info():
+    assert CalvinCB(Mock())._debug_info is None
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import pytest
+
+from calvin.runtime.north.calvin_token import Token, ExceptionToken, EOSToken, encode_compact, decode_compact
+from calvin.runtime.north.plugins.coders.messages import message_coder_factory, msgpack_coder
+
+pytestmark = pytest.mark.unittest
+
+
+@pytest.mark.parametrize("token", [Token(5), Token({'a': [1, 2.5, None]}), Token("\x00\xffjpeg"),
+                                   ExceptionToken(), EOSToken(), Token(None)])
+def test_compact_roundtrip(token):
+    data = encode_compact(token.encode())
+    decoded = Token.decode(data)
+    assert decoded.__class__ == token.__class__
+    assert decoded.value == token.value
+    assert decode_compact(data) == token.encode()
+
+
+def test_compact_bytes_passthrough():
+    frame = "\xff\xd8" + "x" * 1000
+    data = encode_compact(Token(frame).encode())
+    # One tag byte followed by the raw bytes
+    assert len(data) == len(frame) + 1
+    assert data[1:] == frame
+
+
+def test_compact_coder():
+    coder = message_coder_factory.get("compact")
+    tokens = [Token(1).encode(), Token("raw").encode(), EOSToken().encode()]
+    msg = {'cmd': 'TUNNEL_DATA', 'tunnel_id': "x", 'value': {'cmd': 'TOKENS', 'sequencenbr': 3, 'tokens': tokens}}
+    decoded = coder.decode(coder.encode(msg))
+    # The message sent is not modified
+    assert msg['value']['tokens'] == tokens
+    assert decoded['value']['sequencenbr'] == 3
+    assert [Token.decode(t).value for t in decoded['value']['tokens']] == [1, "raw", "End of stream"]
+    # Received tokens in wire format are passed along as is
+    assert coder.decode(coder.encode(decoded))['value']['tokens'] == decoded['value']['tokens']
+
+    msg = {'cmd': 'TUNNEL_DATA', 'tunnel_id': "x", 'value': {'cmd': 'TOKEN', 'sequencenbr': 3, 'token': tokens[0]}}
+    assert Token.decode(coder.decode(coder.encode(msg))['value']['token']).value == 1
+
+
+def test_coder_prio_list():
+    prio_list = message_coder_factory.get_prio_list()
+    assert set(prio_list) == set(["compact", "json", "msgpack"])
+    assert prio_list[0] == ("compact" if msgpack_coder.NATIVE else "json")
@@ -96,3 +96,25 @@ def test_analyze(extract_stack, node_id, func, param, peer_node_id, tb, mute, ar
             assert extract_stack.called
         else:
             assert not extract_stack.called
+
+
+def test_lazy():
+    func = Mock(return_value="value")
+    lazy = calvinlogger.Lazy(func, 1, 2)
+    assert not func.called
+    assert str(lazy) == "value"
+    func.assert_called_with(1, 2)
+
+
+def test_analyze_lazy():
+    calvinlogger._log = None
+    log = calvinlogger.get_logger()
+    func = Mock(return_value={"a": 1})
+    log.isEnabledFor = Mock(return_value=False)
+    log._log = Mock()
+    log.analyze(node_id=1, func="func", param=calvinlogger.Lazy(func))
+    assert not func.called
+    log.isEnabledFor = Mock(return_value=True)
+    log.analyze(node_id=1, func="func", param=calvinlogger.Lazy(func))
+    assert func.called
+    assert json.loads(log._log.call_args[0][1][11:])["param"] == {"a": 1}
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import unittest
+import pytest
+from mock import Mock, patch
+
+from calvin.utilities import dynops
+from calvin.utilities import requirement_matching
+from calvin.runtime.north import storage
+from calvin.tests import DummyNode
+
+pytestmark = pytest.mark.unittest
+
+
+def drain(it):
+    values = []
+    try:
+        for v in it:
+            values.append(v)
+    except dynops.PauseIteration:
+        pass
+    return values
+
+
+class DynOpsTests(unittest.TestCase):
+
+    def test_union(self):
+        l = dynops.List()
+        u = dynops.Union(l, [1, 2, 3])
+        cb = Mock()
+        u.set_cb(cb)
+        assert sorted(drain(u)) == [1, 2, 3]
+        l.extend([2, 4])
+        assert cb.called
+        assert drain(u) == [4]
+        l.final()
+        with pytest.raises(StopIteration):
+            u.next()
+
+    def test_map_trig_after_stop(self):
+        l = dynops.List()
+        m = dynops.Map(None, l)
+        cb = Mock()
+        m.set_cb(cb)
+        with pytest.raises(dynops.PauseIteration):
+            m.next()
+        l.append(1)
+        assert cb.call_count == 1
+        assert m.next() == 1
+        m.out_iter.final()
+        with pytest.raises(StopIteration):
+            m.next()
+        assert not m.during_next
+        # Map must still propagate triggers after being stopped
+        cb.reset_mock()
+        m.out_iter._final = False
+        m.out_iter.append(2)
+        assert cb.called
+
+
+class ReqMatchTests(unittest.TestCase):
+
+    def setUp(self):
+        self.node = Mock()
+        self.node.id = "node1"
+        self.leafs = []
+        def req_op(node, actor_id=None, component=None, **kwargs):
+            it = dynops.List()
+            self.leafs.append(it)
+            return it
+        self.req_operations = {'node_attr_match': Mock(req_op=req_op)}
+
+    def match(self, callback):
+        requirements = [{'op': 'node_attr_match', 'kwargs': {}, 'type': '+'},
+                        {'op': 'node_attr_match', 'kwargs': {}, 'type': '+'}]
+        with patch.object(requirement_matching, 'req_operations', self.req_operations):
+            r = requirement_matching.ReqMatch(self.node, callback=callback)
+            r.match(requirements, actor_id="actor1")
+        return r
+
+    @patch.object(requirement_matching, 'async')
+    def test_triggered_by_leafs(self, async_mock):
+        callback = Mock()
+        r = self.match(callback)
+        assert not callback.called
+        self.leafs[0].extend(["node1", "node2"])
+        self.leafs[0].final()
+        self.leafs[1].extend(["node2", "node3"])
+        assert not callback.called
+        self.leafs[1].final()
+        # Completed through the leaf triggers, not by the safety net timer
+        assert callback.called
+        assert callback.call_args[1]['possible_placements'] == set(["node2"])
+        assert r.done
+        delayed = async_mock.DelayedCall
+        assert delayed.call_args[0][0] == requirement_matching.PAUSE_TIMEOUT
+
+    @patch.object(requirement_matching, 'async')
+    def test_retrigger_during_iteration(self, async_mock):
+        callback = Mock()
+        r = self.match(callback)
+        self.leafs[0].extend(["node1"])
+        self.leafs[0].final()
+        # A leaf filled in while collecting makes the collection iterate again
+        r._collecting = True
+        self.leafs[1].extend(["node1"])
+        self.leafs[1].final()
+        assert r._collect_placement_retrigger
+        assert not callback.called
+        r._collecting = False
+        r._collect_placements()
+        assert callback.call_args[1]['possible_placements'] == set(["node1"])
+
+
+class IndexCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.storage = storage.Storage(DummyNode(), override_storage=Mock())
+        self.sources = []
+        def get_iter(index, include_key=False):
+            it = dynops.List()
+            self.sources.append(it)
+            return it
+        self.storage.index.get_iter = get_iter
+
+    def test_shared_lookup(self):
+        it1 = self.storage.get_index_iter(['node', 'attr'], cached=True)
+        it2 = self.storage.get_index_iter(['node', 'attr'], cached=True)
+        assert len(self.sources) == 1
+        self.sources[0].extend(["node1", "node2"])
+        assert drain(it1) == []
+        self.sources[0].final()
+        assert drain(it1) == ["node1", "node2"]
+        assert drain(it2) == ["node1", "node2"]
+        it3 = self.storage.get_index_iter(['node', 'attr'], cached=True)
+        assert it3._final
+        assert drain(it3) == ["node1", "node2"]
+        assert len(self.sources) == 1
+        # Not cached lookups and other indexes are asked for
+        self.storage.get_index_iter(['node', 'attr'])
+        self.storage.get_index_iter(['node', 'other'], cached=True)
+        assert len(self.sources) == 3
+
+    @patch.object(storage, 'time')
+    def test_expire(self, time_mock):
+        time_mock.time.return_value = 100.0
+        self.storage.get_index_iter(['node', 'attr'], cached=True)
+        self.sources[0].final()
+        time_mock.time.return_value = 100.0 + storage.INDEX_CACHE_TTL + 1
+        self.storage.get_index_iter(['node', 'attr'], cached=True)
+        assert len(self.sources) == 2
@@ -66,6 +66,34 @@ class TestLocalEndpoint(unittest.TestCase):
         self.port.queue.commit(self.port.id)
         assert self.port.tokens_available(0, self.port.id)
 
+    def test_communicate_wakeup(self):
+        trigger_loop = Mock()
+        self.local_in.trigger_loop = trigger_loop
+        self.local_out.trigger_loop = trigger_loop
+
+        assert not self.local_out.communicate()
+        assert not trigger_loop.called
+
+        self.peer_port.queue.write(0, None)
+        assert self.local_out.communicate()
+        # Only the reader got tokens, the writer was never blocked
+        trigger_loop.assert_called_once_with(actor_ids=[self.port.owner.id])
+
+        trigger_loop.reset_mock()
+        for i in range(1, 5):
+            self.peer_port.queue.write(i, None)
+        # Reader queue full, refill writer queue until full
+        self.local_out.communicate()
+        for i in range(5, 8):
+            self.peer_port.queue.write(i, None)
+        assert not self.peer_port.tokens_available(1)
+        trigger_loop.reset_mock()
+        self.port.queue.peek(self.port.id)
+        self.port.queue.commit(self.port.id)
+        assert self.local_out.communicate()
+        trigger_loop.assert_any_call(actor_ids=[self.port.owner.id])
+        trigger_loop.assert_any_call(actor_ids=[self.peer_port.owner.id])
+
     def test_get_peer(self):
         assert self.local_in.get_peer() == ('local', self.peer_port.id)
         assert self.local_out.get_peer() == ('local', self.port.id)
@@ -77,6 +105,7 @@ class TestTunnelEndpoint(unittest.TestCase):
         self.port = InPort("port", Mock())
         self.peer_port = OutPort("peer_port", Mock())
         self.tunnel = Mock()
+        self.tunnel.peer_capabilities = set()
         self.trigger_loop = Mock()
         self.node_id = 123
         self.peer_node_id = 456
@@ -126,6 +155,28 @@ class TestTunnelEndpoint(unittest.TestCase):
         expected_reply['value'] = 'ACK'
         self.tunnel.send.assert_called_with(expected_reply)
 
+    def test_recv_tokens(self):
+        payload = {
+            'port_id': self.port.id,
+            'peer_port_id': self.peer_port.id,
+            'sequencenbr': 0,
+            'tokens': [{'type': 'Token', 'data': n} for n in range(5)]
+        }
+        self.tunnel_in.recv_tokens(payload)
+        assert self.trigger_loop.called
+        assert [self.port.queue.fifo[n].value for n in range(4)] == [0, 1, 2, 3]
+        # The queue is full after 4 tokens
+        self.tunnel.send.assert_called_with({
+            'cmd': 'TOKENS_REPLY',
+            'port_id': self.port.id,
+            'peer_port_id': self.peer_port.id,
+            'sequencenbr': 0,
+            'count': 5,
+            'acked': 3,
+            'nack': [[4, 4]],
+            'value': 'ACK'
+        })
+
     def test_get_peer(self):
         assert self.tunnel_in.get_peer() == (self.peer_node_id, self.peer_port.id)
         assert self.tunnel_out.get_peer() == (self.node_id, self.port.id)
@@ -177,6 +228,78 @@ class TestTunnelEndpoint(unittest.TestCase):
         self.tunnel_out.communicate()
         assert self.tunnel.send.call_count == 2
 
+    def test_batch_communicate(self):
+        self.tunnel.peer_capabilities = set(['TOKENS'])
+        self.tunnel_out.port.write_token(Token(1))
+        self.tunnel_out.port.write_token(Token(2))
+        self.tunnel_out.port.write_token(Token(3))
+        assert self.tunnel_out.communicate() is True
+        assert self.tunnel.send.call_count == 1
+        msg = self.tunnel.send.call_args[0][0]
+        assert msg['cmd'] == 'TOKENS'
+        assert msg['sequencenbr'] == 0
+        assert len(msg['tokens']) == 3
+
+        self.tunnel_out.reply_tokens(0, 3, 0, [[1, 2]], 'ACK')
+        queue = self.tunnel_out.port.queue
+        assert queue.read_pos[self.port.id] == 1
+        assert queue.tentative_read_pos[self.port.id] == 1
+        assert not self.tunnel_out.bulk
+
+    def test_window_recv_token(self):
+        tunnel_in = TunnelInEndpoint(self.port, self.tunnel, self.peer_node_id, self.peer_port.id,
+                                     {'flow_control': 'window'}, self.trigger_loop)
+        self.port.attach_endpoint(tunnel_in)
+        assert tunnel_in.use_monitor()
+        # Nothing received yet, window unknown
+        assert tunnel_in.communicate() is False
+        tunnel_in.recv_token({
+            'port_id': self.peer_port.id,
+            'peer_port_id': self.port.id,
+            'sequencenbr': 0,
+            'token': {'type': 'Token', 'data': 5}
+        })
+        reply = self.tunnel.send.call_args[0][0]
+        assert reply['value'] == 'ACK'
+        assert reply['window'] == 4
+        assert tunnel_in.communicate() is False
+        # Actor consumes the token, advertise the larger window
+        self.port.queue.peek(self.port.id)
+        self.port.queue.commit(self.port.id)
+        assert tunnel_in.communicate() is True
+        self.tunnel.send.assert_called_with({
+            'cmd': 'TOKEN_WINDOW',
+            'port_id': self.peer_port.id,
+            'peer_port_id': self.port.id,
+            'window': 5
+        })
+
+    def test_window_communicate(self):
+        self.peer_port.properties['flow_control'] = 'window'
+        tunnel_out = TunnelOutEndpoint(self.peer_port, self.tunnel, self.node_id, self.port.id, {}, self.trigger_loop)
+        self.peer_port.attach_endpoint(tunnel_out)
+        for n in range(3):
+            tunnel_out.port.write_token(Token(n))
+        # Window unknown before first reply, behaves as backoff mode
+        tunnel_out.update_window(None)
+        assert tunnel_out.window is None
+
+        tunnel_out._send_one_token()
+        tunnel_out.reply(0, 'ACK', 2)
+        assert tunnel_out.communicate() is True
+        # Only one more token fits the window
+        assert self.tunnel.send.call_count == 2
+        assert self.tunnel.send.call_args[0][0]['sequencenbr'] == 1
+        assert tunnel_out.communicate() is False
+
+        # NACK does not make the endpoint back off
+        tunnel_out.reply(1, 'NACK', 1)
+        assert tunnel_out.bulk
+        assert tunnel_out.port.queue.tentative_read_pos[self.port.id] == 1
+        tunnel_out.update_window(3)
+        assert tunnel_out.communicate() is True
+        assert self.tunnel.send.call_count == 4
+
     def test_communicate(self):
         self.tunnel_out.port.write_token(Token(1))
         self.tunnel_out.port.write_token(Token(2))
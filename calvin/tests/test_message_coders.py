@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import pytest
+
+from calvin.runtime.north.calvin_token import Token
+from calvin.runtime.north.plugins.coders import benchmark
+from calvin.runtime.north.plugins.coders.messages import message_coder_factory
+
+pytestmark = pytest.mark.unittest
+
+
+@pytest.mark.parametrize("coder_name", message_coder_factory.get_prio_list())
+def test_roundtrip(coder_name):
+    coder = message_coder_factory.get(coder_name)
+    for name, msg in benchmark.messages().items():
+        decoded = coder.decode(coder.encode(msg))
+        value = decoded['value']
+        # Tokens might be left in a compact wire format
+        if 'token' in value:
+            value['token'] = Token.decode(value['token']).encode()
+        if 'tokens' in value:
+            value['tokens'] = [Token.decode(t).encode() for t in value['tokens']]
+        assert decoded == msg, name
+
+
+@pytest.mark.parametrize("coder_name", ["msgpack", "compact"])
+def test_msgpack_modes(coder_name):
+    coder = message_coder_factory.get(coder_name)
+    # Strings as raw bytes and maps with integer keys, whichever msgpack backend and version is used
+    decoded = coder.decode(coder.encode({'name': "data", 'ports': {1: "a", 2: "b"}}))
+    assert decoded == {'name': "data", 'ports': {1: "a", 2: "b"}}
+    assert isinstance(decoded['name'], str)
+
+
+def test_benchmark():
+    coder = message_coder_factory.get("json")
+    encode, decode, size = benchmark.benchmark(coder, benchmark.messages()['TOKEN_REPLY'], 10)
+    assert encode > 0 and decode > 0 and size > 0
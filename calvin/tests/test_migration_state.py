@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import unittest
+import pytest
+
+from calvin.runtime.north import migration_state
+from calvin.runtime.north.calvin_token import Token
+
+pytestmark = pytest.mark.unittest
+
+
+def actor_state():
+    return {
+        '_id': "actor-1",
+        '_managed': ['_id', 'history', 'n'],
+        'history': ["frame-%d" % (i % 10) for i in range(1000)],
+        'n': 3,
+        'inports': {'token': {'queue': {'fifo': {'first': 0, 'tokens': []}}}},
+        'outports': {}
+    }
+
+
+class MigrationStateTests(unittest.TestCase):
+
+    def test_plain_state(self):
+        state = actor_state()
+        assert not migration_state.is_packed(state)
+        assert migration_state.unpack(state) is state
+
+    def test_compressed(self):
+        state = actor_state()
+        packed, chunks, size = migration_state.pack(state, 6)
+        assert migration_state.is_packed(packed)
+        assert packed['_id'] == "actor-1"
+        assert chunks == {}
+        assert migration_state.packed_size(packed, chunks) < size / 2
+        assert migration_state.unpack(packed) == state
+
+    def test_uncompressed(self):
+        state = actor_state()
+        packed, chunks, size = migration_state.pack(state, 0)
+        assert migration_state.packed_size(packed, chunks) > size
+        assert migration_state.unpack(packed) == state
+
+    def test_chunked(self):
+        state = actor_state()
+        packed, chunks, size = migration_state.pack(state, 0, chunk_size=1024)
+        # Only the large attribute is chunked, the state is left intact
+        assert chunks.keys() == ['history']
+        assert len(chunks['history']) > 1
+        assert all(len(data) <= 1024 for data in chunks['history'])
+        assert packed['chunks'] == {'history': len(chunks['history'])}
+        assert 'history' in state
+        assert migration_state.unpack(packed, chunks) == state
+
+    def test_missing_chunk(self):
+        packed, chunks, size = migration_state.pack(actor_state(), 6, chunk_size=64)
+        chunks['history'].pop()
+        with pytest.raises(Exception):
+            migration_state.unpack(packed, chunks)
+
+    def test_with_fifo_slots(self):
+        state = actor_state()
+        state['inports']['token']['queue'] = {'N': 3, 'fifo': {'first': 4, 'tokens': [Token(1).encode()]}}
+        state['outports']['token'] = {'queue': {'N': 2, 'fifo': {'reader-1': {'first': 0, 'tokens': []}}}}
+        legacy = migration_state.with_fifo_slots(state)
+        fifo = legacy['inports']['token']['queue']['fifo']
+        self.assertEqual(len(fifo), 3)
+        self.assertEqual(fifo[1], Token(1).encode())
+        self.assertEqual(len(legacy['outports']['token']['queue']['fifo']['reader-1']), 2)
+        # The original state is left as is
+        self.assertEqual(state['inports']['token']['queue']['fifo']['first'], 4)
+
+    def test_delta(self):
+        snapshot = actor_state()
+        digests = migration_state.digests(snapshot)
+        state = actor_state()
+        state['n'] = 4
+        state['_managed'].append('m')
+        state['m'] = "new"
+        delta = migration_state.delta(state, digests)
+        assert migration_state.is_delta(delta)
+        # Unchanged attributes are left out, but the id and ports are always there
+        assert 'history' not in delta
+        assert delta['n'] == 4
+        assert delta['m'] == "new"
+        assert delta['_id'] == "actor-1"
+        assert delta['inports'] == state['inports']
+        assert migration_state.merge(snapshot, delta) == state
+
+    def test_delta_removed_attribute(self):
+        snapshot = actor_state()
+        digests = migration_state.digests(snapshot)
+        state = actor_state()
+        state['_managed'].remove('n')
+        del state['n']
+        merged = migration_state.merge(snapshot, migration_state.delta(state, digests))
+        assert 'n' not in merged
+        assert merged == state
+
+    def test_packed_delta(self):
+        snapshot = actor_state()
+        state = actor_state()
+        state['n'] = 4
+        delta = migration_state.delta(state, migration_state.digests(snapshot))
+        packed, chunks, size = migration_state.pack(delta, 6, chunk_size=1024)
+        assert chunks == {}
+        assert migration_state.merge(snapshot, migration_state.unpack(packed, chunks)) == state
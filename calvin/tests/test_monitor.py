@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import pytest
+import unittest
+from mock import Mock
+
+from calvin.actor.actorport import InPort, OutPort
+from calvin.runtime.north.calvin_token import Token
+from calvin.runtime.north.plugins.port.endpoint import LocalInEndpoint, LocalOutEndpoint
+from calvin.runtime.north.plugins.port import queue
+from calvin.runtime.south.monitor import Event_Monitor
+
+pytestmark = pytest.mark.unittest
+
+
+def create_endpoint(sent=False, pending=False):
+    endp = Mock()
+    endp.communicate = Mock(return_value=sent)
+    endp.pending = Mock(return_value=pending)
+    return endp
+
+
+class EventMonitorTests(unittest.TestCase):
+
+    def setUp(self):
+        self.monitor = Event_Monitor()
+
+    def test_register(self):
+        endp = create_endpoint(sent=True)
+        self.monitor.register_endpoint(endp)
+        assert endp.monitor is self.monitor
+        # Newly registered endpoints are serviced once
+        assert self.monitor.loop(None)
+        assert not self.monitor.loop(None)
+        assert endp.communicate.call_count == 1
+        self.monitor.unregister_endpoint(endp)
+        assert endp.monitor is None
+        assert self.monitor.statistics() == {'registered': 0, 'dirty': 0, 'last_loop': 0, 'serviced': 1, 'loops': 2}
+
+    def test_only_dirty(self):
+        endpoints = [create_endpoint() for _ in range(10)]
+        for endp in endpoints:
+            self.monitor.register_endpoint(endp)
+        self.monitor.loop(None)
+        self.monitor.set_dirty(endpoints[3])
+        self.monitor.loop(None)
+        assert endpoints[3].communicate.call_count == 2
+        assert sum(endp.communicate.call_count for endp in endpoints) == 11
+        stats = self.monitor.statistics()
+        assert stats['registered'] == 10
+        assert stats['last_loop'] == 1
+        # Unregistered endpoints are never serviced
+        self.monitor.unregister_endpoint(endpoints[3])
+        self.monitor.set_dirty(endpoints[3])
+        self.monitor.loop(None)
+        assert endpoints[3].communicate.call_count == 2
+
+    def test_pending(self):
+        endp = create_endpoint(pending=True)
+        self.monitor.register_endpoint(endp)
+        self.monitor.loop(None)
+        self.monitor.loop(None)
+        assert endp.communicate.call_count == 2
+        endp.pending.return_value = False
+        self.monitor.loop(None)
+        self.monitor.loop(None)
+        assert endp.communicate.call_count == 3
+
+    def test_failing_endpoint(self):
+        endp = create_endpoint()
+        endp.communicate.side_effect = Exception("failed")
+        self.monitor.register_endpoint(endp)
+        for _ in range(3):
+            self.monitor.register_endpoint(create_endpoint())
+        with pytest.raises(Exception):
+            self.monitor.loop(None)
+        # The failed endpoint and the endpoints not serviced remain dirty
+        assert endp in self.monitor._dirty
+        assert self.monitor.statistics()['dirty'] + self.monitor.statistics()['last_loop'] == 5
+        endp.communicate.side_effect = None
+        self.monitor.loop(None)
+        assert endp.communicate.call_count == 2
+
+
+class EndpointEventTests(unittest.TestCase):
+
+    def setUp(self):
+        self.monitor = Event_Monitor()
+        self.port = InPort("port", Mock())
+        self.peer_port = OutPort("peer_port", Mock())
+        self.local_in = LocalInEndpoint(self.port, self.peer_port)
+        self.local_out = LocalOutEndpoint(self.peer_port, self.port)
+        self.port.set_queue(queue.fanout_fifo.FanoutFIFO({'queue_length': 4, 'direction': "in"}, {}))
+        self.peer_port.set_queue(queue.fanout_fifo.FanoutFIFO({'queue_length': 4, 'direction': "out"}, {}))
+        self.monitor.register_endpoint(self.local_out)
+        self.peer_port.attach_endpoint(self.local_out)
+        self.port.attach_endpoint(self.local_in)
+        self.monitor.loop(None)
+
+    def test_write_marks_dirty(self):
+        assert not self.monitor.loop(None)
+        self.peer_port.write_token(Token(1))
+        assert self.monitor.statistics()['dirty'] == 1
+        assert self.monitor.loop(None)
+        assert self.port.tokens_available(1)
+        assert self.monitor.statistics()['dirty'] == 0
+
+    def test_full_peer_pending(self):
+        for i in range(5):
+            self.peer_port.write_token(Token(i))
+            self.monitor.loop(None)
+        # Inport full, the last token waits in the outport queue
+        assert self.monitor.statistics()['dirty'] == 1
+        self.port.read()
+        assert self.monitor.loop(None)
+        assert self.monitor.statistics()['dirty'] == 0
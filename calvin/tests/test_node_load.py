@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import random
+import time
+import unittest
+import pytest
+from mock import Mock, patch
+
+from calvin.runtime.north import node_load
+from calvin.runtime.north.node_load import LoadReporter, load_score, select_node
+from calvin.runtime.north.replicationmanager import ReplicationManager
+from calvin.runtime.north.appmanager import AppManager
+from calvin.runtime.north.plugins.requirements import performance_scaling, device_scaling
+
+pytestmark = pytest.mark.unittest
+
+
+def summary(cpu=0.0, idle=1.0, pressure=0.0, age=0.0):
+    return {'cpu': cpu, 'idle': idle, 'pressure': pressure, 'actors': 1, 'time': time.time() - age}
+
+
+class SelectNodeTests(unittest.TestCase):
+
+    def setUp(self):
+        self.loads = {"n1": summary(cpu=0.9), "n2": summary(idle=0.2), "n3": summary(cpu=0.1, idle=0.8),
+                      "n4": summary(idle=0.0, pressure=3.0)}
+
+    def test_load_score(self):
+        assert load_score(summary()) == 0.0
+        assert load_score(summary(cpu=0.2, idle=0.5)) == pytest.approx(0.5)
+        assert load_score(summary(cpu=2.0, pressure=1.0)) == pytest.approx(1.5)
+        assert load_score(None) == node_load.UNKNOWN_LOAD
+        assert load_score(summary(age=node_load.LOAD_MAX_AGE + 1)) == node_load.UNKNOWN_LOAD
+
+    def test_capacity(self):
+        assert node_load.capacity(summary()) == 1.0
+        assert node_load.capacity(summary(cpu=0.5)) == pytest.approx(0.75)
+        assert node_load.capacity(None) == 1.0 - node_load.UNKNOWN_LOAD / 2.0
+        assert node_load.capacity(summary(cpu=1.0, pressure=1000.0)) == node_load.MIN_CAPACITY
+
+    def test_least_loaded(self):
+        assert select_node(self.loads.keys(), self.loads, "least_loaded") == "n3"
+        # Unknown nodes are preferred over saturated nodes
+        assert select_node(["n1", "n4", "n5"], self.loads, "least_loaded") == "n1"
+        assert select_node(["n4", "n5"], self.loads, "least_loaded") == "n5"
+        assert select_node([], self.loads, "least_loaded") is None
+
+    def test_two_choices(self):
+        rnd = random.Random(1)
+        picked = set(select_node(self.loads.keys(), self.loads, "two_choices", rnd) for _ in range(100))
+        # Never the most loaded, but not always the least loaded either
+        assert "n4" not in picked
+        assert len(picked) > 1
+        assert select_node(["n1", "n3"], self.loads, "two_choices", rnd) == "n3"
+
+    def test_random(self):
+        rnd = random.Random(1)
+        picked = set(select_node(self.loads.keys(), self.loads, "random", rnd) for _ in range(100))
+        assert picked == set(self.loads.keys())
+
+    def test_unknown_selection(self):
+        with pytest.raises(ValueError):
+            select_node(["n1", "n2"], self.loads, "unknown")
+
+
+class LoadReporterTests(unittest.TestCase):
+
+    def setUp(self):
+        self.actor = Mock()
+        self.actor.get_pressure = Mock(return_value={("p1", "q1"): (3, 4, [1, 2])})
+        self.node = Mock()
+        self.node.am.actors = {"a1": self.actor}
+        self.node.sched.busy_time = 0.0
+
+    def test_summary(self):
+        reporter = LoadReporter(self.node, interval=1.0)
+        reporter._last = reporter._sample()
+        reporter._last = (reporter._last[0] - 2.0,) + reporter._last[1:]
+        self.node.sched.busy_time = 0.5
+        self.actor.get_pressure = Mock(return_value={("p1", "q1"): (3, 8, [1, 2])})
+        s = reporter.summary()
+        assert s['idle'] == pytest.approx(0.75, abs=1e-2)
+        assert s['pressure'] == pytest.approx(2.0, abs=1e-2)
+        assert s['actors'] == 1
+        assert 0.0 <= s['cpu']
+        # Actors leaving does not give negative pressure
+        self.node.am.actors = {}
+        assert reporter.summary()['pressure'] == 0.0
+
+    def test_disabled(self):
+        reporter = LoadReporter(self.node, interval=0)
+        reporter.start()
+        assert reporter._timer is None
+
+    def test_report(self):
+        self.node.quitting = False
+        reporter = LoadReporter(self.node, interval=1.0)
+        node_load.async.DelayedCall = Mock()
+        reporter._report()
+        assert self.node.storage.set_node_load.call_args[0][0] == self.node.id
+        assert node_load.async.DelayedCall.called
+
+
+class ReplicaSelectionTests(unittest.TestCase):
+
+    def setUp(self):
+        self.node = Mock()
+        self.node.id = "n0"
+        self.actor = Mock()
+        self.loads = {"n1": summary(cpu=0.9), "n2": summary(cpu=0.1)}
+
+    def test_performance_scaling(self):
+        placement = set(["n0", "n1", "n2"])
+        assert performance_scaling.select(self.node, self.actor, placement, loads=self.loads) == ["n2"]
+        assert performance_scaling.select(self.node, self.actor, set(["n0"]), loads=self.loads) is None
+
+    def test_device_scaling(self):
+        placement = set(["n0", "n1", "n2"])
+        assert device_scaling.select(self.node, self.actor, placement, loads=self.loads) == ["n2"]
+        assert self.actor._replication_data.known_runtimes == set(["n1", "n2"])
+
+    def test_collect_loads(self):
+        rm = ReplicationManager(self.node)
+        rm.replicate = Mock()
+        self.actor._migrating_to = None
+        self.actor._replication_data.requirements = {'op': "performance_scaling", 'kwargs': {'max': 3}}
+        rm._update_requirements_placements(self.actor, set(["n0", "n1", "n2"]))
+        calls = self.node.storage.get_node_load.call_args_list
+        assert sorted(c[0][0] for c in calls) == ["n1", "n2"]
+        assert not rm.replicate.called
+        for c in calls:
+            c[1]['cb'](c[0][0], self.loads[c[0][0]])
+        rm.replicate.assert_called_once_with(self.actor.id, "n2", callback=self.actor._replicate_callback)
+
+
+class PlacementCapacityTests(unittest.TestCase):
+
+    @patch('calvin.runtime.north.appmanager.HeuristicSolver')
+    @patch('calvin.runtime.north.appmanager.PlacementProblem')
+    def test_capacity_from_loads(self, problem_mock, solver_mock):
+        loads = {"n1": summary(cpu=0.9), "n2": summary()}
+        node = Mock()
+        node.id = "n1"
+        node.network.link_get = Mock(return_value=None)
+        solver_mock.return_value.ranked.return_value = {}
+        app = Mock()
+        app.actor_placement = {}
+        app.actor_placement_nbr = 1
+        app.get_actors = Mock(return_value=[])
+        org_cb = app._org_cb = Mock()
+        AppManager(node).collect_placement(app, "a1", set(["n1", "n2"]), None)
+        calls = node.storage.get_node_load.call_args_list
+        assert sorted(c[0][0] for c in calls) == ["n1", "n2"]
+        assert not problem_mock.called
+        for c in calls:
+            c[1]['cb'](c[0][0], loads[c[0][0]])
+        capacity = problem_mock.call_args[1]['capacity']
+        assert capacity["n1"] == pytest.approx(0.55)
+        assert capacity["n2"] == 1.0
+        assert org_cb.called
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+import pytest
+
+from calvin.runtime.north.plugins.placement.placement_problem import PlacementProblem
+from calvin.runtime.north.plugins.placement.heuristic_solver import HeuristicSolver
+from calvin.runtime.north.plugins.placement import objective_factory
+
+pytestmark = pytest.mark.unittest
+
+
+def solver(problem, objectives, time_budget=1.0):
+    return HeuristicSolver(problem, [(weight, objective_factory.get(name, problem))
+                                     for name, weight in objectives.items()], time_budget)
+
+
+class PlacementProblemTests(unittest.TestCase):
+
+    def test_indexes(self):
+        problem = PlacementProblem(["a1", "a2", "a3"], {"a1": ["n2", "n1"], "a2": set(["n1"]), "a3": ["n3"]},
+                                   [("a1", "a2"), ("a2", "a1"), ("a2", "a3"), ("a1", "a1"), ("a1", "remote")])
+        assert problem.node_ids == ["n1", "n2", "n3"]
+        assert problem.allowed == [[0, 1], [0], [2]]
+        # Connections are symmetric and weighted by count, self and unknown actors ignored
+        assert sorted(problem.neighbors[0]) == [(1, 2.0)]
+        assert sorted(problem.neighbors[1]) == [(0, 2.0), (2, 1.0)]
+        assert problem.neighbors[2] == [(1, 1.0)]
+        assert problem.capacity == [1.0, 1.0, 1.0]
+
+    def test_link_cost(self):
+        problem = PlacementProblem(["a1"], {"a1": ["local", "n1", "n2", "n3"]}, [],
+                                   rtt={"n1": 0.01, "n2": 0.03, "n3": None}, local_node_id="local")
+        local, n1, n2, n3 = [problem.node_ids.index(n) for n in ["local", "n1", "n2", "n3"]]
+        cost = problem.link_cost
+        assert cost[local][local] == 0.0
+        assert cost[local][n1] == pytest.approx(0.01 / 0.06)
+        assert cost[n1][n2] == pytest.approx(0.04 / 0.06)
+        # Unmeasured node gets the highest RTT
+        assert cost[n2][n3] == 1.0
+        assert cost[n1][n2] == cost[n2][n1]
+
+
+class HeuristicSolverTests(unittest.TestCase):
+
+    def chains(self, nbr_chains, length, nodes):
+        actor_ids = ["a%d-%d" % (c, i) for c in range(nbr_chains) for i in range(length)]
+        connections = [("a%d-%d" % (c, i), "a%d-%d" % (c, i + 1)) for c in range(nbr_chains) for i in range(length - 1)]
+        return PlacementProblem(actor_ids, {a: nodes for a in actor_ids}, connections)
+
+    def test_colocation(self):
+        problem = self.chains(2, 5, ["n1", "n2"])
+        s = solver(problem, {"colocation": 1.0})
+        placement = s.solve()
+        # Each chain on one node
+        for c in range(2):
+            assert len(set(placement[c * 5:(c + 1) * 5])) == 1
+
+    def test_load_balance(self):
+        problem = PlacementProblem(["a%d" % i for i in range(9)], {"a%d" % i: ["n1", "n2", "n3"] for i in range(9)}, [],
+                                   capacity={"n1": 2.0})
+        placement = solver(problem, {"load_balance": 1.0}).solve()
+        # n1 has half of the capacity
+        assert [placement.count(n) for n in range(3)] == [5, 2, 2]
+
+    def test_colocation_and_load_balance(self):
+        problem = self.chains(2, 5, ["n1", "n2"])
+        placement = solver(problem, {"colocation": 1.0, "load_balance": 0.5}).solve()
+        # The two chains on different nodes
+        assert len(set(placement[:5])) == 1
+        assert len(set(placement[5:])) == 1
+        assert placement[0] != placement[5]
+
+    def test_link_cost(self):
+        actor_ids = ["src", "snk"]
+        problem = PlacementProblem(actor_ids, {"src": ["near", "far"], "snk": ["local"]}, [("src", "snk")],
+                                   rtt={"near": 0.001, "far": 0.1}, local_node_id="local")
+        placement = solver(problem, {"link_cost": 1.0}).solve()
+        assert problem.node_ids[placement[0]] == "near"
+
+    def test_allowed(self):
+        problem = PlacementProblem(["a1", "a2", "a3"], {"a1": ["n1"], "a2": ["n2", "n3"], "a3": []},
+                                   [("a1", "a2")])
+        s = solver(problem, {"colocation": 1.0, "load_balance": 1.0})
+        placement = s.solve()
+        assert problem.node_ids[placement[0]] == "n1"
+        assert problem.node_ids[placement[1]] in ["n2", "n3"]
+        assert placement[2] is None
+        ranked = s.ranked()
+        assert ranked["a1"] == ["n1"]
+        assert sorted(ranked["a2"]) == ["n2", "n3"]
+        assert ranked["a2"][0] == problem.node_ids[placement[1]]
+        assert ranked["a3"] == []
+
+    def test_time_budget(self):
+        problem = self.chains(50, 20, ["n%d" % i for i in range(10)])
+        s = solver(problem, {"colocation": 1.0, "load_balance": 1.0}, time_budget=0.0)
+        placement = s.solve()
+        # Greedy placement only
+        assert s.moves == 0
+        assert None not in placement
+
+    def test_unknown_objective(self):
+        with pytest.raises(Exception):
+            objective_factory.get("unknown", self.chains(1, 2, ["n1"]))
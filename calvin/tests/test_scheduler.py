@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+import pytest
+from mock import Mock
+
+from calvin.runtime.north.scheduler import Scheduler
+from calvin.runtime.north.plugins.scheduling import policy_factory
+
+pytestmark = pytest.mark.unittest
+
+
+def create_actor(actor_id, fires, priority=1):
+    actor = Mock()
+    actor.id = actor_id
+    actor.priority = priority
+    actor.name = actor_id
+    actor.fire = Mock(return_value=fires)
+    actor.get_pressure = Mock(return_value={})
+    return actor
+
+
+class FakeActorManager(object):
+
+    def __init__(self, actors):
+        self.actors = {a.id: a for a in actors}
+
+    def enabled_actors(self, actor_ids=None):
+        if actor_ids is None:
+            return self.actors.values()
+        return [self.actors[i] for i in actor_ids if i in self.actors]
+
+
+class SchedulerTests(unittest.TestCase):
+
+    def setUp(self):
+        self.actors = [create_actor("a1", True), create_actor("a2", False), create_actor("a3", False)]
+        self.am = FakeActorManager(self.actors)
+        self.scheduler = Scheduler(Mock(), self.am, Mock())
+
+    def test_fire_all(self):
+        did_fire, timeout, actor_ids = self.scheduler.fire_actors(set(["a1"]))
+        assert did_fire
+        assert not timeout
+        for actor in self.actors:
+            assert actor.fire.called
+        stats = self.scheduler.statistics()
+        assert stats['mode'] == "all"
+        assert stats['policy'] == "random"
+        assert stats['last_loop'] == {'fired': 1, 'evaluated': 3, 'skipped': 0, 'queue_depth': 3}
+
+    def test_fire_ready(self):
+        self.scheduler._mode = "ready"
+        did_fire, timeout, actor_ids = self.scheduler.fire_actors(set(["a1", "a2", None]))
+        assert did_fire
+        assert self.actors[0].fire.called
+        assert self.actors[1].fire.called
+        assert not self.actors[2].fire.called
+        # Only actors that fired stays runnable
+        assert actor_ids == set(["a1"])
+        stats = self.scheduler.statistics()
+        assert stats['last_loop'] == {'fired': 1, 'evaluated': 2, 'skipped': 1, 'queue_depth': 2}
+
+    def test_fire_ready_all(self):
+        self.scheduler._mode = "ready"
+        did_fire, timeout, actor_ids = self.scheduler.fire_actors(None)
+        for actor in self.actors:
+            assert actor.fire.called
+        assert actor_ids == set(["a1"])
+
+    def test_statistics_total(self):
+        self.scheduler._mode = "ready"
+        self.scheduler.fire_actors(set(["a2"]))
+        self.scheduler.fire_actors(set(["a1", "a3"]))
+        total = self.scheduler.statistics()['total']
+        assert total == {'loops': 2, 'fired': 1, 'evaluated': 3, 'skipped': 3}
+
+    def test_io_wakeups(self):
+        self.scheduler.trigger_loop = Mock()
+        file_trigger = self.scheduler.io_trigger("a1", "file")
+        socket_trigger = self.scheduler.io_trigger("a2", "socket")
+        file_trigger()
+        file_trigger()
+        # Called as trigger_loop by the I/O objects, still only wakes the owner
+        socket_trigger(actor_ids=[None])
+        assert self.scheduler.trigger_loop.call_args_list == [
+            ((), {'actor_ids': ["a1"]}), ((), {'actor_ids': ["a1"]}), ((), {'actor_ids': ["a2"]})]
+        self.scheduler.wakeup(None, "gpio")
+        self.scheduler.trigger_loop.assert_called_with()
+        assert self.scheduler.statistics()['wakeups'] == {'file': 2, 'socket': 1, 'gpio': 1}
+
+
+class SchedulingPolicyTests(unittest.TestCase):
+
+    def setUp(self):
+        self.actors = [create_actor("a1", True), create_actor("a2", True, priority=3), create_actor("a3", True)]
+
+    def test_unknown_policy(self):
+        with pytest.raises(Exception):
+            policy_factory.get("unknown", 0.02)
+
+    def test_random(self):
+        policy = policy_factory.get("random", 0.02)
+        order = policy.order(self.actors)
+        assert set(order) == set(self.actors)
+        assert policy.time_slice(self.actors[1]) == 0.02
+
+    def test_weighted_round_robin(self):
+        policy = policy_factory.get("weighted_round_robin", 0.02)
+        assert [a.id for a in policy.order(self.actors)] == ["a1", "a2", "a3"]
+        assert [a.id for a in policy.order(self.actors)] == ["a2", "a3", "a1"]
+        assert [a.id for a in policy.order(self.actors)] == ["a3", "a1", "a2"]
+        assert policy.time_slice(self.actors[0]) == 0.02
+        assert policy.time_slice(self.actors[1]) == pytest.approx(0.06)
+
+    def test_deficit_round_robin(self):
+        policy = policy_factory.get("deficit_round_robin", 0.02)
+        order = policy.order(self.actors)
+        # Highest priority gets most credit
+        assert order[0].id == "a2"
+        assert policy.time_slice(order[0]) == pytest.approx(0.06)
+        policy.fired(order[0], True, 0.05)
+        # a1 was not reached, a3 had nothing to do
+        policy.fired(order[2], False, 0.0)
+        order = policy.order(self.actors)
+        assert [a.id for a in order] == ["a2", "a1", "a3"]
+        assert policy.time_slice(self.actors[0]) == pytest.approx(0.04)
+        assert policy.time_slice(self.actors[1]) == pytest.approx(0.07)
+        assert policy.time_slice(self.actors[2]) == pytest.approx(0.02)
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import unittest
+import pytest
+from mock import Mock, patch
+
+from calvin.runtime.north import storage
+from calvin.tests import DummyNode
+
+pytestmark = pytest.mark.unittest
+
+
+class StorageCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.plugin = Mock()
+        self.storage = storage.Storage(DummyNode(), override_storage=self.plugin)
+        self.storage.started = True
+        self.storage.cache_size = 16
+
+    def reply(self, value):
+        # Answer the latest get sent to the storage plugin
+        args, kwargs = self.plugin.get.call_args
+        kwargs['cb'](key=kwargs['key'], value=self.storage.coder.encode(value) if value else value)
+
+    @patch.object(storage, 'async')
+    def test_read_through(self, async_mock):
+        cb = Mock()
+        self.storage.get_port("p1", cb=cb)
+        self.reply({'node_id': "n1"})
+        cb.assert_called_with("p1", {'node_id': "n1"})
+        self.storage.get_port("p1", cb=cb)
+        assert self.plugin.get.call_count == 1
+        async_mock.DelayedCall.assert_called_with(0, cb, key="p1", value={'node_id': "n1"})
+        stats = self.storage.cache_statistics()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['size'] == 1
+
+    @patch.object(storage, 'async')
+    def test_copies(self, async_mock):
+        cb = Mock()
+        self.storage.get_port("p1", cb=cb)
+        self.reply({'node_id': "n1", 'peers': ["p2"]})
+        # Modifying the received value must not change what later readers get
+        cb.call_args[0][1]['peers'].append("p3")
+        self.storage.get_port("p1", cb=cb)
+        args, kwargs = async_mock.DelayedCall.call_args
+        kwargs['value']['node_id'] = "n2"
+        self.storage.get_port("p1", cb=cb)
+        args, kwargs = async_mock.DelayedCall.call_args
+        assert kwargs['value'] == {'node_id': "n1", 'peers': ["p2"]}
+
+    def test_default_prefixes(self):
+        # Changed by other nodes without invalidation
+        assert "application-" not in storage.STORAGE_CACHE_TTL
+        assert "actor-" not in storage.STORAGE_CACHE_TTL
+
+    def test_not_found_not_cached(self):
+        self.storage.get_port("p1", cb=Mock())
+        self.reply(None)
+        self.storage.get_port("p1", cb=Mock())
+        assert self.plugin.get.call_count == 2
+        assert self.storage.cache_statistics()['size'] == 0
+
+    def test_uncached_prefix(self):
+        self.storage.get("other-", "k", cb=Mock())
+        self.reply("value")
+        self.storage.get("other-", "k", cb=Mock())
+        assert self.plugin.get.call_count == 2
+        assert self.storage.cache_statistics()['misses'] == 0
+
+    @patch.object(storage, 'time')
+    def test_ttl(self, time_mock):
+        time_mock.time.return_value = 100.0
+        self.storage.get_port("p1", cb=Mock())
+        self.reply({'node_id': "n1"})
+        time_mock.time.return_value = 100.0 + storage.STORAGE_CACHE_TTL["port-"] + 1
+        self.storage.get_port("p1", cb=Mock())
+        assert self.plugin.get.call_count == 2
+
+    @patch.object(storage, 'async')
+    def test_lru_eviction(self, async_mock):
+        self.storage.cache_size = 2
+        for port_id in ("p1", "p2", "p1", "p3"):
+            gets = self.plugin.get.call_count
+            self.storage.get_port(port_id, cb=Mock())
+            if self.plugin.get.call_count > gets:
+                self.reply({'node_id': "n1"})
+        assert self.storage.cache.keys() == ["port-p1", "port-p3"]
+        assert self.storage.cache_statistics()['evictions'] == 1
+
+    def test_invalidate_on_set(self):
+        self.storage.get_port("p1", cb=Mock())
+        self.reply({'node_id': "n1"})
+        self.storage.set("port-", "p1", {'node_id': "n2"}, cb=None)
+        assert "port-p1" not in self.storage.cache
+        self.storage.delete("port-", "p1", cb=None)
+        assert self.storage.cache_statistics()['invalidations'] == 1
+
+    def test_invalidate_outstanding_get(self):
+        self.storage.get_port("p1", cb=Mock())
+        self.storage.invalidate("port-", "p1")
+        self.reply({'node_id': "n1"})
+        assert "port-p1" not in self.storage.cache
+
+    def test_disabled(self):
+        self.storage.cache_size = 0
+        self.storage.get_port("p1", cb=Mock())
+        self.reply({'node_id': "n1"})
+        self.storage.get_port("p1", cb=Mock())
+        assert self.plugin.get.call_count == 2
+        assert self.storage.cache_statistics()['misses'] == 0
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+import shutil
+import tempfile
+import unittest
+import pytest
+from mock import Mock, patch
+
+from calvin.runtime.north.plugins.storage import storage_dict_local
+
+pytestmark = pytest.mark.unittest
+
+
+class StorageLocalTests(unittest.TestCase):
+
+    def setUp(self):
+        self.patcher = patch.object(storage_dict_local, 'async')
+        self.async = self.patcher.__enter__()
+        self.storage = storage_dict_local.StorageLocal()
+        self.cb = Mock()
+
+    def tearDown(self):
+        self.patcher.__exit__()
+
+    def result(self):
+        # Arguments of the latest callback
+        return self.async.DelayedCall.call_args[0][2:]
+
+    def test_set_get(self):
+        self.storage.set("actor-1", '{"name": "a"}', cb=self.cb)
+        assert self.result() == ("actor-1", True)
+        self.storage.get("actor-1", cb=self.cb)
+        assert self.result() == ("actor-1", '{"name": "a"}')
+        self.storage.set("actor-1", None, cb=self.cb)
+        self.storage.get("actor-1", cb=self.cb)
+        assert self.result() == ("actor-1", None)
+
+    def test_sets(self):
+        self.storage.append("index-a", '["n1", "n2"]', cb=self.cb)
+        self.storage.append("index-a", '["n2", "n3"]', cb=self.cb)
+        self.storage.remove("index-a", '["n1"]', cb=self.cb)
+        assert self.result() == ("index-a", True)
+        self.storage.get_concat("index-a", cb=self.cb)
+        key, value = self.result()
+        assert sorted(storage_dict_local.json.loads(value)) == ["n2", "n3"]
+        self.storage.remove("index-a", '["n2", "n3"]', cb=self.cb)
+        self.storage.get_concat("index-a", cb=self.cb)
+        assert self.result() == ("index-a", None)
+        self.storage.remove("index-b", '["n1"]', cb=self.cb)
+        assert self.result() == ("index-b", True)
+
+    def test_prefix(self):
+        for key in ("port-1", "actor-2", "actor-1", "actorx"):
+            self.storage.set(key, "v", cb=self.cb)
+        self.storage.set("actor-2", None, cb=self.cb)
+        self.storage.get_prefix("actor-", cb=self.cb)
+        assert self.result() == ("actor-", {"actor-1": "v"})
+
+    def test_snapshot(self):
+        directory = tempfile.mkdtemp()
+        try:
+            name = os.path.join(directory, "registry.json")
+            self.storage._snapshot_file = name
+            self.storage.set("actor-1", "v", cb=self.cb)
+            self.storage.append("index-a", '["n1"]', cb=self.cb)
+            # Changes are written after a delay
+            assert self.async.DelayedCall.call_args_list[0][0][1] == self.storage.snapshot
+            self.storage.stop()
+            restored = storage_dict_local.StorageLocal()
+            restored._snapshot_file = name
+            restored.start()
+            restored.get_prefix("actor-", cb=self.cb)
+            assert self.result() == ("actor-", {"actor-1": "v"})
+            restored.get_concat("index-a", cb=self.cb)
+            assert self.result() == ("index-a", '["n1"]')
+        finally:
+            shutil.rmtree(directory)
+
+    def test_snapshot_synced_before_replace(self):
+        directory = tempfile.mkdtemp()
+        try:
+            name = os.path.join(directory, "registry.json")
+            self.storage._snapshot_file = name
+            self.storage.set("actor-1", "v", cb=self.cb)
+            synced = []
+            # Not yet in place when synced
+            fsync = lambda fd: synced.append(os.path.exists(name))
+            with patch.object(storage_dict_local.os, 'fsync', side_effect=fsync):
+                self.storage.snapshot()
+            assert synced == [False]
+            assert os.path.isfile(name)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_snapshot_failed(self):
+        directory = tempfile.mkdtemp()
+        try:
+            name = os.path.join(directory, "registry.json")
+            self.storage._snapshot_file = name
+            self.storage.set("actor-1", object(), cb=self.cb)
+            self.storage.snapshot()
+            # Neither a snapshot nor the temporary file is left
+            assert os.listdir(directory) == []
+        finally:
+            shutil.rmtree(directory)
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import unittest
+import pytest
+from mock import Mock, patch
+
+from calvin.runtime.north import storage
+from calvin.runtime.north.plugins.storage.index import index_factory, index_trie
+from calvin.runtime.north.plugins.storage.index.index_base import index_strings
+from calvin.tests import DummyNode
+
+pytestmark = pytest.mark.unittest
+
+
+class SetStorage(object):
+    """ Storage plugin answering immediately, counts the registry operations """
+
+    def __init__(self, coder):
+        self.coder = coder
+        self.data = {}
+        self.ops = 0
+
+    def set(self, key, value, cb=None):
+        self.ops += 1
+        if value is None:
+            self.data.pop(key, None)
+        else:
+            self.data[key] = value
+        cb(key, True)
+
+    def get_concat(self, key, cb=None):
+        self.ops += 1
+        cb(key, self.coder.encode(list(self.data[key])) if key in self.data else None)
+
+    def append(self, key, value, cb=None):
+        self.ops += 1
+        self.data.setdefault(key, set()).update(self.coder.decode(value))
+        cb(key, True)
+
+    def remove(self, key, value, cb=None):
+        self.ops += 1
+        self.data.setdefault(key, set()).difference_update(self.coder.decode(value))
+        cb(key, True)
+
+
+def values(it):
+    assert it._final
+    return set(it.list)
+
+
+class IndexTests(object):
+    """ The same behaviour is expected from all index layouts """
+
+    index_type = None
+
+    def setUp(self):
+        self.storage = storage.Storage(DummyNode(), override_storage=Mock())
+        self.plugin = SetStorage(self.storage.coder)
+        self.storage.storage = self.plugin
+        self.storage.started = True
+        self.storage.index = index_factory.get(self.index_type, self.storage)
+        self.patcher = patch.object(index_trie, 'async')
+        self.patcher.__enter__()
+
+    def tearDown(self):
+        self.patcher.__exit__()
+
+    def lookup(self, index):
+        return values(self.storage.get_index_iter(index))
+
+    def test_levels(self):
+        self.storage.add_index("node/affiliation/owner/com.ericsson/Harald", "n1")
+        self.storage.add_index("node/affiliation/owner/com.ericsson/Per", "n2")
+        self.storage.add_index("node/affiliation/owner/com.ericsson/Per", "n3")
+        self.storage.add_index(['node', 'capabilities', 'sys.timer'], "n1")
+        assert self.lookup("node/affiliation/owner/com.ericsson/Harald") == set(["n1"])
+        assert self.lookup("node/affiliation/owner/com.ericsson/Per") == set(["n2", "n3"])
+        assert self.lookup("node/affiliation/owner/com.ericsson") == set(["n1", "n2", "n3"])
+        assert self.lookup("/node/affiliation/owner") == set(["n1", "n2", "n3"])
+        assert self.lookup(['node', 'capabilities', 'sys.timer']) == set(["n1"])
+        assert self.lookup("node/affiliation/owner/com.ericsson/Pe") == set()
+
+    def test_remove(self):
+        self.storage.add_index("node/affiliation/owner/com.ericsson/Harald", "n1")
+        self.storage.add_index("node/affiliation/owner/com.ericsson/Per", "n2")
+        self.storage.remove_index("node/affiliation/owner/com.ericsson/Harald", "n1")
+        assert self.lookup("node/affiliation/owner/com.ericsson/Harald") == set()
+        assert self.lookup("node/affiliation/owner/com.ericsson") == set(["n2"])
+
+    def test_delete(self):
+        self.storage.add_index(['replicas', 'actors', 'r1'], "a1", root_prefix_level=3)
+        self.storage.add_index(['replicas', 'actors', 'r1'], "a2", root_prefix_level=3)
+        self.storage.add_index(['replicas', 'actors', 'r2'], "a3", root_prefix_level=3)
+        self.storage.delete_index(['replicas', 'actors', 'r1'], root_prefix_level=3)
+        assert self.lookup(['replicas', 'actors', 'r1']) == set()
+        assert self.lookup(['replicas', 'actors', 'r2']) == set(["a3"])
+
+    def test_include_key(self):
+        self.storage.add_index(['node', 'capabilities', 'sys.timer'], "n1")
+        it = self.storage.get_index_iter(['node', 'capabilities', 'sys.timer'], include_key=True)
+        assert values(it) == set([("/node/capabilities/sys.timer", "n1")])
+
+
+class SharedValueTests(object):
+    """ Values stored only once keep a value added under several indexes """
+
+    def test_remove_shared(self):
+        self.storage.add_index("node/affiliation/owner/com.ericsson/Harald", "common")
+        self.storage.add_index("node/affiliation/owner/com.ericsson/Per", "common")
+        self.storage.remove_index("node/affiliation/owner/com.ericsson/Harald", "common")
+        assert self.lookup("node/affiliation/owner/com.ericsson/Harald") == set()
+        assert self.lookup("node/affiliation/owner/com.ericsson") == set(["common"])
+
+
+class LevelIndexTests(IndexTests, unittest.TestCase):
+    index_type = "levels"
+
+
+class PrefixHashIndexTests(IndexTests, SharedValueTests, unittest.TestCase):
+    index_type = "prefix_hash"
+
+    def test_single_write(self):
+        self.storage.add_index("node/address/country/region/city/street/number", "n1")
+        assert self.plugin.ops == 1
+        self.storage.remove_index("node/address/country/region/city/street/number", "n1")
+        assert self.plugin.ops == 2
+
+
+class TrieIndexTests(IndexTests, SharedValueTests, unittest.TestCase):
+    index_type = "trie"
+
+    def setUp(self):
+        super(TrieIndexTests, self).setUp()
+        self.storage.storage_type = "local_dict"
+
+    def test_prune(self):
+        self.storage.add_index("node/affiliation/owner/com.ericsson/Harald", "n1")
+        self.storage.remove_index("node/affiliation/owner/com.ericsson/Harald", "n1")
+        assert self.storage.index.root.children == {}
+
+    def test_write_through(self):
+        self.storage.add_index("node/affiliation/owner/com.ericsson/Harald", "n1")
+        # Same registry keys as the levels layout
+        assert self.plugin.data["index-/node/affiliation/owner/com.ericsson/Harald"] == set(["n1"])
+        ops = self.plugin.ops
+        assert self.lookup("node/affiliation/owner") == set(["n1"])
+        assert self.plugin.ops == ops
+
+    def test_proxy_clients(self):
+        self.storage.add_index("node/affiliation/owner/com.ericsson/Harald", "n1")
+        # Index entry of a storage proxy client, only in the registry
+        self.storage.tunnel["client"] = Mock()
+        self.storage.append(prefix="index-", key="/node/affiliation/owner", value=["n2"], cb=None)
+        assert self.lookup("node/affiliation/owner") == set(["n1", "n2"])
+
+    def test_shared_registry(self):
+        self.storage.storage_type = "dht"
+        self.storage.add_index(['node', 'capabilities', 'sys.timer'], "n1")
+        # Index entry written by another runtime sharing the registry
+        self.storage.append(prefix="index-", key="/node/capabilities/sys.timer", value=["n2"], cb=None)
+        assert self.lookup(['node', 'capabilities', 'sys.timer']) == set(["n1", "n2"])
+        ops = self.plugin.ops
+        self.storage.get_index(['node', 'capabilities'], cb=Mock())
+        assert self.plugin.ops > ops
+
+
+def test_default_levels():
+    assert isinstance(storage.Storage(DummyNode(), override_storage=Mock()).index,
+                      index_factory.LevelIndex)
+
+
+def test_index_strings():
+    assert index_strings("node/a/b/c", 2) == ["/node/a", "/node/a/b", "/node/a/b/c"]
+    assert index_strings(['node', 'a\\/b', 'c'], 1) == ["/node", "/node/a\\/b", "/node/a\\/b/c"]
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import unittest
+import pytest
+from mock import Mock, patch
+
+from calvin.runtime.north import storage
+from calvin.runtime.north.plugins.storage import storage_dict_local
+from calvin.runtime.north.plugins.storage import proxy
+from calvin.runtime.north.plugins.storage.storage_base import StorageBase
+from calvin.runtime.north.plugins.storage.proxy import StorageProxy
+from calvin.utilities import dynops
+from calvin.tests import DummyNode
+
+pytestmark = pytest.mark.unittest
+
+
+class SingleKeyStorage(StorageBase):
+    """ Only implements the single key operations, answering immediately """
+
+    def __init__(self):
+        super(SingleKeyStorage, self).__init__()
+        self.data = {}
+        self.calls = 0
+
+    def get(self, key, cb=None):
+        self.calls += 1
+        cb(key, self.data.get(key))
+
+    def set(self, key, value, cb=None):
+        self.calls += 1
+        self.data[key] = value
+        cb(key, True)
+
+    def append(self, key, value, cb=None):
+        self.calls += 1
+        self.data.setdefault(key, []).append(value)
+        cb(key, True)
+
+
+class StoragePluginManyTests(unittest.TestCase):
+
+    def test_base_defaults(self):
+        plugin = SingleKeyStorage()
+        cb = Mock()
+        plugin.set_many({'a': 1, 'b': 2}, cb=cb)
+        assert cb.call_args[1]['value'] == {'a': True, 'b': True}
+        plugin.get_many(['a', 'b', 'c', 'a'], cb=cb)
+        assert sorted(cb.call_args[1]['key']) == ['a', 'b', 'c']
+        assert cb.call_args[1]['value'] == {'a': 1, 'b': 2, 'c': None}
+        plugin.append_many({'s': 3}, cb=cb)
+        assert plugin.data['s'] == [3]
+        plugin.get_many([], cb=cb)
+        cb.assert_called_with(key=[], value={})
+
+    @patch.object(storage_dict_local, 'async')
+    def test_local(self, async_mock):
+        plugin = storage_dict_local.StorageLocal()
+        cb = Mock()
+        plugin.set_many({'a': 1, 'b': 2}, cb=cb)
+        assert async_mock.DelayedCall.call_args[0][3] == {'a': True, 'b': True}
+        plugin.append_many({'s': '[3]'}, cb=cb)
+        plugin.get_concat('s', cb=cb)
+        assert async_mock.DelayedCall.call_args[0][3] == '[3]'
+        plugin.get_many(['a', 'c'], cb=cb)
+        assert async_mock.DelayedCall.call_args[0][3] == {'a': 1, 'c': None}
+
+    def proxy_client(self):
+        plugin = StorageProxy(DummyNode())
+        plugin.tunnel = Mock()
+        plugin.tunnel_up(org_cb=None)
+        msg = plugin.tunnel.send.call_args[0][0]
+        assert msg['cmd'] == 'CAPABILITIES'
+        return plugin, msg
+
+    @patch.object(proxy, 'async')
+    def test_proxy_client(self, async_mock):
+        plugin, msg = self.proxy_client()
+        plugin.tunnel_recv_handler({'cmd': 'REPLY', 'msg_uuid': msg['msg_uuid'], 'key': None,
+                                    'value': ['APPEND_MANY', 'GET_MANY', 'SET_MANY']})
+        cb = Mock()
+        plugin.get_many(['a', 'b'], cb=cb)
+        assert plugin.tunnel.send.call_count == 2
+        msg = plugin.tunnel.send.call_args[0][0]
+        assert msg['cmd'] == 'GET_MANY'
+        assert sorted(msg['key']) == ['a', 'b']
+        plugin.tunnel_recv_handler({'cmd': 'REPLY', 'msg_uuid': msg['msg_uuid'], 'key': msg['key'], 'value': {'a': 1}})
+        cb.assert_called_with(key=msg['key'], value={'a': 1})
+        assert async_mock.DelayedCall.return_value.cancel.call_count == 2
+        assert plugin.replies == {}
+
+    @patch.object(proxy, 'async')
+    def test_proxy_client_old_master(self, async_mock):
+        plugin, msg = self.proxy_client()
+        # An older master never replies to the capabilities request
+        timeout = async_mock.DelayedCall.call_args[0]
+        assert timeout[0] == proxy.REPLY_TIMEOUT
+        timeout[1](*timeout[2:])
+        assert plugin.capabilities == set()
+        cb = Mock()
+        plugin.set_many({'a': 1, 'b': 2}, cb=cb)
+        cmds = [c[0][0]['cmd'] for c in plugin.tunnel.send.call_args_list[1:]]
+        assert cmds == ['SET', 'SET']
+        for c in plugin.tunnel.send.call_args_list[1:]:
+            plugin.tunnel_recv_handler({'cmd': 'REPLY', 'msg_uuid': c[0][0]['msg_uuid'], 'key': c[0][0]['key'],
+                                        'value': True})
+        cb.assert_called_with(key=['a', 'b'], value={'a': True, 'b': True})
+
+    @patch.object(proxy, 'async')
+    def test_proxy_client_no_reply(self, async_mock):
+        plugin, msg = self.proxy_client()
+        plugin.capabilities = set(['GET_MANY'])
+        cb = Mock()
+        plugin.get_many(['a', 'b'], cb=cb)
+        timeout = async_mock.DelayedCall.call_args[0]
+        timeout[1](*timeout[2:])
+        assert cb.call_args[1]['value'] == {'a': False, 'b': False}
+        # Pending requests fail when the tunnel goes down
+        get_cb = Mock()
+        plugin.get('c', cb=get_cb)
+        plugin.tunnel_down(org_cb=None)
+        get_cb.assert_called_with(key='c', value=False)
+        assert plugin.replies == {}
+
+
+class StorageManyTests(unittest.TestCase):
+
+    def setUp(self):
+        self.plugin = SingleKeyStorage()
+        self.storage = storage.Storage(DummyNode(), override_storage=self.plugin)
+        self.storage.started = True
+
+    @patch.object(storage, 'async')
+    def test_flush_batches(self, async_mock):
+        self.storage.storage = Mock()
+        self.storage.localstore = {"k%d" % i: "v" for i in range(storage.STORAGE_BATCH_SIZE + 1)}
+        self.storage.localstore_sets = {'s': {'+': set(["x"]), '-': set([])}}
+        self.storage.flush_localdata()
+        assert self.storage.storage.set_many.call_count == 2
+        assert self.storage.storage.append_many.call_count == 1
+        assert not self.storage.storage.set.called
+        cb = self.storage.storage.set_many.call_args[1]['cb']
+        cb(key=["k0"], value={"k0": True})
+        assert "k0" not in self.storage.localstore
+
+    @patch.object(storage, 'async')
+    def test_get_iter_batched(self, async_mock):
+        self.plugin.data = {'actor_type-a': self.storage.coder.encode({'v': 1})}
+        it = dynops.List()
+        self.storage.get_iter('actor_type-', 'a', it=it)
+        self.storage.get_iter('actor_type-', 'b', it=it)
+        assert async_mock.DelayedCall.call_count == 1
+        assert it.list == []
+        self.storage._flush_get_iter()
+        assert it.list == [{'v': 1}, dynops.FailedElement]
+
+    @patch.object(storage, 'async')
+    def test_proxy_server(self, async_mock):
+        tunnel = Mock()
+        self.storage._init_proxy()
+        self.storage.tunnel_recv_handler(tunnel, {'cmd': 'SET_MANY', 'msg_uuid': 'm1', 'key': ['a', 'b'],
+                                                  'value': {'a': self.storage.coder.encode(1), 'b': None}})
+        reply = tunnel.send.call_args[0][0]
+        assert reply['msg_uuid'] == 'm1'
+        assert reply['value'] == {'a': True, 'b': True}
+        self.storage.localstore = {}
+        self.storage.tunnel_recv_handler(tunnel, {'cmd': 'GET_MANY', 'msg_uuid': 'm2', 'key': ['a']})
+        reply = tunnel.send.call_args[0][0]
+        assert reply['value'] == {'a': self.storage.coder.encode(1)}
+        self.storage.tunnel_recv_handler(tunnel, {'cmd': 'CAPABILITIES', 'msg_uuid': 'm3'})
+        reply = tunnel.send.call_args[0][0]
+        assert reply['value'] == ['APPEND_MANY', 'GET_MANY', 'SET_MANY']
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import pytest
+from mock import Mock, patch
+
+from calvin.runtime.north.plugins.storage import storage_sqlite
+
+pytestmark = pytest.mark.unittest
+
+
+class StorageSQLiteTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.patcher = patch.object(storage_sqlite, 'async')
+        self.async = self.patcher.__enter__()
+        self.storage = self.open()
+        self.cb = Mock()
+
+    def tearDown(self):
+        self.patcher.__exit__()
+        shutil.rmtree(self.directory)
+
+    def open(self):
+        storage = storage_sqlite.StorageSQLite()
+        storage._filename = os.path.join(self.directory, "registry.sqlite")
+        storage.start()
+        return storage
+
+    def result(self):
+        # Arguments of the latest callback called through DelayedCall
+        return self.async.DelayedCall.call_args[0][2:]
+
+    def test_group_commit(self):
+        self.storage.set("actor-1", '{"name": "a"}', cb=self.cb)
+        self.storage.set_many({"port-1": "p1", "port-2": "p2"}, cb=self.cb)
+        self.storage.append("index-a", '["n1", "n2"]', cb=self.cb)
+        # Seen by reads but not confirmed until committed
+        assert not self.cb.called
+        self.storage.get("actor-1", cb=self.cb)
+        assert self.result() == ("actor-1", '{"name": "a"}')
+        self.storage.commit()
+        assert self.cb.call_count == 3
+        self.cb.assert_called_with("index-a", True)
+        assert self.cb.call_args_list[1][0][1] == {"port-1": True, "port-2": True}
+
+    def test_sets(self):
+        self.storage.append_many({"index-a": '["n1", "n2"]', "index-b": '["n1"]'}, cb=self.cb)
+        self.storage.remove("index-a", '["n1"]', cb=self.cb)
+        self.storage.get_concat("index-a", cb=self.cb)
+        assert self.result() == ("index-a", '["n2"]')
+        self.storage.set("index-b", None, cb=self.cb)
+        self.storage.get_concat("index-b", cb=self.cb)
+        assert self.result() == ("index-b", None)
+
+    def test_get_many(self):
+        self.storage.set_many({"port-%d" % i: str(i) for i in range(storage_sqlite._MAX_VARIABLES + 1)})
+        self.storage.get_many(["port-0", "port-%d" % storage_sqlite._MAX_VARIABLES, "port-x"], cb=self.cb)
+        keys, values = self.result()
+        assert values == {"port-0": "0", "port-%d" % storage_sqlite._MAX_VARIABLES: str(storage_sqlite._MAX_VARIABLES),
+                          "port-x": None}
+
+    def test_warm_start(self):
+        self.storage.set("node-1", '{"uris": []}')
+        self.storage.append("index-a", '["n1"]')
+        self.storage.stop()
+        storage = self.open()
+        storage.get("node-1", cb=self.cb)
+        assert self.result() == ("node-1", '{"uris": []}')
+        storage.get_concat("index-a", cb=self.cb)
+        assert json.loads(self.result()[1]) == ["n1"]
+        storage.stop()
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import unittest
+import pytest
+from mock import Mock
+
+from calvin.runtime.north import timer_wheel
+from calvin.runtime.north.timer_wheel import TimerWheel
+from calvin.runtime.south.calvinsys.sys.timer.Timer import Timer
+
+pytestmark = pytest.mark.unittest
+
+
+class FakeClock(object):
+
+    def __init__(self):
+        self.now = 1000.0
+        self.calls = []
+
+    def time(self):
+        return self.now
+
+    def DelayedCall(self, delay, callback):
+        call = Mock()
+        call.delay = delay
+        call.when = self.now + delay
+        call.callback = callback
+        call.ran = False
+        self.calls.append(call)
+        return call
+
+    def run_until(self, when):
+        """ Run the armed calls in time order up to when """
+        while True:
+            pending = [c for c in self.calls if not c.cancel.called and not c.ran and c.when <= when]
+            if not pending:
+                break
+            call = min(pending, key=lambda c: c.when)
+            call.ran = True
+            self.now = max(self.now, call.when)
+            call.callback()
+        self.now = when
+
+
+class TimerWheelTests(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self._time, self._async = timer_wheel.time, timer_wheel.async
+        timer_wheel.time = self.clock
+        timer_wheel.async = self.clock
+        self.trigger_loop = Mock()
+        self.wheel = TimerWheel(self.trigger_loop, resolution=0.01)
+
+    def tearDown(self):
+        timer_wheel.time, timer_wheel.async = self._time, self._async
+
+    def woken(self):
+        return [sorted(c[1]['actor_ids']) for c in self.trigger_loop.call_args_list]
+
+    def test_once(self):
+        timer = self.wheel.once("a1", 0.5)
+        assert timer.active()
+        self.clock.run_until(1000.49)
+        assert not timer.triggered
+        self.clock.run_until(1000.51)
+        assert timer.triggered
+        assert not timer.active()
+        assert self.woken() == [["a1"]]
+        timer.ack()
+        assert not timer.triggered
+        assert self.wheel.statistics()['timers'] == 0
+
+    def test_batch_wakeup(self):
+        timers = [self.wheel.once("a%d" % i, 0.1) for i in range(3)]
+        self.wheel.once("a9", 0.3)
+        self.clock.run_until(1001.0)
+        assert self.woken() == [["a0", "a1", "a2"], ["a9"]]
+        assert all(t.triggered for t in timers)
+        assert self.wheel.statistics()['wakeups'] == 2
+
+    def test_periodic_keeps_phase(self):
+        timer = self.wheel.repeat("a1", 0.25)
+        start = timer.deadline - 0.25
+        deadlines = []
+        for _ in range(100):
+            self.clock.run_until(self.clock.now + 0.25)
+            deadlines.append(timer.deadline)
+        # Next deadline always from the original phase, no accumulated scheduling latency
+        assert timer.deadline == pytest.approx(start + 101 * 0.25)
+        assert len(self.trigger_loop.call_args_list) == 100
+
+    def test_periodic_missed(self):
+        timer = self.wheel.repeat("a1", 0.1)
+        start = timer.deadline - 0.1
+        # Reactor blocked for a while
+        self.clock.now += 1.05
+        self.clock.run_until(self.clock.now)
+        assert timer.deadline == pytest.approx(start + 1.1)
+        assert self.wheel.statistics()['missed'] == 9
+        assert len(self.trigger_loop.call_args_list) == 1
+
+    def test_cancel(self):
+        timer = self.wheel.once("a1", 0.5)
+        timer.cancel()
+        assert not timer.active()
+        # Nothing left, the armed call is cancelled
+        assert self.clock.calls[-1].cancel.called
+        self.clock.run_until(1002.0)
+        assert not self.trigger_loop.called
+        timer.reset()
+        self.clock.run_until(1003.0)
+        assert timer.triggered
+
+    def test_long_timers(self):
+        # Timers on each level of the wheel, and beyond
+        delays = [0.01, 2.5, 2.6, 100.0, 655.36, 700.0, 2000.0]
+        timers = [self.wheel.once("a%d" % i, delay) for i, delay in enumerate(delays)]
+        for timer, delay in zip(timers, delays):
+            self.clock.run_until(1000.0 + delay - 0.005)
+            assert not timer.triggered
+            self.clock.run_until(1000.0 + delay + 0.011)
+            assert timer.triggered
+        assert self.wheel.statistics()['timers'] == 0
+
+    def test_earlier_timer_rearms(self):
+        self.wheel.once("a1", 10.0)
+        self.wheel.once("a2", 0.1)
+        self.clock.run_until(1000.2)
+        assert self.woken() == [["a2"]]
+
+    def test_trigger(self):
+        timer = self.wheel.once("a1", 10.0)
+        timer.trigger()
+        assert timer.triggered
+        assert self.woken() == [["a1"]]
+
+
+class CalvinsysTimerTests(unittest.TestCase):
+
+    def setUp(self):
+        self.timers = Mock()
+        calvinsys = Mock()
+        calvinsys.timers = Mock(return_value=self.timers)
+        self.actor = Mock()
+        self.timer = Timer(calvinsys, "sys.timer.repeating", self.actor)
+
+    def test_repeating(self):
+        self.timer.init(repeats=True)
+        assert not self.timer.can_read()
+        self.timer.write(0.5)
+        self.timers.repeat.assert_called_with(self.actor.id, 0.5)
+        wheel_timer = self.timers.repeat.return_value
+        wheel_timer.triggered = True
+        assert self.timer.can_read()
+        self.timer.read()
+        assert wheel_timer.ack.called
+
+    def test_once(self):
+        self.timer.init(repeats=False)
+        self.timer.write(1)
+        self.timers.once.assert_called_with(self.actor.id, 1.0)
+        wheel_timer = self.timers.once.return_value
+        wheel_timer.triggered = True
+        # Setting it again keeps the unread trigger
+        self.timers.once.return_value = Mock(triggered=False)
+        self.timer.write(2)
+        assert wheel_timer.cancel.called
+        assert self.timer.can_read()
+        self.timer.read()
+        assert not self.timer.can_read()
+        self.timer.write(False)
+        self.timer.close()
+        assert not self.timer.can_read()
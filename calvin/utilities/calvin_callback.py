@@ -14,22 +14,30 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import logging
+import itertools
+import traceback
 
-from calvin.utilities import calvinuuid
 from calvin.utilities import calvinlogger
+from calvin.utilities import calvinconfig
 
 _log = calvinlogger.get_logger(__name__)
+_conf = calvinconfig.get()
+
+# Record where each callback is created, dumped when the callback fails. Costly, only for debugging.
+CALLBACK_DEBUG = bool(_conf.get(None, "callback_debug"))
+
+# Ids of callbacks and callback groups, unique within the runtime
+_next_id = itertools.count(1).next
 
 def get_debug_info(start=-2, limit=10):
-    if _log.getEffectiveLevel() == logging.INFO:
-        import traceback
-        return traceback.format_stack(limit=10)[:start]
+    if CALLBACK_DEBUG:
+        # Formatted first when dumped
+        return traceback.extract_stack(limit=limit)[:start]
     return None
 
 def dump_debug_info(debug_info):
     if debug_info:
-        _log.info("Calvin callback created here: \n" + ''.join(debug_info))
+        _log.info("Calvin callback created here: \n" + ''.join(traceback.format_list(debug_info)))
 
 
 class CalvinCB(object):
@@ -40,18 +48,19 @@ class CalvinCB(object):
 
         For example see example code at end of file.
     """
+    __slots__ = ('_debug_info', '_id', 'func', 'args', 'kwargs', 'name')
+
     def __init__(self, func, *args, **kwargs):
-        super(CalvinCB, self).__init__()
-        self._debug_info = get_debug_info()
-        self._id = calvinuuid.uuid("CB")
+        self._debug_info = get_debug_info() if CALLBACK_DEBUG else None
+        self._id = _next_id()
         self.func = func
         self.args = list(args)
         self.kwargs = kwargs
         # Ref a functions name if we wrap several CalvinCB and need to take __str__
         try:
-            self.name = self.func.__name__
-        except:
-            self.name = self.func.name if hasattr(self.func, 'name') else "unknown"
+            self.name = func.__name__
+        except AttributeError:
+            self.name = getattr(func, 'name', "unknown")
 
     def args_append(self, *args):
         """ Append specific args to the call"""
@@ -93,7 +102,7 @@ class CalvinCBGroup(object):
     """
     def __init__(self, funcs=None):
         super(CalvinCBGroup, self).__init__()
-        self._id = calvinuuid.uuid("CBG")
+        self._id = _next_id()
         self.funcs = funcs if funcs else []
 
     def func_append(self, func):
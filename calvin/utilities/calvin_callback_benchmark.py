@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+
+"""
+Cost of creating and calling a CalvinCB, compared with how callbacks used to be created:
+an uuid4 id and a formatted creation stack when logging at INFO level.
+
+    python -m calvin.utilities.calvin_callback_benchmark [-n ITERATIONS]
+"""
+
+import argparse
+import timeit
+import traceback
+
+from calvin.utilities import calvin_callback, calvinuuid
+from calvin.utilities.calvin_callback import CalvinCB
+
+
+class _PreviousCB(object):
+    """ Construction cost of the previous CalvinCB """
+    def __init__(self, func, *args, **kwargs):
+        super(_PreviousCB, self).__init__()
+        self._debug_info = traceback.format_stack(limit=10)[:-2]
+        self._id = calvinuuid.uuid("CB")
+        self.func = func
+        self.args = list(args)
+        self.kwargs = kwargs
+        try:
+            self.name = self.func.__name__
+        except:
+            self.name = self.func.name if hasattr(self.func, 'name') else "unknown"
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*(self.args + list(args)), **dict(self.kwargs, **kwargs))
+
+
+def _storage_cb(key, value, org_cb, org_key):
+    pass
+
+
+def cases():
+    """ name: (previous, current) """
+    return {
+        'create': (
+            lambda: _PreviousCB(_storage_cb, org_cb=None, org_key="key"),
+            lambda: CalvinCB(_storage_cb, org_cb=None, org_key="key")),
+        'create_call': (
+            lambda: _PreviousCB(_storage_cb, org_cb=None, org_key="key")("key", 1),
+            lambda: CalvinCB(_storage_cb, org_cb=None, org_key="key")("key", 1)),
+    }
+
+
+def main():
+    argparser = argparse.ArgumentParser(description="Benchmark callback construction")
+    argparser.add_argument('-n', '--iterations', type=int, default=20000, help="callbacks per case")
+    args = argparser.parse_args()
+
+    print "callback_debug: %s" % calvin_callback.CALLBACK_DEBUG
+    print "%-15s %12s %12s %8s" % ("case", "previous us", "current us", "speedup")
+    for name, (previous, current) in sorted(cases().items()):
+        t_previous = min(timeit.repeat(previous, number=args.iterations, repeat=3)) / args.iterations
+        t_current = min(timeit.repeat(current, number=args.iterations, repeat=3)) / args.iterations
+        print "%-15s %12.2f %12.2f %7.1fx" % (name, t_previous * 1e6, t_current * 1e6, t_previous / t_current)
+
+
+if __name__ == '__main__':
+    main()
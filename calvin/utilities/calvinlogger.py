@@ -43,8 +43,37 @@ class JSONEncoderIters(json.JSONEncoder):
             # Convert it to a string
             return unicode(str(o))
 
+class Lazy(object):
+
+    """
+    Log argument that is computed first when the log message is formatted, i.e. never
+    when the log level is disabled. Use for arguments that are expensive to create,
+    formatting of arguments is deferred anyway when passed as arguments to the logger:
+        _log.debug("Peers %s of %s", Lazy(lambda: [e.get_peer() for e in endpoints]), port_id)
+    Can also be used as the param argument of analyze.
+    """
+
+    __slots__ = ('func', 'args')
+
+    def __init__(self, func, *args):
+        super(Lazy, self).__init__()
+        self.func = func
+        self.args = args
+
+    def value(self):
+        return self.func(*self.args)
+
+    def __str__(self):
+        return str(self.value())
+
+    def __repr__(self):
+        return repr(self.value())
+
+
 def analyze(self, node_id, func, param, peer_node_id=None, tb=False, mute=False, *args, **kws):
     if not mute and self.isEnabledFor(5):
+        if isinstance(param, Lazy):
+            param = param.value()
         if node_id is None:
             # Allow None node_id and enter the process id instead
             node_id = os.getpid()
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Cost of debug log calls in the token and message paths when debug logging is disabled,
+eager formatting (the message is built before the call) vs deferred formatting.
+
+    python -m calvin.utilities.calvinlogger_benchmark [-n ITERATIONS]
+"""
+
+import argparse
+import logging
+import timeit
+
+from calvin.runtime.north.calvin_token import Token
+from calvin.utilities import calvinlogger, calvinuuid
+
+_log = calvinlogger.get_logger(__name__)
+
+
+def cases():
+    """ name: (eager, lazy) """
+    port_id = calvinuuid.uuid("PORT")
+    token = Token({'temperature': 21.5, 'unit': "C"}).encode()
+    payload = {'cmd': 'TUNNEL_DATA', 'tunnel_id': calvinuuid.uuid("TUNNEL"),
+               'value': {'cmd': 'TOKENS', 'tokens': [token] * 32, 'sequencenbr': 0, 'port_id': port_id}}
+    endpoints = [calvinuuid.uuid("PORT") for _ in range(4)]
+
+    return {
+        'recv_token': (
+            lambda: _log.debug("recv_token %s %s: %d %s => %s %d" % (port_id, "in", 17, token, "True", 0)),
+            lambda: _log.debug("recv_token %s %s: %d %s => %s %d", port_id, "in", 17, token, "True", 0)),
+        'send_message': (
+            lambda: _log.debug('send_message %s => %s "%s"' % (port_id, port_id, payload)),
+            lambda: _log.debug('send_message %s => %s "%s"', port_id, port_id, payload)),
+        'endpoints': (
+            lambda: _log.debug("disconnect current: %s" % [e[:8] for e in endpoints]),
+            lambda: _log.debug("disconnect current: %s", calvinlogger.Lazy(lambda: [e[:8] for e in endpoints]))),
+    }
+
+
+def main():
+    argparser = argparse.ArgumentParser(description="Benchmark disabled debug logging")
+    argparser.add_argument('-n', '--iterations', type=int, default=20000, help="log calls per case")
+    args = argparser.parse_args()
+
+    _log.setLevel(logging.INFO)
+    print "%-15s %12s %12s %8s" % ("case", "eager us", "lazy us", "speedup")
+    for name, (eager, lazy) in sorted(cases().items()):
+        t_eager = min(timeit.repeat(eager, number=args.iterations, repeat=3)) / args.iterations
+        t_lazy = min(timeit.repeat(lazy, number=args.iterations, repeat=3)) / args.iterations
+        print "%-15s %12.2f %12.2f %7.1fx" % (name, t_eager * 1e6, t_lazy * 1e6, t_eager / t_lazy)
+
+
+if __name__ == '__main__':
+    main()
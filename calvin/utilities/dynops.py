@@ -86,7 +86,7 @@ class DynOps(object):
         return "" if self._trigger else "<NoCB>" 
 
     def trig(self):
-        _log.debug("%s TRIG BEGIN" % (self.__str__()))
+        _log.debug("%s TRIG BEGIN", self)
         if self._trigger:
             self._trigger(*self.cb_args, **self.cb_kwargs)
 
@@ -104,12 +104,12 @@ class DynOps(object):
 
     def next(self):
         if self.infinite_set:
-            _log.debug("%s INFINITE" % self.__str__())
+            _log.debug("%s INFINITE", self)
             if self.infinite_sent:
-                _log.debug("%s INFINITE STOP" % self.__str__())
+                _log.debug("%s INFINITE STOP", self)
                 raise StopIteration
             else:
-                _log.debug("%s INFINITE SEND" % self.__str__())
+                _log.debug("%s INFINITE SEND", self)
                 self.infinite_sent = True
                 # FIXME Need to trig?
                 #self.trig()
@@ -136,7 +136,7 @@ class Union(DynOps):
         self.iters = [iter(v) for v in iters]
         # If any iterators are infinite the union will be infinite
         self.infinite_set = any([True for v in self.iters if getattr(v, 'infinite_set', False)])
-        self.set = []
+        self.set = set([])
         self.trigger_add(self.iters)
         self.final = False
         if self.infinite_set:
@@ -149,23 +149,23 @@ class Union(DynOps):
         for v in self.iters:
             try:
                 while True:
-                    _log.debug("%s:next TRY iter:%s" % (self.__str__(), str(v)))
+                    _log.debug("%s:next TRY iter:%s", self, v)
                     n = v.next()
                     if n not in self.set:
-                        _log.debug("%s:next GOT NEW value:%s iter:%s" % (self.__str__(), str(n), str(v)))
-                        self.set.append(n)
+                        _log.debug("%s:next GOT NEW value:%s iter:%s", self, n, v)
+                        self.set.add(n)
                         return n
             except PauseIteration:
-                _log.debug("%s:next GOT PAUSE iter:%s" % (self.__str__(), str(v)))
+                _log.debug("%s:next GOT PAUSE iter:%s", self, v)
                 paused = True
             except StopIteration:
-                _log.debug("%s:next GOT STOP iter:%s" % (self.__str__(), str(v)))
+                _log.debug("%s:next GOT STOP iter:%s", self, v)
                 pass
         if paused:
-            _log.debug("%s:next RAISE PAUSE" % (self.__str__(), ))
+            _log.debug("%s:next RAISE PAUSE", self)
             raise PauseIteration
         else:
-            _log.debug("%s:next RAISE STOP" % (self.__str__(), ))
+            _log.debug("%s:next RAISE STOP", self)
             self.final = True
             raise StopIteration
 
@@ -225,10 +225,10 @@ class Intersection(DynOps):
             if all(self.infs.values()):
                 self.infinite_set = True
                 if self.infinite_sent:
-                    _log.debug("%s INFINITE STOP" % self.__str__())
+                    _log.debug("%s INFINITE STOP", self)
                     raise StopIteration
                 else:
-                    _log.debug("%s INFINITE SEND" % self.__str__())
+                    _log.debug("%s INFINITE SEND", self)
                     self.infinite_sent = True
                     # FIXME Need to trig?
                     #self.trig()
@@ -236,9 +236,9 @@ class Intersection(DynOps):
                 
             # Current seen intersection
             self.candidates.update(set.intersection(*[self.drawn[id(v)] for v in self.iters if not self.infs[id(v)]]))
-            _log.debug("Intersection%s%s%s candidates: %s drawn: %s infs: %s"  % (("<" + self.name + ">") if self.name else "",
+            _log.debug("Intersection%s%s%s candidates: %s drawn: %s infs: %s", ("<" + self.name + ">") if self.name else "",
                                            "<Inf>" if self.infinite_set else "",
-                                           "#" if self._final else "-", self.candidates, self.drawn.values(), self.infs.values()))
+                                           "#" if self._final else "-", self.candidates, self.drawn.values(), self.infs.values())
             # remove from individual iterables
             for v in self.drawn.values():
                 v.difference_update(self.candidates)
@@ -288,20 +288,20 @@ class Difference(DynOps):
         self.final = {id(k): False for k in self.iters}
 
     def op(self):
-        _log.debug("%s.next()" % self.__str__())
+        _log.debug("%s.next()", self)
         if self.zero_set:
-            _log.debug("%s.next() REMOVE INFINITE" % self.__str__())
+            _log.debug("%s.next() REMOVE INFINITE", self)
             raise StopIteration
         if all(self.final.values()):
-            _log.debug("%s.next() REMOVE THESE %s" % (self.__str__(), str(self.remove)))
+            _log.debug("%s.next() REMOVE THESE %s", self, self.remove)
             # All remove values obtained just filter first
             # The first's exception are exposed
             while True:
                 n = self.first.next()
-                _log.debug("%s.next() = %s" % (self.__str__(), str(n)))
+                _log.debug("%s.next() = %s", self, n)
                 if n not in self.remove:
                     self.remove.add(n)  # Enforce set behaviour 
-                    _log.debug("%s.next() ACTUAL = %s" % (self.__str__(), str(n)))
+                    _log.debug("%s.next() ACTUAL = %s", self, n)
                     return n
         paused = False
         for v in self.iters:
@@ -379,7 +379,7 @@ class Map(DynOps):
         self.out_iter._trigger = self.out_trig
 
     def trig(self):
-        _log.debug("%s trig BEGIN" % (self.__str__()))
+        _log.debug("%s trig BEGIN", self)
         if self.eager:
             # Execute map function until Stop- or PauseIteration exception
             try:
@@ -392,14 +392,20 @@ class Map(DynOps):
 
     def _op(self, eager=False):
         self.during_next = True
+        try:
+            return self._map(eager)
+        finally:
+            self.during_next = False
+
+    def _map(self, eager):
         while True:
             active = False
             for v in self.iters:
                 if not self.final[id(v)]:
                     try:
-                        _log.debug("Map%s(func=%s) Next iter: %s" % (("<" + self.name + ">") if self.name else "", self.func.__name__, str(v)))
+                        _log.debug("Map%s(func=%s) Next iter: %s", ("<" + self.name + ">") if self.name else "", self.func.__name__, v)
                         e = v.next()
-                        _log.debug("Map%s(func=%s) Next in: %s" % (("<" + self.name + ">") if self.name else "", self.func.__name__, e))
+                        _log.debug("Map%s(func=%s) Next in: %s", ("<" + self.name + ">") if self.name else "", self.func.__name__, e)
                         self.drawn[id(v)].append(e)
                         active = True
                     except PauseIteration:
@@ -413,7 +419,7 @@ class Map(DynOps):
                 l = min([len(self.drawn[id(i)]) for i in self.iters if not self.final[id(i)]])
             except ValueError:
                 l = 0
-            _log.debug("Map%s(func=%s) Loop: %d, Final:%s" % (("<" + self.name + ">") if self.name else "", self.func.__name__, l, self.final.values()))
+            _log.debug("Map%s(func=%s) Loop: %d, Final:%s", ("<" + self.name + ">") if self.name else "", self.func.__name__, l, self.final.values())
             # Execute map function l times
             for i in range(l):
                 try:
@@ -440,39 +446,32 @@ class Map(DynOps):
                     raise e
             # If lazy break out of while True with the return value (or exception) otherwise break when no progress
             if not eager:
-                _log.debug("Map%s(func=%s) TRY OUT %s" % (("<" + self.name + ">") if self.name else "", 
-                                                         self.func.__name__, self.out_iter))
+                _log.debug("Map%s(func=%s) TRY OUT %s", ("<" + self.name + ">") if self.name else "", self.func.__name__, self.out_iter)
                 try:
                     e = self.out_iter.next()
                 except StopIteration:
-                    _log.debug("Map%s(func=%s) GOT STOP" % (("<" + self.name + ">") if self.name else "", 
-                                                         self.func.__name__))
-                    self.during_next = False
+                    _log.debug("Map%s(func=%s) GOT STOP", ("<" + self.name + ">") if self.name else "", self.func.__name__)
                     raise StopIteration
                 except PauseIteration:
-                    _log.debug("Map%s(func=%s) GOT PAUSE" % (("<" + self.name + ">") if self.name else "", 
-                                                         self.func.__name__))
-                    self.during_next = False
+                    _log.debug("Map%s(func=%s) GOT PAUSE", ("<" + self.name + ">") if self.name else "", self.func.__name__)
                     raise PauseIteration
-                _log.debug("Map%s(func=%s) GOT OUT %s" % (("<" + self.name + ">") if self.name else "", 
-                                                         self.func.__name__, e))
-                self.during_next = False
+                _log.debug("Map%s(func=%s) GOT OUT %s", ("<" + self.name + ">") if self.name else "", self.func.__name__, e)
                 return e
             if not active or all(self.final.values()):
                 # Reach here only when eager, any exception will do to break loop in trig method
-                self.during_next = False
                 raise Exception()
 
     def op(self):
         self.during_next = True
         try:
             # Deliver any already mapped results
-            n = self.out_iter.next()
-            self.during_next = False
-            return n
+            return self.out_iter.next()
         except PauseIteration:
             # Try to get more results
             return self._op()
+        finally:
+            # Must be cleared on all exits, otherwise out list triggers are lost for good
+            self.during_next = False
 
     def __str__(self):
         s = ""
@@ -495,30 +494,30 @@ class Chain(DynOps):
         super(Chain, self).__init__()
         # To allow lists etc to be arguments directly always take the iter
         self.it = iter(it)
-        _log.debug("%s.__init__()" % self.__str__())
+        _log.debug("%s.__init__()", self)
         self.elem_it = iter([])
         self.trigger_add([self.it])
 
     def op(self):
         try:
-            _log.debug("Chain%s.next() Try %s" % (("<" + self.name + ">") if self.name else "", str(self.elem_it)))
+            _log.debug("Chain%s.next() Try %s", ("<" + self.name + ">") if self.name else "", self.elem_it)
             e = self.elem_it.next()
-            _log.debug("Chain%s.next()=%s" % ((("<" + self.name + ">") if self.name else "", str(e))))
+            _log.debug("Chain%s.next()=%s", ("<" + self.name + ">") if self.name else "", e)
             return e
         except StopIteration:
-            _log.debug("Chain%s.next() ELEM ITER STOP %s" % (("<" + self.name + ">") if self.name else "", str(self.elem_it)))
+            _log.debug("Chain%s.next() ELEM ITER STOP %s", ("<" + self.name + ">") if self.name else "", self.elem_it)
             try:
                 self.elem_it = self.it.next()
             except StopIteration:
-                _log.debug("Chain%s.next() ITER STOP %s" % (("<" + self.name + ">") if self.name else "", str(self.it)))
+                _log.debug("Chain%s.next() ITER STOP %s", ("<" + self.name + ">") if self.name else "", self.it)
                 raise StopIteration
             except PauseIteration:
-                _log.debug("Chain%s.next() ITER PAUSE %s" % (("<" + self.name + ">") if self.name else "", str(self.it)))
+                _log.debug("Chain%s.next() ITER PAUSE %s", ("<" + self.name + ">") if self.name else "", self.it)
                 raise PauseIteration
             except Exception as e:
-                _log.debug("Chain%s.next() ITER OTHER EXCEPTION %s" % (("<" + self.name + ">") if self.name else "", str(self.it)), exc_info=True)
+                _log.debug("Chain%s.next() ITER OTHER EXCEPTION %s", ("<" + self.name + ">") if self.name else "", self.it, exc_info=True)
                 raise e
-            _log.debug("Chain%s.next() New iterator %s" % (("<" + self.name + ">") if self.name else "", str(self.elem_it)))
+            _log.debug("Chain%s.next() New iterator %s", ("<" + self.name + ">") if self.name else "", self.elem_it)
             # when not exception try to take next from the latest list
             return self.op()
 
@@ -606,7 +605,7 @@ class List(DynOps):
             Optinally specify what dynops iterable should trigger this instance
             this is useful when having (key, iter) tuples for Collect
         """
-        _log.debug("%s.append(%s)" % (self.__str__(), elem))
+        _log.debug("%s.append(%s)", self, elem)
         if not self._final:
             self.list.append(elem)
             # Potentially an interable
@@ -618,7 +617,7 @@ class List(DynOps):
             Optinally specify what dynops iterables should trigger this instance
             this is useful when having (key, iter) tuples for Collect
         """
-        _log.debug("%s.extend(%s)" % (self.__str__(), elems))
+        _log.debug("%s.extend(%s)", self, elems)
         if not self._final:
             self.list.extend(elems)
             # Potentially an interable
@@ -631,8 +630,7 @@ class List(DynOps):
             self.trig()
 
     def auto_final(self, max_length):
-        _log.debug("%s:auto_final max:%d index:%d final:%s trigger:%s" % (self.__str__(), 
-                        max_length, self.index, str(self._final), str(self._trigger)))
+        _log.debug("%s:auto_final max:%d index:%d final:%s trigger:%s", self, max_length, self.index, self._final, self._trigger)
         self.max_length = max_length
         if self.index >= self.max_length:
             self.final()
@@ -643,15 +641,15 @@ class List(DynOps):
             raise StopIteration
         try:
             e = self.list[self.index]
-            _log.debug("%s.next() = %s" % (self.__str__(), e))
+            _log.debug("%s.next() = %s", self, e)
             self.index += 1
             return e
         except:
             if self._final:
-                _log.debug("%s.next() GOT STOP" % self.__str__())
+                _log.debug("%s.next() GOT STOP", self)
                 raise StopIteration
             else:
-                _log.debug("%s.next() GOT PAUSE" % self.__str__())
+                _log.debug("%s.next() GOT PAUSE", self)
                 raise PauseIteration
 
     def __str__(self):
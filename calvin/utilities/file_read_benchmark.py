@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Time to read files line by line with the bounded line buffer and with memory mapping,
+and for small files with the former unbounded string buffer. The file is generated
+when it doesn't exist, sizes in MB, e.g. 4096 for a 4 GB file.
+
+    python -m calvin.utilities.file_read_benchmark [-s SIZE [SIZE ...]] [-d DIRECTORY]
+"""
+
+import argparse
+import os
+import resource
+import tempfile
+import time
+
+from calvin.runtime.south.plugins.async.twistedimpl.filedescriptor import LineBuffer, MappedFile
+
+# The string buffer is quadratic in the file size when the reader falls behind
+LEGACY_MAX_SIZE = 4
+# Bytes per read, as when reading through the reactor
+CHUNK_SIZE = 8192
+LINE = "%08d The quick brown fox jumps over the lazy dog\n"
+
+
+def _generate(path, size):
+    if os.path.exists(path) and os.path.getsize(path) >= size:
+        return
+    with open(path, "wb") as fp:
+        lines = "".join(LINE % i for i in xrange(1000))
+        for _ in xrange(size / len(lines) + 1):
+            fp.write(lines)
+
+
+def run_legacy(path):
+    """ The whole file buffered in a string, partitioned for each line """
+    start = time.time()
+    lines = 0
+    data = b""
+    with open(path, "rb") as fp:
+        for chunk in iter(lambda: fp.read(CHUNK_SIZE), b""):
+            data += chunk
+    while data:
+        line, _, data = data.partition("\n")
+        lines += 1
+    return time.time() - start, lines
+
+
+def run_buffer(path):
+    """ Chunks read while the buffer has room, lines read in between """
+    start = time.time()
+    lines = 0
+    buf = LineBuffer()
+    at_end = False
+    with open(path, "rb") as fp:
+        while not at_end or len(buf):
+            while not at_end and not buf.full():
+                chunk = fp.read(CHUNK_SIZE)
+                at_end = not chunk
+                buf.append(chunk)
+            while buf.has_line(at_end):
+                buf.read_line()
+                lines += 1
+    return time.time() - start, lines
+
+
+def run_mmap(path):
+    start = time.time()
+    lines = 0
+    with open(path, "rb") as fp:
+        mapped = MappedFile(fp)
+        while mapped.has_line():
+            mapped.read_line()
+            lines += 1
+        mapped.close()
+    return time.time() - start, lines
+
+
+def main():
+    argparser = argparse.ArgumentParser(description="Benchmark reading files line by line")
+    argparser.add_argument('-s', '--sizes', type=int, nargs='+', default=[1, 64, 1024], help="file sizes in MB")
+    argparser.add_argument('-d', '--directory', default=tempfile.gettempdir(), help="directory of the files")
+    args = argparser.parse_args()
+
+    print "%7s %10s %12s %12s %12s %10s" % ("MB", "lines", "string s", "buffer s", "mmap s", "max rss MB")
+    for size in args.sizes:
+        path = os.path.join(args.directory, "calvin_read_benchmark_%d.txt" % size)
+        _generate(path, size * 1024 * 1024)
+        legacy = "%12.2f" % run_legacy(path)[0] if size <= LEGACY_MAX_SIZE else "%12s" % "-"
+        buffered, lines = run_buffer(path)
+        # Before mapping the file, whose pages are counted when read
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+        mapped, _ = run_mmap(path)
+        print "%7d %10d %s %12.2f %12.2f %10.1f" % (size, lines, legacy, buffered, mapped, rss)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Cost of registering nodes in the hierarchical index and of looking them up,
+for each index layout, using an in-memory registry that counts operations.
+
+    python -m calvin.utilities.index_benchmark [-n NODES [NODES ...]]
+"""
+
+import argparse
+import time
+
+from calvin.runtime.north import storage
+from calvin.runtime.north.plugins.storage.index import index_factory
+
+
+class _CountingRegistry(object):
+    """ Registry answering immediately, counts the operations """
+
+    def __init__(self, coder):
+        self.coder = coder
+        self.data = {}
+        self.ops = 0
+
+    def get_concat(self, key, cb=None):
+        self.ops += 1
+        cb(key, self.coder.encode(list(self.data[key])) if key in self.data else None)
+
+    def append(self, key, value, cb=None):
+        self.ops += 1
+        self.data.setdefault(key, set()).update(self.coder.decode(value))
+        cb(key, True)
+
+    def remove(self, key, value, cb=None):
+        self.ops += 1
+        self.data.setdefault(key, set()).difference_update(self.coder.decode(value))
+        cb(key, True)
+
+
+class _Node(object):
+    id = "benchmark"
+
+
+def _indexes(i):
+    """ Indexes a node registers, an address and two capabilities """
+    return [("node/address/se/region%d/city%d/street%d/%d" % (i % 4, i % 20, i % 200, i), 3),
+            (['node', 'capabilities', 'sys.timer'], 3),
+            (['node', 'capabilities', 'io.sensor%d' % (i % 10)], 3)]
+
+
+LOOKUPS = ["node/address/se/region1", "node/address/se/region1/city5/street5", ['node', 'capabilities', 'io.sensor3']]
+
+
+def run(index_type, nodes):
+    s = storage.Storage(_Node(), override_storage=object())
+    registry = _CountingRegistry(s.coder)
+    s.storage = registry
+    s.started = True
+    s.index = index_factory.get(index_type, s)
+
+    start = time.time()
+    for i in xrange(nodes):
+        for index, root_prefix_level in _indexes(i):
+            s.add_index(index, "node%d" % i, root_prefix_level=root_prefix_level)
+    add_time = time.time() - start
+    add_ops = registry.ops
+
+    registry.ops = 0
+    start = time.time()
+    for index in LOOKUPS:
+        s.get_index_iter(index)
+    get_time = time.time() - start
+    return (float(add_ops) / nodes, add_time / nodes, float(registry.ops) / len(LOOKUPS), get_time / len(LOOKUPS))
+
+
+def main():
+    argparser = argparse.ArgumentParser(description="Benchmark index layouts")
+    argparser.add_argument('-n', '--nodes', type=int, nargs='+', default=[1000, 10000], help="number of nodes")
+    args = argparser.parse_args()
+
+    print "%-12s %7s %12s %12s %12s %12s" % ("layout", "nodes", "add ops", "add us", "lookup ops", "lookup ms")
+    for nodes in args.nodes:
+        for index_type in ("levels", "prefix_hash", "trie"):
+            add_ops, add_time, get_ops, get_time = run(index_type, nodes)
+            print "%-12s %7d %12.1f %12.1f %12.1f %12.2f" % (index_type, nodes, add_ops, add_time * 1e6,
+                                                             get_ops, get_time * 1e3)
+
+
+if __name__ == '__main__':
+    main()
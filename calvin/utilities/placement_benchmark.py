@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+
+"""
+Time to place synthetic applications of chained actors with the placement solver,
+and for small applications with the former connectivity matrix weighting.
+
+    python -m calvin.utilities.placement_benchmark [-n ACTORS [ACTORS ...]] [-m NODES]
+"""
+
+import argparse
+import random
+import time
+
+from calvin.runtime.north.plugins.placement.placement_problem import PlacementProblem
+from calvin.runtime.north.plugins.placement.heuristic_solver import HeuristicSolver
+from calvin.runtime.north.plugins.placement import objective_factory
+
+# The matrix weighting is cubic in the number of actors
+MATRIX_MAX_ACTORS = 500
+CHAIN_LENGTH = 10
+
+
+def _application(actors, nodes):
+    """ Chains of actors with some random extra connections, each actor allowed on a few nodes """
+    rnd = random.Random(actors)
+    actor_ids = ["actor%d" % i for i in xrange(actors)]
+    node_ids = ["node%d" % i for i in xrange(nodes)]
+    connections = [(actor_ids[i], actor_ids[i + 1]) for i in xrange(actors - 1) if (i + 1) % CHAIN_LENGTH]
+    connections += [(rnd.choice(actor_ids), rnd.choice(actor_ids)) for _ in xrange(actors / 10)]
+    allowed = {actor_id: rnd.sample(node_ids, max(1, nodes / 2)) for actor_id in actor_ids}
+    rtt = {node_id: rnd.uniform(0.001, 0.05) for node_id in node_ids}
+    return actor_ids, allowed, connections, node_ids, rtt
+
+
+def run_matrix(actor_ids, allowed, connections, node_ids):
+    """ The weighting of the actor by actor connectivity matrix used before the solver """
+    start = time.time()
+    l = len(actor_ids)
+    actor_matrix = [[0 for x in range(l)] for x in range(l)]
+    for actor_id, peer_actor_id in connections:
+        actor_matrix[actor_ids.index(actor_id)][actor_ids.index(peer_actor_id)] = 0.5
+        actor_matrix[actor_ids.index(peer_actor_id)][actor_ids.index(actor_id)] = 0.5
+    for i in range(l):
+        actor_matrix[i][i] = 1
+    for actor_id in actor_ids:
+        actor_weights = actor_matrix[actor_ids.index(actor_id)]
+        weights = [sum([actor_weights[actor_ids.index(_id)] if node_id in allowed[actor_id] else 0
+                        for _id in actor_ids])
+                   for node_id in node_ids]
+        [n for (w, n) in sorted(zip(weights, node_ids), reverse=True)]
+    return time.time() - start
+
+
+def run_solver(actor_ids, allowed, connections, node_ids, rtt, time_budget):
+    start = time.time()
+    problem = PlacementProblem(actor_ids, allowed, connections, rtt=rtt, local_node_id=node_ids[0])
+    objectives = [(1.0, objective_factory.get("colocation", problem)),
+                  (0.5, objective_factory.get("load_balance", problem)),
+                  (1.0, objective_factory.get("link_cost", problem))]
+    solver = HeuristicSolver(problem, objectives, time_budget)
+    placement = solver.solve()
+    solver.ranked()
+    elapsed = time.time() - start
+    # Fraction of the connections between actors on the same node
+    colocated = sum(1 for a, b in connections
+                    if placement[problem.actor_ids.index(a)] == placement[problem.actor_ids.index(b)])
+    return elapsed, solver.moves, float(colocated) / (len(connections) or 1)
+
+
+def main():
+    argparser = argparse.ArgumentParser(description="Benchmark actor placement")
+    argparser.add_argument('-n', '--actors', type=int, nargs='+', default=[100, 1000, 5000], help="number of actors")
+    argparser.add_argument('-m', '--nodes', type=int, default=20, help="number of nodes")
+    argparser.add_argument('-t', '--time-budget', type=float, default=0.2, help="solver time budget in seconds")
+    args = argparser.parse_args()
+
+    print "%7s %7s %12s %12s %8s %10s" % ("actors", "nodes", "matrix ms", "solver ms", "moves", "colocated")
+    for actors in args.actors:
+        actor_ids, allowed, connections, node_ids, rtt = _application(actors, args.nodes)
+        matrix = "%12.1f" % (run_matrix(actor_ids, allowed, connections, node_ids) * 1e3) \
+            if actors <= MATRIX_MAX_ACTORS else "%12s" % "-"
+        elapsed, moves, colocated = run_solver(actor_ids, allowed, connections, node_ids, rtt, args.time_budget)
+        print "%7d %7d %s %12.1f %8d %10.2f" % (actors, args.nodes, matrix, elapsed * 1e3, moves, colocated)
+
+
+if __name__ == '__main__':
+    main()
@@ -19,8 +19,13 @@ from calvin.utilities import calvinlogger
 from calvin.runtime.north.plugins.requirements import req_operations
 import calvin.requests.calvinresponse as response
 from calvin.runtime.south.plugins.async import async
+from calvin.utilities import calvinconfig
 
 _log = calvinlogger.get_logger(__name__)
+_conf = calvinconfig.get()
+
+# Seconds to wait for a paused requirement match before iterating anyway
+PAUSE_TIMEOUT = _conf.get(None, "req_match_pause_timeout") or 5.0
 
 class ReqMatch(object):
     """ ReqMatch Do requirement matching for an actor.
@@ -65,9 +70,9 @@ class ReqMatch(object):
         self.requirements = requirements
         self.actor_id = actor_id
         self.component_ids = component_ids
-        self._collect_placement_counter = 0
-        self._collect_placement_last_value = 0
         self._collect_placement_cb = None
+        self._collect_placement_retrigger = False
+        self._collecting = False
         self.node_iter = self._build_match()
         self.possible_placements = set([])
         self.done = False
@@ -126,21 +131,29 @@ class ReqMatch(object):
             self._collect_placement_cb = None
         if self.done:
             return
+        if self._collecting:
+            # Triggered from within our own iteration, e.g. a synchronous storage response,
+            # iterate once more when the current iteration pauses
+            self._collect_placement_retrigger = True
+            return
+        self._collecting = True
         try:
             while True:
-                _log.analyze(self.node.id, "+ ITER", {})
-                node_id = self.node_iter.next()
-                self.possible_placements.add(node_id)
+                self._collect_placement_retrigger = False
+                try:
+                    while True:
+                        _log.analyze(self.node.id, "+ ITER", {})
+                        node_id = self.node_iter.next()
+                        self.possible_placements.add(node_id)
+                except dynops.PauseIteration:
+                    if self._collect_placement_retrigger:
+                        continue
+                    raise
         except dynops.PauseIteration:
-            _log.analyze(self.node.id, "+ PAUSED",
-                    {'counter': self._collect_placement_counter,
-                     'last_value': self._collect_placement_last_value,
-                     'diff': self._collect_placement_counter - self._collect_placement_last_value})
-            # FIXME the dynops should be self triggering, but is not...
-            # This is a temporary fix by keep trying
-            delay = 0.0 if self._collect_placement_counter > self._collect_placement_last_value + 100 else 0.2
-            self._collect_placement_counter += 1
-            self._collect_placement_cb = async.DelayedCall(delay, self._collect_placements)
+            _log.analyze(self.node.id, "+ PAUSED", {})
+            # The dynops trigger us when leafs are filled in, the timer is only a safety net
+            # for leafs never reporting back
+            self._collect_placement_cb = async.DelayedCall(PAUSE_TIMEOUT, self._collect_placements)
             return
         except StopIteration:
             # All possible actor placements derived
@@ -153,4 +166,5 @@ class ReqMatch(object):
             _log.analyze(self.node.id, "+ END", {})
         except:
             _log.exception("ReqMatch:_collect_placements")
-
+        finally:
+            self._collecting = False
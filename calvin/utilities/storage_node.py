@@ -31,7 +31,9 @@ _log = get_logger(__name__)
 
 
 class FakeAM(object):
-    def enabled_actors():
+    actors = {}
+
+    def enabled_actors(self, actor_ids=None):
         return []
 
 